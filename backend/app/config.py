@@ -15,6 +15,36 @@ class Settings(BaseSettings):
     default_chunk_size: int = 5000
     preview_row_limit: int = 100
 
+    # Execution motoru
+    default_prefetch_chunks: int = 2  # Kaynak okuma ön belleği (chunk sayısı, 0 = kapalı)
+    default_max_parallel_branches: int = 4  # Aynı anda çalışabilecek bağımsız hedef dalı
+    default_fanout_buffer_chunks: int = 4  # Fan-out'ta tüketici başına bellekte bekleyen chunk
+    default_columnar_chunks: bool = False  # Kaynaklar chunk'ları kolon bazlı (ColumnarChunk) üretsin
+    max_source_partitions: int = 16  # Paralel okumada kaynak başına en fazla parça (bağlantı)
+    default_pushdown: bool = True  # Filtre koşullarını ve kullanılan kolonları kaynak sorgusuna taşı
+    default_join_memory_rows: int = 500_000  # Join build tarafı bu satır sayısını aşınca diske taşar
+    default_aggregate_memory_groups: int = 200_000  # Aggregate bu grup sayısını aşınca kısmi sonuçları diske döker
+
+    # BigQuery
+    bigquery_load_format: str = "parquet"  # parquet (pyarrow gerekir, yoksa json'a düşer) | json
+    bigquery_load_batch_rows: int = 1_000_000  # Bu kadar satır birikince tek load job (0 = chunk başına job)
+    bigquery_load_batch_bytes: int = 256 * 1024 * 1024  # Tampon (sıkıştırılmış gövde) bu boyutu aşınca yükle
+    bigquery_max_inflight_loads: int = 4  # Hedef tablo başına aynı anda çalışan load job (0 = her job beklenir)
+    bigquery_schema_cache_ttl_seconds: int = 0  # Hedef şemaları çalıştırmalar arası önbellekte tut (0 = yalnız çalıştırma boyunca)
+    bigquery_storage_read: bool = True  # Kaynak okumada Storage Read API (google-cloud-bigquery-storage + pyarrow)
+
+    # MSSQL bağlantı havuzu (connection id + config başına)
+    mssql_pool_min_size: int = 1  # Boşta da açık tutulan bağlantı
+    mssql_pool_max_size: int = 20
+    mssql_pool_idle_timeout_seconds: int = 300  # Bu süre boşta kalan bağlantı kapatılır
+    mssql_pool_health_check_after_seconds: int = 30  # Bu süreden uzun boşta kaldıysa checkout'ta ping
+    mssql_pool_acquire_timeout_seconds: int = 60
+
+    # Execution logları (toplu yazım)
+    log_flush_batch_size: int = 200  # Bu kadar satır birikince DB'ye yazılır
+    log_flush_interval_ms: int = 500  # Birikmese de en geç bu sürede yazılır
+    log_tail_size: int = 1000  # Execution başına bellekte tutulan son log satırı
+
     # JWT Authentication
     jwt_secret_key: str = _DEFAULT_JWT_SECRET
     jwt_algorithm: str = "HS256"
@@ -1,10 +1,31 @@
+import contextlib
 from abc import ABC, abstractmethod
-from typing import Any, Generator
+from typing import Any, Callable, ContextManager, Generator, Optional
+
+from app.engine.cancellation import CancellationToken
+from app.engine.chunk import Chunk
 
 
 class BaseConnector(ABC):
     """Tüm veri kaynağı/hedef bağlayıcılarının soyut temel sınıfı."""
 
+    # Execution'ın iptal token'ı (bkz. engine.cancellation); None ise iptal denetlenmez
+    cancel_token: Optional[CancellationToken] = None
+
+    def bind_cancellation(self, token: Optional[CancellationToken]) -> None:
+        """Uzun süren okuma/yazma çağrıları bu token iptal edilince kesilir."""
+        self.cancel_token = token
+
+    def _check_cancelled(self) -> None:
+        if self.cancel_token is not None:
+            self.cancel_token.check()
+
+    def _abort_on_cancel(self, abort: Callable[[], None]) -> ContextManager[None]:
+        """Blok süresince iptalde abort'u çağırır (çalışan sorgu / job'ı keser)."""
+        if self.cancel_token is None:
+            return contextlib.nullcontext()
+        return self.cancel_token.on_cancel(abort)
+
     @abstractmethod
     def test_connection(self) -> dict:
         """Bağlantıyı test eder. {"success": bool, "message": str} döner."""
@@ -37,18 +58,75 @@ class BaseConnector(ABC):
 
     @abstractmethod
     def read_chunks(
-        self, query: str, chunk_size: int = 5000
-    ) -> Generator[list[dict[str, Any]], None, None]:
-        """Streaming okuma — chunk chunk yield eder. Bellek dostu."""
+        self, query: str, chunk_size: int = 5000, columnar: bool = False
+    ) -> Generator[Chunk, None, None]:
+        """
+        Streaming okuma — chunk chunk yield eder. Bellek dostu.
+        columnar=True ise chunk'lar list[dict] yerine ColumnarChunk olarak üretilir.
+        """
         ...
 
     @abstractmethod
     def write_chunk(
-        self, schema: str, table: str, rows: list[dict[str, Any]], mode: str = "append"
+        self, schema: str, table: str, rows: Chunk, mode: str = "append"
     ) -> int:
-        """Bir chunk yazar, yazılan satır sayısını döner."""
+        """
+        Bir chunk yazar (list[dict] veya ColumnarChunk), yazılan satır sayısını döner.
+        Yazmaları tamponlayan / asenkron yükleyen connector'larda dönen sayı kabul
+        edilen satırdır; satırlar flush_writes() (veya tampon eşiği) ile commit edilir.
+        """
         ...
 
+    @property
+    def pending_write_rows(self) -> int:
+        """
+        write_chunk ile kabul edilip henüz commit edilmemiş (tamponda veya çalışan
+        job'da bekleyen) satır sayısı. Commit'ler kabul sırasıyla görünür: değer
+        azaldığında en önce kabul edilen satırlar commit edilmiştir.
+        """
+        return 0
+
+    @property
+    def discarded_write_rows(self) -> int:
+        """
+        Kabul edildikten sonra yazma hatası nedeniyle atılan (commit edilmemiş)
+        satırların toplamı. Hatayı fırlatan write_chunk çağrısının kendi satırları
+        bu sayıya dahil değildir.
+        """
+        return 0
+
+    def flush_writes(self) -> int:
+        """
+        Tamponda bekleyen yazmaları commit eder, commit edilen satır sayısını döner.
+        Hata alınırsa tampondaki satırlar atılır. close() tamponu commit etmez.
+        """
+        return 0
+
+    def partition_queries(
+        self, query: str, column: str, count: int, method: str = "range"
+    ) -> list[str]:
+        """
+        Sorguyu ayrı bağlantılardan paralel okunabilecek parçalara böler
+        (bkz. connectors.partitioning). Parça sorgularının listesini döner.
+        """
+        raise NotImplementedError(f"{type(self).__name__} paralel okuma desteklemiyor")
+
+    def describe_query(self, query: str) -> dict:
+        """
+        Sorguyu veri okumadan inceler:
+        {"columns": [kolon adları], "types": {kolon: SQL tip adı}, "bytes_processed": int | None}.
+        Pushdown planında kaynak kolonlarını ve tiplerini (ve destekleyen lehçede
+        taranacak byte miktarını) öğrenmek için kullanılır. Geçersiz sorguda hata fırlatır.
+        """
+        raise NotImplementedError(f"{type(self).__name__} sorgu inceleme desteklemiyor")
+
+    def finish_upsert(self, schema: str, table: str, key_columns: list[str]) -> int:
+        """
+        write_chunk(mode="upsert") ile staging'e yazılan satırları anahtar
+        kolonlara göre hedefe MERGE eder. Etkilenen satır sayısını döner.
+        """
+        raise NotImplementedError(f"{type(self).__name__} upsert desteklemiyor")
+
     def execute_non_query(self, sql: str) -> int:
         """
         SELECT dışı (INSERT/UPDATE/DELETE/TRUNCATE/DDL) sorgu çalıştırır.
@@ -1,15 +1,49 @@
+import itertools
 import json
-import os
-import tempfile
+import re
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, Callable, Generator, Iterable, Optional
 
+from google.api_core.exceptions import GoogleAPICallError
 from google.cloud import bigquery
 from google.oauth2 import service_account
 
+from app.config import settings
 from app.connectors.base import BaseConnector
+from app.connectors.bigquery_load import LoadBuffer, SchemaPlan, schema_plan_cache
+from app.connectors.partitioning import plan_partition_queries
+from app.engine.chunk import Chunk, ColumnarChunk, as_columnar, chunk_columns
 from app.utils.logger import logger
 
+_STG_SEQ = "__stg_seq"      # Staging tablosunda yazılış sırası
+_STAGING_TTL_HOURS = 24     # Yarıda kalan upsert staging tablosu bu sürede silinir
+_POLL_MIN_SECONDS = 1.0     # Çalışan load job'ın durumu ilk bu süre sonra sorulur
+_POLL_MAX_SECONDS = 16.0    # Sorgu aralığı her denemede iki katına çıkar, en fazla bu kadar
+
+# Filtresiz/projeksiyonsuz tüm tablo sorgusu: [ds].[tablo] (kaynak node'un ürettiği),
+# `proje.ds.tablo` veya ds.tablo — sorgu job'ı çalıştırılmadan tablo doğrudan okunur
+_WHOLE_TABLE_RE = re.compile(
+    r"^\s*SELECT\s+\*\s+FROM\s+"
+    r"(?P<ref>\[[^\]]+\](?:\.\[[^\]]+\]){0,2}|`[^`]+`(?:\.`[^`]+`){0,2}|[\w-]+(?:\.[\w-]+){1,2})"
+    r"\s*;?\s*$",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class _InflightLoad:
+    """Gönderilmiş, sonucu henüz alınmamış load job."""
+    job: Any
+    rows: int
+    write_disposition: str
+    poll_at: float
+    poll_delay: float = _POLL_MIN_SECONDS
+
 
 class BigQueryConnector(BaseConnector):
     def __init__(self, config: dict):
@@ -17,6 +51,22 @@ class BigQueryConnector(BaseConnector):
         self.project_id = config["project_id"]
         self.default_dataset = config.get("dataset", "")
         self._client = self._create_client()
+        self._staging: dict[tuple[str, str], dict] = {}  # (dataset, tablo) → upsert staging bilgisi
+        # parquet: chunk bellekte Parquet olarak yüklenir (pyarrow gerekir) | json: NDJSON
+        self._load_format = (config.get("load_format") or settings.bigquery_load_format).lower()
+        # Chunk'lar tabloya ait tamponda birikir; eşik aşılınca tek load job (0 = chunk başına job)
+        self._load_batch_rows = int(config.get("load_batch_rows", settings.bigquery_load_batch_rows))
+        self._load_batch_bytes = int(config.get("load_batch_bytes", settings.bigquery_load_batch_bytes))
+        self._loads: dict[str, LoadBuffer] = {}  # tablo referansı → henüz yüklenmemiş tampon
+        # Load job'lar beklenmeden gönderilir; tablo başına en fazla bu kadarı aynı anda çalışır (0 = her job beklenir)
+        self._max_inflight = int(config.get("max_inflight_loads", settings.bigquery_max_inflight_loads))
+        self._inflight: dict[str, deque[_InflightLoad]] = {}  # tablo referansı → gönderiliş sırasıyla job'lar
+        self._discarded_rows = 0
+        self._plans: dict[str, SchemaPlan] = {}  # tablo referansı → derlenmiş hedef şema planı
+        self._schema_cache_ttl = float(config.get("schema_cache_ttl", settings.bigquery_schema_cache_ttl_seconds))
+        # Büyük sonuçlar Storage Read API'nin paralel Arrow stream'leriyle okunur
+        self._storage_read = bool(config.get("storage_read", settings.bigquery_storage_read))
+        self._bqstorage: Any = None
 
     def _create_client(self) -> bigquery.Client:
         credentials_json = self.config["credentials_json"]
@@ -26,7 +76,7 @@ class BigQueryConnector(BaseConnector):
         else:
             cred_dict = credentials_json
 
-        credentials = service_account.Credentials.from_service_account_info(cred_dict)
+        credentials = self._credentials = service_account.Credentials.from_service_account_info(cred_dict)
         return bigquery.Client(project=self.project_id, credentials=credentials)
 
     def test_connection(self) -> dict:
@@ -61,6 +111,10 @@ class BigQueryConnector(BaseConnector):
     def get_columns(self, schema: str, table: str) -> list[dict]:
         table_ref = f"{self.project_id}.{schema}.{table}"
         bq_table = self._client.get_table(table_ref)
+        # BQ primary key kısıtı (enforced değil) — upsert anahtarı olarak kullanılır
+        constraints = getattr(bq_table, "table_constraints", None)
+        primary_key = getattr(constraints, "primary_key", None) if constraints else None
+        pk_columns = set(getattr(primary_key, "columns", None) or [])
         columns = []
         for field in bq_table.schema:
             columns.append(
@@ -69,7 +123,7 @@ class BigQueryConnector(BaseConnector):
                     "data_type": field.field_type,
                     "nullable": field.mode != "REQUIRED",
                     "max_length": field.max_length,
-                    "is_primary_key": False,
+                    "is_primary_key": field.name in pk_columns,
                 }
             )
         return columns
@@ -109,174 +163,500 @@ class BigQueryConnector(BaseConnector):
         return {"columns": columns, "rows": rows, "total_rows": len(rows)}
 
     def read_chunks(
-        self, query: str, chunk_size: int = 5000
-    ) -> Generator[list[dict[str, Any]], None, None]:
-        result = self._client.query(query).result(page_size=chunk_size)
+        self, query: str, chunk_size: int = 5000, columnar: bool = False
+    ) -> Generator[Chunk, None, None]:
+        """
+        Tüm tablo sorgularında (SELECT * FROM tablo) sorgu job'ı çalıştırılmaz,
+        tablo doğrudan okunur. Diğer sorgularda job'ın sonuç tablosu okunur.
+        Storage Read API kullanılabiliyorsa satırlar paralel Arrow stream'leriyle,
+        yoksa REST sayfalarıyla gelir.
+        """
+        bq_table = self._whole_table(query)
+        if bq_table is not None:
+            # Tek sayfaya sığan tabloda read session açmaya değmez
+            use_storage = bq_table.num_rows is None or bq_table.num_rows > chunk_size
+            yield from self._read_result(
+                lambda: self._client.list_rows(bq_table, page_size=chunk_size),
+                chunk_size, columnar, use_storage,
+            )
+            return
+
+        job = self._client.query(query)
+        # İptalde job.cancel(): sorgu slot tüketmeyi bırakır, sayfa okuması hata verir
+        with self._abort_on_cancel(job.cancel):
+            try:
+                yield from self._read_result(lambda: job.result(page_size=chunk_size), chunk_size, columnar)
+            except Exception:
+                self._check_cancelled()
+                raise
 
-        chunk: list[dict[str, Any]] = []
+    def _whole_table(self, query: str) -> Optional["bigquery.Table"]:
+        """Sorgu filtresiz tüm tablo okumasıysa tabloyu döner (view/harici tablolar hariç)."""
+        match = _WHOLE_TABLE_RE.match(query)
+        if match is None:
+            return None
+        ref = match.group("ref")
+        parts = [p for p in re.split(r"[\[\]`.]+", ref) if p] if ref[0] in "[`" else ref.split(".")
+        if len(parts) == 1:
+            if not self.default_dataset:
+                return None
+            parts = [self.default_dataset] + parts
+        if len(parts) == 2:
+            parts = [self.project_id] + parts
+        try:
+            bq_table = self._client.get_table(".".join(parts))
+        except Exception as exc:
+            logger.debug(f"Tablo doğrudan okunamıyor, sorgu çalıştırılacak: {exc}")
+            return None
+        # View, materialized view ve harici tablolar list_rows / read session ile okunamaz
+        return bq_table if bq_table.table_type == "TABLE" else None
+
+    def _read_result(
+        self,
+        fetch: Callable[[], Any],
+        chunk_size: int,
+        columnar: bool,
+        use_storage: bool = True,
+    ) -> Generator[Chunk, None, None]:
+        """
+        fetch() → RowIterator. Storage istemcisi varsa sonuç Arrow RecordBatch
+        akışı olarak okunup chunk_size'lık chunk'lara bölünür (küçük sonuçları
+        kütüphane yine REST ile getirir). Read session açılamazsa (ör. yetki yok)
+        REST sayfalamaya dönülür.
+        """
+        storage = self._storage_client() if use_storage else None
+        if storage is not None:
+            batches = fetch().to_arrow_iterable(bqstorage_client=storage)
+            try:
+                first = next(batches, None)
+            except GoogleAPICallError as exc:
+                self._check_cancelled()
+                logger.warning(f"BigQuery Storage Read API kullanılamadı, REST sayfalama kullanılacak: {exc}")
+                self._storage_read = False
+            else:
+                if first is not None:
+                    yield from self._arrow_chunks(itertools.chain([first], batches), chunk_size, columnar)
+                return
+
+        result = fetch()
+        columns = [f.name for f in result.schema] if columnar else []
+
+        def _emit(batch: list) -> Chunk:
+            return ColumnarChunk.from_tuples(columns, batch) if columnar else batch
+
+        chunk: list = []
         for row in result:
-            chunk.append(dict(row.items()))
+            chunk.append(row.values() if columnar else dict(row.items()))
             if len(chunk) >= chunk_size:
-                yield chunk
+                self._check_cancelled()
+                yield _emit(chunk)
                 chunk = []
 
         if chunk:
-            yield chunk
-
-    # ── BQ tip dönüşüm yardımcıları ─────────────────────────────────────
-    @staticmethod
-    def _bq_type_to_python(field_type: str, value: Any) -> Any:
-        """BQ alan tipine göre Python değerini dönüştürür (tip uyumsuzluğunu önler)."""
-        import decimal as _decimal
-        import datetime as _dt
-
-        if value is None:
+            yield _emit(chunk)
+
+    def _arrow_chunks(self, batches: Iterable[Any], chunk_size: int, columnar: bool) -> Generator[Chunk, None, None]:
+        """Stream'lerden gelen RecordBatch'leri chunk_size satırlık chunk'lara böler."""
+        import pyarrow as pa
+
+        def _emit(table: Any) -> Chunk:
+            return ColumnarChunk.from_arrow(table) if columnar else table.to_pylist()
+
+        pending: list[Any] = []
+        count = 0
+        for batch in batches:
+            if not batch.num_rows:
+                continue
+            pending.append(batch)
+            count += batch.num_rows
+            while count >= chunk_size:
+                # Dilimleme kopya üretmez; kalan kısım sonraki chunk'a devreder
+                table = pa.Table.from_batches(pending)
+                rest = table.slice(chunk_size)
+                self._check_cancelled()
+                yield _emit(table.slice(0, chunk_size))
+                pending, count = rest.to_batches(), rest.num_rows
+
+        if count:
+            yield _emit(pa.Table.from_batches(pending))
+
+    def _storage_client(self) -> Any:
+        """Storage Read API istemcisi; kapalıysa veya kütüphaneler kurulu değilse None."""
+        if not self._storage_read:
             return None
-
-        ft = field_type.upper()
-
-        # Tam sayı tipleri
-        if ft in ("INTEGER", "INT64", "INT", "SMALLINT", "BIGINT", "TINYINT", "BYTEINT"):
-            if isinstance(value, bool):
-                return int(value)
-            if isinstance(value, (_decimal.Decimal, float)):
-                return int(value)
-            try:
-                return int(float(str(value)))
-            except (ValueError, TypeError):
-                return None
-
-        # Ondalık tipleri
-        if ft in ("FLOAT", "FLOAT64"):
-            if isinstance(value, bool):
-                return float(int(value))
+        if self._bqstorage is None:
             try:
-                return float(str(value))
-            except (ValueError, TypeError):
+                import pyarrow  # noqa: F401 - Arrow stream'lerini çözmek için gerekir
+                from google.cloud import bigquery_storage
+            except ImportError:
+                logger.info("google-cloud-bigquery-storage / pyarrow kurulu değil, REST sayfalama kullanılacak")
+                self._storage_read = False
                 return None
-
-        # Yüksek hassasiyetli sayı
-        if ft in ("NUMERIC", "BIGNUMERIC", "DECIMAL", "BIGDECIMAL"):
-            if isinstance(value, bool):
-                return float(int(value))
+            self._bqstorage = bigquery_storage.BigQueryReadClient(credentials=self._credentials)
+        return self._bqstorage
+
+    def partition_queries(
+        self, query: str, column: str, count: int, method: str = "range"
+    ) -> list[str]:
+        # Partition'lı tablolarda aralık filtresi partition pruning'e dönüşür
+        def _fetch(sql: str) -> list[tuple]:
+            return [tuple(row.values()) for row in self._client.query(sql).result()]
+
+        return plan_partition_queries(query, column, count, method, "bigquery", _fetch)
+
+    def describe_query(self, query: str) -> dict:
+        # Dry-run job ücretsizdir: şema ve taranacak byte miktarı sorgu çalışmadan döner
+        job = self._client.query(query, job_config=bigquery.QueryJobConfig(dry_run=True, use_query_cache=False))
+        schema = job.schema or []
+        return {
+            "columns": [f.name for f in schema],
+            "types": {f.name: "ARRAY" if f.mode == "REPEATED" else f.field_type.upper() for f in schema},
+            "bytes_processed": job.total_bytes_processed,
+        }
+
+    # ── Hedef şema planları ─────────────────────────────────────────────
+    def _schema_plan(self, table_ref_str: str) -> Optional[SchemaPlan]:
+        """
+        Tablonun derlenmiş şema planı (bkz. bigquery_load.SchemaPlan). Şema
+        connector ömrü boyunca bir kez alınır; schema_cache_ttl verilmişse
+        çalıştırmalar arası da paylaşılır. Tablo yoksa None (autodetect).
+        """
+        plan = self._plans.get(table_ref_str)
+        if plan is not None:
+            return plan
+        if self._schema_cache_ttl > 0:
+            plan = schema_plan_cache.get(table_ref_str)
+        if plan is None:
+            # Mevcut BQ tablo şemasını al — tip uyumsuzluğunu engeller
             try:
-                return float(_decimal.Decimal(str(value)))
-            except Exception:
+                bq_table = self._client.get_table(table_ref_str)
+            except Exception as schema_err:
+                logger.warning(f"BQ tablo şeması alınamadı, autodetect kullanılıyor: {schema_err}")
                 return None
-
-        # Metin
-        if ft in ("STRING", "VARCHAR", "CHAR", "BYTES"):
-            if isinstance(value, (_dt.datetime, _dt.date, _dt.time)):
-                return value.isoformat()
-            return str(value)
-
-        # Boolean
-        if ft == "BOOL" or ft == "BOOLEAN":
-            if isinstance(value, bool):
-                return value
-            return str(value).lower() in ("1", "true", "yes", "t", "on")
-
-        # Tarih
-        if ft == "DATE":
-            if isinstance(value, _dt.datetime):
-                return value.date().isoformat()
-            if isinstance(value, _dt.date):
-                return value.isoformat()
-            # "20231205" gibi integer → "2023-12-05"
-            if isinstance(value, (int, float)):
-                s = str(int(value))
-                if len(s) == 8:
-                    return f"{s[:4]}-{s[4:6]}-{s[6:8]}"
-                return s
-            return str(value)
-
-        # Zaman damgası
-        if ft in ("DATETIME", "TIMESTAMP"):
-            if isinstance(value, (_dt.datetime, _dt.date)):
-                return value.isoformat()
-            return str(value)
-
-        # Bilinmeyen tip — string'e çevir
-        return str(value) if not isinstance(value, (str, int, float, bool, type(None))) else value
-
-    def _apply_bq_schema_types(
-        self, rows: list[dict[str, Any]], bq_table: "bigquery.Table"
-    ) -> list[dict[str, Any]]:
-        """Satırlardaki değerleri BQ tablo şemasına göre Python tipine dönüştürür."""
-        field_map = {f.name: f.field_type for f in bq_table.schema}
-        result = []
-        for row in rows:
-            new_row: dict[str, Any] = {}
-            for key, val in row.items():
-                ft = field_map.get(key)
-                new_row[key] = self._bq_type_to_python(ft, val) if ft else val
-            result.append(new_row)
-        return result
+            plan = SchemaPlan(bq_table.schema)
+            if self._schema_cache_ttl > 0:
+                schema_plan_cache.put(table_ref_str, plan, self._schema_cache_ttl)
+        self._plans[table_ref_str] = plan
+        return plan
+
+    def _forget_schema(self, table_ref_str: str = "") -> None:
+        """Şema değişmiş olabilir (load hatası, DDL): planlar bir sonraki yazımda yeniden alınır."""
+        if table_ref_str:
+            self._plans.pop(table_ref_str, None)
+            schema_plan_cache.invalidate(table_ref_str)
+        else:
+            self._plans.clear()
+            schema_plan_cache.invalidate(f"{self.project_id}.")
 
     def write_chunk(
-        self, schema: str, table: str, rows: list[dict[str, Any]], mode: str = "append",
+        self, schema: str, table: str, rows: Chunk, mode: str = "append",
         col_type_map: Any = None, on_error: str = "rollback", batch_size: int = 500,
     ) -> int:
+        """
+        mode="upsert" ise satırlar geçici staging tablosuna yüklenir;
+        hedefe aktarım finish_upsert() ile tek MERGE sorgusu olarak yapılır.
+        """
         if not rows:
             return 0
 
-        table_ref_str = f"{self.project_id}.{schema}.{table}"
+        if mode == "upsert":
+            return self._stage_rows(schema, table, rows)
 
         write_disposition = (
             bigquery.WriteDisposition.WRITE_TRUNCATE
             if mode == "overwrite"
             else bigquery.WriteDisposition.WRITE_APPEND
         )
+        return self._load_rows(f"{self.project_id}.{schema}.{table}", rows, write_disposition)
+
+    def _load_rows(self, table_ref_str: str, rows: Chunk, write_disposition: str) -> int:
+        """
+        Chunk'ı tablonun load tamponuna ekler (bkz. bigquery_load.LoadBuffer).
+        Tampon satır veya byte eşiğini aşınca load job olarak gönderilir (bkz.
+        _flush_load); kalan satırlar flush_writes() ile yüklenir. Hata alınırsa
+        tablonun tamponu atılır ve çalışan job'ları beklenir.
+        """
+        pending = self._loads.get(table_ref_str)
+        accepted = False
+        try:
+            if pending is not None and not (
+                write_disposition == pending.write_disposition
+                or write_disposition == bigquery.WriteDisposition.WRITE_APPEND
+            ):
+                # Sonradan gelen truncate öncekilerle birleştirilemez; WRITE_TRUNCATE + append birleşebilir
+                self._flush_load(table_ref_str)
+                pending = None
+            self._reap_loads(table_ref_str)
+            if pending is None:
+                pending = self._new_load(table_ref_str, write_disposition)
+            if not pending.add(rows):
+                self._flush_load(table_ref_str)
+                pending = self._new_load(table_ref_str, write_disposition)
+                pending.add(rows)
+            accepted = True
+            if pending.rows >= self._load_batch_rows or pending.size >= self._load_batch_bytes:
+                self._flush_load(table_ref_str)
+        except Exception:
+            self._discard_loads(table_ref_str)
+            if accepted:
+                # Bu chunk'ın satırları çağırana hata olarak zaten bildiriliyor
+                self._discarded_rows -= len(rows)
+            raise
+        return len(rows)
+
+    def _new_load(self, table_ref_str: str, write_disposition: str) -> LoadBuffer:
+        pending = self._loads[table_ref_str] = LoadBuffer(
+            write_disposition, self._schema_plan(table_ref_str), self._load_format
+        )
+        return pending
+
+    def _flush_load(self, table_ref_str: str) -> int:
+        """
+        Tablonun tamponunu load job olarak gönderir, sonucunu beklemez; gönderilen
+        satır sayısını döner. Sıra korunur: truncate job'ı tablonun çalışan
+        job'ları bittikten sonra gönderilir, sonraki job'lar da truncate'i bekler.
+        """
+        pending = self._loads.get(table_ref_str)
+        if pending is None or not pending.rows:
+            self._loads.pop(table_ref_str, None)
+            return 0
+
+        # Bekleme hata verirse tampon henüz _loads'ta olduğundan atılan satırlara sayılır
+        queue = self._inflight.get(table_ref_str)
+        if queue and (
+            pending.write_disposition == bigquery.WriteDisposition.WRITE_TRUNCATE
+            or any(load.write_disposition == bigquery.WriteDisposition.WRITE_TRUNCATE for load in queue)
+        ):
+            self._drain_loads(table_ref_str)
+        while queue and len(queue) >= max(self._max_inflight, 1):
+            self._wait_oldest_load(table_ref_str)
+
+        del self._loads[table_ref_str]
+        payload = pending.finish()
+        job_config = bigquery.LoadJobConfig(
+            write_disposition=pending.write_disposition,
+            source_format=payload.source_format,
+        )
+        if pending.schema is not None:
+            job_config.schema = pending.schema
+        else:
+            job_config.autodetect = True
 
-        # Mevcut BQ tablo şemasını al → Python tiplerini dönüştür
         try:
-            bq_table = self._client.get_table(table_ref_str)
-            rows = self._apply_bq_schema_types(rows, bq_table)
-            # Mevcut şemayı kullan — tip uyumsuzluğunu engeller
-            job_config = bigquery.LoadJobConfig(
-                write_disposition=write_disposition,
-                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
-                schema=bq_table.schema,
-            )
-        except Exception as schema_err:
-            logger.warning(f"BQ tablo şeması alınamadı, autodetect kullanılıyor: {schema_err}")
-            job_config = bigquery.LoadJobConfig(
-                write_disposition=write_disposition,
-                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
-                autodetect=True,
-            )
+            self._check_cancelled()
+            job = self._client.load_table_from_file(payload.data, table_ref_str, job_config=job_config)
+        except Exception:
+            self._discarded_rows += payload.rows
+            self._forget_schema(table_ref_str)
+            raise
+        self._inflight.setdefault(table_ref_str, deque()).append(
+            _InflightLoad(job, payload.rows, pending.write_disposition, time.monotonic() + _POLL_MIN_SECONDS)
+        )
+        if self._max_inflight <= 0:
+            self._drain_loads(table_ref_str)
+        return payload.rows
+
+    # ── Çalışan load job'ları ───────────────────────────────────────────
+
+    def _reap_loads(self, table_ref_str: str) -> None:
+        """
+        Sorgu zamanı gelen job'ların durumunu bloklamadan sorar (aralık her
+        sorguda iki katına çıkar). Biten job'lar gönderiliş sırasıyla düşülür;
+        önündeki job bitmemiş bir job beklemede kalır (commit'ler sıralı görünür).
+        """
+        queue = self._inflight.get(table_ref_str)
+        if not queue:
+            return
+        now = time.monotonic()
+        for load in queue:
+            if load.poll_at <= now and not load.job.done():
+                load.poll_delay = min(load.poll_delay * 2, _POLL_MAX_SECONDS)
+                load.poll_at = now + load.poll_delay
+        while queue and queue[0].job.state == "DONE":
+            self._wait_oldest_load(table_ref_str)
+
+    def _wait_oldest_load(self, table_ref_str: str) -> int:
+        """Tablonun en eski job'ını bekler; hata alınırsa tablonun diğer job'ları da beklenir."""
+        queue = self._inflight[table_ref_str]
+        load = queue[0]
+        try:
+            self._wait_job(load.job)
+        except Exception:
+            self._discard_loads(table_ref_str)
+            raise
+        queue.popleft()
+        return load.rows
+
+    def _drain_loads(self, table_ref_str: str) -> int:
+        """Tablonun tüm job'larını sırayla bekler; commit edilen satır sayısını döner."""
+        done = 0
+        while self._inflight.get(table_ref_str):
+            done += self._wait_oldest_load(table_ref_str)
+        return done
+
+    def _discard_loads(self, table_ref_str: str) -> None:
+        """
+        Hata sonrası: tablonun tamponu atılır, çalışan job'ları bitmeleri için
+        beklenir (hataları loglanır). Böylece hata bildirildikten sonra tabloya
+        yazan job kalmaz.
+        """
+        pending = self._loads.pop(table_ref_str, None)
+        if pending is not None:
+            self._discarded_rows += pending.rows
+        self._forget_schema(table_ref_str)
+        queue = self._inflight.pop(table_ref_str, None) or ()
+        for load in queue:
+            try:
+                self._wait_job(load.job)
+            except Exception as exc:
+                self._discarded_rows += load.rows
+                logger.warning(f"BQ load job ({table_ref_str}, {load.rows} satır) başarısız: {exc}")
+
+    @property
+    def pending_write_rows(self) -> int:
+        return sum(p.rows for p in self._loads.values()) + sum(
+            load.rows for queue in self._inflight.values() for load in queue
+        )
 
-        # NDJSON formatına çevir
-        ndjson_lines = [json.dumps(row, default=str) for row in rows]
-        ndjson_content = "\n".join(ndjson_lines)
+    @property
+    def discarded_write_rows(self) -> int:
+        return self._discarded_rows
 
-        # Windows'ta delete=True ile açık dosyayı tekrar açmak Permission denied verir.
-        # Bu yüzden delete=False kullanıp, işlem bittikten sonra manuel siliyoruz.
-        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+    def flush_writes(self) -> int:
+        flushed = 0
         try:
-            tmp.write(ndjson_content)
-            tmp.flush()
-            tmp.close()  # Windows'ta başka process açabilmesi için önce kapat
+            for table_ref_str in list(self._loads):
+                self._flush_load(table_ref_str)
+            for table_ref_str in list(self._inflight):
+                flushed += self._drain_loads(table_ref_str)
+        except Exception:
+            # Hata halinde kalan tamponlar atılır, çalışan job'lar beklenir
+            for table_ref_str in set(self._loads) | set(self._inflight):
+                self._discard_loads(table_ref_str)
+            raise
+        return flushed
+
+    # ── Upsert (staging + MERGE) ────────────────────────────────────────
+
+    def _stage_rows(self, schema: str, table: str, rows: Chunk) -> int:
+        """
+        Satırları hedefle aynı dataset'teki staging tablosuna yükler.
+        Staging tablosu hedef şemasıyla ilk chunk'ta oluşturulur ve süreli
+        (expires) açılır; iş yarıda kalsa bile BQ tarafından silinir.
+        """
+        key = (schema, table)
+        staging = self._staging.get(key)
+        if staging is None:
+            target = self._schema_plan(f"{self.project_id}.{schema}.{table}")
+            if target is None:
+                raise ValueError(f"Upsert hedef tablosu bulunamadı: {schema}.{table}")
+            stg_id = f"{self.project_id}.{schema}._stg_{table}_{uuid.uuid4().hex[:8]}"
+            stg_table = bigquery.Table(stg_id, schema=target.schema + [bigquery.SchemaField(_STG_SEQ, "INT64")])
+            stg_table.expires = datetime.now(timezone.utc) + timedelta(hours=_STAGING_TTL_HOURS)
+            self._client.create_table(stg_table)
+            # Staging şeması bilindiği için load'larda get_table çağrılmaz
+            self._plans[stg_id] = SchemaPlan(stg_table.schema)
+            staging = self._staging[key] = {"table_id": stg_id, "columns": list(chunk_columns(rows)), "seq": 0}
+
+        columnar = as_columnar(rows)
+        start = staging["seq"]
+        staging["seq"] += len(columnar)
+        staged = ColumnarChunk(
+            columnar.columns + [_STG_SEQ],
+            columnar.data + [list(range(start + 1, staging["seq"] + 1))],
+            length=len(columnar),
+        )
+        self._load_rows(staging["table_id"], staged, bigquery.WriteDisposition.WRITE_APPEND)
+        return len(columnar)
 
-            with open(tmp.name, "rb") as f:
-                job = self._client.load_table_from_file(f, table_ref_str, job_config=job_config)
-                job.result()  # Tamamlanmasını bekle
-        finally:
-            try:
-                os.unlink(tmp.name)  # Geçici dosyayı temizle
-            except OSError:
-                pass
+    def finish_upsert(self, schema: str, table: str, key_columns: list[str]) -> int:
+        """Staging tablosunu anahtar kolonlara göre hedefe MERGE eder; aynı anahtarın son yazılanı kazanır."""
+        staging = self._staging.get((schema, table))
+        if staging is None:
+            return 0
+        self._flush_load(staging["table_id"])
+        self._drain_loads(staging["table_id"])
+
+        columns: list[str] = staging["columns"]
+        lower_cols = {c.lower(): c for c in columns}
+        missing = [k for k in key_columns if k.lower() not in lower_cols]
+        if missing:
+            raise ValueError(f"Upsert anahtar kolonu veride yok ({schema}.{table}): {', '.join(missing)}")
+        keys = [lower_cols[k.lower()] for k in key_columns]
+        key_set = {k.lower() for k in keys}
+        updates = [c for c in columns if c.lower() not in key_set]
+
+        cols = ", ".join(f"`{c}`" for c in columns)
+        sql = (
+            f"MERGE `{self.project_id}.{schema}.{table}` AS t "
+            f"USING (SELECT {cols} FROM `{staging['table_id']}` WHERE TRUE "
+            f"QUALIFY ROW_NUMBER() OVER (PARTITION BY {', '.join(f'`{k}`' for k in keys)} "
+            f"ORDER BY `{_STG_SEQ}` DESC) = 1) AS s "
+            f"ON {' AND '.join(f't.`{k}` = s.`{k}`' for k in keys)} "
+        )
+        if updates:
+            sql += "WHEN MATCHED THEN UPDATE SET " + ", ".join(f"`{c}` = s.`{c}`" for c in updates) + " "
+        sql += f"WHEN NOT MATCHED THEN INSERT ({cols}) VALUES ({', '.join(f's.`{c}`' for c in columns)})"
 
-        return len(rows)
+        try:
+            job = self._client.query(sql)
+            self._wait_job(job)
+        finally:
+            self._client.delete_table(staging["table_id"], not_found_ok=True)
+            self._plans.pop(staging["table_id"], None)
+            del self._staging[(schema, table)]
+        affected = job.num_dml_affected_rows
+        return affected if affected is not None else -1
 
     def execute_non_query(self, sql: str) -> int:
         """BigQuery üzerinde DML / DDL sorgusu çalıştırır."""
+        # Sorgu yüklenen tablolara dokunabilir; gönderilmiş load job'lar önce biter
+        for table_ref_str in list(self._inflight):
+            self._drain_loads(table_ref_str)
         job = self._client.query(sql)
-        job.result()  # Tamamlanmasını bekle
+        try:
+            self._wait_job(job)
+        finally:
+            if job.statement_type not in (None, "SELECT", "INSERT", "UPDATE", "DELETE", "MERGE"):
+                # DDL tablo şemalarını değiştirmiş olabilir
+                self._forget_schema()
         # DML için num_dml_affected_rows, DDL için None
         affected = job.num_dml_affected_rows
         return affected if affected is not None else -1
 
+    def _wait_job(self, job: Any) -> None:
+        """Job'un bitmesini bekler; execution iptal edilirse job.cancel() ile durdurur."""
+        with self._abort_on_cancel(job.cancel):
+            try:
+                job.result()
+            except Exception:
+                self._check_cancelled()
+                raise
+
     def close(self):
+        # Yüklenmemiş tamponlar commit edilmez (bkz. flush_writes); yarıda bırakılan
+        # (iptal / hata) çalışmadaki job'lar iptal edilir
+        self._loads.clear()
+        for queue in self._inflight.values():
+            for load in queue:
+                if load.job.state != "DONE":
+                    try:
+                        load.job.cancel()
+                    except Exception as exc:
+                        logger.warning(f"BQ load job iptal edilemedi: {exc}")
+        self._inflight.clear()
         if self._client:
+            # Tamamlanmamış upsert staging tabloları (expires zaten ayarlı)
+            for staging in self._staging.values():
+                try:
+                    self._client.delete_table(staging["table_id"], not_found_ok=True)
+                except Exception as exc:
+                    logger.warning(f"BQ staging tablosu silinemedi: {exc}")
+            self._staging.clear()
             self._client.close()
+        if self._bqstorage is not None:
+            try:
+                self._bqstorage.transport.close()
+            except Exception as exc:
+                logger.warning(f"BQ Storage istemcisi kapatılamadı: {exc}")
+            self._bqstorage = None
@@ -0,0 +1,443 @@
+"""
+BigQuery load job gövdesi (payload) üretimi.
+
+Chunk'lar load job'a geçici dosya yerine bellekteki buffer'dan gönderilir.
+pyarrow kuruluysa ve chunk'ın tüm kolonları hedef şemada Arrow'a eşlenebilen
+tiplerdeyse chunk, hedef şemayla tiplenmiş kolon bazlı Parquet olarak yazılır
+(satır başına JSON metni üretilmez). Eşlenemeyen tipler (RECORD, JSON,
+REPEATED vb.), şemasız (autodetect) yükleme veya dönüştürülemeyen değerler
+NDJSON'a düşer.
+
+LoadBuffer birden fazla chunk'ı tek load job gövdesinde biriktirir: Parquet'te
+her chunk ayrı row group olarak sıkıştırılmış halde yazılır, böylece binlerce
+chunk'lık bir yükleme birkaç job'a iner.
+
+Hedef şema SchemaPlan olarak derlenir: kolon listesi başına ad eşlemesi ve
+kolon dönüştürücüleri bir kez çözülür, chunk'lar kolon bazlı dönüştürülür.
+Değerleri zaten hedef tipte olan kolonlar Python dönüştürücüsü çağrılmadan
+doğrudan Arrow dizisine çevrilir. Planlar connector ömrü boyunca, TTL
+verilirse (bigquery_schema_cache_ttl_seconds) çalıştırmalar arası saklanır.
+
+Arrow tip eşlemesi google-cloud-bigquery'nin DataFrame yüklemesinde
+kullandığıyla aynıdır (DATETIME → tz'siz timestamp, TIMESTAMP → UTC timestamp,
+NUMERIC → decimal128(38, 9), BIGNUMERIC → decimal256(76, 38)).
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import decimal as _decimal
+import io
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from app.engine.chunk import Chunk, ColumnarChunk, as_columnar, as_rows
+from app.utils.logger import logger
+
+try:
+    import pyarrow as _pa
+    import pyarrow.parquet as _pq
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    _pa = None
+    _pq = None
+
+SOURCE_FORMAT_PARQUET = "PARQUET"
+SOURCE_FORMAT_NDJSON = "NEWLINE_DELIMITED_JSON"
+
+# NUMERIC/BIGNUMERIC ölçeklemesinde 28 basamaklı varsayılan context yetmez
+_DECIMAL_CONTEXT = _decimal.Context(prec=80)
+_NUMERIC_SCALE = _decimal.Decimal(1).scaleb(-9)
+_BIGNUMERIC_SCALE = _decimal.Decimal(1).scaleb(-38)
+
+
+@dataclass
+class LoadPayload:
+    """load_table_from_file'a verilecek bellek içi gövde."""
+    data: io.BytesIO
+    source_format: str
+    rows: int
+
+
+# ─── Değer dönüştürücüler (Arrow'a native Python tipleri) ─────────────────
+
+def _to_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (_decimal.Decimal, float)):
+        return int(value)
+    try:
+        return int(float(str(value)))
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return float(int(value))
+    try:
+        return float(value if isinstance(value, (int, float, _decimal.Decimal)) else str(value))
+    except (ValueError, TypeError):
+        return None
+
+
+def _decimal_converter(scale: _decimal.Decimal) -> Callable[[Any], Any]:
+    def _convert(value: Any) -> _decimal.Decimal:
+        if isinstance(value, bool):
+            value = int(value)
+        if not isinstance(value, _decimal.Decimal):
+            value = _decimal.Decimal(str(value))
+        return value.quantize(scale, context=_DECIMAL_CONTEXT)
+    return _convert
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (_dt.datetime, _dt.date, _dt.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_bytes(value: Any) -> bytes:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    return str(value).encode("utf-8")
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("1", "true", "yes", "t", "on")
+
+
+def _to_date(value: Any) -> _dt.date:
+    if isinstance(value, _dt.datetime):
+        return value.date()
+    if isinstance(value, _dt.date):
+        return value
+    if isinstance(value, (int, float)):
+        # 20231205 gibi integer tarih
+        s = str(int(value))
+        return _dt.date(int(s[:4]), int(s[4:6]), int(s[6:8]))
+    return _dt.date.fromisoformat(str(value)[:10])
+
+
+def _to_datetime(value: Any) -> _dt.datetime:
+    if isinstance(value, _dt.datetime):
+        if value.tzinfo is not None:
+            return value.astimezone(_dt.timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, _dt.date):
+        return _dt.datetime.combine(value, _dt.time())
+    return _to_datetime(_dt.datetime.fromisoformat(str(value)))
+
+
+def _to_timestamp(value: Any) -> _dt.datetime:
+    if isinstance(value, _dt.datetime):
+        # tz'siz değer BigQuery'deki gibi UTC kabul edilir
+        return value if value.tzinfo is not None else value.replace(tzinfo=_dt.timezone.utc)
+    if isinstance(value, _dt.date):
+        return _dt.datetime.combine(value, _dt.time(), tzinfo=_dt.timezone.utc)
+    return _to_timestamp(_dt.datetime.fromisoformat(str(value)))
+
+
+def _to_time(value: Any) -> _dt.time:
+    if isinstance(value, _dt.datetime):
+        return value.time()
+    if isinstance(value, _dt.time):
+        return value
+    return _dt.time.fromisoformat(str(value))
+
+
+def _json_numeric(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return float(int(value))
+    try:
+        return float(_decimal.Decimal(str(value)))
+    except Exception:
+        return None
+
+
+def _json_date(value: Any) -> str:
+    if isinstance(value, _dt.datetime):
+        return value.date().isoformat()
+    if isinstance(value, _dt.date):
+        return value.isoformat()
+    # "20231205" gibi integer → "2023-12-05"
+    if isinstance(value, (int, float)):
+        s = str(int(value))
+        if len(s) == 8:
+            return f"{s[:4]}-{s[4:6]}-{s[6:8]}"
+        return s
+    return str(value)
+
+
+def _json_datetime(value: Any) -> str:
+    if isinstance(value, (_dt.datetime, _dt.date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_other(value: Any) -> Any:
+    # Bilinmeyen tip — JSON'a yazılamayan değerler string'e çevrilir
+    return str(value) if not isinstance(value, (str, int, float, bool)) else value
+
+
+_JSON_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    **dict.fromkeys(("INTEGER", "INT64", "INT", "SMALLINT", "BIGINT", "TINYINT", "BYTEINT"), _to_int),
+    **dict.fromkeys(("FLOAT", "FLOAT64"), _to_float),
+    **dict.fromkeys(("NUMERIC", "BIGNUMERIC", "DECIMAL", "BIGDECIMAL"), _json_numeric),
+    **dict.fromkeys(("STRING", "VARCHAR", "CHAR", "BYTES"), _to_str),
+    **dict.fromkeys(("BOOL", "BOOLEAN"), _to_bool),
+    "DATE": _json_date,
+    "DATETIME": _json_datetime,
+    "TIMESTAMP": _json_datetime,
+}
+
+
+def json_converter(field_type: str) -> Callable[[Any], Any]:
+    """BQ alan tipi → NDJSON değer dönüştürücüsü (None olmayan değerler için)."""
+    return _JSON_CONVERTERS.get(field_type.upper(), _json_other)
+
+
+_ARROW_TYPES: Optional[dict[str, tuple[Any, Callable[[Any], Any], tuple[type, ...]]]] = None
+
+
+def _arrow_types() -> dict[str, tuple[Any, Callable[[Any], Any], tuple[type, ...]]]:
+    """BQ alan tipi → (Arrow tipi, değer dönüştürücü, doğrudan çevrilebilen Python tipleri)."""
+    global _ARROW_TYPES
+    if _ARROW_TYPES is None:
+        pa = _pa
+        numeric = (pa.decimal128(38, 9), _decimal_converter(_NUMERIC_SCALE), (_decimal.Decimal, int))
+        bignumeric = (pa.decimal256(76, 38), _decimal_converter(_BIGNUMERIC_SCALE), (_decimal.Decimal, int))
+        _ARROW_TYPES = {
+            "INTEGER": (pa.int64(), _to_int, (int,)),
+            "INT64": (pa.int64(), _to_int, (int,)),
+            "FLOAT": (pa.float64(), _to_float, (float, int)),
+            "FLOAT64": (pa.float64(), _to_float, (float, int)),
+            "NUMERIC": numeric,
+            "DECIMAL": numeric,
+            "BIGNUMERIC": bignumeric,
+            "BIGDECIMAL": bignumeric,
+            "STRING": (pa.string(), _to_str, (str,)),
+            "GEOGRAPHY": (pa.string(), _to_str, (str,)),
+            "BYTES": (pa.binary(), _to_bytes, (bytes,)),
+            "BOOL": (pa.bool_(), _to_bool, (bool,)),
+            "BOOLEAN": (pa.bool_(), _to_bool, (bool,)),
+            "DATE": (pa.date32(), _to_date, (_dt.date,)),
+            "DATETIME": (pa.timestamp("us"), _to_datetime, (_dt.datetime,)),
+            "TIMESTAMP": (pa.timestamp("us", tz="UTC"), _to_timestamp, (_dt.datetime,)),
+            "TIME": (pa.time64("us"), _to_time, (_dt.time,)),
+        }
+    return _ARROW_TYPES
+
+
+# ─── Derlenmiş şema planı ─────────────────────────────────────────────────
+
+class _ArrowColumn:
+    """Bir kolonun Arrow dönüşümü: önce doğrudan, olmazsa dönüştürücüyle."""
+    __slots__ = ("name", "arrow_type", "convert", "native", "direct")
+
+    def __init__(self, name: str, arrow_type: Any, convert: Callable[[Any], Any], native: tuple[type, ...]) -> None:
+        self.name = name
+        self.arrow_type = arrow_type
+        self.convert = convert
+        self.native = native
+        self.direct = True  # Doğrudan çevrim bir kez başarısız olursa bu kolon için denenmez
+
+    def array(self, values: list[Any]) -> Any:
+        """Kolon değerlerini tipli Arrow dizisine çevirir; çevrilemezse None."""
+        if self.direct:
+            # bool int'in alt sınıfıdır; tam tip eşleşmesi aranır
+            first = next((v for v in values if v is not None), None)
+            if first is None or type(first) in self.native:
+                try:
+                    return _pa.array(values, type=self.arrow_type)
+                except (_pa.ArrowException, TypeError, ValueError, OverflowError):
+                    self.direct = False
+        convert = self.convert
+        try:
+            return _pa.array([None if v is None else convert(v) for v in values], type=self.arrow_type)
+        except (_pa.ArrowException, TypeError, ValueError, OverflowError, ArithmeticError) as exc:
+            logger.debug("Parquet dönüşümü yapılamadı (%s), NDJSON kullanılacak: %s", self.name, exc)
+            return None
+
+
+class SchemaPlan:
+    """
+    Hedef tablo şemasının derlenmiş dönüşüm planı. Gelen kolon listesi başına
+    hedef alanlar ve dönüştürücüler bir kez çözülüp saklanır.
+    """
+
+    def __init__(self, schema: list[Any]) -> None:
+        self.schema = list(schema)
+        self._by_name = {f.name: f for f in self.schema}
+        self._by_lower = {f.name.lower(): f for f in self.schema}
+        self._arrow_plans: dict[tuple[str, ...], Optional[list[_ArrowColumn]]] = {}
+        self._json_plans: dict[tuple[str, ...], list[Optional[Callable[[Any], Any]]]] = {}
+
+    def _field(self, name: str) -> Any:
+        return self._by_name.get(name) or self._by_lower.get(name.lower())
+
+    def _arrow_plan(self, columns: tuple[str, ...]) -> Optional[list[_ArrowColumn]]:
+        if columns in self._arrow_plans:
+            return self._arrow_plans[columns]
+        types = _arrow_types()
+        plan: Optional[list[_ArrowColumn]] = []
+        for name in columns:
+            field = self._field(name)
+            mapped = types.get(field.field_type.upper()) if field is not None and field.mode != "REPEATED" else None
+            if mapped is None:
+                # Şemada olmayan / RECORD / JSON / REPEATED kolon: Parquet yazılamaz
+                plan = None
+                break
+            plan.append(_ArrowColumn(name, *mapped))
+        self._arrow_plans[columns] = plan
+        return plan
+
+    def arrow_table(self, chunk: Chunk) -> Any:
+        """
+        Chunk'ı hedef şemayla tiplenmiş pyarrow.Table'a çevirir.
+        pyarrow yoksa, kolonlardan biri şemada yoksa/eşlenemiyorsa veya bir değer
+        dönüştürülemezse None döner (çağıran NDJSON'a düşer).
+        """
+        if _pa is None or not chunk:
+            return None
+        columnar = as_columnar(chunk)
+        plan = self._arrow_plan(tuple(columnar.columns))
+        if plan is None:
+            return None
+        arrays: list[Any] = []
+        for column, values in zip(plan, columnar.data):
+            array = column.array(values)
+            if array is None:
+                return None
+            arrays.append(array)
+        return _pa.Table.from_arrays(arrays, names=list(columnar.columns))
+
+    def _json_plan(self, columns: tuple[str, ...]) -> list[Optional[Callable[[Any], Any]]]:
+        plan = self._json_plans.get(columns)
+        if plan is None:
+            fields = [self._by_name.get(name) for name in columns]
+            plan = self._json_plans[columns] = [
+                json_converter(f.field_type) if f is not None else None for f in fields
+            ]
+        return plan
+
+    def json_rows(self, chunk: Chunk) -> list[dict[str, Any]]:
+        """Satırlardaki değerleri şemadaki alan tiplerine göre JSON'a yazılabilir hale getirir."""
+        if isinstance(chunk, ColumnarChunk):
+            data = [
+                values if convert is None else [None if v is None else convert(v) for v in values]
+                for convert, values in zip(self._json_plan(tuple(chunk.columns)), chunk.data)
+            ]
+            columns = chunk.columns
+            return [dict(zip(columns, row)) for row in zip(*data)]
+
+        result = []
+        plans = self._json_plans
+        for row in chunk:
+            key = tuple(row)
+            plan = plans.get(key) or self._json_plan(key)
+            result.append({
+                k: v if convert is None or v is None else convert(v)
+                for (k, v), convert in zip(row.items(), plan)
+            })
+        return result
+
+
+class SchemaPlanCache:
+    """Çalıştırmalar arası paylaşılan tablo referansı → (son geçerlilik, SchemaPlan) önbelleği."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._plans: dict[str, tuple[float, SchemaPlan]] = {}
+
+    def get(self, table_ref: str) -> Optional[SchemaPlan]:
+        with self._lock:
+            entry = self._plans.get(table_ref)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._plans[table_ref]
+                return None
+            return entry[1]
+
+    def put(self, table_ref: str, plan: SchemaPlan, ttl_seconds: float) -> None:
+        with self._lock:
+            self._plans[table_ref] = (time.monotonic() + ttl_seconds, plan)
+
+    def invalidate(self, prefix: str = "") -> None:
+        """prefix ile başlayan tablo referanslarını (boşsa hepsini) siler."""
+        with self._lock:
+            for table_ref in [t for t in self._plans if t.startswith(prefix)]:
+                del self._plans[table_ref]
+
+
+schema_plan_cache = SchemaPlanCache()
+
+
+# ─── Payload üretimi ──────────────────────────────────────────────────────
+
+class LoadBuffer:
+    """
+    Bir hedef tablo için biriken tek load job gövdesi.
+
+    Biçim ilk chunk'ta belirlenir (Parquet olabiliyorsa Parquet). Sonraki
+    chunk aynı biçim/kolonlarla yazılamıyorsa add() False döner; çağıran
+    tamponu yükleyip chunk'ı yeni tampona ekler.
+    """
+
+    def __init__(self, write_disposition: str, plan: Optional[SchemaPlan], load_format: str) -> None:
+        self.write_disposition = write_disposition
+        self.plan = plan
+        self.rows = 0
+        self.chunks = 0
+        self._parquet = plan is not None and load_format == "parquet" and _pa is not None
+        self._format: Optional[str] = None
+        self._buffer = io.BytesIO()
+        self._writer: Any = None
+
+    @property
+    def schema(self) -> Optional[list[Any]]:
+        """Load job şeması; None ise autodetect."""
+        return self.plan.schema if self.plan is not None else None
+
+    @property
+    def size(self) -> int:
+        """Tampondaki (sıkıştırılmış) gövde boyutu, byte."""
+        return self._buffer.tell()
+
+    def add(self, chunk: Chunk) -> bool:
+        table = self.plan.arrow_table(chunk) if self._parquet else None
+        if table is not None:
+            if self._format is None:
+                self._format = SOURCE_FORMAT_PARQUET
+                self._writer = _pq.ParquetWriter(self._buffer, table.schema)
+            elif self._format != SOURCE_FORMAT_PARQUET or not table.schema.equals(self._writer.schema):
+                return False
+            self._writer.write_table(table)
+        else:
+            if self._format is None:
+                self._format = SOURCE_FORMAT_NDJSON
+            elif self._format != SOURCE_FORMAT_NDJSON:
+                return False
+            rows = self.plan.json_rows(chunk) if self.plan is not None else as_rows(chunk)
+            for row in rows:
+                self._buffer.write(json.dumps(row, default=str).encode("utf-8"))
+                self._buffer.write(b"\n")
+        self.rows += len(chunk)
+        self.chunks += 1
+        return True
+
+    def finish(self) -> LoadPayload:
+        """Gövdeyi kapatır ve baştan okunacak şekilde döner."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._buffer.seek(0)
+        return LoadPayload(data=self._buffer, source_format=self._format or SOURCE_FORMAT_NDJSON, rows=self.rows)
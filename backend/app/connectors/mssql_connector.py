@@ -1,10 +1,16 @@
 import datetime
 import decimal
+import uuid
+from dataclasses import dataclass
 from typing import Any, Generator, Optional
 
 import pymssql
 
+from app.config import settings
 from app.connectors.base import BaseConnector
+from app.connectors.partitioning import plan_partition_queries
+from app.connectors.pool import ConnectionPool, get_pool
+from app.engine.chunk import Chunk, ColumnarChunk, chunk_columns
 from app.utils.logger import logger
 
 
@@ -127,50 +133,129 @@ def _to_mssql_safe(value: Any, target_type: Optional[str] = None) -> Any:
     return value
 
 
+_STG_SEQ = "__stg_seq"  # Staging tablosunda yazılış sırası
+
+
+@dataclass
+class _Staging:
+    name: str             # #temp tablo adı
+    columns: list[str]    # staging'e yazılan veri kolonları
+
+
+def _q(name: str) -> str:
+    """MSSQL identifier'ı köşeli parantezle korur."""
+    return f"[{name.replace(']', ']]')}]"
+
+
+def _open_connection(c: dict) -> pymssql.Connection:
+    return pymssql.connect(
+        server=c["host"],
+        port=int(c.get("port", 1433)),
+        database=c["database"],
+        user=c["username"],
+        password=c["password"],
+        login_timeout=15,
+        tds_version="7.4",
+        appname="DataFlowETL",
+    )
+
+
+def _ping(conn: pymssql.Connection) -> None:
+    cur = conn.cursor()
+    cur.execute("SELECT 1")
+    cur.fetchall()
+    cur.close()
+
+
+def _reset(conn: pymssql.Connection) -> None:
+    # Bir sonraki kullanıcıya açık transaction / kilit devredilmesin
+    conn.rollback()
+
+
 class MssqlConnector(BaseConnector):
     """
     MSSQL bağlantı yöneticisi.
     _conn: Tek bir bağlantıyı instance'ta cache'ler.
     Tüm operasyonlar aynı bağlantıyı paylaşır; close() ile serbest bırakılır.
+
+    pool_key verilirse bağlantı process geneli havuzdan alınır ve close()
+    ile havuza geri bırakılır (yeni TCP+TDS login maliyeti ödenmez).
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, pool_key: Optional[str] = None):
         self.config = config
         self._conn: Optional[pymssql.Connection] = None
+        self._ordinal_cache: dict[tuple[str, str], dict[str, int]] = {}
+        self._staging: dict[tuple[str, str], _Staging] = {}
+        self._bulk_fallback_logged = False
+        self._bulk_batch_logged = False
+        self._aborted = False  # iptalde sorgu kesildi; bağlantı havuza dönmeden atılır
+        self._pool: Optional[ConnectionPool] = (
+            get_pool(pool_key, config, self._create_pool) if pool_key else None
+        )
 
-    def _get_connection(self) -> pymssql.Connection:
-        """Mevcut bağlantıyı döner; yoksa veya kopuksa yeni açar."""
-        if self._conn is not None:
-            # Bağlantı hâlâ canlı mı kontrol et (ucuz ping)
-            try:
-                _cur = self._conn.cursor()
-                _cur.execute("SELECT 1")
-                _cur.close()
-                return self._conn
-            except Exception:
-                self._conn = None
-
-        c = self.config
-        self._conn = pymssql.connect(
-            server=c["host"],
-            port=int(c.get("port", 1433)),
-            database=c["database"],
-            user=c["username"],
-            password=c["password"],
-            login_timeout=15,
-            tds_version="7.4",
-            appname="DataFlowETL",
+    def _connect(self) -> pymssql.Connection:
+        return _open_connection(self.config)
+
+    def _create_pool(self, name: str) -> ConnectionPool:
+        config = self.config
+        return ConnectionPool(
+            name=f"mssql:{name}",
+            connect=lambda: _open_connection(config),
+            ping=_ping,
+            reset=_reset,
+            min_size=settings.mssql_pool_min_size,
+            max_size=settings.mssql_pool_max_size,
+            idle_timeout=settings.mssql_pool_idle_timeout_seconds,
+            health_check_after=settings.mssql_pool_health_check_after_seconds,
+            acquire_timeout=settings.mssql_pool_acquire_timeout_seconds,
         )
+
+    def _get_connection(self) -> pymssql.Connection:
+        """Instance'ın bağlantısını döner; yoksa havuzdan alır (havuz yoksa yeni açar)."""
+        if self._conn is None:
+            self._conn = self._pool.acquire() if self._pool is not None else self._connect()
         return self._conn
 
+    def _cancel_running(self, conn: pymssql.Connection) -> None:
+        """İptal: bağlantıda çalışan sorguyu keser (dbcancel); bağlantı sonra atılır."""
+        self._aborted = True
+        cancel = getattr(getattr(conn, "_conn", None), "cancel", None)
+        if cancel is not None:
+            cancel()
+
     def close(self):
-        """Bağlantıyı kapat ve sıfırla."""
-        if self._conn is not None:
-            try:
-                self._conn.close()
-            except Exception:
-                pass
-            self._conn = None
+        """Bağlantıyı havuza bırak (havuz yoksa kapat) ve sıfırla."""
+        if self._aborted:
+            # Kesilen oturumun durumu belirsiz; #temp tablolar oturumla birlikte düşer
+            self._staging.clear()
+        else:
+            self._drop_staging()
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if self._pool is not None:
+            self._pool.release(conn, discard=self._aborted)
+            return
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def __del__(self):
+        # close() unutulursa havuz slotu kaybolmasın. GC herhangi bir thread'de
+        # (havuz kilidi veya başka bir cursor açıkken) çalışabilir: SQL çalıştırılmaz,
+        # bağlantı havuza dönmeden atılır (#temp tablolar oturumla birlikte düşer)
+        conn, self._conn = getattr(self, "_conn", None), None
+        if conn is None:
+            return
+        try:
+            if self._pool is not None:
+                self._pool.release(conn, discard=True)
+            else:
+                conn.close()
+        except Exception:
+            pass
 
     def test_connection(self) -> dict:
         try:
@@ -346,20 +431,73 @@ class MssqlConnector(BaseConnector):
         return {"columns": columns, "rows": rows, "total_rows": len(rows)}
 
     def read_chunks(
-        self, query: str, chunk_size: int = 5000
-    ) -> Generator[list[dict[str, Any]], None, None]:
+        self, query: str, chunk_size: int = 5000, columnar: bool = False
+    ) -> Generator[Chunk, None, None]:
         conn = self._get_connection()
-        cursor = conn.cursor(as_dict=True)
-        cursor.execute(query)
+        # columnar: satır başına dict oluşturulmaz, tuple'lar kolonlara çevrilir
+        cursor = conn.cursor(as_dict=not columnar)
+        try:
+            with self._abort_on_cancel(lambda: self._cancel_running(conn)):
+                try:
+                    cursor.execute(query)
+                    columns = [d[0] for d in cursor.description] if columnar else []
+
+                    while True:
+                        self._check_cancelled()
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        yield ColumnarChunk.from_tuples(columns, rows) if columnar else list(rows)
+                except Exception:
+                    self._check_cancelled()  # iptalle kesilen sorgu hatası iptal olarak iletilir
+                    raise
+        finally:
+            cursor.close()
+            # conn.close() kaldırıldı — instance bağlantısı reuse ediliyor
 
-        while True:
-            rows = cursor.fetchmany(chunk_size)
-            if not rows:
-                break
-            yield list(rows)
+    def partition_queries(
+        self, query: str, column: str, count: int, method: str = "range"
+    ) -> list[str]:
+        def _fetch(sql: str) -> list[tuple]:
+            cur = self._get_connection().cursor()
+            try:
+                cur.execute(sql)
+                return cur.fetchall()
+            finally:
+                cur.close()
 
-        cursor.close()
-        # conn.close() kaldırıldı — instance bağlantısı reuse ediliyor
+        return plan_partition_queries(query, column, count, method, "mssql", _fetch)
+
+    def describe_query(self, query: str) -> dict:
+        # Sorgu çalıştırılmadan ilk sonuç kümesinin kolonları ve tipleri döner
+        sql = query.strip().rstrip(";")
+        cur = self._get_connection().cursor()
+        try:
+            try:
+                cur.execute(
+                    "SELECT name, system_type_name, is_hidden, error_message "
+                    "FROM sys.dm_exec_describe_first_result_set(%s, NULL, 0) ORDER BY column_ordinal",
+                    (sql,),
+                )
+                rows = cur.fetchall()
+            except pymssql.Error as exc:
+                # Eski sunucu / yetki yok: TOP 0 ile yalnızca kolon adları (tipsiz)
+                logger.debug(f"dm_exec_describe_first_result_set kullanılamadı: {exc}")
+                cur.execute(f"SELECT TOP 0 * FROM ({sql}) AS describe_src")
+                columns = [d[0] for d in cur.description or []]
+                cur.fetchall()
+                return {"columns": columns, "types": {}, "bytes_processed": None}
+        finally:
+            cur.close()
+        errors = [row[3] for row in rows if row[3]]
+        if errors:
+            raise ValueError(errors[0])
+        visible = [row for row in rows if not row[2] and row[0]]
+        return {
+            "columns": [row[0] for row in visible],
+            "types": {row[0]: (row[1] or "").split("(")[0].lower() for row in visible},
+            "bytes_processed": None,
+        }
 
     def get_column_types(self, schema: str, table: str) -> dict[str, str]:
         """Hedef tablonun kolon adı → DATA_TYPE haritasını döner. Cache için ayrı metot."""
@@ -378,24 +516,42 @@ class MssqlConnector(BaseConnector):
         self,
         schema: str,
         table: str,
-        rows: list[dict[str, Any]],
+        rows: Chunk,
         mode: str = "append",
         col_type_map: Optional[dict[str, str]] = None,
         on_error: str = "rollback",   # "rollback" | "continue"
         batch_size: int = 500,        # multi-row VALUES batch boyutu
+        load_method: str = "insert",  # "insert" | "bulk"
+        tablock: bool = False,        # bulk: TABLOCK ipucu
+        bulk_batch_size: int = 0,     # bulk: commit başına satır (0 = tüm chunk tek batch)
     ) -> int:
         """
-        Rows listesini hedef tabloya yazar.
+        Rows listesini (list[dict] veya ColumnarChunk) hedef tabloya yazar.
 
         Performans stratejisi:
         - Tek seferde çok satırlı INSERT: INSERT INTO t (c1,c2) VALUES (r1),(r2),...
           → executemany'ye göre 5-15x daha hızlı (network round-trip azaltır)
         - batch_size: her multi-row INSERT'teki satır sayısı (500 iyi denge noktası)
         - col_type_map dışarıdan verilirse meta sorgu atlanır (session cache için)
+        - load_method="bulk": TDS bulk copy protokolü kullanılır; 2100 parametre
+          sınırı yoktur, geniş tablolarda çok daha hızlıdır. Sürücü bulk copy
+          desteklemiyorsa INSERT yoluna düşülür. Overwrite'ın ilk chunk'ı bulk
+          modda #temp tablo üzerinden tek transaction'da aktarılır (hata olursa
+          hedef eski haliyle kalır).
+
+        mode:
+        - "append" / "overwrite" (ilk chunk'ta TRUNCATE)
+        - "upsert" : satırlar oturumun #temp staging tablosuna yazılır; hedefe
+          aktarım finish_upsert() ile tek MERGE olarak yapılır
 
         on_error:
         - "rollback" : herhangi bir batch hata verirse tüm write_chunk işlemi geri alınır
         - "continue" : hatalı batch atlanır, diğerleri yazılmaya devam eder
+          (bulk modda batch = bulk_batch_size; 0 ise chunk tek parça değerlendirilir)
+
+        bulk_batch_size > 0 ile bulk copy her batch'i ayrı commit eder; yarıda
+        kalan chunk'ın önceki batch'leri geri alınamaz. Bu yüzden "rollback"
+        modunda yok sayılır ve chunk tek batch yazılır.
         """
         if not rows:
             return 0
@@ -403,8 +559,17 @@ class MssqlConnector(BaseConnector):
         safe_schema = schema.replace("]", "]]")
         safe_table = table.replace("]", "]]")
         full_table = f"[{safe_schema}].[{safe_table}]"
-        columns = list(rows[0].keys())
-        safe_cols = ", ".join(f"[{c.replace(']', ']]')}]" for c in columns)
+        columns = chunk_columns(rows)
+
+        # upsert: satırlar oturumun staging (#temp) tablosuna yazılır, MERGE finish_upsert'te
+        staging: Optional[_Staging] = None
+        if mode == "upsert":
+            staging = self._ensure_staging(schema, table, columns)
+            full_table = _q(staging.name)
+            columns = staging.columns
+            mode = "append"
+
+        safe_cols = ", ".join(_q(c) for c in columns)
         col_count = len(columns)
 
         # Kolon tip haritası (dışarıdan verilmemişse çek)
@@ -416,51 +581,84 @@ class MssqlConnector(BaseConnector):
                 col_type_map = {}
 
         # Tüm satırları dönüştür
-        converted: list[tuple] = [
-            tuple(_to_mssql_safe(row.get(c), col_type_map.get(c)) for c in columns)
-            for row in rows
-        ]
+        if isinstance(rows, ColumnarChunk):
+            # Kolon bazlı: hedef tipi kolon başına bir kez çözülür
+            converted: list[tuple] = list(zip(*(
+                [_to_mssql_safe(v, col_type_map.get(c)) for v in rows.column(c)] for c in columns
+            )))
+        else:
+            converted = [
+                tuple(_to_mssql_safe(row.get(c), col_type_map.get(c)) for c in columns)
+                for row in rows
+            ]
 
         conn = self._get_connection()
-        cursor = conn.cursor()
-
-        try:
-            if mode == "overwrite":
-                cursor.execute(f"TRUNCATE TABLE {full_table}")
 
-            # Multi-row batch INSERT
-            placeholders_single = "(" + ", ".join(["%s"] * col_count) + ")"
-            total_written = 0
-            skipped = 0
+        if load_method == "bulk":
+            if hasattr(conn, "bulk_copy"):
+                column_ids = (
+                    list(range(1, col_count + 1)) if staging is not None
+                    else self._bulk_column_ids(schema, table, columns)
+                )
+                if mode == "overwrite":
+                    return self._bulk_overwrite(conn, full_table, columns, converted, tablock, bulk_batch_size)
+                if bulk_batch_size > 0 and on_error == "rollback":
+                    # Batch'ler ayrı commit edilir; geri alınabilmesi için chunk tek batch yazılır
+                    if not self._bulk_batch_logged:
+                        logger.warning(
+                            "on_error=rollback ile bulk_batch_size yok sayılıyor; chunk tek batch yazılacak (%s.%s)",
+                            schema, table,
+                        )
+                        self._bulk_batch_logged = True
+                    bulk_batch_size = 0
+                return self._bulk_copy(conn, full_table, column_ids, converted, tablock, bulk_batch_size)
+            if not self._bulk_fallback_logged:
+                logger.warning("pymssql bulk copy desteklemiyor, INSERT yoluna düşülüyor (%s.%s)", schema, table)
+                self._bulk_fallback_logged = True
 
-            for batch_start in range(0, len(converted), batch_size):
-                batch = converted[batch_start : batch_start + batch_size]
-                # "INSERT INTO t (c1,c2) VALUES (%s,%s), (%s,%s), ..."
-                multi_placeholders = ", ".join([placeholders_single] * len(batch))
-                insert_sql = f"INSERT INTO {full_table} ({safe_cols}) VALUES {multi_placeholders}"
-                # Tüm tuple'ları düzleştir
-                flat_values = [v for row in batch for v in row]
+        cursor = conn.cursor()
 
-                try:
-                    cursor.execute(insert_sql, flat_values)
-                    total_written += len(batch)
-                except Exception as batch_err:
-                    if on_error == "rollback":
-                        conn.rollback()
-                        raise  # Üst katmana ilet
-                    else:
+        try:
+            with self._abort_on_cancel(lambda: self._cancel_running(conn)):
+                if mode == "overwrite":
+                    cursor.execute(f"TRUNCATE TABLE {full_table}")
+
+                # Multi-row batch INSERT
+                placeholders_single = "(" + ", ".join(["%s"] * col_count) + ")"
+                total_written = 0
+                skipped = 0
+
+                for batch_start in range(0, len(converted), batch_size):
+                    self._check_cancelled()
+                    batch = converted[batch_start : batch_start + batch_size]
+                    # "INSERT INTO t (c1,c2) VALUES (%s,%s), (%s,%s), ..."
+                    multi_placeholders = ", ".join([placeholders_single] * len(batch))
+                    insert_sql = f"INSERT INTO {full_table} ({safe_cols}) VALUES {multi_placeholders}"
+                    # Tüm tuple'ları düzleştir
+                    flat_values = [v for row in batch for v in row]
+
+                    try:
+                        cursor.execute(insert_sql, flat_values)
+                        total_written += len(batch)
+                    except Exception as batch_err:
+                        if on_error == "rollback":
+                            conn.rollback()
+                            raise  # Üst katmana ilet
+                        self._check_cancelled()  # iptal batch hatası sayılıp atlanmaz
                         # continue: bu batch'i atla, logla
                         logger.warning(
                             f"Batch atlandı ({batch_start}–{batch_start+len(batch)}): {batch_err}"
                         )
                         skipped += len(batch)
 
-            conn.commit()
+                conn.commit()
         except Exception:
+            # İptalde açık transaction geri alınır; hata iptal olarak iletilir
             try:
                 conn.rollback()
             except Exception:
                 pass
+            self._check_cancelled()
             raise
         finally:
             cursor.close()
@@ -470,15 +668,243 @@ class MssqlConnector(BaseConnector):
             logger.warning(f"{skipped} satır hata nedeniyle atlandı ({schema}.{table})")
         return total_written
 
-    def execute_non_query(self, sql: str) -> int:
-        """INSERT / UPDATE / DELETE / TRUNCATE / DDL sorgularını çalıştırır."""
+    def _get_column_ordinals(self, schema: str, table: str) -> dict[str, int]:
+        """Bulk copy için kolon adı (küçük harf) → 1'den başlayan sıra no. Instance'ta cache'lenir."""
+        key = (schema, table)
+        if key not in self._ordinal_cache:
+            conn = self._get_connection()
+            cur = conn.cursor()
+            # sys.columns column_id'de silinmiş kolon boşlukları olabilir; bulk copy ardışık sıra bekler
+            cur.execute(
+                "SELECT name, ROW_NUMBER() OVER (ORDER BY column_id) FROM sys.columns "
+                "WHERE object_id = OBJECT_ID(%s)",
+                (f"[{schema.replace(']', ']]')}].[{table.replace(']', ']]')}]",),
+            )
+            self._ordinal_cache[key] = {name.lower(): int(pos) for name, pos in cur.fetchall()}
+            cur.close()
+        return self._ordinal_cache[key]
+
+    def _bulk_column_ids(self, schema: str, table: str, columns: list[str]) -> list[int]:
+        ordinals = self._get_column_ordinals(schema, table)
+        missing = [c for c in columns if c.lower() not in ordinals]
+        if missing:
+            raise ValueError(f"Hedef tabloda olmayan kolon(lar) ({schema}.{table}): {', '.join(missing)}")
+        return [ordinals[c.lower()] for c in columns]
+
+    def _bulk_copy(
+        self,
+        conn: pymssql.Connection,
+        full_table: str,
+        column_ids: list[int],
+        converted: list[tuple],
+        tablock: bool,
+        bulk_batch_size: int,
+    ) -> int:
+        """
+        Dönüştürülmüş satırları TDS bulk copy ile yazar. bulk_batch_size > 0 ise
+        (yalnızca on_error="continue") her batch ayrı bulk copy ile yazılıp
+        commit edilir: hatalı batch atlanır, önceki batch'ler yazılı kalır ve
+        dönen sayı yalnızca yazılan satırlardır. Tek batch'te hata fırlatılır.
+        """
+        step = bulk_batch_size if 0 < bulk_batch_size < len(converted) else len(converted)
+        written = 0
+        skipped = 0
+        try:
+            with self._abort_on_cancel(lambda: self._cancel_running(conn)):
+                for start in range(0, len(converted), step):
+                    self._check_cancelled()
+                    batch = converted[start:start + step]
+                    try:
+                        conn.bulk_copy(full_table, batch, column_ids=column_ids, batch_size=len(batch), tablock=tablock)
+                        conn.commit()
+                        written += len(batch)
+                    except Exception as batch_err:
+                        if step == len(converted):
+                            raise
+                        try:
+                            conn.rollback()
+                        except Exception:
+                            pass
+                        self._check_cancelled()  # iptal batch hatası sayılıp atlanmaz
+                        logger.warning(f"Bulk batch atlandı ({start}–{start + len(batch)}): {batch_err}")
+                        skipped += len(batch)
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self._check_cancelled()
+            raise
+        if skipped:
+            logger.warning(f"{skipped} satır hata nedeniyle atlandı ({full_table})")
+        return written
+
+    def _bulk_overwrite(
+        self,
+        conn: pymssql.Connection,
+        full_table: str,
+        columns: list[str],
+        converted: list[tuple],
+        tablock: bool,
+        bulk_batch_size: int,
+    ) -> int:
+        """
+        Overwrite'ın ilk chunk'ı bulk modda. bulk_copy batch'lerini kendisi
+        commit ettiğinden TRUNCATE ile aynı geri alınabilir transaction'a
+        giremez; satırlar önce oturuma özel #temp tabloya yüklenir, TRUNCATE ve
+        INSERT…SELECT sonra tek transaction'da çalışır. Yükleme veya aktarım
+        hata verirse hedef tablo eski verisiyle kalır.
+        """
+        name = _q(f"#ovw_{uuid.uuid4().hex[:12]}")
+        cols = ", ".join(_q(c) for c in columns)
+        hint = " WITH (TABLOCK)" if tablock else ""
+        cursor = conn.cursor()
+        try:
+            with self._abort_on_cancel(lambda: self._cancel_running(conn)):
+                cursor.execute(
+                    f"SELECT {cols} INTO {name} FROM {full_table} WHERE 1 = 0 "
+                    f"UNION ALL SELECT {cols} FROM {full_table} WHERE 1 = 0"
+                )
+                conn.commit()
+                conn.bulk_copy(
+                    name,
+                    converted,
+                    column_ids=list(range(1, len(columns) + 1)),
+                    batch_size=bulk_batch_size if bulk_batch_size > 0 else len(converted),
+                    tablock=True,
+                )
+                conn.commit()
+                cursor.execute(f"TRUNCATE TABLE {full_table}")
+                cursor.execute(f"INSERT INTO {full_table}{hint} ({cols}) SELECT {cols} FROM {name}")
+                conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self._check_cancelled()
+            raise
+        finally:
+            try:
+                cursor.execute(f"IF OBJECT_ID('tempdb..{name[1:-1]}') IS NOT NULL DROP TABLE {name}")
+                conn.commit()
+            except Exception as exc:
+                logger.warning(f"Overwrite ara tablosu silinemedi: {exc}")
+            cursor.close()
+        return len(converted)
+
+    # ─── Upsert (staging + MERGE) ─────────────────────────────────────────
+
+    def _ensure_staging(self, schema: str, table: str, columns: list[str]) -> _Staging:
+        """
+        Hedef tablo için oturuma özel #temp staging tablosu oluşturur (yoksa).
+        Kolon tipleri hedeften kopyalanır; UNION ALL hilesi IDENTITY özelliğinin
+        kopyalanmasını engeller. Sıra kolonu aynı anahtarın son yazılanını seçmek içindir.
+        """
+        key = (schema, table)
+        staging = self._staging.get(key)
+        if staging is not None:
+            return staging
+
+        name = f"#stg_{uuid.uuid4().hex[:12]}"
+        full_table = f"{_q(schema)}.{_q(table)}"
+        cols = ", ".join(_q(c) for c in columns)
+        conn = self._get_connection()
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                f"SELECT {cols} INTO {_q(name)} FROM {full_table} WHERE 1 = 0 "
+                f"UNION ALL SELECT {cols} FROM {full_table} WHERE 1 = 0"
+            )
+            cur.execute(f"ALTER TABLE {_q(name)} ADD {_q(_STG_SEQ)} BIGINT IDENTITY(1, 1)")
+            conn.commit()
+        finally:
+            cur.close()
+        staging = self._staging[key] = _Staging(name=name, columns=list(columns))
+        return staging
+
+    def finish_upsert(self, schema: str, table: str, key_columns: list[str]) -> int:
+        """Staging tablosundaki satırları tek bir MERGE ile hedefe yazar. Etkilenen satır sayısını döner."""
+        staging = self._staging.get((schema, table))
+        if staging is None:
+            return 0
+
+        lower_cols = {c.lower(): c for c in staging.columns}
+        missing = [k for k in key_columns if k.lower() not in lower_cols]
+        if missing:
+            raise ValueError(f"Upsert anahtar kolonu veride yok ({schema}.{table}): {', '.join(missing)}")
+        keys = [lower_cols[k.lower()] for k in key_columns]
+        key_set = {k.lower() for k in keys}
+        updates = [c for c in staging.columns if c.lower() not in key_set]
+
+        cols = ", ".join(_q(c) for c in staging.columns)
+        on_clause = " AND ".join(f"t.{_q(k)} = s.{_q(k)}" for k in keys)
+        partition = ", ".join(_q(k) for k in keys)
+        sql = (
+            f"MERGE {_q(schema)}.{_q(table)} WITH (HOLDLOCK) AS t "
+            f"USING (SELECT {cols} FROM ("
+            f"SELECT *, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY {_q(_STG_SEQ)} DESC) AS [__stg_rn] "
+            f"FROM {_q(staging.name)}) AS d WHERE [__stg_rn] = 1) AS s "
+            f"ON {on_clause} "
+        )
+        if updates:
+            sql += "WHEN MATCHED THEN UPDATE SET " + ", ".join(f"t.{_q(c)} = s.{_q(c)}" for c in updates) + " "
+        sql += (
+            f"WHEN NOT MATCHED BY TARGET THEN INSERT ({cols}) "
+            f"VALUES ({', '.join(f's.{_q(c)}' for c in staging.columns)});"
+        )
+
         conn = self._get_connection()
+        cur = conn.cursor()
         try:
-            with conn.cursor() as cur:
+            with self._abort_on_cancel(lambda: self._cancel_running(conn)):
                 cur.execute(sql)
                 affected = cur.rowcount if cur.rowcount is not None else -1
-            conn.commit()
+                cur.execute(f"DROP TABLE {_q(staging.name)}")
+                conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self._check_cancelled()
+            raise
+        finally:
+            cur.close()
+        del self._staging[(schema, table)]
+        return affected
+
+    def _drop_staging(self) -> None:
+        """Bitmemiş upsert'lerin #temp tablolarını temizler (havuzdaki oturumda kalmasın)."""
+        if not self._staging or self._conn is None:
+            self._staging.clear()
+            return
+        try:
+            cur = self._conn.cursor()
+            for staging in self._staging.values():
+                cur.execute(
+                    f"IF OBJECT_ID('tempdb..{staging.name}') IS NOT NULL DROP TABLE {_q(staging.name)}"
+                )
+            cur.close()
+            self._conn.commit()
+        except Exception as exc:
+            logger.warning(f"Upsert staging tablosu silinemedi: {exc}")
+        self._staging.clear()
+
+    def execute_non_query(self, sql: str) -> int:
+        """INSERT / UPDATE / DELETE / TRUNCATE / DDL sorgularını çalıştırır."""
+        conn = self._get_connection()
+        try:
+            with self._abort_on_cancel(lambda: self._cancel_running(conn)):
+                with conn.cursor() as cur:
+                    cur.execute(sql)
+                    affected = cur.rowcount if cur.rowcount is not None else -1
+                conn.commit()
             return affected
         except Exception:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self._check_cancelled()
             raise
@@ -0,0 +1,115 @@
+"""
+Kaynak sorgusunu paralel okunabilecek K parçaya bölme yardımcıları.
+
+Parçalar kaynak sorgusu alt sorgu olarak sarılıp bölme kolonuna filtre
+eklenerek üretilir; her parça ayrı bağlantıdan okunur. Parçaların birleşimi
+her zaman orijinal sorgunun tamamını kapsar (NULL değerler ilk parçada,
+planlamadan sonra eklenen büyük değerler son parçada okunur).
+
+Yöntemler:
+  range : MIN/MAX arası eşit aralıklar (sayı, tarih/datetime kolonları)
+  ntile : NTILE ile eşit satır sayılı aralıklar (dengesiz dağılımlı anahtarlar)
+  hash  : kolon değerinin hash'ine göre kova (MSSQL CHECKSUM, BQ FARM_FINGERPRINT)
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import decimal as _decimal
+from typing import Any, Callable
+
+from app.utils.sql_validator import quote_identifier, sql_literal
+
+PARTITION_METHODS = ("range", "ntile", "hash")
+
+
+def split_range(low: Any, high: Any, count: int) -> list[Any]:
+    """[low, high] aralığını count parçaya bölen iç sınırları döner (artan, tekrarsız)."""
+    if isinstance(low, bool) or isinstance(high, bool):
+        raise ValueError("range bölme boolean kolonda yapılamaz; hash kullanın")
+    if isinstance(low, int) and isinstance(high, int):
+        bounds = [low + (high - low) * i // count for i in range(1, count)]
+    elif isinstance(low, (int, float, _decimal.Decimal)) and isinstance(high, (int, float, _decimal.Decimal)):
+        if isinstance(low, _decimal.Decimal) or isinstance(high, _decimal.Decimal):
+            low, high = _decimal.Decimal(low), _decimal.Decimal(high)
+        bounds = [low + (high - low) * i / count for i in range(1, count)]
+    elif isinstance(low, _dt.datetime) and isinstance(high, _dt.datetime):
+        bounds = [low + (high - low) * i / count for i in range(1, count)]
+    elif isinstance(low, _dt.date) and isinstance(high, _dt.date):
+        bounds = [low + _dt.timedelta(days=(high - low).days * i // count) for i in range(1, count)]
+    else:
+        raise ValueError(
+            f"range bölme yalnızca sayı ve tarih kolonlarında yapılabilir "
+            f"({type(low).__name__}); ntile veya hash kullanın"
+        )
+    return _dedupe_bounds(low, bounds)
+
+
+def range_queries(inner: str, column_sql: str, bounds: list[Any], dialect: str) -> list[str]:
+    """İç sınırlardan len(bounds) + 1 adet aralık sorgusu üretir."""
+    if not bounds:
+        return [inner]
+    literals = [sql_literal(b, dialect) for b in bounds]
+    queries = [f"SELECT * FROM ({inner}) AS part_src WHERE ({column_sql} < {literals[0]} OR {column_sql} IS NULL)"]
+    for lo, hi in zip(literals, literals[1:]):
+        queries.append(f"SELECT * FROM ({inner}) AS part_src WHERE {column_sql} >= {lo} AND {column_sql} < {hi}")
+    queries.append(f"SELECT * FROM ({inner}) AS part_src WHERE {column_sql} >= {literals[-1]}")
+    return queries
+
+
+def _hash_bucket_sql(column_sql: str, count: int, dialect: str) -> str:
+    if dialect == "bigquery":
+        # TO_JSON_STRING her tipi (NULL dahil) metne çevirir
+        return f"ABS(MOD(FARM_FINGERPRINT(TO_JSON_STRING({column_sql})), {count}))"
+    return f"ISNULL(ABS(CAST(CHECKSUM({column_sql}) AS bigint)) % {count}, 0)"
+
+
+def _dedupe_bounds(low: Any, bounds: list[Any]) -> list[Any]:
+    result: list[Any] = []
+    for bound in bounds:
+        if bound is None or bound <= low or (result and bound <= result[-1]):
+            continue
+        result.append(bound)
+    return result
+
+
+def plan_partition_queries(
+    query: str,
+    column: str,
+    count: int,
+    method: str,
+    dialect: str,
+    fetch: Callable[[str], list[tuple]],
+) -> list[str]:
+    """
+    Kaynak sorgusunu en fazla count parçaya böler.
+    fetch: planlama sorgusunu (MIN/MAX, NTILE sınırları) çalıştırıp satırları tuple olarak döner.
+    Veri bölünemiyorsa (boş tablo, tek değer) tek sorgu döner.
+    """
+    if method not in PARTITION_METHODS:
+        raise ValueError(f"Bilinmeyen partition yöntemi: {method} ({' | '.join(PARTITION_METHODS)})")
+    inner = query.strip().rstrip(";")
+    if count <= 1:
+        return [inner]
+    col = quote_identifier(column, dialect)
+
+    if method == "hash":
+        bucket = _hash_bucket_sql(col, count, dialect)
+        return [f"SELECT * FROM ({inner}) AS part_src WHERE {bucket} = {i}" for i in range(count)]
+
+    if method == "ntile":
+        rows = fetch(
+            f"SELECT bucket, MIN(part_key) FROM ("
+            f"SELECT {col} AS part_key, NTILE({count}) OVER (ORDER BY {col}) AS bucket "
+            f"FROM ({inner}) AS part_src WHERE {col} IS NOT NULL"
+            f") AS part_tiles GROUP BY bucket ORDER BY bucket"
+        )
+        if len(rows) <= 1:
+            return [inner]
+        bounds = _dedupe_bounds(rows[0][1], [row[1] for row in rows[1:]])
+        return range_queries(inner, col, bounds, dialect)
+
+    rows = fetch(f"SELECT MIN({col}), MAX({col}) FROM ({inner}) AS part_src")
+    low, high = (rows[0][0], rows[0][1]) if rows else (None, None)
+    if low is None or high is None or low == high:
+        return [inner]
+    return range_queries(inner, col, split_range(low, high, count), dialect)
@@ -0,0 +1,246 @@
+"""
+Process geneli veritabanı bağlantı havuzu.
+
+Connector'lar her işlemde yeni login yapmak yerine bağlantıyı havuzdan
+alır ve close() ile geri bırakır. Havuzlar bağlantı id'si + config hash'i
+ile anahtarlanır; config değişince eski havuz kapatılır.
+
+Sağlık kontrolü her checkout'ta yapılmaz: bağlantı bir süre boşta
+kaldıysa ping atılır, geri bırakılırken yapılan rollback başarısız olursa
+bağlantı atılır.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from app.utils.logger import logger
+
+REAPER_INTERVAL_SECONDS = 30
+
+
+@dataclass
+class _IdleConnection:
+    conn: Any
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ConnectionPool:
+    """
+    Thread-safe, sınırlı boyutlu bağlantı havuzu.
+
+    connect: yeni bağlantı açan fonksiyon
+    ping: bağlantının canlı olduğunu doğrulayan fonksiyon (hata fırlatırsa ölü)
+    reset: geri bırakılan bağlantıyı temizleyen fonksiyon (ör. rollback)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Any],
+        ping: Callable[[Any], None],
+        reset: Callable[[Any], None],
+        min_size: int = 1,
+        max_size: int = 20,
+        idle_timeout: float = 300,
+        health_check_after: float = 30,
+        acquire_timeout: float = 60,
+    ) -> None:
+        self.name = name
+        self._connect = connect
+        self._ping = ping
+        self._reset = reset
+        self._min_size = max(0, min_size)
+        self._max_size = max(1, max_size)
+        self._idle_timeout = idle_timeout
+        self._health_check_after = health_check_after
+        self._acquire_timeout = acquire_timeout
+        self._cond = threading.Condition()
+        self._idle: list[_IdleConnection] = []   # LIFO: en son kullanılan üstte
+        self._size = 0                           # açık (boşta + kullanımda) bağlantı
+        self._closed = False
+
+    def acquire(self) -> Any:
+        deadline = time.monotonic() + self._acquire_timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self._max_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"Bağlantı havuzu dolu ({self.name}, max {self._max_size}); "
+                            f"{self._acquire_timeout:.0f} sn içinde boş bağlantı bulunamadı"
+                        )
+                    self._cond.wait(remaining)
+                if self._closed:
+                    raise RuntimeError(f"Bağlantı havuzu kapatıldı: {self.name}")
+                idle = self._idle.pop() if self._idle else None
+                if idle is None:
+                    self._size += 1  # Yer ayır; login kilit dışında yapılır
+
+            if idle is None:
+                try:
+                    return self._connect()
+                except BaseException:
+                    self._discard_slot()
+                    raise
+
+            if time.monotonic() - idle.last_used < self._health_check_after:
+                return idle.conn
+            try:
+                self._ping(idle.conn)
+                return idle.conn
+            except Exception:
+                logger.info("Havuzdaki bağlantı kopmuş, atılıyor: %s", self.name)
+                self._close_conn(idle.conn)
+                self._discard_slot()
+
+    def release(self, conn: Any, discard: bool = False) -> None:
+        if not discard:
+            try:
+                self._reset(conn)
+            except Exception:
+                discard = True
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                self._cond.notify()
+            else:
+                self._idle.append(_IdleConnection(conn))
+                self._cond.notify()
+                return
+        self._close_conn(conn)
+
+    def maintain(self) -> None:
+        """Boşta süresi dolan bağlantıları kapatır, min_size kadar sıcak bağlantı tutar."""
+        now = time.monotonic()
+        expired: list[Any] = []
+        with self._cond:
+            if self._closed:
+                return
+            keep = max(0, self._min_size - (self._size - len(self._idle)))
+            # Eskiden yeniye sıralı; en yeni `keep` tanesi korunur
+            for idle in self._idle[: max(0, len(self._idle) - keep)]:
+                if now - idle.last_used >= self._idle_timeout:
+                    expired.append(idle.conn)
+            self._idle = [i for i in self._idle if i.conn not in expired]
+            self._size -= len(expired)
+            missing = self._min_size - self._size if self._size else 0
+            self._size += max(0, missing)
+        for conn in expired:
+            self._close_conn(conn)
+
+        # Havuz hiç kullanılmadıysa (size 0) boşuna login yapılmaz
+        for _ in range(max(0, missing)):
+            try:
+                conn = self._connect()
+            except Exception as exc:
+                logger.warning("Havuz ön bağlantısı açılamadı (%s): %s", self.name, exc)
+                self._discard_slot()
+                continue
+            with self._cond:
+                if self._closed:
+                    self._size -= 1
+                else:
+                    self._idle.insert(0, _IdleConnection(conn))
+                    self._cond.notify()
+                    continue
+            self._close_conn(conn)
+
+    def close(self) -> None:
+        """Boştaki bağlantıları kapatır; kullanımdakiler geri bırakılınca kapanır."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for item in idle:
+            self._close_conn(item.conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"size": self._size, "idle": len(self._idle), "max_size": self._max_size}
+
+    def _discard_slot(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_conn(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+# ─── Havuz kayıt defteri ──────────────────────────────────────────────────
+
+_lock = threading.Lock()
+_pools: dict[str, tuple[str, ConnectionPool]] = {}  # connection_id → (config hash, havuz)
+_reaper: Optional[threading.Thread] = None
+
+
+def config_hash(config: dict) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_pool(connection_id: str, config: dict, factory: Callable[[str], ConnectionPool]) -> ConnectionPool:
+    """
+    Bağlantı için havuzu döner; yoksa factory ile oluşturur.
+    Config değişmişse eski havuz kapatılıp yenisi açılır.
+    """
+    digest = config_hash(config)
+    stale: Optional[ConnectionPool] = None
+    with _lock:
+        entry = _pools.get(connection_id)
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+        if entry is not None:
+            stale = entry[1]
+        pool = factory(f"{connection_id[:8]}:{digest[:8]}")
+        _pools[connection_id] = (digest, pool)
+        _ensure_reaper()
+    if stale is not None:
+        stale.close()
+    return pool
+
+
+def invalidate_pool(connection_id: str) -> None:
+    """Bağlantı güncellendi/silindi — havuzdaki bağlantıları kapat."""
+    with _lock:
+        entry = _pools.pop(connection_id, None)
+    if entry is not None:
+        entry[1].close()
+        logger.info("Bağlantı havuzu kapatıldı: %s", entry[1].name)
+
+
+def close_all_pools() -> None:
+    with _lock:
+        entries = list(_pools.values())
+        _pools.clear()
+    for _, pool in entries:
+        pool.close()
+
+
+def _ensure_reaper() -> None:
+    global _reaper
+    if _reaper is None or not _reaper.is_alive():
+        _reaper = threading.Thread(target=_reap_loop, name="connection-pool-reaper", daemon=True)
+        _reaper.start()
+
+
+def _reap_loop() -> None:
+    while True:
+        time.sleep(REAPER_INTERVAL_SECONDS)
+        with _lock:
+            pools = [pool for _, pool in _pools.values()]
+        for pool in pools:
+            try:
+                pool.maintain()
+            except Exception as exc:
+                logger.warning("Havuz bakımı başarısız (%s): %s", pool.name, exc)
@@ -0,0 +1,442 @@
+"""
+Hash aggregate (GROUP BY) operatörü.
+
+Girdi chunk chunk okunur; her chunk'ın satırları grup anahtarına göre hash
+tablosundaki kısmi durumlara (partial state) işlenir. Akış bitince durumlar
+sonuçlandırılır (finalize) ve gruplar chunk olarak yazılır.
+
+Fonksiyonlar: count (kolonsuz: count(*)), sum, min, max, avg,
+count_distinct ve approx_count_distinct (HyperLogLog, ~%1.6 hata, grup
+başına sabit 4 KB). NULL değerler SQL'deki gibi atlanır; NULL grup anahtarı
+ayrı bir grup oluşturur. Grup kolonu verilmezse tüm girdi tek satıra indirgenir
+(girdi boş olsa bile).
+
+Grup sayısı memory_groups'u aşarsa kısmi durumlar anahtar hash'ine göre
+disk'e dökülür ve tablo boşaltılır; akış sonunda her parçadaki kısmi durumlar
+birleştirilip (merge) sonuçlandırılır. Parça hâlâ büyükse farklı tuzla
+yeniden bölünür (en fazla _MAX_SPILL_DEPTH seviye).
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from app.engine.chunk import Chunk, ColumnarChunk
+from app.engine.spill import SpillPartitions
+
+AGGREGATE_FUNCTIONS = (
+    "count", "sum", "min", "max", "avg", "count_distinct", "approx_count_distinct",
+)
+
+_MAX_SPILL_DEPTH = 3
+_SPILL_PREFIX = "dataflow_agg_"
+
+
+# ─── HyperLogLog ──────────────────────────────────────────────────────────
+
+_HLL_P = 12
+_HLL_M = 1 << _HLL_P
+_HLL_ALPHA = 0.7213 / (1 + 1.079 / _HLL_M)
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value: Any) -> int:
+    """Python hash'ini 64 bit'e yayar (splitmix64); int hash'leri kendisidir, dağılmaz."""
+    x = (hash(value) + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def hll_add(registers: bytearray, value: Any) -> None:
+    x = _mix64(value)
+    index = x >> (64 - _HLL_P)
+    rest = (x << _HLL_P) & _MASK64
+    rank = 64 - rest.bit_length() + 1 if rest else 64 - _HLL_P + 1
+    if rank > registers[index]:
+        registers[index] = rank
+
+
+def hll_estimate(registers: bytearray) -> int:
+    total = 0.0
+    zeros = 0
+    for r in registers:
+        total += 2.0 ** -r
+        if r == 0:
+            zeros += 1
+    estimate = _HLL_ALPHA * _HLL_M * _HLL_M / total
+    if estimate <= 2.5 * _HLL_M and zeros:
+        # Küçük kümelerde linear counting daha isabetli
+        estimate = _HLL_M * math.log(_HLL_M / zeros)
+    return int(round(estimate))
+
+
+# ─── Fonksiyon tanımları ──────────────────────────────────────────────────
+#
+# Her fonksiyon grup durum listesinde bir (avg için iki) slot kullanır.
+# init:   grubun başlangıç durumunu ekler
+# update: chunk'ın kolon değerlerini satırların durumlarına işler
+# merge:  aynı grubun iki kısmi durumunu birleştirir (spill sonrası)
+# final:  durumdan çıktı değerini üretir
+
+def _init_none(state: list) -> None:
+    state.append(None)
+
+
+def _init_zero(state: list) -> None:
+    state.append(0)
+
+
+def _init_avg(state: list) -> None:
+    state.extend((None, 0))
+
+
+def _init_set(state: list) -> None:
+    state.append(set())
+
+
+def _init_hll(state: list) -> None:
+    state.append(bytearray(_HLL_M))
+
+
+def _update_count_all(states: list[list], j: int, values: Optional[list]) -> None:
+    for state in states:
+        state[j] += 1
+
+
+def _update_count(states: list[list], j: int, values: list) -> None:
+    for state, v in zip(states, values):
+        if v is not None:
+            state[j] += 1
+
+
+def _update_sum(states: list[list], j: int, values: list) -> None:
+    for state, v in zip(states, values):
+        if v is not None:
+            s = state[j]
+            state[j] = v if s is None else s + v
+
+
+def _update_min(states: list[list], j: int, values: list) -> None:
+    for state, v in zip(states, values):
+        if v is not None:
+            s = state[j]
+            if s is None or v < s:
+                state[j] = v
+
+
+def _update_max(states: list[list], j: int, values: list) -> None:
+    for state, v in zip(states, values):
+        if v is not None:
+            s = state[j]
+            if s is None or v > s:
+                state[j] = v
+
+
+def _update_avg(states: list[list], j: int, values: list) -> None:
+    for state, v in zip(states, values):
+        if v is not None:
+            s = state[j]
+            state[j] = v if s is None else s + v
+            state[j + 1] += 1
+
+
+def _update_distinct(states: list[list], j: int, values: list) -> None:
+    for state, v in zip(states, values):
+        if v is not None:
+            state[j].add(v)
+
+
+def _update_hll(states: list[list], j: int, values: list) -> None:
+    for state, v in zip(states, values):
+        if v is not None:
+            hll_add(state[j], v)
+
+
+def _merge_add(a: list, b: list, j: int) -> None:
+    if b[j] is not None:
+        a[j] = b[j] if a[j] is None else a[j] + b[j]
+
+
+def _merge_min(a: list, b: list, j: int) -> None:
+    if b[j] is not None and (a[j] is None or b[j] < a[j]):
+        a[j] = b[j]
+
+
+def _merge_max(a: list, b: list, j: int) -> None:
+    if b[j] is not None and (a[j] is None or b[j] > a[j]):
+        a[j] = b[j]
+
+
+def _merge_avg(a: list, b: list, j: int) -> None:
+    _merge_add(a, b, j)
+    a[j + 1] += b[j + 1]
+
+
+def _merge_set(a: list, b: list, j: int) -> None:
+    a[j] |= b[j]
+
+
+def _merge_hll(a: list, b: list, j: int) -> None:
+    ra, rb = a[j], b[j]
+    for i, r in enumerate(rb):
+        if r > ra[i]:
+            ra[i] = r
+
+
+def _final_value(state: list, j: int) -> Any:
+    return state[j]
+
+
+def _final_avg(state: list, j: int) -> Any:
+    count = state[j + 1]
+    return state[j] / count if count else None
+
+
+def _final_len(state: list, j: int) -> Any:
+    return len(state[j])
+
+
+def _final_hll(state: list, j: int) -> Any:
+    return hll_estimate(state[j])
+
+
+# fonksiyon → (slot sayısı, init, update, merge, final)
+_FUNCTIONS: dict[str, tuple[int, Callable, Callable, Callable, Callable]] = {
+    "count": (1, _init_zero, _update_count, _merge_add, _final_value),
+    "sum": (1, _init_none, _update_sum, _merge_add, _final_value),
+    "min": (1, _init_none, _update_min, _merge_min, _final_value),
+    "max": (1, _init_none, _update_max, _merge_max, _final_value),
+    "avg": (2, _init_avg, _update_avg, _merge_avg, _final_avg),
+    "count_distinct": (1, _init_set, _update_distinct, _merge_set, _final_len),
+    "approx_count_distinct": (1, _init_hll, _update_hll, _merge_hll, _final_hll),
+}
+
+
+@dataclass(frozen=True)
+class AggregateSpec:
+    """Tek bir çıktı kolonu: alias = function(column)."""
+    function: str
+    column: Optional[str]
+    alias: str
+
+
+def parse_aggregates(items: list[dict]) -> list[AggregateSpec]:
+    """
+    Node config'indeki aggregates listesini doğrular.
+    Öğe: {"function": "sum", "column": "amount", "alias": "total"} —
+    alias verilmezse "<function>_<column>" (count(*) için "count") kullanılır.
+    """
+    specs: list[AggregateSpec] = []
+    for item in items:
+        function = (item.get("function") or "").lower()
+        if function not in _FUNCTIONS:
+            raise ValueError(
+                f"Bilinmeyen aggregate fonksiyonu: {function or '(boş)'} "
+                f"({' | '.join(AGGREGATE_FUNCTIONS)})"
+            )
+        column = item.get("column") or None
+        if column == "*":
+            column = None
+        if column is None and function != "count":
+            raise ValueError(f"{function} için kolon belirtilmeli")
+        alias = item.get("alias") or (f"{function}_{column}" if column else function)
+        specs.append(AggregateSpec(function, column, alias))
+    return specs
+
+
+# ─── Operatör ─────────────────────────────────────────────────────────────
+
+class HashAggregate:
+    """
+    source: chunk akışı (list[dict] veya ColumnarChunk)
+    group_by: grup kolonları (boşsa tek satırlık toplam)
+    aggregates: AggregateSpec listesi (parse_aggregates)
+    memory_groups: bellekte tutulacak en fazla grup sayısı
+    on_event: spill kararları için bilgi mesajı callback'i (log)
+    """
+
+    def __init__(
+        self,
+        source: Iterable[Chunk],
+        group_by: list[str],
+        aggregates: list[AggregateSpec],
+        memory_groups: int = 200_000,
+        chunk_size: int = 5000,
+        partitions: int = 16,
+        on_event: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if not aggregates and not group_by:
+            raise ValueError("Aggregate için en az bir grup kolonu veya fonksiyon belirtilmeli")
+        aliases = [spec.alias for spec in aggregates]
+        duplicates = sorted({a for a in aliases if aliases.count(a) > 1} | (set(aliases) & set(group_by)))
+        if duplicates:
+            raise ValueError(f"Aggregate çıktı kolonları tekrar ediyor: {', '.join(duplicates)}")
+        self.source = source
+        self.group_by = list(group_by)
+        self.aggregates = list(aggregates)
+        self.memory_groups = max(1, memory_groups)
+        self.chunk_size = max(1, chunk_size)
+        self.partitions = max(2, partitions)
+        self._on_event = on_event
+
+        # Her spec'in durum listesindeki slot'u
+        self._slots: list[int] = []
+        slot = 0
+        for spec in self.aggregates:
+            self._slots.append(slot)
+            slot += _FUNCTIONS[spec.function][0]
+
+    # ─── Yardımcılar ──────────────────────────────────────────────────────
+
+    def _event(self, message: str) -> None:
+        if self._on_event is not None:
+            self._on_event(message)
+
+    def _new_state(self) -> list:
+        state: list = []
+        for spec in self.aggregates:
+            _FUNCTIONS[spec.function][1](state)
+        return state
+
+    def _chunk_keys(self, chunk: Chunk) -> Iterable[Any]:
+        group_by = self.group_by
+        if isinstance(chunk, ColumnarChunk):
+            if len(group_by) == 1:
+                return chunk.column(group_by[0])
+            if not group_by:
+                return [None] * len(chunk)
+            return zip(*(chunk.column(name) for name in group_by))
+        if len(group_by) == 1:
+            name = group_by[0]
+            return [row.get(name) for row in chunk]
+        if not group_by:
+            return [None] * len(chunk)
+        return [tuple(row.get(name) for name in group_by) for row in chunk]
+
+    @staticmethod
+    def _chunk_values(chunk: Chunk, column: str) -> list:
+        if isinstance(chunk, ColumnarChunk):
+            return chunk.column(column)
+        return [row.get(column) for row in chunk]
+
+    def _output_row(self, key: Any, state: list) -> dict:
+        if len(self.group_by) == 1:
+            row = {self.group_by[0]: key}
+        else:
+            row = dict(zip(self.group_by, key)) if self.group_by else {}
+        for spec, j in zip(self.aggregates, self._slots):
+            row[spec.alias] = _FUNCTIONS[spec.function][4](state, j)
+        return row
+
+    def _merge_state(self, target: list, other: list) -> None:
+        for spec, j in zip(self.aggregates, self._slots):
+            _FUNCTIONS[spec.function][3](target, other, j)
+
+    def _rechunk(self, table: dict[Any, list]) -> Iterator[list[dict]]:
+        batch: list[dict] = []
+        for key, state in table.items():
+            batch.append(self._output_row(key, state))
+            if len(batch) >= self.chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _spill_table(self, table: dict[Any, list], spill: SpillPartitions, salt: int) -> None:
+        count = spill.count
+        for key, state in table.items():
+            spill.add(hash((salt, key)) % count, (key, state))
+
+    # ─── Akış ─────────────────────────────────────────────────────────────
+
+    def __iter__(self) -> Iterator[list[dict]]:
+        return self.run()
+
+    def run(self) -> Iterator[list[dict]]:
+        table: dict[Any, list] = {}
+        spill: Optional[SpillPartitions] = None
+        new_state = self._new_state
+        updates = [
+            (_FUNCTIONS[spec.function][2] if spec.column else _update_count_all, j, spec.column)
+            for spec, j in zip(self.aggregates, self._slots)
+        ]
+        try:
+            for chunk in self.source:
+                if not len(chunk):
+                    continue
+                # Satır başına grup durumu; yeni gruplar burada açılır
+                states: list[list] = []
+                get = table.get
+                for key in self._chunk_keys(chunk):
+                    state = get(key)
+                    if state is None:
+                        state = table[key] = new_state()
+                    states.append(state)
+                for update, j, column in updates:
+                    update(states, j, self._chunk_values(chunk, column) if column else None)
+
+                if len(table) > self.memory_groups:
+                    if spill is None:
+                        spill = SpillPartitions(self.partitions, _SPILL_PREFIX)
+                        self._event(
+                            f"Aggregate spill: grup sayısı bellek limitini aştı ({self.memory_groups} grup), "
+                            f"kısmi sonuçlar {self.partitions} parçaya bölünüyor"
+                        )
+                    self._spill_table(table, spill, 0)
+                    table = {}
+
+            if spill is None:
+                if not table and not self.group_by:
+                    table[None] = new_state()
+                self._event(f"Aggregate: {len(table)} grup (bellekte)")
+                yield from self._rechunk(table)
+                return
+
+            self._spill_table(table, spill, 0)
+            table = {}
+            self._event(f"Aggregate: {sum(spill.rows)} kısmi grup diskte birleştiriliyor")
+            for p in range(spill.count):
+                yield from self._merge_partition(spill, p, depth=1)
+        finally:
+            if spill is not None:
+                spill.close()
+
+    def _merge_partition(self, spill: SpillPartitions, index: int, depth: int) -> Iterator[list[dict]]:
+        """Parçadaki kısmi durumları birleştirir; tablo yine büyürse tuzlayıp yeniden böler."""
+        table: dict[Any, list] = {}
+        sub: Optional[SpillPartitions] = None
+        try:
+            for items in spill.read(index):
+                for key, state in items:
+                    if sub is not None:
+                        sub.add(hash((depth, key)) % sub.count, (key, state))
+                        continue
+                    current = table.get(key)
+                    if current is None:
+                        table[key] = state
+                    else:
+                        self._merge_state(current, state)
+                    if len(table) > self.memory_groups and depth < _MAX_SPILL_DEPTH:
+                        sub = SpillPartitions(self.partitions, _SPILL_PREFIX)
+                        self._spill_table(table, sub, depth)
+                        table = {}
+            if sub is None:
+                yield from self._rechunk(table)
+                return
+            for p in range(sub.count):
+                yield from self._merge_partition(sub, p, depth + 1)
+        finally:
+            if sub is not None:
+                sub.close()
+
+
+def hash_aggregate(
+    source: Iterable[Chunk],
+    group_by: list[str],
+    aggregates: list[dict],
+    **options: Any,
+) -> Iterator[list[dict]]:
+    """HashAggregate kısayolu; aggregates config sözlükleri olarak verilir."""
+    return HashAggregate(source, group_by, parse_aggregates(aggregates), **options).run()
@@ -0,0 +1,115 @@
+"""
+Execution iptali (cooperative cancellation).
+
+Her çalışan execution için bir CancellationToken kaydedilir. İptal isteği
+token'ı işaretler ve kayıtlı abort callback'lerini çağırır: MSSQL'de
+çalışan sorgu iptal edilir, BigQuery'de job.cancel() çağrılır. Motor
+chunk aralarında token.check() ile durur; yarıda kalan hedef transaction'ı
+connector'ın hata yolunda geri alınır, bağlantılar havuza bırakılır.
+"""
+from __future__ import annotations
+
+import contextlib
+import threading
+from typing import Callable, Iterator, Optional
+
+from app.utils.logger import logger
+
+
+class ExecutionCancelled(Exception):
+    """Execution kullanıcı tarafından iptal edildi."""
+
+
+class CancellationToken:
+    """Thread-safe iptal bayrağı; iptalde abort callback'lerini çalıştırır."""
+
+    def __init__(self, execution_id: str) -> None:
+        self.execution_id = execution_id
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: dict[int, Callable[[], None]] = {}
+        self._next_id = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        # Callback'ler kilit altında çalışır: on_cancel bloğundan çıkmış bir
+        # işlemin (ör. havuza dönmüş bağlantının) yanlışlıkla kesilmesi önlenir
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            for callback in list(self._callbacks.values()):
+                _run_abort(callback)
+
+    def check(self) -> None:
+        """İptal edildiyse ExecutionCancelled fırlatır."""
+        if self._event.is_set():
+            raise ExecutionCancelled(f"Execution iptal edildi: {self.execution_id}")
+
+    def wait(self, timeout: float) -> bool:
+        """timeout kadar bekler; iptal edilirse erken döner (True)."""
+        return self._event.wait(timeout)
+
+    @contextlib.contextmanager
+    def on_cancel(self, abort: Callable[[], None]) -> Iterator[None]:
+        """
+        Blok süresince iptalde çağrılacak abort callback'i kaydeder (ör. çalışan
+        sorguyu kesmek). Token zaten iptal edildiyse abort hemen çağrılır ve
+        blok başlamadan ExecutionCancelled fırlatılır.
+        """
+        with self._lock:
+            if self._event.is_set():
+                _run_abort(abort)
+                self.check()
+            key = self._next_id
+            self._next_id += 1
+            self._callbacks[key] = abort
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.pop(key, None)
+
+
+def _run_abort(callback: Callable[[], None]) -> None:
+    try:
+        callback()
+    except Exception as exc:
+        logger.warning("İptal callback'i başarısız: %s", exc)
+
+
+# ─── Token kayıt defteri ──────────────────────────────────────────────────
+
+_lock = threading.Lock()
+_tokens: dict[str, CancellationToken] = {}
+
+
+def register(execution_id: str) -> CancellationToken:
+    """Execution için token oluşturur (varsa mevcut token'ı döner)."""
+    with _lock:
+        token = _tokens.get(execution_id)
+        if token is None:
+            token = _tokens[execution_id] = CancellationToken(execution_id)
+        return token
+
+
+def get_token(execution_id: str) -> Optional[CancellationToken]:
+    with _lock:
+        return _tokens.get(execution_id)
+
+
+def unregister(execution_id: str) -> None:
+    with _lock:
+        _tokens.pop(execution_id, None)
+
+
+def cancel(execution_id: str) -> bool:
+    """Bu process'te çalışan execution'ı iptal eder; çalışmıyorsa False döner."""
+    token = get_token(execution_id)
+    if token is None:
+        return False
+    token.cancel()
+    return True
@@ -0,0 +1,139 @@
+"""
+Kolon bazlı (columnar) chunk tipi.
+
+Varsayılan chunk biçimi list[dict]'tir: her satır ayrı bir dict, kolon
+adları her satırda tekrar anahtar olarak tutulur. ColumnarChunk aynı veriyi
+kolon adı başlığı + kolon başına bir liste olarak taşır; satır başına dict
+oluşturulmaz, mapping/filtre/cast işlemleri kolon üzerinde döner.
+
+Motor iki biçimi de kabul eder; as_rows / as_columnar ile birbirine
+çevrilir. pyarrow kuruluysa to_arrow / from_arrow ile RecordBatch'e
+dönüştürülebilir (zorunlu bağımlılık değildir).
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Optional, Union
+
+
+class ColumnarChunk:
+    """
+    columns: kolon adları (çıktı sırası)
+    data: columns ile aynı sırada, her biri satır sayısı uzunluğunda listeler
+
+    Kolon listeleri chunk'lar arasında paylaşılabilir (ör. dönüşümsüz mapping);
+    yerinde değiştirilmemeli, yeni liste üretilmelidir.
+    """
+
+    __slots__ = ("columns", "data", "_length", "_index")
+
+    def __init__(self, columns: list[str], data: list[list[Any]], length: Optional[int] = None) -> None:
+        if len(columns) != len(data):
+            raise ValueError(f"Kolon sayısı ({len(columns)}) ile veri kolonu sayısı ({len(data)}) farklı")
+        self.columns = columns
+        self.data = data
+        self._length = len(data[0]) if data else (length or 0)
+        self._index: Optional[dict[str, int]] = None
+
+    # ─── Oluşturma / dönüştürme ───────────────────────────────────────────
+
+    @classmethod
+    def from_rows(cls, rows: list[dict[str, Any]]) -> "ColumnarChunk":
+        """list[dict] → ColumnarChunk. Satırlarda olmayan anahtarlar None olur."""
+        columns: dict[str, None] = dict.fromkeys(rows[0]) if rows else {}
+        first_keys = columns.keys()
+        for row in rows:
+            if row.keys() != first_keys:  # Farklı anahtarlı satır — kolonları birleştir
+                for key in row:
+                    columns.setdefault(key)
+        names = list(columns)
+        return cls(names, [[row.get(c) for row in rows] for c in names], length=len(rows))
+
+    @classmethod
+    def from_tuples(cls, columns: list[str], tuples: list[tuple]) -> "ColumnarChunk":
+        """Cursor'dan gelen satır tuple'larından (kolon sırası columns ile aynı) oluşturur."""
+        if not tuples:
+            return cls(list(columns), [[] for _ in columns])
+        return cls(list(columns), [list(col) for col in zip(*tuples)])
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        columns = self.columns
+        if not columns:
+            return [{} for _ in range(self._length)]
+        return [dict(zip(columns, values)) for values in zip(*self.data)]
+
+    def iter_tuples(self) -> Iterator[tuple]:
+        return zip(*self.data)
+
+    def to_arrow(self) -> Any:
+        """pyarrow.RecordBatch döner (pyarrow kurulu olmalı)."""
+        pa = _require_pyarrow()
+        return pa.RecordBatch.from_arrays([pa.array(col) for col in self.data], names=list(self.columns))
+
+    @classmethod
+    def from_arrow(cls, batch: Any) -> "ColumnarChunk":
+        """pyarrow.RecordBatch / Table → ColumnarChunk."""
+        return cls(list(batch.schema.names), [col.to_pylist() for col in batch.columns], length=batch.num_rows)
+
+    # ─── Erişim ───────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"ColumnarChunk({self._length} satır, {len(self.columns)} kolon)"
+
+    def has_column(self, name: str) -> bool:
+        return name in self._column_index()
+
+    def column(self, name: str) -> list[Any]:
+        """Kolon değerleri; kolon yoksa satır sayısı kadar None (dict.get ile aynı)."""
+        idx = self._column_index().get(name)
+        if idx is None:
+            return [None] * self._length
+        return self.data[idx]
+
+    def take(self, indices: list[int]) -> "ColumnarChunk":
+        """Verilen satır indekslerinden yeni chunk üretir (filtre sonucu)."""
+        if len(indices) == self._length:
+            return self
+        return ColumnarChunk(
+            self.columns, [[col[i] for i in indices] for col in self.data], length=len(indices)
+        )
+
+    def _column_index(self) -> dict[str, int]:
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.columns)}
+        return self._index
+
+
+Chunk = Union[list[dict[str, Any]], ColumnarChunk]
+
+
+def as_rows(chunk: Chunk) -> list[dict[str, Any]]:
+    """Her iki biçimdeki chunk'ı list[dict]'e çevirir (list[dict] aynen döner)."""
+    return chunk.to_rows() if isinstance(chunk, ColumnarChunk) else chunk
+
+
+def as_columnar(chunk: Chunk) -> ColumnarChunk:
+    return chunk if isinstance(chunk, ColumnarChunk) else ColumnarChunk.from_rows(chunk)
+
+
+def chunk_columns(chunk: Chunk) -> list[str]:
+    """Chunk'ın kolon adları (list[dict] için ilk satırın anahtarları)."""
+    if isinstance(chunk, ColumnarChunk):
+        return chunk.columns
+    return list(chunk[0].keys()) if chunk else []
+
+
+def column_values(chunk: Chunk, name: str) -> Iterable[Any]:
+    if isinstance(chunk, ColumnarChunk):
+        return chunk.column(name)
+    return (row.get(name) for row in chunk)
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("Arrow dönüşümü için pyarrow paketi kurulu olmalı (pip install pyarrow)") from exc
+    return pyarrow
@@ -0,0 +1,69 @@
+"""
+Workflow DAG yardımcıları.
+
+Workflow definition'daki nodes/edges listesi üzerinde sıralama ve
+bağımlılık hesapları yapar. Veri akışına dokunmaz; sadece plan çıkarır.
+"""
+from __future__ import annotations
+
+from collections import defaultdict, deque
+
+
+def topological_sort(nodes: list[dict], edges: list[dict]) -> list[dict]:
+    """Kahn algoritması ile node'ları bağımlılık sırasına dizer. Döngüdeki node'lar atlanır."""
+    in_degree: dict[str, int] = {n["id"]: 0 for n in nodes}
+    adj: dict[str, list[str]] = defaultdict(list)
+
+    for edge in edges:
+        src = edge.get("source", "")
+        tgt = edge.get("target", "")
+        if src in in_degree and tgt in in_degree:
+            in_degree[tgt] += 1
+            adj[src].append(tgt)
+
+    queue = deque(nid for nid, deg in in_degree.items() if deg == 0)
+    order: list[str] = []
+    while queue:
+        nid = queue.popleft()
+        order.append(nid)
+        for nxt in adj[nid]:
+            in_degree[nxt] -= 1
+            if in_degree[nxt] == 0:
+                queue.append(nxt)
+
+    node_map = {n["id"]: n for n in nodes}
+    return [node_map[nid] for nid in order if nid in node_map]
+
+
+def upstream_map(nodes: list[dict], edges: list[dict]) -> dict[str, list[str]]:
+    """node_id → kendisine edge ile bağlanan node id'leri (edge sırasıyla)."""
+    node_ids = {n["id"] for n in nodes}
+    upstream: dict[str, list[str]] = {nid: [] for nid in node_ids}
+    for edge in edges:
+        src = edge.get("source", "")
+        tgt = edge.get("target", "")
+        if src in node_ids and tgt in node_ids:
+            upstream[tgt].append(src)
+    return upstream
+
+
+def ancestors(node_id: str, upstream: dict[str, list[str]]) -> set[str]:
+    """node_id'ye doğrudan veya dolaylı bağlanan tüm node id'leri."""
+    seen: set[str] = set()
+    stack = list(upstream.get(node_id, []))
+    while stack:
+        nid = stack.pop()
+        if nid in seen:
+            continue
+        seen.add(nid)
+        stack.extend(upstream.get(nid, []))
+    return seen
+
+
+def target_handles(edges: list[dict]) -> dict[tuple[str, str], str]:
+    """(kaynak, hedef) → edge'in bağlandığı hedef handle (ör. join node'unda left/right)."""
+    return {
+        (edge.get("source", ""), edge.get("target", "")): edge["targetHandle"]
+        for edge in edges
+        if edge.get("targetHandle")
+    }
@@ -0,0 +1,701 @@
+"""
+Filtre ifadesi dili: ayrıştırıcı (parser), AST ve derleyici.
+
+Filter node koşulu SQL WHERE benzeri bir ifadedir:
+
+    status = 'active' AND (amount > 100 OR vip = TRUE)
+    NOT country IN ('TR', 'DE') AND created_at >= DATE '2024-01-01'
+    name LIKE 'Ah%' AND deleted_at IS NULL AND score BETWEEN 1 AND 5
+
+Desteklenenler:
+  mantıksal  : AND, OR, NOT, parantez
+  karşılaştırma : =, ==, !=, <>, <, <=, >, >=
+  diğer      : [NOT] IN (...), [NOT] BETWEEN a AND b, [NOT] LIKE, IS [NOT] NULL
+  literal    : sayı, 'metin' / "metin", TRUE/FALSE, NULL,
+               DATE 'yyyy-mm-dd', TIMESTAMP/DATETIME 'yyyy-mm-dd hh:mm:ss',
+               tırnaksız tek kelime (eski format uyumu: status = active)
+  kolon      : ad, [köşeli parantezli ad] veya `backtick'li ad`
+  LIKE       : % ve * çoklu karakter, _ tek karakter joker
+
+Koşul bir kez AST'ye ayrıştırılır, NOT'lar yapraklara indirilir ve her yaprak
+tek değer alan bir test fonksiyonuna derlenir. Literal, hücre tipine göre bir
+kez dönüştürülür (ör. sayı literal'i + metin hücre → hücre sayıya çevrilir);
+dönüşüm tip başına önbelleğe alınır. SQL'deki gibi NULL ve karşılaştırılamayan
+değerler hiçbir koşulu (NOT dahil) sağlamaz.
+
+list[dict] chunk'larda satır başına kısa devreli predicate, ColumnarChunk'ta
+seçim vektörü (satır indeksleri) kullanılır: AND her yaprakta yalnızca önceki
+yaprakları geçen satırları tarar.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import decimal as _decimal
+import operator
+import re
+from dataclasses import dataclass
+from itertools import compress
+from typing import Any, Callable, Optional, Union
+
+from app.engine.chunk import Chunk, ColumnarChunk
+
+
+class ExpressionError(ValueError):
+    """Filtre ifadesi ayrıştırılamadı. position: hatanın ifadedeki karakter konumu."""
+
+    def __init__(self, message: str, position: Optional[int] = None) -> None:
+        if position is not None:
+            message = f"{message} (konum {position})"
+        super().__init__(message)
+        self.position = position
+
+
+# ─── AST ──────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Compare:
+    column: str
+    op: str  # = != < <= > >=
+    value: Any
+
+
+@dataclass(frozen=True)
+class Like:
+    column: str
+    pattern: str
+    negated: bool = False
+
+
+@dataclass(frozen=True)
+class InList:
+    column: str
+    values: tuple
+    negated: bool = False
+
+
+@dataclass(frozen=True)
+class Between:
+    column: str
+    low: Any
+    high: Any
+    negated: bool = False
+
+
+@dataclass(frozen=True)
+class IsNull:
+    column: str
+    negated: bool = False
+
+
+@dataclass(frozen=True)
+class And:
+    items: tuple
+
+
+@dataclass(frozen=True)
+class Or:
+    items: tuple
+
+
+@dataclass(frozen=True)
+class Not:
+    item: Any
+
+
+Expression = Union[Compare, Like, InList, Between, IsNull, And, Or, Not]
+
+_NEGATED_OPS = {"=": "!=", "!=": "=", "<": ">=", ">=": "<", ">": "<=", "<=": ">"}
+
+
+def expression_columns(expr: Expression) -> list[str]:
+    """İfadede geçen kolon adları (ilk görülme sırasıyla, tekrarsız)."""
+    seen: dict[str, None] = {}
+
+    def _walk(node: Expression) -> None:
+        if isinstance(node, (And, Or)):
+            for item in node.items:
+                _walk(item)
+        elif isinstance(node, Not):
+            _walk(node.item)
+        else:
+            seen.setdefault(node.column)
+
+    _walk(expr)
+    return list(seen)
+
+
+def negate(expr: Expression) -> Expression:
+    """İfadenin değilini NOT kullanmadan üretir (De Morgan, yaprakta operatör çevirme)."""
+    if isinstance(expr, And):
+        return Or(tuple(negate(i) for i in expr.items))
+    if isinstance(expr, Or):
+        return And(tuple(negate(i) for i in expr.items))
+    if isinstance(expr, Not):
+        return push_down_not(expr.item)
+    if isinstance(expr, Compare):
+        return Compare(expr.column, _NEGATED_OPS[expr.op], expr.value)
+    if isinstance(expr, Like):
+        return Like(expr.column, expr.pattern, not expr.negated)
+    if isinstance(expr, InList):
+        return InList(expr.column, expr.values, not expr.negated)
+    if isinstance(expr, Between):
+        return Between(expr.column, expr.low, expr.high, not expr.negated)
+    return IsNull(expr.column, not expr.negated)
+
+
+def push_down_not(expr: Expression) -> Expression:
+    """NOT düğümlerini yapraklara indirir; sonuçta yalnızca And/Or ve yapraklar kalır."""
+    if isinstance(expr, Not):
+        return negate(expr.item)
+    if isinstance(expr, And):
+        return And(tuple(push_down_not(i) for i in expr.items))
+    if isinstance(expr, Or):
+        return Or(tuple(push_down_not(i) for i in expr.items))
+    return expr
+
+
+# ─── Tokenizer ────────────────────────────────────────────────────────────
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+  | (?P<string>'(?:[^']|'')*'|"(?:[^"]|"")*")
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<qident>\[[^\]]+\]|`[^`]+`)
+  | (?P<op><=|>=|<>|!=|==|=|<|>)
+  | (?P<punct>[(),\-+])
+  | (?P<word>[^\W\d][\w$#@]*)
+    """,
+    re.VERBOSE,
+)
+
+_KEYWORDS = {
+    "AND", "OR", "NOT", "IN", "BETWEEN", "LIKE", "IS", "NULL",
+    "TRUE", "FALSE", "DATE", "TIMESTAMP", "DATETIME",
+}
+
+_COMPARE_OPS = {"=": "=", "==": "=", "!=": "!=", "<>": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+@dataclass(frozen=True)
+class _Token:
+    kind: str   # string | number | ident | keyword | op | punct | end
+    value: Any
+    pos: int
+
+
+def _tokenize(text: str) -> list[_Token]:
+    tokens: list[_Token] = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if m is None:
+            raise ExpressionError(f"Beklenmeyen karakter: {text[pos]!r}", pos)
+        kind = m.lastgroup
+        raw = m.group()
+        if kind == "string":
+            quote = raw[0]
+            tokens.append(_Token("string", raw[1:-1].replace(quote * 2, quote), pos))
+        elif kind == "number":
+            tokens.append(_Token("number", raw, pos))
+        elif kind == "qident":
+            tokens.append(_Token("ident", raw[1:-1], pos))
+        elif kind == "word":
+            upper = raw.upper()
+            if upper in _KEYWORDS:
+                tokens.append(_Token("keyword", upper, pos))
+            else:
+                tokens.append(_Token("ident", raw, pos))
+        elif kind != "ws":
+            tokens.append(_Token(kind, raw, pos))
+        pos = m.end()
+    tokens.append(_Token("end", None, len(text)))
+    return tokens
+
+
+# ─── Parser ───────────────────────────────────────────────────────────────
+
+class _Parser:
+    """Özyinelemeli iniş: or_expr → and_expr → not_expr → primary → predicate."""
+
+    def __init__(self, text: str) -> None:
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def parse(self) -> Expression:
+        expr = self._or()
+        tok = self._peek()
+        if tok.kind != "end":
+            raise ExpressionError(f"Beklenmeyen ifade: {tok.value!r}", tok.pos)
+        return expr
+
+    def _peek(self) -> _Token:
+        return self.tokens[self.i]
+
+    def _next(self) -> _Token:
+        tok = self.tokens[self.i]
+        self.i += 1
+        return tok
+
+    def _accept(self, kind: str, value: Any = None) -> Optional[_Token]:
+        tok = self.tokens[self.i]
+        if tok.kind == kind and (value is None or tok.value == value):
+            self.i += 1
+            return tok
+        return None
+
+    def _expect(self, kind: str, value: Any, what: str) -> _Token:
+        tok = self._accept(kind, value)
+        if tok is None:
+            cur = self._peek()
+            found = "ifade sonu" if cur.kind == "end" else repr(cur.value)
+            raise ExpressionError(f"{what} bekleniyordu, {found} bulundu", cur.pos)
+        return tok
+
+    def _or(self) -> Expression:
+        items = [self._and()]
+        while self._accept("keyword", "OR"):
+            items.append(self._and())
+        return items[0] if len(items) == 1 else Or(tuple(items))
+
+    def _and(self) -> Expression:
+        items = [self._not()]
+        while self._accept("keyword", "AND"):
+            items.append(self._not())
+        return items[0] if len(items) == 1 else And(tuple(items))
+
+    def _not(self) -> Expression:
+        if self._accept("keyword", "NOT"):
+            return Not(self._not())
+        if self._accept("punct", "("):
+            expr = self._or()
+            self._expect("punct", ")", "')'")
+            return expr
+        return self._predicate()
+
+    def _predicate(self) -> Expression:
+        tok = self._next()
+        if tok.kind != "ident":
+            found = "ifade sonu" if tok.kind == "end" else repr(tok.value)
+            raise ExpressionError(f"Kolon adı bekleniyordu, {found} bulundu", tok.pos)
+        column = tok.value
+
+        op = self._accept("op")
+        if op is not None:
+            return Compare(column, _COMPARE_OPS[op.value], self._literal())
+
+        if self._accept("keyword", "IS"):
+            negated = self._accept("keyword", "NOT") is not None
+            self._expect("keyword", "NULL", "NULL")
+            return IsNull(column, negated)
+
+        negated = self._accept("keyword", "NOT") is not None
+        if self._accept("keyword", "LIKE"):
+            pattern = self._literal()
+            if pattern is None:
+                raise ExpressionError("LIKE deseni NULL olamaz", tok.pos)
+            return Like(column, str(pattern), negated)
+        if self._accept("keyword", "IN"):
+            self._expect("punct", "(", "'('")
+            values = [self._literal()]
+            while self._accept("punct", ","):
+                values.append(self._literal())
+            self._expect("punct", ")", "')'")
+            return InList(column, tuple(values), negated)
+        if self._accept("keyword", "BETWEEN"):
+            low = self._literal()
+            self._expect("keyword", "AND", "BETWEEN ... AND")
+            return Between(column, low, self._literal(), negated)
+
+        cur = self._peek()
+        found = "ifade sonu" if cur.kind == "end" else repr(cur.value)
+        raise ExpressionError(f"{column} için operatör bekleniyordu, {found} bulundu", cur.pos)
+
+    def _literal(self) -> Any:
+        tok = self._next()
+        if tok.kind == "punct" and tok.value in ("-", "+"):
+            num = self._next()
+            if num.kind != "number":
+                raise ExpressionError("İşaretten sonra sayı bekleniyordu", num.pos)
+            value = _parse_number_literal(num.value)
+            return -value if tok.value == "-" else value
+        if tok.kind == "number":
+            return _parse_number_literal(tok.value)
+        if tok.kind == "string":
+            return tok.value
+        if tok.kind == "ident":
+            # Eski format uyumu: tırnaksız değer metin literal'idir (status = active)
+            return tok.value
+        if tok.kind == "keyword":
+            if tok.value == "NULL":
+                return None
+            if tok.value in ("TRUE", "FALSE"):
+                return tok.value == "TRUE"
+            if tok.value in ("DATE", "TIMESTAMP", "DATETIME"):
+                text = self._next()
+                if text.kind != "string":
+                    raise ExpressionError(f"{tok.value} sonrası tırnaklı değer bekleniyordu", text.pos)
+                try:
+                    if tok.value == "DATE":
+                        return _dt.date.fromisoformat(text.value.strip())
+                    return _dt.datetime.fromisoformat(text.value.strip())
+                except ValueError:
+                    raise ExpressionError(f"Geçersiz {tok.value} değeri: {text.value!r}", text.pos) from None
+        found = "ifade sonu" if tok.kind == "end" else repr(tok.value)
+        raise ExpressionError(f"Değer bekleniyordu, {found} bulundu", tok.pos)
+
+
+def _parse_number_literal(text: str) -> Union[int, float]:
+    if re.fullmatch(r"\d+", text):
+        return int(text)
+    return float(text)
+
+
+_LEGACY_RE = re.compile(r"^\s*(\S+)\s+(=|!=|>=|<=|>|<|LIKE)\s+(.+?)\s*$", re.IGNORECASE | re.DOTALL)
+_LEGACY_BLOCKERS = re.compile(r"\b(?:%s)\b|[()]" % "|".join(sorted(_KEYWORDS)), re.IGNORECASE)
+
+
+def parse_expression(text: str) -> Expression:
+    """
+    Koşul metnini AST'ye ayrıştırır; hatada ExpressionError fırlatır.
+
+    Yeni dilde ayrıştırılamayan eski tek koşullu biçim ("col op değer",
+    değer boşluk veya * içerebilir) metin literal'i olarak kabul edilir.
+    """
+    try:
+        return _Parser(text).parse()
+    except ExpressionError:
+        legacy = _LEGACY_RE.match(text)
+        # Çok koşullu görünen ifadeler eski biçime düşürülmez; hata aynen iletilir
+        if legacy is None or _LEGACY_BLOCKERS.search(legacy.group(3)):
+            raise
+        column, op, raw = legacy.groups()
+        value = raw.strip("'\"")
+        if op.upper() == "LIKE":
+            return Like(column, value)
+        return Compare(column, _COMPARE_OPS[op], value)
+
+
+# ─── Değer dönüştürme (literal ↔ hücre tipi) ──────────────────────────────
+
+_FAIL = object()
+_MISSING = object()
+_TRUE_WORDS = frozenset({"true", "1", "yes", "evet"})
+_FALSE_WORDS = frozenset({"false", "0", "no", "hayir", "hayır"})
+
+# Hücre tipi → (hücre dönüştürücü | None, karşılaştırılacak literal) ; None = karşılaştırılamaz
+Coercion = Optional[tuple[Optional[Callable[[Any], Any]], Any]]
+
+
+def _cell_number(value: str) -> Any:
+    text = value.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return _FAIL
+
+
+def _cell_bool(value: str) -> Any:
+    text = value.strip().lower()
+    if text in _TRUE_WORDS:
+        return True
+    if text in _FALSE_WORDS:
+        return False
+    return _FAIL
+
+
+def _cell_datetime(value: Any) -> Any:
+    if isinstance(value, _dt.datetime):
+        return value
+    if isinstance(value, _dt.date):
+        return _dt.datetime(value.year, value.month, value.day)
+    try:
+        return _dt.datetime.fromisoformat(value.strip())
+    except ValueError:
+        return _FAIL
+
+
+def _literal_number(text: str) -> Any:
+    result = _cell_number(text)
+    return None if result is _FAIL else result
+
+
+def _coerce(cell_type: type, literal: Any) -> Coercion:
+    """Literal'i hücre tipiyle karşılaştırılabilir hale getirir (hücre tipi başına bir kez)."""
+    if literal is None or issubclass(cell_type, type(None)):
+        return None
+    if isinstance(literal, bool):
+        if issubclass(cell_type, (int, float, _decimal.Decimal)):
+            return None, literal
+        if issubclass(cell_type, str):
+            return _cell_bool, literal
+        return None
+    if isinstance(literal, (int, float)):
+        if issubclass(cell_type, (int, float)):
+            return None, literal
+        if issubclass(cell_type, _decimal.Decimal):
+            return None, _decimal.Decimal(repr(literal)) if isinstance(literal, float) else literal
+        if issubclass(cell_type, str):
+            return _cell_number, literal
+        return None
+    if isinstance(literal, _dt.date):
+        if isinstance(literal, _dt.datetime):
+            target = literal
+        else:
+            target = _dt.datetime(literal.year, literal.month, literal.day)
+        if issubclass(cell_type, _dt.datetime):
+            return None, target
+        if issubclass(cell_type, _dt.date):
+            if isinstance(literal, _dt.datetime):
+                return _cell_datetime, target
+            return None, literal
+        if issubclass(cell_type, str):
+            return _cell_datetime, target
+        return None
+
+    # Metin literal'i: hücre tipine çevrilebiliyorsa tipli, değilse str(hücre) karşılaştırılır
+    text = literal if isinstance(literal, str) else str(literal)
+    if issubclass(cell_type, str):
+        return None, text
+    if issubclass(cell_type, bool):
+        flag = _cell_bool(text)
+        return (None, flag) if flag is not _FAIL else (str, text)
+    if issubclass(cell_type, (int, float)):
+        number = _literal_number(text)
+        return (None, number) if number is not None else (str, text)
+    if issubclass(cell_type, _decimal.Decimal):
+        try:
+            return None, _decimal.Decimal(text.strip())
+        except _decimal.InvalidOperation:
+            return str, text
+    if issubclass(cell_type, _dt.datetime):
+        parsed = _cell_datetime(text)
+        return (None, parsed) if parsed is not _FAIL else (str, text)
+    if issubclass(cell_type, _dt.date):
+        try:
+            return None, _dt.date.fromisoformat(text.strip())
+        except ValueError:
+            parsed = _cell_datetime(text)
+            return (_cell_datetime, parsed) if parsed is not _FAIL else (str, text)
+    return str, text
+
+
+# ─── Yaprak derleme ───────────────────────────────────────────────────────
+
+Test = Callable[[Any], bool]
+
+_OPS = {"=": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+def _never(value: Any) -> bool:
+    return False
+
+
+def _compile_compare(op: str, literal: Any) -> Test:
+    if literal is None:
+        return _never  # SQL: NULL ile karşılaştırma hiçbir zaman doğru değildir
+    compare = _OPS[op]
+    cache: dict[type, Coercion] = {type(None): None}
+
+    lookup = cache.get
+
+    def test(value: Any) -> bool:
+        entry = lookup(type(value), _MISSING)
+        if entry is _MISSING:
+            entry = cache[type(value)] = _coerce(type(value), literal)
+        if entry is None:
+            return False
+        convert, target = entry
+        if convert is not None:
+            value = convert(value)
+            if value is _FAIL:
+                return False
+        try:
+            return compare(value, target)
+        except TypeError:  # ör. timezone'lu ve timezone'suz datetime
+            return False
+
+    return test
+
+
+def _compile_in(values: tuple, negated: bool) -> Test:
+    literals = [v for v in values if v is not None]
+    if negated and len(literals) != len(values):
+        return _never  # SQL: NOT IN listesinde NULL varsa sonuç hiçbir zaman doğru değildir
+    cache: dict[type, Any] = {}
+
+    def groups_for(cell_type: type) -> list[tuple[Optional[Callable], frozenset]]:
+        grouped: dict[Any, set] = {}
+        for literal in literals:
+            entry = _coerce(cell_type, literal)
+            if entry is not None:
+                grouped.setdefault(entry[0], set()).add(entry[1])
+        return [(convert, frozenset(targets)) for convert, targets in grouped.items()]
+
+    def contains(value: Any) -> bool:
+        groups = cache.get(type(value))
+        if groups is None:
+            groups = cache[type(value)] = groups_for(type(value))
+        for convert, targets in groups:
+            cell = value if convert is None else convert(value)
+            if cell is not _FAIL:
+                try:
+                    if cell in targets:
+                        return True
+                except TypeError:  # hash'lenemeyen hücre
+                    continue
+        return False
+
+    if negated:
+        return lambda value: value is not None and not contains(value)
+    return lambda value: value is not None and contains(value)
+
+
+def _like_regex(pattern: str) -> re.Pattern:
+    parts = []
+    for ch in pattern:
+        if ch in "%*":
+            parts.append(".*")
+        elif ch == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(ch))
+    return re.compile("".join(parts), re.DOTALL)
+
+
+def _compile_like(pattern: str, negated: bool) -> Test:
+    match = _like_regex(pattern).fullmatch
+
+    def test(value: Any) -> bool:
+        if value is None:
+            return False
+        found = match(value if isinstance(value, str) else str(value)) is not None
+        return found is not negated
+
+    return test
+
+
+def _compile_leaf(expr: Expression) -> Test:
+    if isinstance(expr, Compare):
+        return _compile_compare(expr.op, expr.value)
+    if isinstance(expr, IsNull):
+        return (lambda value: value is not None) if expr.negated else (lambda value: value is None)
+    if isinstance(expr, Like):
+        return _compile_like(expr.pattern, expr.negated)
+    if isinstance(expr, InList):
+        return _compile_in(expr.values, expr.negated)
+    if isinstance(expr, Between):
+        if expr.negated:
+            below, above = _compile_compare("<", expr.low), _compile_compare(">", expr.high)
+            return lambda value: below(value) or above(value)
+        low, high = _compile_compare(">=", expr.low), _compile_compare("<=", expr.high)
+        return lambda value: low(value) and high(value)
+    raise TypeError(f"Bilinmeyen ifade düğümü: {type(expr).__name__}")
+
+
+# ─── Predicate ────────────────────────────────────────────────────────────
+
+RowTest = Callable[[dict], bool]
+Selector = Callable[[ColumnarChunk, Optional[list[int]]], list[int]]
+
+
+def _both(first: RowTest, second: RowTest) -> RowTest:
+    return lambda row: first(row) and second(row)
+
+
+def _either(first: RowTest, second: RowTest) -> RowTest:
+    return lambda row: first(row) or second(row)
+
+
+def _row_test(expr: Expression) -> RowTest:
+    if isinstance(expr, (And, Or)):
+        # Soldan sağa iç içe ikili kapanışlar: generator/all() maliyeti olmadan kısa devre
+        combine = _both if isinstance(expr, And) else _either
+        tests = [_row_test(i) for i in expr.items]
+        result = tests[-1]
+        for test in reversed(tests[:-1]):
+            result = combine(test, result)
+        return result
+    test = _compile_leaf(expr)
+    column = expr.column
+    return lambda row: test(row.get(column))
+
+
+def _selector(expr: Expression) -> Selector:
+    if isinstance(expr, And):
+        selectors = [_selector(i) for i in expr.items]
+
+        def select_and(chunk: ColumnarChunk, candidates: Optional[list[int]]) -> list[int]:
+            for select in selectors:
+                candidates = select(chunk, candidates)
+                if not candidates:
+                    break
+            return candidates
+
+        return select_and
+
+    if isinstance(expr, Or):
+        selectors = [_selector(i) for i in expr.items]
+
+        def select_or(chunk: ColumnarChunk, candidates: Optional[list[int]]) -> list[int]:
+            remaining = list(range(len(chunk))) if candidates is None else candidates
+            selected: set[int] = set()
+            for select in selectors:
+                if not remaining:
+                    break
+                hits = select(chunk, remaining)
+                if hits:
+                    selected.update(hits)
+                    remaining = [i for i in remaining if i not in selected]
+            return sorted(selected)
+
+        return select_or
+
+    test = _compile_leaf(expr)
+    column = expr.column
+
+    def select_leaf(chunk: ColumnarChunk, candidates: Optional[list[int]]) -> list[int]:
+        values = chunk.column(column)
+        if candidates is None:
+            return list(compress(range(len(values)), map(test, values)))
+        return [i for i in candidates if test(values[i])]
+
+    return select_leaf
+
+
+class Predicate:
+    """
+    Derlenmiş filtre. expression: NOT'ları yapraklara indirilmiş AST
+    (pushdown gibi planlama adımları için), columns: kullanılan kolonlar.
+    """
+
+    __slots__ = ("source", "expression", "columns", "matches", "_select")
+
+    def __init__(self, source: str, expression: Expression) -> None:
+        self.source = source
+        self.expression = push_down_not(expression)
+        self.columns = expression_columns(self.expression)
+        self.matches: RowTest = _row_test(self.expression)
+        self._select: Selector = _selector(self.expression)
+
+    def __repr__(self) -> str:
+        return f"Predicate({self.source!r})"
+
+    def select(self, chunk: ColumnarChunk) -> list[int]:
+        """Koşulu sağlayan satır indeksleri (artan sırada)."""
+        return self._select(chunk, None)
+
+    def filter(self, rows: Chunk) -> Chunk:
+        if isinstance(rows, ColumnarChunk):
+            return rows.take(self.select(rows))
+        matches = self.matches
+        return [row for row in rows if matches(row)]
+
+
+def compile_predicate(text: str) -> Predicate:
+    """Koşul metnini ayrıştırıp derler; hatada ExpressionError fırlatır."""
+    return Predicate(text, parse_expression(text))
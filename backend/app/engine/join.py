@@ -0,0 +1,331 @@
+"""
+Hash join operatörü.
+
+İki chunk akışını anahtar kolonlar üzerinden birleştirir (inner, left, anti).
+Küçük taraf (build) anahtara göre bellekte hash tabloya alınır, büyük taraf
+(probe) chunk chunk taranır; çıktı da chunk olarak akar.
+
+build_side="auto" ise iki girdi satır sayısı dengelenerek sırayla okunur; önce
+biten taraf küçük taraftır ve build olur, diğer tarafın okunmuş chunk'ları
+probe'un başına eklenir. Her iki taraf da inner/left/anti için build
+olabilir: sol taraf build edildiğinde eşleşmeyen sol satırlar probe bitince
+yazılır.
+
+Build tarafı memory_rows satırı aşarsa grace hash join'e geçilir: her iki
+taraf anahtarın hash'ine göre `partitions` parçaya bölünerek geçici dosyalara
+yazılır ve parçalar tek tek bellekte birleştirilir. Parça hâlâ büyükse farklı
+tuz (salt) ile yeniden bölünür (en fazla _MAX_SPILL_DEPTH seviye).
+
+NULL anahtarlı satırlar SQL'deki gibi hiçbir satırla eşleşmez.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from app.engine.chunk import Chunk, as_rows
+from app.engine.spill import SpillPartitions
+
+JOIN_TYPES = ("inner", "left", "anti")
+BUILD_SIDES = ("auto", "left", "right")
+
+_MAX_SPILL_DEPTH = 3
+_SPILL_PREFIX = "dataflow_join_"
+
+
+# ─── Operatör ─────────────────────────────────────────────────────────────
+
+class HashJoin:
+    """
+    left / right: chunk akışları (list[dict] veya ColumnarChunk)
+    left_keys / right_keys: eşleşen anahtar kolonlar (aynı uzunlukta)
+    how: inner | left | anti (anti: sağda eşi olmayan sol satırlar)
+    right_suffix: sol tarafta da bulunan sağ kolonlara eklenecek sonek;
+        aynı adlı anahtar kolonlar çıktıda bir kez yer alır
+    on_event: plan kararları için bilgi mesajı callback'i (log)
+    """
+
+    def __init__(
+        self,
+        left: Iterable[Chunk],
+        right: Iterable[Chunk],
+        left_keys: list[str],
+        right_keys: list[str],
+        how: str = "inner",
+        build_side: str = "auto",
+        memory_rows: int = 500_000,
+        chunk_size: int = 5000,
+        partitions: int = 16,
+        right_suffix: str = "_right",
+        on_event: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if how not in JOIN_TYPES:
+            raise ValueError(f"Bilinmeyen join tipi: {how} ({' | '.join(JOIN_TYPES)})")
+        if build_side not in BUILD_SIDES:
+            raise ValueError(f"Bilinmeyen build tarafı: {build_side} ({' | '.join(BUILD_SIDES)})")
+        if not left_keys or len(left_keys) != len(right_keys):
+            raise ValueError("Join anahtarları boş olamaz; sol ve sağ anahtar sayısı eşit olmalı")
+        self.left = left
+        self.right = right
+        self.left_keys = list(left_keys)
+        self.right_keys = list(right_keys)
+        self.how = how
+        self.build_side = build_side
+        self.memory_rows = max(1, memory_rows)
+        self.chunk_size = max(1, chunk_size)
+        self.partitions = max(2, partitions)
+        self.right_suffix = right_suffix
+        self._on_event = on_event
+        # Aynı adlı anahtarların sağ kopyası çıktıya yazılmaz (değerleri eşittir)
+        self._drop = {rk for lk, rk in zip(self.left_keys, self.right_keys) if lk == rk}
+        self._right_columns: Optional[list[str]] = None
+
+    # ─── Yardımcılar ──────────────────────────────────────────────────────
+
+    def _event(self, message: str) -> None:
+        if self._on_event is not None:
+            self._on_event(message)
+
+    @staticmethod
+    def _key_getter(keys: list[str]) -> Callable[[dict], Any]:
+        """Satırın join anahtarı; NULL içeren anahtar için None."""
+        if len(keys) == 1:
+            name = keys[0]
+            return lambda row: row.get(name)
+
+        def _key(row: dict) -> Any:
+            key = tuple(row.get(k) for k in keys)
+            return None if None in key else key
+
+        return _key
+
+    def _note_right(self, row: dict) -> None:
+        if self._right_columns is None:
+            self._right_columns = [c for c in row if c not in self._drop]
+
+    def _combine(self, left_row: dict, right_row: dict) -> dict:
+        if not (left_row.keys() & right_row.keys()):
+            return {**left_row, **right_row}
+        out = dict(left_row)
+        drop = self._drop
+        suffix = self.right_suffix
+        for name, value in right_row.items():
+            if name in drop:
+                continue
+            out[name + suffix if name in left_row else name] = value
+        return out
+
+    def _pad(self, left_row: dict) -> dict:
+        """Eşi olmayan sol satırı sağ kolonlar NULL olacak şekilde tamamlar (left join)."""
+        out = dict(left_row)
+        for name in self._right_columns or ():
+            out.setdefault(name + self.right_suffix if name in left_row else name, None)
+        return out
+
+    # ─── Akış ─────────────────────────────────────────────────────────────
+
+    def __iter__(self) -> Iterator[list[dict]]:
+        return self.run()
+
+    def run(self) -> Iterator[list[dict]]:
+        left_iter = (as_rows(c) for c in self.left)
+        right_iter = (as_rows(c) for c in self.right)
+        build_is_left, build_chunks, probe_prefix, probe_rest = self._choose_build(left_iter, right_iter)
+
+        build_keys = self.left_keys if build_is_left else self.right_keys
+        probe_keys = self.right_keys if build_is_left else self.left_keys
+        build_key = self._key_getter(build_keys)
+        probe_key = self._key_getter(probe_keys)
+
+        def _probe() -> Iterator[list[dict]]:
+            yield from probe_prefix
+            yield from probe_rest
+
+        # Build tarafını topla; bütçe aşılırsa parçalara dök
+        build_rows: list[dict] = []
+        spill: Optional[SpillPartitions] = None
+        for chunk in build_chunks:
+            if not build_is_left and chunk:
+                self._note_right(chunk[0])
+            if spill is None:
+                build_rows.extend(chunk)
+                if len(build_rows) > self.memory_rows:
+                    spill = SpillPartitions(self.partitions, _SPILL_PREFIX)
+                    self._event(
+                        f"Join spill: build tarafı bellek limitini aştı ({self.memory_rows} satır), "
+                        f"{self.partitions} parçaya bölünüyor"
+                    )
+                    for row in build_rows:
+                        spill.add(hash((0, build_key(row))) % self.partitions, row)
+                    build_rows = []
+            else:
+                for row in chunk:
+                    spill.add(hash((0, build_key(row))) % self.partitions, row)
+
+        side = "sol" if build_is_left else "sağ"
+        if spill is None:
+            self._event(f"Join ({self.how}): build={side} ({len(build_rows)} satır, bellekte)")
+            yield from self._rechunk(self._join_memory(build_rows, _probe(), build_is_left, build_key, probe_key))
+            return
+
+        self._event(f"Join ({self.how}): build={side} ({sum(spill.rows)} satır, diskte)")
+        probe_spill = SpillPartitions(self.partitions, _SPILL_PREFIX)
+        try:
+            for chunk in _probe():
+                if build_is_left and chunk:
+                    self._note_right(chunk[0])
+                for row in chunk:
+                    probe_spill.add(hash((0, probe_key(row))) % self.partitions, row)
+            yield from self._rechunk(
+                self._join_partitions(spill, probe_spill, build_is_left, build_key, probe_key, depth=1)
+            )
+        finally:
+            spill.close()
+            probe_spill.close()
+
+    def _choose_build(
+        self,
+        left_iter: Iterator[list[dict]],
+        right_iter: Iterator[list[dict]],
+    ) -> tuple[bool, Iterable[list[dict]], list[list[dict]], Iterator[list[dict]]]:
+        """(build sol mu, build chunk'ları, probe'un okunmuş chunk'ları, probe'un kalanı)."""
+        if self.build_side == "left":
+            return True, left_iter, [], right_iter
+        if self.build_side == "right":
+            return False, right_iter, [], left_iter
+
+        # auto: satır sayısı az olan taraftan okuyarak ilerle; önce biten küçük taraftır
+        buffers: dict[bool, list[list[dict]]] = {True: [], False: []}
+        counts = {True: 0, False: 0}
+        iters = {True: left_iter, False: right_iter}
+        while True:
+            side = counts[True] <= counts[False]
+            chunk = next(iters[side], None)
+            if chunk is None:
+                other = not side
+                return side, buffers[side], buffers[other], iters[other]
+            buffers[side].append(chunk)
+            counts[side] += len(chunk)
+            if counts[True] + counts[False] > 2 * self.memory_rows:
+                # İki taraf da büyük: sağ build (disk'e taşar), sol probe
+                return False, _chain(buffers[False], right_iter), buffers[True], left_iter
+
+    def _rechunk(self, rows: Iterator[dict]) -> Iterator[list[dict]]:
+        batch: list[dict] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _join_memory(
+        self,
+        build_rows: list[dict],
+        probe_chunks: Iterable[list[dict]],
+        build_is_left: bool,
+        build_key: Callable[[dict], Any],
+        probe_key: Callable[[dict], Any],
+    ) -> Iterator[dict]:
+        how = self.how
+        combine = self._combine
+        if not build_is_left:
+            # Sağ build: sol satırlar akarken eşleşmeler hemen yazılır
+            table: dict[Any, list[dict]] = {}
+            for row in build_rows:
+                key = build_key(row)
+                if key is not None:
+                    table.setdefault(key, []).append(row)
+            get = table.get
+            for chunk in probe_chunks:
+                for left_row in chunk:
+                    key = probe_key(left_row)
+                    matches = get(key) if key is not None else None
+                    if how == "anti":
+                        if not matches:
+                            yield left_row
+                    elif matches:
+                        for right_row in matches:
+                            yield combine(left_row, right_row)
+                    elif how == "left":
+                        yield self._pad(left_row)
+            return
+
+        # Sol build: eşleşen sol satırlar işaretlenir, eşleşmeyenler probe bitince yazılır
+        index: dict[Any, list[int]] = {}
+        for i, row in enumerate(build_rows):
+            key = build_key(row)
+            if key is not None:
+                index.setdefault(key, []).append(i)
+        matched = bytearray(len(build_rows))
+        get = index.get
+        for chunk in probe_chunks:
+            if chunk:
+                self._note_right(chunk[0])
+            for right_row in chunk:
+                key = probe_key(right_row)
+                positions = get(key) if key is not None else None
+                if not positions:
+                    continue
+                for i in positions:
+                    matched[i] = 1
+                    if how != "anti":
+                        yield combine(build_rows[i], right_row)
+        if how == "inner":
+            return
+        for i, left_row in enumerate(build_rows):
+            if not matched[i]:
+                yield left_row if how == "anti" else self._pad(left_row)
+
+    def _join_partitions(
+        self,
+        build: SpillPartitions,
+        probe: SpillPartitions,
+        build_is_left: bool,
+        build_key: Callable[[dict], Any],
+        probe_key: Callable[[dict], Any],
+        depth: int,
+    ) -> Iterator[dict]:
+        for p in range(build.count):
+            if build.rows[p] > self.memory_rows and depth < _MAX_SPILL_DEPTH:
+                # Parça hâlâ büyük: farklı tuzla yeniden böl
+                sub_build = SpillPartitions(self.partitions, _SPILL_PREFIX)
+                sub_probe = SpillPartitions(self.partitions, _SPILL_PREFIX)
+                try:
+                    for rows in build.read(p):
+                        for row in rows:
+                            sub_build.add(hash((depth, build_key(row))) % self.partitions, row)
+                    for rows in probe.read(p):
+                        for row in rows:
+                            sub_probe.add(hash((depth, probe_key(row))) % self.partitions, row)
+                    yield from self._join_partitions(
+                        sub_build, sub_probe, build_is_left, build_key, probe_key, depth + 1
+                    )
+                finally:
+                    sub_build.close()
+                    sub_probe.close()
+                continue
+            if build.rows[p] > self.memory_rows:
+                self._event(
+                    f"Join spill: {build.rows[p]} satırlık parça bölünemedi "
+                    f"(tek anahtarda yoğunlaşma), bellekte birleştiriliyor"
+                )
+            build_rows = [row for rows in build.read(p) for row in rows]
+            yield from self._join_memory(build_rows, probe.read(p), build_is_left, build_key, probe_key)
+
+
+def _chain(first: list[list[dict]], rest: Iterator[list[dict]]) -> Iterator[list[dict]]:
+    yield from first
+    yield from rest
+
+
+def hash_join(
+    left: Iterable[Chunk],
+    right: Iterable[Chunk],
+    left_keys: list[str],
+    right_keys: list[str],
+    how: str = "inner",
+    **options: Any,
+) -> Iterator[list[dict]]:
+    """HashJoin kısayolu; birleştirilmiş chunk'ları (list[dict]) üretir."""
+    return HashJoin(left, right, left_keys, right_keys, how, **options).run()
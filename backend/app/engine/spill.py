@@ -0,0 +1,62 @@
+"""
+Disk'e taşan hash parçaları.
+
+Bellek bütçesini aşan operatörler (join, aggregate) öğeleri anahtar hash'ine
+göre parçalara ayırıp geçici dosyalara yazar; parçalar daha sonra tek tek
+belleğe alınarak işlenir. Öğeler pickle'lanmış gruplar halinde yazılır,
+dosyalar kapatıldığında işletim sistemi tarafından silinir.
+"""
+from __future__ import annotations
+
+import pickle
+import tempfile
+from typing import Any, Iterator
+
+_SPILL_BATCH_ITEMS = 2000
+
+
+class SpillPartitions:
+    """Öğeleri parça dosyalarına yazar; `rows[i]` i. parçadaki öğe sayısıdır."""
+
+    def __init__(self, count: int, prefix: str = "dataflow_spill_") -> None:
+        self.count = count
+        self.prefix = prefix
+        self.rows = [0] * count
+        self._files: list[Any] = [None] * count
+        self._buffers: list[list[Any]] = [[] for _ in range(count)]
+
+    def add(self, index: int, item: Any) -> None:
+        buffer = self._buffers[index]
+        buffer.append(item)
+        self.rows[index] += 1
+        if len(buffer) >= _SPILL_BATCH_ITEMS:
+            self._flush(index)
+
+    def _flush(self, index: int) -> None:
+        buffer = self._buffers[index]
+        if not buffer:
+            return
+        if self._files[index] is None:
+            self._files[index] = tempfile.TemporaryFile(prefix=self.prefix)
+        pickle.dump(buffer, self._files[index], protocol=pickle.HIGHEST_PROTOCOL)
+        self._buffers[index] = []
+
+    def read(self, index: int) -> Iterator[list[Any]]:
+        """Parçanın öğe gruplarını yazılma sırasıyla döner."""
+        self._flush(index)
+        file = self._files[index]
+        if file is None:
+            return
+        file.seek(0)
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+    def close(self) -> None:
+        for file in self._files:
+            if file is not None:
+                file.close()
+        self._files = [None] * self.count
+        self._buffers = [[] for _ in range(self.count)]
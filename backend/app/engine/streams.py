@@ -0,0 +1,338 @@
+"""
+Chunk akışı yardımcıları.
+
+Execution motorunda node'lar arasında taşınan chunk generator'ları
+için ortak yapı taşları burada tutulur.
+"""
+from __future__ import annotations
+
+import pickle
+import queue
+import tempfile
+import threading
+from collections import deque
+from typing import Any, Callable, Generator, Iterable, Iterator, Optional
+
+_DONE = object()
+
+
+def prefetch_chunks(
+    chunks: Iterable[Any],
+    depth: int,
+    name: str = "prefetch",
+) -> Generator[Any, None, None]:
+    """
+    Kaynak chunk'larını arka plan thread'inde önceden okur.
+
+    Okuyucu thread en fazla `depth` chunk ileride durur (sınırlı kuyruk);
+    tüketici yavaşsa okuyucu bekler, böylece bellek kullanımı sınırlı kalır.
+    Okuma ve yazma aynı anda ilerlediği için toplam süre yaklaşık
+    max(okuma, yazma) olur.
+
+    depth <= 0 ise prefetch kapalıdır; chunk'lar aynen geçirilir.
+    Okuyucudaki hata tüketici tarafında yeniden fırlatılır. Tüketici erken
+    çıkarsa (generator close) okuyucu durdurulur ve thread'in bitmesi beklenir —
+    böylece connector, okuma sürerken kapatılmaz.
+    """
+    if depth <= 0:
+        yield from chunks
+        return
+
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def _put(item: Any) -> bool:
+        # Kuyruk doluysa periyodik olarak stop bayrağını kontrol ederek bekle
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader() -> None:
+        iterator = iter(chunks)
+        try:
+            for chunk in iterator:
+                if not _put((chunk, None)):
+                    return
+            _put((_DONE, None))
+        except BaseException as exc:  # noqa: BLE001 — tüketiciye taşınır
+            _put((_DONE, exc))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    reader = threading.Thread(target=_reader, name=name, daemon=True)
+    reader.start()
+    try:
+        while True:
+            chunk, error = buffer.get()
+            if chunk is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield chunk
+    finally:
+        stop.set()
+        reader.join()
+
+
+def merge_chunks(
+    factories: list[Callable[[], Iterable[Any]]],
+    depth: int,
+    name: str = "merge",
+) -> Generator[Any, None, None]:
+    """
+    Birden fazla chunk akışını paralel okuyup tek akışta birleştirir (fan-in).
+
+    Her factory kendi thread'inde çağrılır ve akışı okunur; chunk'lar geliş
+    sırasıyla verilir (akışlar arası sıra korunmaz). Ortak kuyruk `depth`
+    chunk ile sınırlıdır. İlk hatada tüm okuyucular durdurulur ve hata
+    tüketici tarafında fırlatılır; erken çıkışta thread'lerin bitmesi beklenir.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader(factory: Callable[[], Iterable[Any]]) -> None:
+        iterator = None
+        try:
+            iterator = iter(factory())
+            for chunk in iterator:
+                if not _put((chunk, None)):
+                    return
+            _put((_DONE, None))
+        except BaseException as exc:  # noqa: BLE001 — tüketiciye taşınır
+            _put((_DONE, exc))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    readers = [
+        threading.Thread(target=_reader, args=(factory,), name=f"{name}-{i}", daemon=True)
+        for i, factory in enumerate(factories)
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        remaining = len(readers)
+        while remaining:
+            chunk, error = buffer.get()
+            if chunk is _DONE:
+                if error is not None:
+                    raise error
+                remaining -= 1
+                continue
+            yield chunk
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+
+# ─── Fan-out (tee)────────────────────────────────────────────────────────
+
+class _TeeBranch:
+    """
+    ChunkTee'nin tek tüketiciye ait tamponu.
+
+    Normal modda en fazla `depth` chunk bellekte tutulur; doluysa üretici
+    bekler (backpressure). Spill modunda bellek dolunca chunk'lar geçici
+    dosyaya yazılır ve üretici hiç beklemez; sıra korunur.
+    """
+
+    def __init__(self, depth: int, spill: bool) -> None:
+        self._cond = threading.Condition()
+        self._memory: deque = deque()
+        self._depth = max(1, depth)
+        self._spill = spill
+        self._spill_file = None
+        self._spill_pending = 0
+        self._read_pos = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self.closed = False
+
+    def put(self, chunk: Any) -> None:
+        with self._cond:
+            if self._spill:
+                if self._spill_pending or len(self._memory) >= self._depth:
+                    self._write_spill(chunk)
+                else:
+                    self._memory.append(chunk)
+                self._cond.notify_all()
+                return
+            while len(self._memory) >= self._depth and not self.closed:
+                self._cond.wait()
+            if not self.closed:
+                self._memory.append(chunk)
+                self._cond.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    def get(self) -> Any:
+        """Sıradaki chunk'ı döner; akış bittiyse _DONE (hata varsa fırlatır)."""
+        with self._cond:
+            while True:
+                if self.closed:
+                    return _DONE
+                if self._memory:
+                    chunk = self._memory.popleft()
+                    self._cond.notify_all()
+                    return chunk
+                if self._spill_pending:
+                    return self._read_spill()
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return _DONE
+                self._cond.wait()
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._memory.clear()
+            self._spill_pending = 0
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+            self._cond.notify_all()
+
+    def _write_spill(self, chunk: Any) -> None:
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix="dataflow_tee_")
+        self._spill_file.seek(0, 2)
+        pickle.dump(chunk, self._spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spill_pending += 1
+
+    def _read_spill(self) -> Any:
+        self._spill_file.seek(self._read_pos)
+        chunk = pickle.load(self._spill_file)
+        self._read_pos = self._spill_file.tell()
+        self._spill_pending -= 1
+        if not self._spill_pending:
+            # Dosya tamamen okundu — yeniden kullanmak için sıfırla
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+            self._read_pos = 0
+        return chunk
+
+
+class _TeeIterator:
+    """Tek bir tüketicinin ChunkTee akışı. Hiç okunmadan da close() edilebilir."""
+
+    def __init__(self, tee: "ChunkTee", branch: _TeeBranch) -> None:
+        self._tee = tee
+        self._branch = branch
+
+    def __iter__(self) -> "_TeeIterator":
+        return self
+
+    def __next__(self) -> Any:
+        if self._branch.closed:
+            raise StopIteration
+        self._tee._start()
+        chunk = self._branch.get()
+        if chunk is _DONE:
+            self._branch.close()
+            raise StopIteration
+        return chunk
+
+    def close(self) -> None:
+        self._branch.close()
+
+
+class ChunkTee:
+    """
+    Tek bir chunk akışını birden fazla tüketiciye dağıtır (fan-out).
+
+    Kaynak akış yalnızca bir kez okunur: arka plan thread'i her chunk'ı tüm
+    açık tüketici tamponlarına koyar. Tamponlar sınırlıdır; en yavaş tüketici
+    üreticiyi yavaşlatır. Tüketiciler aynı anda çalışamıyorsa (ör. sıralı
+    yürütme) spill=True ile taşan chunk'lar geçici dosyaya yazılır.
+
+    factory: kaynak akışı üreten fonksiyon; üretici thread'inde çağrılır.
+    Tüm tüketiciler kapandığında okuma durdurulur ve kaynak kapatılır.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Iterable[Any]],
+        consumer_ids: list[str],
+        depth: int = 4,
+        spill: bool = False,
+        name: str = "tee",
+    ) -> None:
+        self._factory = factory
+        self._branches = {cid: _TeeBranch(depth, spill) for cid in consumer_ids}
+        self._taken: set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._name = name
+
+    def branch(self, consumer_id: str) -> Iterator[Any]:
+        """Tüketiciye ait akışı döner. Her tüketici kendi dalını bir kez alabilir."""
+        with self._lock:
+            if consumer_id not in self._branches or consumer_id in self._taken:
+                return iter(())
+            self._taken.add(consumer_id)
+            return _TeeIterator(self, self._branches[consumer_id])
+
+    def close(self) -> None:
+        """Tüm dalları kapatır; üretici thread bir sonraki chunk'ta durur."""
+        for branch in self._branches.values():
+            branch.close()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._pump, name=self._name, daemon=True)
+                self._thread.start()
+
+    def _pump(self) -> None:
+        source = None
+        error: Optional[BaseException] = None
+        try:
+            source = iter(self._factory())
+            for chunk in source:
+                alive = [b for b in self._branches.values() if not b.closed]
+                if not alive:
+                    break
+                for branch in alive:
+                    branch.put(chunk)
+        except BaseException as exc:  # noqa: BLE001 — tüketicilere taşınır
+            error = exc
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+            for branch in self._branches.values():
+                branch.finish(error)
@@ -1,11 +1,13 @@
 from app.models.ai_settings import AISettings
 from app.models.audit_log import AuditLog
+from app.models.checkpoint import ExecutionCheckpoint
 from app.models.connection import Connection
 from app.models.execution import Execution, ExecutionLog
 from app.models.folder import Folder
 from app.models.orchestration import Orchestration, OrchestrationStep
 from app.models.schedule import Schedule
 from app.models.user import User
+from app.models.watermark import SourceWatermark
 from app.models.workflow import Workflow
 
 __all__ = [
@@ -16,8 +18,10 @@ __all__ = [
     "Workflow",
     "Execution",
     "ExecutionLog",
+    "ExecutionCheckpoint",
     "Schedule",
     "Orchestration",
     "OrchestrationStep",
     "User",
+    "SourceWatermark",
 ]
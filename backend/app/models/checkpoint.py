@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.utils.timezone import now_istanbul
+
+
+class ExecutionCheckpoint(Base):
+    """Hedef node'un execution içindeki son kalıcı (commit edilmiş) yazma noktası."""
+
+    __tablename__ = "execution_checkpoints"
+    __table_args__ = (UniqueConstraint("execution_id", "node_id", name="uq_execution_checkpoint_node"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    execution_id: Mapped[str] = mapped_column(
+        String(32), ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    node_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), default="running", nullable=False
+    )  # running | done
+    chunk_index: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows_written: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    key_column: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    key_type: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # bkz. SourceWatermark.value_type
+    key_value: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=now_istanbul, onupdate=now_istanbul, nullable=False
+    )
@@ -23,7 +23,7 @@ class Execution(Base):
     )  # pending | running | success | failed | cancelled
     trigger_type: Mapped[str] = mapped_column(
         String(20), default="manual", nullable=False
-    )  # manual | scheduled | chained
+    )  # manual | scheduled | chained | resume
     trigger_info: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     rows_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -47,6 +47,7 @@ class ExecutionLog(Base):
     execution_id: Mapped[str] = mapped_column(
         String(32), ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True
     )
+    seq: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # execution içi sıra no (canlı akış id'si)
     node_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     level: Mapped[str] = mapped_column(
         String(10), default="info", nullable=False
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.utils.timezone import now_istanbul
+
+
+class SourceWatermark(Base):
+    """Incremental source node'un en son başarıyla aktarılan kolon değeri (high-water mark)."""
+
+    __tablename__ = "source_watermarks"
+    __table_args__ = (UniqueConstraint("workflow_id", "node_id", name="uq_source_watermark_node"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    workflow_id: Mapped[str] = mapped_column(
+        String(32), ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    node_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    column_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    value_type: Mapped[str] = mapped_column(
+        String(20), nullable=False
+    )  # int | decimal | float | datetime | date | str | bytes
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+    execution_id: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=now_istanbul, onupdate=now_istanbul, nullable=False
+    )
@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db, engine
 from app.config import settings
 from app.models.audit_log import AuditLog
+from app.models.checkpoint import ExecutionCheckpoint
 from app.models.execution import Execution, ExecutionLog
 from app.models.workflow import Workflow
 from app.models.user import User
@@ -403,6 +404,7 @@ async def delete_executions_by_ids(
     def _delete():
         # Once execution loglari sil (cascade yerine manuel — SQLAlchemy bulk delete cascade desteklemez)
         db.query(ExecutionLog).filter(ExecutionLog.execution_id.in_(data.ids)).delete(synchronize_session=False)
+        db.query(ExecutionCheckpoint).filter(ExecutionCheckpoint.execution_id.in_(data.ids)).delete(synchronize_session=False)
         count = db.query(Execution).filter(Execution.id.in_(data.ids)).delete(synchronize_session=False)
         db.commit()
         logger.info("Execution silindi: %d kayit (ID bazli, loglar dahil)", count)
@@ -427,6 +429,7 @@ async def delete_executions_by_date(
 
         if exec_ids:
             db.query(ExecutionLog).filter(ExecutionLog.execution_id.in_(exec_ids)).delete(synchronize_session=False)
+            db.query(ExecutionCheckpoint).filter(ExecutionCheckpoint.execution_id.in_(exec_ids)).delete(synchronize_session=False)
             count = db.query(Execution).filter(Execution.id.in_(exec_ids)).delete(synchronize_session=False)
         else:
             count = 0
@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import json
 
@@ -15,6 +15,8 @@ from sqlalchemy.orm import Session
 from app.database import get_db, SessionLocal
 from app.schemas.execution import ExecutionDetail, ExecutionLogResponse, ExecutionResponse, ExecutionTimeline, TimelineNodeEntry
 from app.services import auth_service, execution_service
+from app.services.execution_event_service import FINAL_STATUSES, done_event, execution_events, log_event
+from app.services.execution_log_service import execution_log_sink
 from app.utils.logger import logger
 from app.utils.auth_deps import get_current_user
 
@@ -62,6 +64,23 @@ async def cancel_execution(execution_id: str, db: Session = Depends(get_db), _us
         raise HTTPException(status_code=400, detail="Execution iptal edilemedi")
 
 
+@router.post("/{execution_id}/resume", response_model=ExecutionResponse, status_code=202)
+async def resume_execution(
+    execution_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _user=Depends(get_current_user),
+):
+    """Başarısız/iptal edilmiş execution'ı son checkpoint'ten devam ettiren yeni execution başlatır."""
+    execution = await run_in_threadpool(execution_service.create_resume_execution, db, execution_id)
+    if execution is None:
+        raise HTTPException(status_code=400, detail="Execution devam ettirilemedi")
+    background_tasks.add_task(
+        _run_workflow_task, execution.workflow_id, execution.id, "resume", resume_from=execution_id,
+    )
+    return ExecutionResponse.model_validate(execution)
+
+
 @router.get("/{execution_id}/timeline", response_model=ExecutionTimeline)
 async def get_execution_timeline(execution_id: str, db: Session = Depends(get_db), _user=Depends(get_current_user)):
     """Execution'daki her node'un başlangıç/bitiş zamanını ve süresini döner (Gantt grafik için)."""
@@ -158,11 +177,13 @@ async def get_execution_timeline(execution_id: str, db: Session = Depends(get_db
 
 # ─── Workflow tetikleyici ──────────────────────────────────────────────────
 
-def _run_workflow_task(workflow_id: str, execution_id: str, trigger_type: str):
+def _run_workflow_task(workflow_id: str, execution_id: str, trigger_type: str, resume_from: Optional[str] = None):
     """Background task: kendi DB session'ını açar ve kapatır."""
     db = SessionLocal()
     try:
-        execution_service.run_workflow(db, workflow_id, trigger_type, execution_id=execution_id)
+        execution_service.run_workflow(
+            db, workflow_id, trigger_type, execution_id=execution_id, resume_from=resume_from,
+        )
     except Exception as e:
         logger.error(f"Workflow çalıştırma hatası [{workflow_id}]: {e}")
     finally:
@@ -205,6 +226,86 @@ async def run_workflow(
     return ExecutionResponse.model_validate(execution)
 
 
+# ─── Canlı log akışı: ortak backfill + push ──────────────────────────────
+
+LIVE_HEARTBEAT_SECONDS = 15  # Olay gelmezse bağlantıyı canlı tutmak için
+
+
+def _load_log_backfill(execution_id: str):
+    """Bağlantı anındaki tek DB okuması: mevcut loglar ve execution durumu."""
+    db = SessionLocal()
+    try:
+        execution = execution_service.get_execution(db, execution_id)
+        if not execution:
+            return None
+
+        from app.models.execution import ExecutionLog
+        rows = (
+            db.query(ExecutionLog)
+            .filter(ExecutionLog.execution_id == execution_id)
+            .order_by(ExecutionLog.id)
+            .all()
+        )
+        # Canlı olaylarla aynı sıra no (seq); seq'siz eski satırlarda sıra konumu
+        log_data = [
+            {
+                "id": log.seq or seq,
+                "node_id": log.node_id,
+                "level": log.level,
+                "message": log.message,
+                "created_at": log.created_at.isoformat(),
+            }
+            for seq, log in enumerate(rows, start=1)
+        ]
+        return log_data, execution.status, execution.rows_processed, execution.rows_failed
+    finally:
+        db.close()
+
+
+async def _live_log_events(execution_id: str) -> AsyncIterator[Optional[dict]]:
+    """
+    Execution log olaylarını sırayla üretir: önce geçmiş satırlar, sonra
+    motorun yayınladığı canlı olaylar. Abonelik backfill'den önce açılır;
+    iki kaynakta da görünen satırlar sıra no (id) ile elenir.
+    LIVE_HEARTBEAT_SECONDS boyunca olay gelmezse None üretir.
+    'done' veya hata olayından sonra biter.
+    """
+    sub = execution_events.subscribe(execution_id)
+    try:
+        backfill = await run_in_threadpool(_load_log_backfill, execution_id)
+        if backfill is None:
+            yield {"error": "Execution bulunamadı"}
+            return
+
+        log_data, current_status, rows_processed, rows_failed = backfill
+        # DB'ye henüz yazılmamış satırlar log yazıcısının bellekteki tail'inden gelir
+        after_seq = log_data[-1]["id"] if log_data else 0
+        log_data += [log_event(e) for e in execution_log_sink.tail(execution_id, after_seq=after_seq)]
+        last_seq = 0
+        for item in log_data:
+            yield item
+            last_seq = item["id"]
+
+        if current_status in FINAL_STATUSES:
+            yield done_event(current_status, rows_processed, rows_failed)
+            return
+
+        while True:
+            event = await sub.get(timeout=LIVE_HEARTBEAT_SECONDS)
+            if event is None:
+                yield None
+                continue
+            if event.get("type") == "done":
+                yield event
+                return
+            if event.get("type") == "status" or event["id"] <= last_seq:
+                continue
+            yield event
+            last_seq = event["id"]
+    finally:
+        execution_events.unsubscribe(sub)
+
+
 # ─── WebSocket: canlı log akışı ───────────────────────────────────────────
 
 @router.websocket("/ws/{execution_id}/logs")
@@ -213,8 +314,8 @@ async def ws_execution_logs(
     execution_id: str,
 ):
     """
-    Belirli bir execution için yeni log satırlarını canlı gönderir.
-    DB sorguları thread pool'da çalışır — event loop bloke olmaz.
+    Belirli bir execution için log satırlarını canlı gönderir.
+    DB yalnızca bağlantı anında okunur; sonraki satırlar motordan push edilir.
     """
     # WebSocket kimlik doğrulama — query param ile token kontrolü
     token = websocket.query_params.get("token")
@@ -227,62 +328,10 @@ async def ws_execution_logs(
         return
 
     await websocket.accept()
-    last_log_id = 0
     try:
-        while True:
-            def _fetch_logs(last_id: int):
-                db = SessionLocal()
-                try:
-                    execution = execution_service.get_execution(db, execution_id)
-                    if not execution:
-                        return None, None, None, None
-
-                    from app.models.execution import ExecutionLog
-                    new_logs = (
-                        db.query(ExecutionLog)
-                        .filter(
-                            ExecutionLog.execution_id == execution_id,
-                            ExecutionLog.id > last_id,
-                        )
-                        .order_by(ExecutionLog.id)
-                        .all()
-                    )
-                    log_data = [
-                        {
-                            "id": log.id,
-                            "node_id": log.node_id,
-                            "level": log.level,
-                            "message": log.message,
-                            "created_at": log.created_at.isoformat(),
-                        }
-                        for log in new_logs
-                    ]
-                    return log_data, execution.status, execution.rows_processed, execution.rows_failed
-                finally:
-                    db.close()
-
-            log_data, current_status, rows_processed, rows_failed = await run_in_threadpool(
-                _fetch_logs, last_log_id
-            )
-
-            if current_status is None:
-                await websocket.send_json({"error": "Execution bulunamadı"})
-                break
-
-            for log_item in log_data:
-                await websocket.send_json(log_item)
-                last_log_id = log_item["id"]
-
-            if current_status in ("success", "failed", "cancelled"):
-                await websocket.send_json({
-                    "type": "done",
-                    "status": current_status,
-                    "rows_processed": rows_processed,
-                    "rows_failed": rows_failed,
-                })
-                break
-
-            await asyncio.sleep(1)
+        async for event in _live_log_events(execution_id):
+            # Heartbeat: kopmuş istemciler gönderim hatasıyla fark edilir
+            await websocket.send_json(event if event is not None else {"type": "heartbeat"})
     except WebSocketDisconnect:
         pass
     except Exception as e:
@@ -307,72 +356,29 @@ async def sse_execution_logs(
     current_user=Depends(get_current_user),
 ):
     """
-    Belirli bir execution için yeni log satırlarını SSE (Server-Sent Events)
+    Belirli bir execution için log satırlarını SSE (Server-Sent Events)
     olarak canlı gönderir. IIS ARR reverse proxy WebSocket desteklemediğinde
     fallback olarak kullanılır.
     """
 
     async def event_generator():
-        last_log_id = 0
+        events = _live_log_events(execution_id)
         try:
-            while True:
-                # İstemci bağlantıyı kesti mi?
-                if await request.is_disconnected():
-                    break
-
-                def _fetch_logs(last_id: int):
-                    db = SessionLocal()
-                    try:
-                        execution = execution_service.get_execution(db, execution_id)
-                        if not execution:
-                            return None, None, None, None
-
-                        from app.models.execution import ExecutionLog
-                        new_logs = (
-                            db.query(ExecutionLog)
-                            .filter(
-                                ExecutionLog.execution_id == execution_id,
-                                ExecutionLog.id > last_id,
-                            )
-                            .order_by(ExecutionLog.id)
-                            .all()
-                        )
-                        log_data = [
-                            {
-                                "id": log.id,
-                                "node_id": log.node_id,
-                                "level": log.level,
-                                "message": log.message,
-                                "created_at": log.created_at.isoformat(),
-                            }
-                            for log in new_logs
-                        ]
-                        return log_data, execution.status, execution.rows_processed, execution.rows_failed
-                    finally:
-                        db.close()
-
-                log_data, current_status, rows_processed, rows_failed = await run_in_threadpool(
-                    _fetch_logs, last_log_id
-                )
-
-                if current_status is None:
-                    yield f"data: {json.dumps({'error': 'Execution bulunamadı'})}\n\n"
-                    break
-
-                for log_item in log_data:
-                    yield f"data: {json.dumps(log_item)}\n\n"
-                    last_log_id = log_item["id"]
-
-                if current_status in ("success", "failed", "cancelled"):
-                    yield f"data: {json.dumps({'type': 'done', 'status': current_status, 'rows_processed': rows_processed, 'rows_failed': rows_failed})}\n\n"
-                    break
-
-                await asyncio.sleep(1)
+            async for event in events:
+                if event is None:
+                    # İstemci bağlantıyı kesti mi? Kesmediyse proxy timeout'una karşı yorum satırı
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
         except asyncio.CancelledError:
             pass
         except Exception as e:
             logger.error(f"SSE hatası [{execution_id}]: {e}")
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        finally:
+            await events.aclose()
 
     return StreamingResponse(
         event_generator(),
@@ -10,13 +10,15 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.audit_log import AuditLogResponse
 from app.schemas.workflow import (
+    SourceReadPlan,
+    SourceWatermarkResponse,
     WorkflowCreate,
     WorkflowDetail,
     WorkflowResponse,
     WorkflowUpdate,
     WorkflowValidationResult,
 )
-from app.services import audit_service, workflow_service
+from app.services import audit_service, pushdown_service, watermark_service, workflow_service
 from app.services.presence_service import presence_store
 from app.utils.auth_deps import get_current_user
 from app.utils.logger import logger
@@ -152,6 +154,18 @@ async def validate_workflow(workflow_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{workflow_id}/dry-run", response_model=list[SourceReadPlan])
+async def dry_run_workflow(workflow_id: str, db: Session = Depends(get_db)):
+    """Workflow'u çalıştırmadan kaynakların okuyacağı sorguları (pushdown planı) döner."""
+    try:
+        plans = await run_in_threadpool(pushdown_service.dry_run_workflow, db, workflow_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if plans is None:
+        raise HTTPException(status_code=404, detail="Workflow bulunamadı")
+    return plans
+
+
 @router.get("/{workflow_id}/export")
 async def export_workflow(workflow_id: str, db: Session = Depends(get_db)):
     data = await run_in_threadpool(workflow_service.export_workflow, db, workflow_id)
@@ -192,6 +206,35 @@ async def import_workflow(
     return workflow
 
 
+# ─── Incremental watermark'lar ────────────────────────────────────────────
+
+@router.get("/{workflow_id}/watermarks", response_model=list[SourceWatermarkResponse])
+async def list_watermarks(workflow_id: str, db: Session = Depends(get_db)):
+    """Workflow'daki incremental source node'ların son watermark değerleri."""
+    return await run_in_threadpool(watermark_service.list_watermarks, db, workflow_id)
+
+
+@router.delete("/{workflow_id}/watermarks")
+async def reset_watermarks(
+    workflow_id: str,
+    request: Request,
+    node_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Watermark'ı sıfırlar (node_id verilmezse tümü); bir sonraki çalıştırma tam okuma yapar."""
+    deleted = await run_in_threadpool(watermark_service.reset_watermark, db, workflow_id, node_id)
+    await run_in_threadpool(
+        audit_service.log_action, db,
+        current_user.id, current_user.username,
+        "update", "workflow",
+        workflow_id, None,
+        None, {"watermark_reset": node_id or "all"},
+        _get_ip(request),
+    )
+    return {"deleted": deleted}
+
+
 # ─── Webhook test ──────────────────────────────────────────────────────────
 
 @router.post("/{workflow_id}/test-webhook")
@@ -51,3 +51,30 @@ class WorkflowValidationResult(BaseModel):
     valid: bool
     errors: list[str] = []
     warnings: list[str] = []
+
+
+class SourceReadPlan(BaseModel):
+    """Dry-run: source node'un çalıştırmada okuyacağı sorgu ve pushdown kararı."""
+    node_id: str
+    label: str = ""
+    dialect: Optional[str] = None
+    original_query: Optional[str] = None
+    query: Optional[str] = None
+    predicate: Optional[str] = None
+    pushed_filters: list[str] = []
+    columns: Optional[list[str]] = None
+    pruned_columns: list[str] = []
+    original_bytes: Optional[int] = None
+    bytes_processed: Optional[int] = None
+    notes: list[str] = []
+
+
+class SourceWatermarkResponse(BaseModel):
+    node_id: str
+    column_name: str
+    value_type: str
+    value: str
+    execution_id: Optional[str] = None
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
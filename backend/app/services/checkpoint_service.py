@@ -0,0 +1,116 @@
+"""
+Execution checkpoint (kaldığı yerden devam) servisi.
+
+Her destination node'u yazdığı her chunk commit edildikten sonra ilerlemesini
+metadata DB'ye kaydeder: chunk sayısı, yazılan satır ve — kaynakta
+`checkpoint_column` tanımlıysa — yazılan en büyük anahtar değeri. Başarısız,
+iptal edilmiş veya sunucu yeniden başlatılırken yarıda kalmış bir execution
+"resume" ile devam ettirildiğinde:
+
+  - önceki çalıştırmada tamamlanan sink'ler (destination / sqlExecute) atlanır,
+  - anahtar checkpoint'i olan hedefler için kaynak keyset sayfalama ile
+    (`WHERE anahtar > son_değer ORDER BY anahtar`) yalnızca kalan satırları okur;
+    overwrite modundaki hedef tekrar truncate edilmez,
+  - anahtarı olmayan hedefler baştan yazılır.
+
+Anahtar checkpoint'i, satırların hedefe anahtar sırasıyla ulaştığı tek kaynaklı
+zincirlerde (source → filter/transform → destination) tutulur; kaynak bu yüzden
+checkpoint kolonuna göre sıralı okunur. Upsert hedeflerinin staging tablosu
+oturuma özel olduğundan bu hedefler yalnızca "tamamlandı" olarak işaretlenir.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.engine.chunk import Chunk, ColumnarChunk
+from app.models.checkpoint import ExecutionCheckpoint
+from app.services.watermark_service import decode_value, encode_value
+from app.utils.logger import logger
+from app.utils.sql_validator import quote_identifier, sql_literal
+
+
+@dataclass
+class ResumePoint:
+    """Bir hedef node'un devam noktası (önceki çalıştırmadan okunur, yazdıkça ilerler)."""
+    status: str = "running"              # running | done
+    chunk_index: int = 0
+    rows_written: int = 0
+    key_column: Optional[str] = None
+    key_value: Any = None
+
+
+# ─── Keyset okuma ─────────────────────────────────────────────────────────
+
+def build_keyset_query(
+    base_query: str,
+    column: str,
+    last_value: Any,
+    dialect: str = "mssql",
+) -> str:
+    """
+    Kaynak sorgusunu checkpoint kolonuna göre sıralar; last_value verilirse
+    yalnızca bu değerden büyük anahtarlar okunur (keyset sayfalama).
+    """
+    inner = base_query.strip().rstrip(";")
+    col = quote_identifier(column, dialect)
+    where = f" WHERE {col} > {sql_literal(last_value, dialect)}" if last_value is not None else ""
+    return f"SELECT * FROM ({inner}) AS ck_src{where} ORDER BY {col}"
+
+
+def skip_committed(rows: Chunk, column: str, last_value: Any) -> Chunk:
+    """Anahtarı last_value'dan büyük olmayan (zaten yazılmış) satırları çıkarır."""
+    if last_value is None or not rows:
+        return rows
+    if isinstance(rows, ColumnarChunk):
+        keys = rows.column(column)
+        keep = [i for i, v in enumerate(keys) if v is not None and v > last_value]
+        return rows if len(keep) == len(rows) else rows.take(keep)
+    return [r for r in rows if r.get(column) is not None and r[column] > last_value]
+
+
+# ─── Kalıcı kayıt ─────────────────────────────────────────────────────────
+
+def load_checkpoints(db: Session, execution_id: str) -> dict[str, ResumePoint]:
+    """Execution'ın node_id → ResumePoint checkpoint'lerini döner."""
+    points: dict[str, ResumePoint] = {}
+    records = db.query(ExecutionCheckpoint).filter(ExecutionCheckpoint.execution_id == execution_id)
+    for record in records:
+        key_value: Any = None
+        if record.key_column and record.key_type and record.key_value is not None:
+            try:
+                key_value = decode_value(record.key_type, record.key_value)
+            except (TypeError, ValueError) as exc:
+                logger.warning("Checkpoint anahtarı çözülemedi (%s/%s): %s", execution_id, record.node_id, exc)
+        points[record.node_id] = ResumePoint(
+            status=record.status,
+            chunk_index=record.chunk_index,
+            rows_written=record.rows_written,
+            key_column=record.key_column if key_value is not None else None,
+            key_value=key_value,
+        )
+    return points
+
+
+def save_checkpoint(db: Session, execution_id: str, node_id: str, point: ResumePoint) -> None:
+    """Node'un checkpoint'ini yazar (varsa günceller) ve hemen commit eder."""
+    record = (
+        db.query(ExecutionCheckpoint)
+        .filter(ExecutionCheckpoint.execution_id == execution_id, ExecutionCheckpoint.node_id == node_id)
+        .first()
+    )
+    if record is None:
+        record = ExecutionCheckpoint(execution_id=execution_id, node_id=node_id)
+        db.add(record)
+    record.status = point.status
+    record.chunk_index = point.chunk_index
+    record.rows_written = point.rows_written
+    if point.key_column and point.key_value is not None:
+        record.key_column = point.key_column
+        record.key_type, record.key_value = encode_value(point.key_value)
+    else:
+        record.key_column = record.key_type = record.key_value = None
+    db.commit()
+
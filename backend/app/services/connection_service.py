@@ -8,18 +8,22 @@ from sqlalchemy.orm import Session
 from app.connectors.base import BaseConnector
 from app.connectors.bigquery_connector import BigQueryConnector
 from app.connectors.mssql_connector import MssqlConnector
+from app.connectors.pool import invalidate_pool
 from app.models.connection import Connection
 from app.schemas.connection import ConnectionCreate, ConnectionUpdate
 from app.utils.encryption import decrypt_value, encrypt_value
 from app.utils.logger import logger
 
 
-def get_connector(connection: Connection) -> BaseConnector:
-    """Connection modeline göre uygun connector döner."""
+def get_connector(connection: Connection, pooled: bool = True) -> BaseConnector:
+    """
+    Connection modeline göre uygun connector döner.
+    pooled: MSSQL bağlantısı process geneli havuzdan alınır (close() ile geri bırakılır).
+    """
     config = json.loads(decrypt_value(connection.config))
 
     if connection.type == "mssql":
-        return MssqlConnector(config)
+        return MssqlConnector(config, pool_key=connection.id if pooled else None)
     elif connection.type == "bigquery":
         return BigQueryConnector(config)
     else:
@@ -82,6 +86,8 @@ def update_connection(db: Session, connection_id: str, data: ConnectionUpdate) -
         connection.config = encrypt_value(json.dumps(new_config))
 
     db.commit()
+    if data.config is not None or data.is_active is False:
+        invalidate_pool(connection_id)
     db.refresh(connection)
     logger.info(f"Bağlantı güncellendi: {connection.name}")
     return connection
@@ -94,6 +100,7 @@ def delete_connection(db: Session, connection_id: str) -> bool:
 
     db.delete(connection)
     db.commit()
+    invalidate_pool(connection_id)
     logger.info(f"Bağlantı silindi: {connection.name}")
     return True
 
@@ -103,7 +110,8 @@ def test_connection_by_id(db: Session, connection_id: str) -> dict:
     if not connection:
         return {"success": False, "message": "Bağlantı bulunamadı"}
 
-    connector = get_connector(connection)
+    # Test gerçek bir login denemesi olmalı — havuzdaki bağlantı kullanılmaz
+    connector = get_connector(connection, pooled=False)
     try:
         return connector.test_connection()
     finally:
@@ -0,0 +1,118 @@
+"""
+Execution canlı olay dağıtıcısı (in-process pub/sub).
+
+Execution motoru log satırlarını ve durum değişikliklerini buraya yayınlar;
+WebSocket/SSE endpoint'leri abone olup olayları anında alır. Abonelerin
+DB'yi periyodik sorgulamasına gerek kalmaz — DB yalnızca bağlantı anında
+geçmiş satırlar (backfill) için okunur.
+
+Yayınlama worker thread'lerinden yapılır; olaylar abonenin event loop'una
+call_soon_threadsafe ile aktarılır.
+"""
+from __future__ import annotations
+
+import asyncio
+from threading import Lock
+from typing import Optional
+
+from app.services.execution_log_service import LogEntry
+from app.utils.logger import logger
+
+FINAL_STATUSES = ("success", "failed", "cancelled")
+
+
+def log_event(entry: LogEntry) -> dict:
+    """Canlı akışta gönderilen log satırı formatı (id = execution içi sıra no)."""
+    return {
+        "id": entry.seq,
+        "node_id": entry.node_id,
+        "level": entry.level,
+        "message": entry.message,
+        "created_at": entry.created_at.isoformat(),
+    }
+
+
+def done_event(status: str, rows_processed: int = 0, rows_failed: int = 0) -> dict:
+    return {
+        "type": "done",
+        "status": status,
+        "rows_processed": rows_processed,
+        "rows_failed": rows_failed,
+    }
+
+
+class Subscription:
+    """Tek bir istemcinin olay kuyruğu; abone olunan event loop'a bağlıdır."""
+
+    def __init__(self, execution_id: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.execution_id = execution_id
+        self._loop = loop
+        # Sınırsız: log hacmi execution ile sınırlı, olay kaybı kabul edilemez
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def push(self, event: dict) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            pass  # Event loop kapanmış — istemci zaten gitti
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Sıradaki olayı döner; timeout dolarsa None."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ExecutionEventHub:
+    """Thread-safe, execution_id bazlı abone listesi."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        # execution_id -> aboneler
+        self._subscribers: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, execution_id: str) -> Subscription:
+        """Çalışan event loop içinden çağrılmalıdır."""
+        sub = Subscription(execution_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(execution_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.execution_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.execution_id]
+
+    def publish(self, execution_id: str, event: dict) -> None:
+        with self._lock:
+            subs = list(self._subscribers.get(execution_id, ()))
+        for sub in subs:
+            sub.push(event)
+
+    def publish_log(self, entry: LogEntry) -> None:
+        self.publish(entry.execution_id, log_event(entry))
+
+    def publish_status(
+        self,
+        execution_id: str,
+        status: str,
+        rows_processed: int = 0,
+        rows_failed: int = 0,
+    ) -> None:
+        if status in FINAL_STATUSES:
+            self.publish(execution_id, done_event(status, rows_processed, rows_failed))
+        else:
+            self.publish(execution_id, {"type": "status", "status": status})
+        logger.debug("Execution durumu yayınlandı [%s]: %s", execution_id[:8], status)
+
+    def subscriber_count(self, execution_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(execution_id, ()))
+
+
+# Singleton instance
+execution_events = ExecutionEventHub()
@@ -0,0 +1,232 @@
+"""
+Execution log yazıcısı.
+
+Execution motoru her log satırı için DB'ye commit atmaz; satırlar bellekte
+kuyruğa alınır ve arka plan thread'i tarafından toplu (batch) INSERT ile
+yazılır. Her execution için son satırlar ayrıca bellekte (tail) tutulur;
+canlı log endpoint'leri henüz DB'ye yazılmamış satırları buradan okur.
+
+Satırın execution içi sıra no'su (seq) DB'ye de yazılır; yazılamayıp atılan
+batch'ler olsa bile DB'deki satırlar ile tail aynı numaralarla eşleşir.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.execution import ExecutionLog
+from app.utils.logger import logger
+from app.utils.timezone import now_istanbul
+
+MAX_TRACKED_EXECUTIONS = 64  # Bellekte tail'i tutulan en fazla execution
+MAX_PENDING_ROWS = 100_000   # DB yazılamazken kuyrukta bekleyebilecek satır
+
+
+@dataclass
+class LogEntry:
+    execution_id: str
+    seq: int                 # execution içinde 1'den başlayan sıra no
+    level: str
+    message: str
+    node_id: Optional[str]
+    created_at: datetime
+
+    def to_row(self) -> dict:
+        return {
+            "execution_id": self.execution_id,
+            "seq": self.seq,
+            "node_id": self.node_id,
+            "level": self.level,
+            "message": self.message,
+            "created_at": self.created_at,
+        }
+
+
+class ExecutionLogSink:
+    """
+    Thread-safe, toplu yazan log kuyruğu.
+
+    Kuyruk batch_size satıra ulaştığında veya flush_interval_ms dolduğunda
+    arka plan thread'i bekleyen satırları tek transaction'da yazar.
+    flush() çağrısı, o ana kadar kuyruğa girmiş tüm satırlar yazılana kadar
+    bekler (execution bitişinde ve hata durumunda kullanılır).
+    """
+
+    def __init__(self, batch_size: int, flush_interval_ms: int, tail_size: int) -> None:
+        self._batch_size = max(1, batch_size)
+        self._interval = max(0.01, flush_interval_ms / 1000)
+        self._tail_size = max(1, tail_size)
+        self._cond = threading.Condition()
+        self._pending: list[LogEntry] = []
+        self._tails: OrderedDict[str, deque[LogEntry]] = OrderedDict()
+        self._seq: dict[str, int] = {}
+        self._enqueued = 0    # toplam kuyruğa giren satır
+        self._written = 0     # toplam yazılan (veya atılan) satır
+        self._flush_requested = False
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    # ─── Yazma ────────────────────────────────────────────────────────────
+
+    def write(
+        self,
+        execution_id: str,
+        message: str,
+        level: str = "info",
+        node_id: Optional[str] = None,
+    ) -> LogEntry:
+        with self._cond:
+            seq = self._next_seq(execution_id)
+            entry = LogEntry(
+                execution_id=execution_id,
+                seq=seq,
+                level=level,
+                message=message,
+                node_id=node_id,
+                created_at=now_istanbul(),
+            )
+            tail = self._tails.get(execution_id)
+            if tail is None:
+                tail = self._tails[execution_id] = deque(maxlen=self._tail_size)
+                while len(self._tails) > MAX_TRACKED_EXECUTIONS:
+                    self._tails.popitem(last=False)
+            tail.append(entry)
+
+            if self._stopped:
+                # Kapanış sonrası gelen satırlar senkron yazılır
+                self._insert([entry])
+                return entry
+
+            self._pending.append(entry)
+            self._enqueued += 1
+            self._ensure_thread()
+            if len(self._pending) >= self._batch_size:
+                self._cond.notify_all()
+            return entry
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Çağrı anına kadar kuyruğa girmiş satırlar yazılana kadar bekler."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            target = self._enqueued
+            if self._written >= target:
+                return True
+            if self._thread is None or not self._thread.is_alive():
+                self._drain_locked()
+                return self._written >= target
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._written < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Execution log flush zaman aşımı (%d satır bekliyor)", target - self._written)
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def release(self, execution_id: str) -> None:
+        """Biten execution'ın sıra sayacını bırakır (tail okunmaya devam eder)."""
+        with self._cond:
+            self._seq.pop(execution_id, None)
+
+    def shutdown(self) -> None:
+        """Bekleyen satırları yazar ve arka plan thread'ini durdurur."""
+        self.flush()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    # ─── Okuma (tail) ─────────────────────────────────────────────────────
+
+    def tail(self, execution_id: str, after_seq: int = 0) -> list[LogEntry]:
+        """Bellekteki son satırlardan seq > after_seq olanları döner."""
+        with self._cond:
+            tail = self._tails.get(execution_id)
+            if not tail:
+                return []
+            return [e for e in tail if e.seq > after_seq]
+
+    def pending_count(self, execution_id: str) -> int:
+        """Execution'ın henüz DB'ye yazılmamış satır sayısı."""
+        with self._cond:
+            return sum(1 for e in self._pending if e.execution_id == execution_id)
+
+    # ─── İç işleyiş ───────────────────────────────────────────────────────
+
+    def _next_seq(self, execution_id: str) -> int:
+        # Execution'lar aynı id ile yeniden çalıştırılmaz (resume yeni execution açar);
+        # sayaç run_workflow bitince release() ile bırakılır
+        seq = self._seq.get(execution_id, 0) + 1
+        self._seq[execution_id] = seq
+        return seq
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="execution-log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                if not self._pending:
+                    if self._stopped:
+                        return
+                    self._cond.wait()
+                    continue
+                if len(self._pending) < self._batch_size and not self._flush_requested and not self._stopped:
+                    self._cond.wait(self._interval)
+                self._drain_locked()
+
+    def _drain_locked(self) -> None:
+        """Bekleyen satırları yazar. _cond tutulurken çağrılır; INSERT sırasında kilit bırakılır."""
+        self._flush_requested = False
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self._cond.release()
+        try:
+            ok = self._insert(batch)
+        finally:
+            self._cond.acquire()
+        if ok or len(self._pending) + len(batch) > MAX_PENDING_ROWS:
+            if not ok:
+                logger.error("Execution logları yazılamadı, %d satır atıldı", len(batch))
+            self._written += len(batch)
+            self._cond.notify_all()
+        else:
+            # Sıra korunarak bir sonraki turda tekrar denenir
+            self._pending[:0] = batch
+            self._cond.wait(self._interval)
+
+    @staticmethod
+    def _insert(batch: list[LogEntry]) -> bool:
+        db = SessionLocal()
+        try:
+            db.execute(insert(ExecutionLog), [e.to_row() for e in batch])
+            db.commit()
+            return True
+        except Exception as exc:
+            db.rollback()
+            logger.warning("Execution log batch yazılamadı (%d satır): %s", len(batch), exc)
+            return False
+        finally:
+            db.close()
+
+
+# Singleton instance
+execution_log_sink = ExecutionLogSink(
+    batch_size=settings.log_flush_batch_size,
+    flush_interval_ms=settings.log_flush_interval_ms,
+    tail_size=settings.log_tail_size,
+)
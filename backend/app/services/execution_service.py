@@ -3,23 +3,53 @@ Workflow execution servisi.
 
 Workflow definition'daki node'ları topological sırada çalıştırır.
 Veriler chunk bazlı aktarılır; tamamı belleğe yüklenmez.
-Her node işleminden önce/sonra ExecutionLog kaydı oluşturulur.
+Her node işleminden önce/sonra ExecutionLog kaydı oluşturulur; kayıtlar
+execution_log_sink üzerinden toplu yazılır.
 """
 from __future__ import annotations
 
 import json
+import threading
 import uuid
-from collections import defaultdict, deque
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime
 from app.utils.timezone import now_istanbul
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.engine import cancellation
+from app.engine.cancellation import CancellationToken, ExecutionCancelled
+from app.engine.dag import ancestors, target_handles, topological_sort, upstream_map
+from app.engine.chunk import chunk_columns
+from app.engine.expressions import ExpressionError, Predicate
+from app.engine.aggregate import HashAggregate, parse_aggregates
+from app.engine.join import HashJoin
+from app.engine.streams import ChunkTee, merge_chunks, prefetch_chunks
 from app.models.execution import Execution, ExecutionLog
 from app.models.workflow import Workflow
+from app.services.checkpoint_service import (
+    ResumePoint,
+    build_keyset_query,
+    load_checkpoints,
+    save_checkpoint,
+    skip_committed,
+)
 from app.services.connection_service import get_connection, get_connector
-from app.services.mapping_service import apply_column_mappings, apply_filter, get_source_query
+from app.services.execution_event_service import execution_events
+from app.services.execution_log_service import execution_log_sink
+from app.services.mapping_service import (
+    apply_column_mappings,
+    apply_filter,
+    compile_column_mappings,
+    compile_filter,
+    get_source_query,
+)
+from app.services.pushdown_service import SourcePushdown, apply_pushdown, plan_pushdown
+from app.services.watermark_service import build_incremental_query, get_watermark, max_value, save_watermarks
 from app.utils.logger import logger
 
 
@@ -128,48 +158,23 @@ def _send_notification_if_needed(
 # ─── Yardımcı: log kaydetme ────────────────────────────────────────────────
 
 def _log(
-    db: Session,
     execution_id: str,
     message: str,
     level: str = "info",
     node_id: Optional[str] = None,
 ) -> None:
-    entry = ExecutionLog(
-        execution_id=execution_id,
-        node_id=node_id,
-        level=level,
-        message=message,
-    )
-    db.add(entry)
-    db.commit()
+    entry = execution_log_sink.write(execution_id, message, level=level, node_id=node_id)
+    execution_events.publish_log(entry)
     logger.info("[exec:%s][%s] %s", execution_id[:8], level, message)
 
 
-# ─── Topological sort (Kahn's algorithm) ──────────────────────────────────
-
-def _topological_sort(nodes: list[dict], edges: list[dict]) -> list[dict]:
-    in_degree: dict[str, int] = {n["id"]: 0 for n in nodes}
-    adj: dict[str, list[str]] = defaultdict(list)
-
-    for edge in edges:
-        src = edge.get("source", "")
-        tgt = edge.get("target", "")
-        if src in in_degree and tgt in in_degree:
-            in_degree[tgt] += 1
-            adj[src].append(tgt)
-
-    queue = deque(nid for nid, deg in in_degree.items() if deg == 0)
-    order: list[str] = []
-    while queue:
-        nid = queue.popleft()
-        order.append(nid)
-        for nxt in adj[nid]:
-            in_degree[nxt] -= 1
-            if in_degree[nxt] == 0:
-                queue.append(nxt)
+# ─── Yardımcı: connector ──────────────────────────────────────────────────
 
-    node_map = {n["id"]: n for n in nodes}
-    return [node_map[nid] for nid in order if nid in node_map]
+def _open_connector(connection: Any, token: Optional[CancellationToken]) -> Any:
+    """Connector'ı açar ve execution'ın iptal token'ına bağlar."""
+    connector = get_connector(connection)
+    connector.bind_cancellation(token)
+    return connector
 
 
 # ─── Node çalıştırıcılar ──────────────────────────────────────────────────
@@ -179,8 +184,42 @@ def _run_source_node(
     execution_id: str,
     node: dict,
     chunk_size: int = 5000,
+    prefetch_depth: int = 0,
+    workflow_id: Optional[str] = None,
+    watermarks: Optional[dict[str, tuple[str, Any]]] = None,
+    columnar: bool = False,
+    pushdown: Optional[SourcePushdown] = None,
+    watermark_node_id: Optional[str] = None,
+    resume_after: Any = None,
 ):
-    """Kaynak node'dan veriyi chunk'lar halinde yield eder."""
+    """
+    Kaynak node'dan veriyi chunk'lar halinde yield eder.
+
+    prefetch_depth > 0 ise okuma ayrı bir thread'de yürür ve en fazla
+    prefetch_depth chunk önceden okunur; hedef yazarken kaynak boşta beklemez.
+
+    incremental_column tanımlıysa yalnızca son watermark'tan büyük satırlar
+    okunur. Okuma sonuna kadar tamamlanırsa görülen en büyük değer
+    `watermarks` sözlüğüne yazılır; kalıcı kayıt execution başarıyla
+    bittiğinde yapılır.
+
+    partition_count > 1 ise sorgu partition_column üzerinden parçalara
+    bölünür (partition_method: range | ntile | hash) ve parçalar ayrı
+    bağlantılardan paralel okunup tek akışta birleştirilir. Chunk sırası
+    korunmaz.
+
+    columnar=True ise connector chunk'ları ColumnarChunk olarak üretir.
+
+    pushdown verilirse (bkz. pushdown_service) sonraki filter node'ların
+    koşulları WHERE'e eklenir ve yalnızca aşağı akışta kullanılan kolonlar okunur.
+
+    watermark_node_id: watermark'ın kayıtlı olduğu node id'si (alt workflow
+    node'ları kendi workflow'larındaki id ile okunur); verilmezse node id'si.
+
+    checkpoint_column tanımlıysa kaynak bu kolona göre sıralı okunur (hedefler
+    checkpoint tutabilsin diye; paralel okuma kapanır). resume_after verilirse
+    yalnızca anahtarı bu değerden büyük satırlar okunur (bkz. checkpoint_service).
+    """
     cfg: dict = node.get("data", {}).get("config") or {}
     conn_id = cfg.get("connection_id")
     if not conn_id:
@@ -194,29 +233,138 @@ def _run_source_node(
     if not connection:
         raise ValueError(f"Bağlantı bulunamadı: {conn_id}")
 
-    connector = get_connector(connection)
-    _log(db, execution_id, f"Kaynak okunuyor: {query[:80]}{'...' if len(query) > 80 else ''}", node_id=node["id"])
+    token = cancellation.get_token(execution_id)
+    connector = _open_connector(connection, token)
+    if pushdown is not None:
+        try:
+            pushed = apply_pushdown(connector, query, pushdown, connection.type)
+        except Exception:
+            connector.close()
+            raise
+        query = pushed.query
+        if pushed.predicate_sql:
+            _log(execution_id,
+                 f"Pushdown: WHERE {pushed.predicate_sql} ({len(pushdown.filter_nodes)} filter node)",
+                 node_id=node["id"])
+        if pushed.columns:
+            _log(execution_id,
+                 f"Projection: {len(pushed.columns)}/{len(pushed.columns) + len(pushed.pruned_columns)} kolon okunacak",
+                 node_id=node["id"])
+        for note in pushed.notes:
+            _log(execution_id, f"Pushdown: {note}", node_id=node["id"])
+
+    incremental_column = (cfg.get("incremental_column") or "").strip() if workflow_id else ""
+    last_value: Any = None
+    if incremental_column:
+        last_value = get_watermark(db, workflow_id, watermark_node_id or node["id"], incremental_column)
+        query = build_incremental_query(query, incremental_column, last_value, connection.type)
+        if last_value is None:
+            _log(execution_id, f"Incremental okuma: {incremental_column} için watermark yok, tam okuma yapılacak", node_id=node["id"])
+        else:
+            _log(execution_id, f"Incremental okuma: {incremental_column} > {last_value!r}", node_id=node["id"])
+
+    checkpoint_column = (cfg.get("checkpoint_column") or "").strip()
+    if checkpoint_column:
+        query = build_keyset_query(query, checkpoint_column, resume_after, connection.type)
+        if resume_after is not None:
+            _log(execution_id, f"Kaldığı yerden okuma: {checkpoint_column} > {resume_after!r}", node_id=node["id"])
+    else:
+        resume_after = None
+
+    _log(execution_id, f"Kaynak okunuyor: {query[:80]}{'...' if len(query) > 80 else ''}", node_id=node["id"])
+
+    partition_count = min(int(cfg.get("partition_count") or 1), settings.max_source_partitions)
+    if checkpoint_column and partition_count > 1:
+        _log(execution_id, "Checkpoint kolonu sıralı okuma gerektirir; paralel okuma kapatıldı",
+             level="warning", node_id=node["id"])
+        partition_count = 1
+    part_queries: list[str] = []
+    if partition_count > 1:
+        partition_column = (cfg.get("partition_column") or "").strip()
+        partition_method = cfg.get("partition_method") or "range"
+        if not partition_column:
+            connector.close()
+            raise ValueError(f"Source node {node['id']}: paralel okuma için partition_column belirtilmeli")
+        try:
+            part_queries = connector.partition_queries(query, partition_column, partition_count, partition_method)
+        except Exception:
+            connector.close()
+            raise
+
+    if len(part_queries) > 1:
+        # Her parça kendi (havuzdan alınan) bağlantısıyla okunur
+        connector.close()
+        _log(execution_id,
+             f"Paralel okuma: {len(part_queries)} parça ({partition_method}: {partition_column})",
+             node_id=node["id"])
+        chunks = merge_chunks(
+            [_partition_reader(connection, q, chunk_size, columnar, token) for q in part_queries],
+            max(prefetch_depth, len(part_queries)),
+            name=f"partition-{node['id'][:8]}",
+        )
+    else:
+        chunks = prefetch_chunks(
+            connector.read_chunks(query, chunk_size, columnar=columnar),
+            prefetch_depth,
+            name=f"prefetch-{node['id'][:8]}",
+        )
     try:
         chunk_count = 0
-        for chunk in connector.read_chunks(query, chunk_size):
+        high_value = last_value
+        if resume_after is not None and incremental_column == checkpoint_column:
+            # Önceki çalıştırmada yazılmış satırlar bu okumada görünmez
+            high_value = resume_after if high_value is None or resume_after > high_value else high_value
+        for chunk in chunks:
+            if token is not None:
+                token.check()
             chunk_count += 1
-            _log(db, execution_id, f"Chunk {chunk_count}: {len(chunk)} satır okundu", node_id=node["id"])
+            if incremental_column and chunk:
+                if incremental_column not in chunk_columns(chunk):
+                    raise ValueError(
+                        f"Source node {node['id']}: incremental kolon sorgu sonucunda yok: {incremental_column}"
+                    )
+                if last_value is not None:
+                    # SQL filtresi kolonun kendi hassasiyetinde çalışmayabilir (ör. MSSQL datetime
+                    # 1/300 sn tick'i datetime2'de watermark'tan büyük çıkar); son satırlar tekrar okunmaz
+                    chunk = skip_committed(chunk, incremental_column, last_value)
+                    if not chunk:
+                        continue
+                high_value = max_value(high_value, chunk, incremental_column)
+            _log(execution_id, f"Chunk {chunk_count}: {len(chunk)} satır okundu", node_id=node["id"])
             yield chunk
-        _log(db, execution_id, f"Okuma tamamlandı ({chunk_count} chunk)", node_id=node["id"])
+        _log(execution_id, f"Okuma tamamlandı ({chunk_count} chunk)", node_id=node["id"])
+        if incremental_column and watermarks is not None and high_value is not None and high_value != last_value:
+            watermarks[node["id"]] = (incremental_column, high_value)
     finally:
+        # Önce prefetch thread'i durdur, sonra bağlantıyı kapat
+        chunks.close()
         connector.close()
 
 
-def _run_transform_node(node: dict, rows: list[dict]) -> list[dict]:
-    cfg: dict = node.get("data", {}).get("config") or {}
-    mappings: list[dict] = cfg.get("column_mappings") or []
-    return apply_column_mappings(rows, mappings)
+def _partition_reader(
+    connection: Any,
+    query: str,
+    chunk_size: int,
+    columnar: bool = False,
+    token: Optional[CancellationToken] = None,
+):
+    """Paralel okumada tek parçanın akışını üreten factory (okuyucu thread'inde çalışır)."""
+    def _read() -> Iterator[list[dict]]:
+        connector = _open_connector(connection, token)
+        try:
+            yield from connector.read_chunks(query, chunk_size, columnar=columnar)
+        finally:
+            connector.close()
+    return _read
 
 
-def _run_filter_node(node: dict, rows: list[dict]) -> list[dict]:
+def _compile_filter_node(node: dict) -> Optional[Predicate]:
+    """Filter node koşulunu node başına bir kez derler; geçersiz koşulda node hatası verir."""
     cfg: dict = node.get("data", {}).get("config") or {}
-    condition: str = cfg.get("condition") or ""
-    return apply_filter(rows, condition)
+    try:
+        return compile_filter(cfg.get("condition") or "")
+    except ExpressionError as exc:
+        raise ValueError(f"Filter node {node['id']}: geçersiz koşul: {exc}") from None
 
 
 def _run_destination_node(
@@ -224,17 +372,30 @@ def _run_destination_node(
     execution_id: str,
     node: dict,
     chunks,  # generator
+    checkpoint: Optional[ResumePoint] = None,
 ) -> tuple[int, int]:
     """
     Hedef node'a yazma. (rows_written, rows_failed) döner.
 
+    checkpoint verilirse her commit edilen chunk'tan sonra ilerleme
+    (chunk, satır, key_column'daki en büyük anahtar) DB'ye kaydedilir. Anahtar
+    değeri dolu checkpoint önceki çalıştırmadan devam anlamına gelir: bu
+    anahtara kadar olan satırlar atlanır, overwrite hedefi tekrar truncate edilmez.
+
     Config parametreleri:
       write_mode    : append | overwrite | upsert
+                      upsert → chunk'lar staging tabloya yazılır, sonda tek MERGE
+      upsert_keys   : upsert eşleşme kolonları (boşsa hedefin primary key'i)
       chunk_size    : kaynak okuma chunk boyutu (execution servisi bu değeri kullanır)
       on_error      : rollback | continue
                       rollback → bir chunk hatası tüm işlemi geri alır
                       continue → hatalı chunk atlanır, diğerleri yazılır
       batch_size    : multi-row INSERT içindeki satır sayısı (varsayılan 500)
+      load_method   : insert | bulk (MSSQL: TDS bulk copy; desteklenmezse insert)
+      bulk_tablock  : bulk yüklemede TABLOCK ipucu (varsayılan true)
+      bulk_batch_size : bulk yüklemede commit başına satır (0 = chunk başına tek batch);
+                      batch'ler ayrı commit edildiğinden yalnızca on_error=continue
+                      ile uygulanır (hatalı batch atlanır), rollback'te chunk tek batch'tir
     """
     cfg: dict = node.get("data", {}).get("config") or {}
     conn_id = cfg.get("connection_id")
@@ -249,13 +410,15 @@ def _run_destination_node(
     write_mode = cfg.get("write_mode", "append")
     on_error   = cfg.get("on_error", "rollback")   # rollback | continue
     batch_size = int(cfg.get("batch_size") or 500)
-    mappings: list[dict] = cfg.get("column_mappings") or []
+    load_method = cfg.get("load_method") or "insert"   # insert | bulk
+    mapping_plan = compile_column_mappings(cfg.get("column_mappings") or [])
 
     connection = get_connection(db, conn_id)
     if not connection:
         raise ValueError(f"Bağlantı bulunamadı: {conn_id}")
 
-    connector = get_connector(connection)
+    token = cancellation.get_token(execution_id)
+    connector = _open_connector(connection, token)
     total_written = 0
     total_failed = 0
     first_chunk = True
@@ -266,29 +429,125 @@ def _run_destination_node(
     if isinstance(connector, MssqlConnector):
         try:
             col_type_map = connector.get_column_types(schema, table)
-            _log(db, execution_id,
+            _log(execution_id,
                  f"Kolon tipleri yüklendi: {len(col_type_map)} kolon",
                  node_id=node["id"])
         except Exception as meta_err:
-            _log(db, execution_id,
+            _log(execution_id,
                  f"Kolon tip bilgisi alınamadı (devam ediliyor): {meta_err}",
                  level="warning", node_id=node["id"])
 
-    _log(db, execution_id,
-         f"Hedef yazılıyor: {schema}.{table} (mod: {write_mode}, hata: {on_error}, batch: {batch_size})",
+    # Upsert anahtarları: config'te yoksa hedef tablonun primary key'i
+    upsert_keys: list[str] = list(cfg.get("upsert_keys") or [])
+    if write_mode == "upsert":
+        if not upsert_keys:
+            try:
+                upsert_keys = [c["name"] for c in connector.get_columns(schema, table) if c.get("is_primary_key")]
+            except Exception as meta_err:
+                connector.close()
+                raise ValueError(f"Upsert için hedef kolonları okunamadı ({schema}.{table}): {meta_err}")
+        if not upsert_keys:
+            connector.close()
+            raise ValueError(
+                f"Destination node {node['id']}: upsert için anahtar kolon yok "
+                f"(upsert_keys belirtin veya hedef tabloya primary key tanımlayın)"
+            )
+        _log(execution_id, f"Upsert anahtarları: {', '.join(upsert_keys)}", node_id=node["id"])
+
+    key_column: Optional[str] = None
+    skip_after: Any = None
+    if checkpoint is not None:
+        key_column = checkpoint.key_column
+        if checkpoint.key_value is not None:
+            # Hedef önceki çalıştırmada yazılmaya başlandı; kaldığı yerden eklenir
+            first_chunk = False
+            skip_after = checkpoint.key_value
+            _log(execution_id,
+                 f"Kaldığı yerden devam: {key_column} > {checkpoint.key_value!r} "
+                 f"(önceki çalıştırmada {checkpoint.rows_written} satır yazılmıştı)",
+                 node_id=node["id"])
+
+    load_info = f", yükleme: {load_method}" if load_method != "insert" else ""
+    _log(execution_id,
+         f"Hedef yazılıyor: {schema}.{table} (mod: {write_mode}, hata: {on_error}, batch: {batch_size}{load_info})",
          node_id=node["id"])
 
-    chunk_index = 0
+    chunk_index = checkpoint.chunk_index if checkpoint is not None else 0
     last_error = None
+    # Tamponlayan / asenkron yükleyen connector'larda (BigQuery) kabul edilip
+    # commit'i henüz görülmemiş chunk'lar: (chunk no, satır, en büyük anahtar)
+    outstanding: deque[tuple[int, int, Any]] = deque()
+    outstanding_rows = 0
+    discarded_seen = connector.discarded_write_rows
+
+    def _settle() -> None:
+        """Commit edilen chunk'ları kabul sırasıyla düşer, checkpoint'i ilerletir."""
+        nonlocal outstanding_rows
+        committed = outstanding_rows - connector.pending_write_rows
+        chunks_done = rows_done = 0
+        last_index = 0
+        high: Any = None
+        while outstanding and outstanding[0][1] <= committed:
+            index, rows, key = outstanding.popleft()
+            committed -= rows
+            outstanding_rows -= rows
+            chunks_done += 1
+            rows_done += rows
+            last_index = index
+            if key is not None and (high is None or key > high):
+                high = key
+        if not chunks_done:
+            return
+        if chunks_done > 1:
+            _log(execution_id,
+                 f"Load job: {chunks_done} chunk ({rows_done} satır) hedefe yüklendi",
+                 node_id=node["id"])
+        if checkpoint is not None and write_mode != "upsert":
+            checkpoint.chunk_index = last_index
+            checkpoint.rows_written += rows_done
+            if high is not None and (checkpoint.key_value is None or high > checkpoint.key_value):
+                checkpoint.key_value = high
+            save_checkpoint(db, execution_id, node["id"], checkpoint)
+
+    def _discard_outstanding() -> int:
+        """
+        Yükleme hatası: connector'ın attığı satır sayısını döner. Bekleyen chunk'lar
+        sıralı commit edilmediğinden checkpoint bunların üzerinden ilerletilmez.
+        """
+        nonlocal outstanding_rows, discarded_seen
+        lost = connector.discarded_write_rows - discarded_seen
+        discarded_seen += lost
+        outstanding.clear()
+        outstanding_rows = 0
+        return lost
+
     try:
         for chunk in chunks:
+            if token is not None:
+                token.check()
+            if key_column and chunk:
+                if key_column not in chunk_columns(chunk):
+                    _log(execution_id,
+                         f"Checkpoint kolonu hedefe gelen satırlarda yok ({key_column}); "
+                         f"yalnızca chunk ilerlemesi kaydedilecek",
+                         level="warning", node_id=node["id"])
+                    key_column = checkpoint.key_column = None
+                    checkpoint.key_value = None
+                elif skip_after is not None:
+                    # Kaynak paylaşılıyorsa daha geriden okumuş olabilir; yazılmış satırlar atlanır
+                    kept = skip_committed(chunk, key_column, skip_after)
+                    if len(kept) == len(chunk):
+                        skip_after = None  # sıralı akış: sonraki chunk'lar zaten ileride
+                    chunk = kept
             if not chunk:
                 continue
             chunk_index += 1
-            if mappings:
-                chunk = apply_column_mappings(chunk, mappings)
+            high_key = max_value(None, chunk, key_column) if key_column else None
+            if mapping_plan is not None:
+                chunk = mapping_plan.apply(chunk)
 
-            mode = write_mode if first_chunk else "append"
+            # upsert: tüm chunk'lar staging'e gider; overwrite sadece ilk chunk'ta
+            mode = write_mode if first_chunk or write_mode == "upsert" else "append"
 
             # write_chunk çağrısı — MssqlConnector için extra parametreler
             write_kwargs: dict = {"mode": mode}
@@ -296,27 +555,69 @@ def _run_destination_node(
                 write_kwargs["col_type_map"] = col_type_map
                 write_kwargs["on_error"] = on_error
                 write_kwargs["batch_size"] = batch_size
+                write_kwargs["load_method"] = load_method
+                write_kwargs["tablock"] = bool(cfg.get("bulk_tablock", True))
+                write_kwargs["bulk_batch_size"] = int(cfg.get("bulk_batch_size") or 0)
 
             try:
                 written = connector.write_chunk(schema, table, chunk, **write_kwargs)
                 total_written += written
                 first_chunk = False
-                _log(db, execution_id,
+                _log(execution_id,
                      f"Chunk {chunk_index}: {written} satır yazıldı (toplam: {total_written})",
                      node_id=node["id"])
+                outstanding.append((chunk_index, written, high_key))
+                outstanding_rows += written
+                _settle()
+            except ExecutionCancelled:
+                raise
             except Exception as chunk_err:
-                total_failed += len(chunk)
+                # Load job hatası: önceki chunk'ların bekleyen satırları da yazılamamış olabilir
+                lost = _discard_outstanding()
+                total_written -= lost
+                total_failed += len(chunk) + lost
                 last_error = chunk_err
-                _log(db, execution_id,
-                     f"Chunk {chunk_index} yazma hatası ({len(chunk)} satır): {chunk_err}",
+                lost_info = f" + bekleyen {lost} satır" if lost else ""
+                _log(execution_id,
+                     f"Chunk {chunk_index} yazma hatası ({len(chunk)} satır{lost_info}): {chunk_err}",
                      level="error", node_id=node["id"])
                 if on_error == "rollback" or (write_mode == "overwrite" and first_chunk):
                     raise chunk_err
                 first_chunk = False
 
+        if connector.pending_write_rows:
+            try:
+                connector.flush_writes()
+                _settle()
+            except ExecutionCancelled:
+                raise
+            except Exception as flush_err:
+                lost = _discard_outstanding()
+                total_written -= lost
+                total_failed += lost
+                last_error = flush_err
+                _log(execution_id,
+                     f"Load job hatası ({lost} satır yüklenemedi): {flush_err}",
+                     level="error", node_id=node["id"])
+                if on_error == "rollback" or not total_written:
+                    raise flush_err
+
+        if write_mode == "upsert" and total_written:
+            merged = connector.finish_upsert(schema, table, upsert_keys)
+            _log(execution_id,
+                 f"Upsert tamamlandı (MERGE): {merged} hedef satır güncellendi/eklendi",
+                 node_id=node["id"])
+
+        if checkpoint is not None and (total_written or last_error is None):
+            checkpoint.status = "done"
+            save_checkpoint(db, execution_id, node["id"], checkpoint)
+
+    except ExecutionCancelled:
+        _log(execution_id, f"Yazma iptal edildi ({total_written} satır yazılmıştı)", level="warning", node_id=node["id"])
+        raise
     except Exception as e:
         if e is not last_error:
-            _log(db, execution_id, f"Yazma akışı hatası: {e}", level="error", node_id=node["id"])
+            _log(execution_id, f"Yazma akışı hatası: {e}", level="error", node_id=node["id"])
         raise
     finally:
         connector.close()
@@ -358,57 +659,703 @@ def _run_sql_execute_node(
     if not connection:
         raise ValueError(f"Bağlantı bulunamadı: {conn_id}")
 
-    connector = get_connector(connection)
+    connector = _open_connector(connection, cancellation.get_token(execution_id))
     preview_lines = sql[:100].replace("\n", " ")
-    _log(db, execution_id, f"SQL çalıştırılıyor: {preview_lines}{'...' if len(sql) > 100 else ''}", node_id=node["id"])
+    _log(execution_id, f"SQL çalıştırılıyor: {preview_lines}{'...' if len(sql) > 100 else ''}", node_id=node["id"])
 
     try:
         affected = connector.execute_non_query(sql)
-        _log(db, execution_id, f"SQL tamamlandı. Etkilenen satır: {affected}", node_id=node["id"])
+        _log(execution_id, f"SQL tamamlandı. Etkilenen satır: {affected}", node_id=node["id"])
     finally:
         connector.close()
 
 
+# ─── Akış kurulumu ve dal zamanlayıcı ─────────────────────────────────────
+
+# Veri üreten (lazy generator) node'lar ve işi fiilen yapan uç (sink) node'lar
+_STREAM_NODE_TYPES = ("source", "transform", "filter", "join", "aggregate")
+_SINK_NODE_TYPES = ("destination", "sqlExecute")
+
+
+@dataclass
+class _RunContext:
+    """Tek bir workflow çalıştırmasının thread'ler arasında paylaşılan planı."""
+    execution_id: str
+    node_map: dict[str, dict]
+    upstream: dict[str, list[str]]   # node_id → gelen edge kaynakları
+    handles: dict[tuple[str, str], str] = field(default_factory=dict)  # (kaynak, hedef) → hedef handle
+    bind: Any = None                 # worker thread'lerin session açacağı engine
+    prefetch_depth: int = 0
+    columnar: bool = False           # kaynaklar varsayılan olarak ColumnarChunk üretsin mi
+    fanout_depth: int = 4
+    fanout: dict[str, list[str]] = field(default_factory=dict)  # tee'lenen node → tüketiciler
+    spill: set[str] = field(default_factory=set)                # diske taşabilen tee'ler
+    tees: dict[str, ChunkTee] = field(default_factory=dict)
+    workflow_id: Optional[str] = None
+    watermarks: dict[str, tuple[str, Any]] = field(default_factory=dict)  # source → (kolon, yeni değer)
+    pushdown: dict[str, SourcePushdown] = field(default_factory=dict)     # source → optimizer planı
+    origins: dict[str, tuple[str, str]] = field(default_factory=dict)    # alt workflow node'u → (workflow, node)
+    checkpoints: dict[str, ResumePoint] = field(default_factory=dict)   # destination → devam noktası
+    resume_after: dict[str, Any] = field(default_factory=dict)          # source → keyset başlangıç anahtarı
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def close_tees(self) -> None:
+        with self.lock:
+            tees = list(self.tees.values())
+        for tee in tees:
+            tee.close()
+
+
+def _node_label(node: dict) -> str:
+    return node.get("data", {}).get("label") or node.get("type", "")
+
+
+def _is_disabled(node: dict) -> bool:
+    return bool(node.get("data", {}).get("disabled", False))
+
+
+def _merge_streams(streams: Iterable[Iterable[list[dict]]]) -> Iterator[list[dict]]:
+    for stream in streams:
+        yield from stream
+
+
+def _close_streams(streams: list) -> None:
+    for stream in streams:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+
+def _transform_stream(node: dict, upstream: list[Iterable[list[dict]]]) -> Iterator[list[dict]]:
+    if node.get("type") == "transform":
+        # Mapping node başına bir kez derlenir; her chunk aynı planla dönüşür
+        cfg: dict = node.get("data", {}).get("config") or {}
+        plan = compile_column_mappings(cfg.get("column_mappings") or [])
+        for chunk in _merge_streams(upstream):
+            yield apply_column_mappings(chunk, plan)
+        return
+    predicate = _compile_filter_node(node)
+    for chunk in _merge_streams(upstream):
+        yield apply_filter(chunk, predicate)
+
+
+def _build_stream(
+    db: Session,
+    ctx: _RunContext,
+    node_id: str,
+    consumer_id: str,
+    owned: list,
+) -> Iterable[list[dict]]:
+    """
+    consumer_id'nin okuyacağı node_id akışını döner.
+    Fan-out node'larında tüketiciye ait tee dalı verilir; dal `owned`
+    listesine eklenir ki tüketici bitince (okumasa bile) kapatılabilsin.
+    """
+    if node_id in ctx.fanout:
+        stream = _get_tee(ctx, node_id).branch(consumer_id)
+        owned.append(stream)
+        return stream
+    return _open_stream(db, ctx, node_id, owned)
+
+
+def _open_stream(db: Session, ctx: _RunContext, node_id: str, owned: list) -> Iterable[list[dict]]:
+    """
+    node_id'nin çıktı akışını upstream zinciriyle birlikte lazy olarak kurar.
+    Pasif, bilinmeyen veya veri üretmeyen (sink) node'lar boş akış döner.
+    """
+    node = ctx.node_map.get(node_id)
+    if node is None or _is_disabled(node) or node.get("type") not in _STREAM_NODE_TYPES:
+        return ()
+
+    node_type = node["type"]
+    if node_type == "source":
+        _log(ctx.execution_id, f"Node çalışıyor: [{_node_label(node)}] ({node_type})", node_id=node_id)
+        cfg: dict = node.get("data", {}).get("config") or {}
+        chunk_size = cfg.get("chunk_size", 5000)
+        prefetch_depth = int(cfg.get("prefetch_chunks", ctx.prefetch_depth))
+        workflow_id, origin_id = ctx.origins.get(node_id, (ctx.workflow_id, node_id))
+        return _run_source_node(
+            db, ctx.execution_id, node, chunk_size, prefetch_depth,
+            workflow_id=workflow_id, watermarks=ctx.watermarks,
+            columnar=bool(cfg.get("columnar", ctx.columnar)),
+            pushdown=ctx.pushdown.get(node_id),
+            watermark_node_id=origin_id,
+            resume_after=ctx.resume_after.get(node_id),
+        )
+
+    if node_type == "join":
+        return _open_join_stream(db, ctx, node, owned)
+
+    # Önce upstream kurulur; loglar kaynak → hedef sırasıyla düşer
+    upstream = [
+        _build_stream(db, ctx, src_id, node_id, owned) for src_id in ctx.upstream.get(node_id, [])
+    ]
+    _log(ctx.execution_id, f"Node çalışıyor: [{_node_label(node)}] ({node_type})", node_id=node_id)
+    if node_type == "aggregate":
+        return _aggregate_stream(ctx, node, upstream)
+    return _transform_stream(node, upstream)
+
+
+def _aggregate_stream(ctx: _RunContext, node: dict, upstream: list[Iterable[list[dict]]]) -> Iterator[list[dict]]:
+    """Aggregate node akışı: tüm girdiler tek GROUP BY'a akar, gruplar girdi bitince yazılır."""
+    node_id = node["id"]
+    cfg: dict = node.get("data", {}).get("config") or {}
+    try:
+        aggregate = HashAggregate(
+            _merge_streams(upstream),
+            [c for c in cfg.get("group_by") or [] if c],
+            parse_aggregates(cfg.get("aggregates") or []),
+            memory_groups=int(cfg.get("memory_groups") or settings.default_aggregate_memory_groups),
+            chunk_size=int(cfg.get("chunk_size") or 5000),
+            on_event=lambda message: _log(ctx.execution_id, message, node_id=node_id),
+        )
+    except ValueError as exc:
+        raise ValueError(f"Aggregate node {node_id}: {exc}") from exc
+    return aggregate.run()
+
+
+def _open_join_stream(db: Session, ctx: _RunContext, node: dict, owned: list) -> Iterator[list[dict]]:
+    """
+    Join node akışı: edge'ler hedef handle'a (left / right) göre iki tarafa
+    ayrılır; handle yoksa ilk edge sol, diğerleri sağ kabul edilir.
+    """
+    node_id = node["id"]
+    cfg: dict = node.get("data", {}).get("config") or {}
+    sources = ctx.upstream.get(node_id, [])
+    handles = [ctx.handles.get((src_id, node_id)) for src_id in sources]
+    if any(handles):
+        left_ids = [s for s, h in zip(sources, handles) if h == "left"]
+        right_ids = [s for s, h in zip(sources, handles) if h == "right"]
+    else:
+        left_ids, right_ids = sources[:1], sources[1:]
+    if not left_ids or not right_ids:
+        raise ValueError(f"Join node {node_id}: sol (left) ve sağ (right) girdi bağlanmalı")
+
+    left_keys = list(cfg.get("left_keys") or [])
+    right_keys = list(cfg.get("right_keys") or left_keys)
+    if not left_keys:
+        raise ValueError(f"Join node {node_id}: join anahtarları (left_keys) belirtilmeli")
+
+    # Aynı node iki tarafa da bağlıysa (self-join) ikinci taraf kendi okumasını yapar;
+    # tee dalı tüketici başına bir kez alınabilir
+    opened: set[str] = set()
+
+    def _side(src_ids: list[str]) -> list:
+        streams = []
+        for src_id in src_ids:
+            if src_id in opened:
+                streams.append(_open_stream(db, ctx, src_id, owned))
+            else:
+                streams.append(_build_stream(db, ctx, src_id, node_id, owned))
+                opened.add(src_id)
+        return streams
+
+    left = _side(left_ids)
+    right = _side(right_ids)
+    _log(ctx.execution_id, f"Node çalışıyor: [{_node_label(node)}] (join)", node_id=node_id)
+    return HashJoin(
+        _merge_streams(left),
+        _merge_streams(right),
+        left_keys,
+        right_keys,
+        how=cfg.get("join_type") or "inner",
+        build_side=cfg.get("build_side") or "auto",
+        memory_rows=int(cfg.get("memory_rows") or settings.default_join_memory_rows),
+        chunk_size=int(cfg.get("chunk_size") or 5000),
+        right_suffix=cfg.get("right_suffix", "_right"),
+        on_event=lambda message: _log(ctx.execution_id, message, node_id=node_id),
+    ).run()
+
+
+def _get_tee(ctx: _RunContext, node_id: str) -> ChunkTee:
+    with ctx.lock:
+        tee = ctx.tees.get(node_id)
+        if tee is None:
+            cfg: dict = ctx.node_map[node_id].get("data", {}).get("config") or {}
+            tee = ChunkTee(
+                lambda: _teed_stream(ctx, node_id),
+                ctx.fanout[node_id],
+                depth=int(cfg.get("fanout_buffer_chunks", ctx.fanout_depth)),
+                spill=node_id in ctx.spill,
+                name=f"tee-{node_id[:8]}",
+            )
+            ctx.tees[node_id] = tee
+        return tee
+
+
+def _teed_stream(ctx: _RunContext, node_id: str) -> Iterator[list[dict]]:
+    """Tee üretici thread'inde, kendi DB session'ı ile node akışını okur."""
+    session = Session(bind=ctx.bind)
+    owned: list = []
+    try:
+        yield from _open_stream(session, ctx, node_id, owned)
+    finally:
+        _close_streams(owned)
+        session.close()
+
+
+def _stream_closure(ctx: _RunContext, node_id: str) -> set[str]:
+    """Sink'in veri okuduğu (aktif) akış node'ları."""
+    seen: set[str] = set()
+    stack = list(ctx.upstream.get(node_id, []))
+    while stack:
+        nid = stack.pop()
+        node = ctx.node_map.get(nid)
+        if nid in seen or node is None or _is_disabled(node) or node.get("type") not in _STREAM_NODE_TYPES:
+            continue
+        seen.add(nid)
+        if node["type"] != "source":
+            stack.extend(ctx.upstream.get(nid, []))
+    return seen
+
+
+def _plan_fanout(
+    ctx: _RunContext,
+    sinks: list[dict],
+    deps: dict[str, set[str]],
+    parallel: bool,
+) -> list[list[dict]]:
+    """
+    Birden fazla tüketicisi olan akış node'larını (fan-out) tee'ye çevirir ve
+    sink'leri birlikte başlatılacak gruplara ayırır.
+
+    Aynı tee'yi paylaşan sink'ler aynı anda çalışmalıdır; aksi halde sınırlı
+    tampon dolar ve akış kilitlenir. Birlikte çalışamayan gruplarda (sıralı
+    mod, birbirine bağımlı sink'ler veya aynı dalları sırayla okuyan tek
+    sink) tee spill moduna alınır. Birden fazla tee okuyan gruplarda da
+    spill zorunludur: çok girdili node'lar girdilerini sırayla okur ve
+    D1=[S1, S2], D2=[S2, S1] gibi çapraz sıralı tüketiciler birbirinin
+    okumadığı dalı doldurup kilitlenir.
+    """
+    closures = {n["id"]: _stream_closure(ctx, n["id"]) for n in sinks if n.get("type") == "destination"}
+    stream_nodes: set[str] = set().union(*closures.values()) if closures else set()
+
+    consumers: dict[str, list[str]] = {}
+    for nid in list(stream_nodes) + list(closures):
+        if ctx.node_map[nid].get("type") == "source":
+            continue  # source girdi okumaz; gelen edge'ler sadece sıralama içindir
+        for src_id in ctx.upstream.get(nid, []):
+            if src_id in stream_nodes and nid not in consumers.setdefault(src_id, []):
+                consumers[src_id].append(nid)
+
+    ctx.fanout = {nid: cons for nid, cons in consumers.items() if len(cons) > 1}
+    if not ctx.fanout:
+        return [[n] for n in sinks]
+
+    for tee_id, cons in ctx.fanout.items():
+        cfg: dict = ctx.node_map[tee_id].get("data", {}).get("config") or {}
+        if cfg.get("fanout_spill"):
+            ctx.spill.add(tee_id)
+        for sink_id, closure in closures.items():
+            if sum(1 for c in cons if c in closure or c == sink_id) > 1:
+                ctx.spill.add(tee_id)
+
+    # Aynı tee'yi okuyan sink'leri grupla (union-find)
+    parent = {n["id"]: n["id"] for n in sinks}
+
+    def find(x: str) -> str:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for tee_id in ctx.fanout:
+        members = [sid for sid, closure in closures.items() if tee_id in closure]
+        for member in members[1:]:
+            parent[find(member)] = find(members[0])
+
+    groups: dict[str, list[dict]] = {}
+    for node in sinks:
+        groups.setdefault(find(node["id"]), []).append(node)
+
+    units: list[list[dict]] = []
+    for group in groups.values():
+        ids = {n["id"] for n in group}
+        group_tees = {t for t in ctx.fanout if any(t in closures.get(i, ()) for i in ids)}
+        if len(group) > 1 and (not parallel or any(deps[i] & ids for i in ids)):
+            ctx.spill.update(group_tees)
+            units.extend([n] for n in group)
+        else:
+            if len(group_tees) > 1:
+                ctx.spill.update(group_tees)
+            units.append(group)
+    return units
+
+
+def _run_sink(db: Session, ctx: _RunContext, node: dict) -> tuple[int, int]:
+    """Sink node'u çalıştırır. (rows_written, rows_failed) döner."""
+    node_id = node["id"]
+    node_type = node.get("type", "")
+    owned: list = []
+    try:
+        if node_type == "destination":
+            upstream = [
+                _build_stream(db, ctx, src_id, node_id, owned) for src_id in ctx.upstream.get(node_id, [])
+            ]
+            _log(ctx.execution_id, f"Node çalışıyor: [{_node_label(node)}] ({node_type})", node_id=node_id)
+            return _run_destination_node(
+                db, ctx.execution_id, node, _merge_streams(upstream), ctx.checkpoints.get(node_id),
+            )
+
+        _log(ctx.execution_id, f"Node çalışıyor: [{_node_label(node)}] ({node_type})", node_id=node_id)
+        _run_sql_execute_node(db, ctx.execution_id, node)
+        save_checkpoint(db, ctx.execution_id, node_id, ResumePoint(status="done"))
+        return 0, 0
+    finally:
+        _close_streams(owned)
+
+
+def _run_sink_isolated(ctx: _RunContext, node: dict) -> tuple[int, int]:
+    """Worker thread'de kendi DB session'ı ile sink çalıştırır."""
+    session = Session(bind=ctx.bind)
+    try:
+        return _run_sink(session, ctx, node)
+    finally:
+        session.close()
+
+
+def _run_sinks(
+    db: Session,
+    ctx: _RunContext,
+    sinks: list[dict],
+    max_parallel: int,
+) -> tuple[int, int]:
+    """
+    Sink node'ları bağımlılık sırasına uyarak çalıştırır.
+
+    Bir sink, kendisinden önce gelen (edge zinciriyle bağlı) tüm sink'ler
+    bittiğinde hazırdır. Hazır sink'ler en fazla max_parallel worker'lık
+    havuzda aynı anda çalışır; birbirine bağlı olmayan kaynak→hedef
+    zincirleri böylece paralel ilerler. Aynı fan-out kaynağını okuyan
+    sink'ler tek grup olarak birlikte başlatılır. İlk hatada yeni sink
+    başlatılmaz, çalışanlar beklenir ve hata yukarı iletilir.
+    """
+    total_rows = 0
+    total_failed = 0
+
+    sink_ids = {n["id"] for n in sinks}
+    deps = {n["id"]: ancestors(n["id"], ctx.upstream) & sink_ids for n in sinks}
+    parallel = max_parallel > 1 and len(sinks) > 1
+    units = _plan_fanout(ctx, sinks, deps, parallel)
+
+    if ctx.fanout:
+        _log(ctx.execution_id, f"Fan-out: {len(ctx.fanout)} node birden fazla hedefe tek okumayla dağıtılacak")
+
+    if not parallel:
+        for node in sinks:
+            written, failed = _run_sink(db, ctx, node)
+            total_rows += written
+            total_failed += failed
+        return total_rows, total_failed
+
+    unit_deps = [
+        set().union(*(deps[n["id"]] for n in unit)) - {n["id"] for n in unit} for unit in units
+    ]
+    pending = list(range(len(units)))
+    running: dict = {}  # future → node_id
+    done: set[str] = set()
+    first_error: Optional[BaseException] = None
+
+    _log(ctx.execution_id, f"{len(sinks)} hedef node, en fazla {max_parallel} paralel çalışacak")
+
+    # Fan-out grupları bölünemez; havuz en büyük grubu da sığdırmalı
+    workers = max(max_parallel, max(len(unit) for unit in units))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix=f"exec-{ctx.execution_id[:8]}"
+    ) as pool:
+        while pending or running:
+            if first_error is None:
+                for idx in list(pending):
+                    unit = units[idx]
+                    if running and len(running) + len(unit) > max_parallel:
+                        break
+                    if unit_deps[idx] <= done:
+                        pending.remove(idx)
+                        for node in unit:
+                            running[pool.submit(_run_sink_isolated, ctx, node)] = node["id"]
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                node_id = running.pop(future)
+                try:
+                    written, failed = future.result()
+                except Exception as exc:
+                    if first_error is None:
+                        first_error = exc
+                    continue
+                total_rows += written
+                total_failed += failed
+                done.add(node_id)
+
+    if first_error is not None:
+        raise first_error
+    return total_rows, total_failed
+
+
+# ─── Checkpoint / resume planı ────────────────────────────────────────────
+
+def _checkpoint_key_column(ctx: _RunContext, node: dict) -> Optional[str]:
+    """
+    Hedefin anahtar checkpoint'i tutabileceği kolon: satırlar hedefe tek
+    kaynaktan, yalnızca filter/transform üzerinden ve kaynak sırasıyla gelmeli.
+    Kaynakta checkpoint_column yoksa veya zincir sırayı bozuyorsa None.
+    """
+    cfg: dict = node.get("data", {}).get("config") or {}
+    if cfg.get("write_mode") == "upsert":
+        return None
+    closure = _stream_closure(ctx, node["id"])
+    sources = [nid for nid in closure if ctx.node_map[nid].get("type") == "source"]
+    if len(sources) != 1:
+        return None
+    if any(ctx.node_map[nid].get("type") not in ("source", "filter", "transform") for nid in closure):
+        return None
+    # Birden fazla girdi birleşen node'da akışlar art arda gelir; sıra bozulur
+    for nid in (closure - set(sources)) | {node["id"]}:
+        if sum(1 for up in ctx.upstream.get(nid, []) if up in closure) > 1:
+            return None
+    source_cfg: dict = ctx.node_map[sources[0]].get("data", {}).get("config") or {}
+    return (source_cfg.get("checkpoint_column") or "").strip() or None
+
+
+def _plan_checkpoints(
+    db: Session,
+    ctx: _RunContext,
+    sinks: list[dict],
+    previous: dict[str, ResumePoint],
+) -> list[dict]:
+    """
+    Hedeflerin checkpoint'lerini hazırlar ve çalışacak sink'leri döner.
+
+    previous (devam edilen execution'ın checkpoint'leri) içinde tamamlanmış
+    sink'ler atlanır; anahtarı eşleşen hedefler kaldığı yerden devam eder.
+    Kaynak, kendisini okuyan hedeflerin en gerideki anahtarından itibaren
+    okunur; hedeflerden biri baştan yazılacaksa kaynak da baştan okunur.
+    """
+    remaining: list[dict] = []
+    for node in sinks:
+        node_id = node["id"]
+        prev = previous.get(node_id)
+        if prev is not None and prev.status == "done":
+            _log(ctx.execution_id, f"Node atlandı (önceki çalıştırmada tamamlandı): {_node_label(node)}",
+                 node_id=node_id)
+            save_checkpoint(db, ctx.execution_id, node_id, prev)
+            continue
+        remaining.append(node)
+        if node.get("type") != "destination":
+            continue
+
+        key_column = _checkpoint_key_column(ctx, node)
+        point = ResumePoint(key_column=key_column)
+        if prev is not None and key_column and prev.key_column == key_column and prev.key_value is not None:
+            point = ResumePoint(
+                chunk_index=prev.chunk_index,
+                rows_written=prev.rows_written,
+                key_column=key_column,
+                key_value=prev.key_value,
+            )
+            save_checkpoint(db, ctx.execution_id, node_id, point)
+        elif prev is not None and prev.rows_written:
+            _log(ctx.execution_id,
+                 f"{_node_label(node)}: devam noktası yok (checkpoint kolonu tanımsız veya değişmiş), "
+                 f"hedef baştan yazılacak — önceki çalıştırmada {prev.rows_written} satır yazılmıştı",
+                 level="warning", node_id=node_id)
+        ctx.checkpoints[node_id] = point
+
+    readers: dict[str, list[Any]] = {}
+    for node in remaining:
+        point = ctx.checkpoints.get(node["id"])
+        if point is None:
+            continue
+        for nid in _stream_closure(ctx, node["id"]):
+            if ctx.node_map[nid].get("type") == "source":
+                readers.setdefault(nid, []).append(point.key_value if point.key_column else None)
+    for source_id, values in readers.items():
+        if values and all(v is not None for v in values):
+            ctx.resume_after[source_id] = min(values)
+    return remaining
+
+
+# ─── Alt workflow (workflow_ref) ──────────────────────────────────────────
+
+_WORKFLOW_REF_NODE_TYPES = ("workflowRef", "workflow_ref")
+_MAX_WORKFLOW_REF_DEPTH = 10
+
+
+def _expand_workflow_refs(
+    db: Session,
+    execution_id: str,
+    nodes: list[dict],
+    edges: list[dict],
+    stack: tuple[str, ...],
+    origins: dict[str, tuple[str, str]],
+    loaded: Optional[dict[str, Workflow]] = None,
+    path: str = "",
+) -> tuple[list[dict], list[dict]]:
+    """
+    workflow_ref node'larını referans verilen workflow'un node'larıyla
+    değiştirir; alt DAG üst workflow'un planına katılır ve sink'leri diğer
+    dallarla aynı zamanlayıcıda (paralel) çalışır, aynı execution kaydına,
+    bağlantı havuzuna ve pushdown/fan-out planına dahil olur.
+
+    Alt node id'leri "<ref_id>/<node_id>" olur. Ref node'una gelen edge'ler
+    alt workflow'un kök node'larına, çıkan edge'ler alt workflow'un sink'lerine
+    bağlanır (sıralama bağımlılığı). İç içe referanslar özyinelemeli açılır;
+    döngüsel referans hata verir. Alt workflow'un kendi `settings`'i
+    kullanılmaz, üst workflow'unki geçerlidir.
+
+    origins: açılan her node için (workflow_id, özgün node id) — watermark'lar
+    alt workflow'un kendi kayıtlarıyla okunup yazılır.
+    path: iç içe açılımda bu seviyedeki node'ların üst id öneki (loglar için).
+    """
+    loaded = {} if loaded is None else loaded
+    refs = {
+        n["id"]: n for n in nodes
+        if n.get("type") in _WORKFLOW_REF_NODE_TYPES and not _is_disabled(n)
+    }
+    if not refs:
+        return nodes, edges
+    if len(stack) > _MAX_WORKFLOW_REF_DEPTH:
+        raise ValueError(f"workflow_ref derinliği {_MAX_WORKFLOW_REF_DEPTH} seviyeyi aşıyor")
+
+    out_nodes = [n for n in nodes if n["id"] not in refs]
+    out_edges = [e for e in edges if e.get("source") not in refs and e.get("target") not in refs]
+    # Ref node'unun yerine geçen (giriş, çıkış) node'ları; alt workflow boşsa ref'in girdileri
+    entries: dict[str, list[str]] = {}
+    exits: dict[str, list[str]] = {}
+
+    for ref_id, ref in refs.items():
+        cfg: dict = ref.get("data", {}).get("config") or {}
+        child_id = cfg.get("workflow_ref_id") or cfg.get("workflow_id")
+        if not child_id:
+            raise ValueError(f"Workflow ref node {ref_id}: workflow_ref_id belirtilmeli")
+        if child_id in stack:
+            raise ValueError(f"Workflow ref node {ref_id}: döngüsel referans ({child_id})")
+        child = loaded.get(child_id)
+        if child is None:
+            child = db.get(Workflow, child_id)
+            if child is None:
+                raise ValueError(f"Workflow ref node {ref_id}: workflow bulunamadı: {child_id}")
+            loaded[child_id] = child
+
+        definition: dict = json.loads(child.definition)
+        child_origins: dict[str, tuple[str, str]] = {}
+        child_nodes, child_edges = _expand_workflow_refs(
+            db, execution_id,
+            definition.get("nodes", []), definition.get("edges", []),
+            stack + (child_id,), child_origins, loaded, f"{path}{ref_id}/",
+        )
+
+        prefix = f"{ref_id}/"
+        label = _node_label(ref)
+        child_ids = {n["id"] for n in child_nodes}
+        for n in child_nodes:
+            data = dict(n.get("data") or {})
+            data["label"] = f"{label}/{_node_label(n)}"
+            out_nodes.append({**n, "id": prefix + n["id"], "data": data})
+            origins[prefix + n["id"]] = child_origins.get(n["id"], (child_id, n["id"]))
+        for e in child_edges:
+            if e.get("source") in child_ids and e.get("target") in child_ids:
+                out_edges.append({**e, "source": prefix + e["source"], "target": prefix + e["target"]})
+
+        targets = {e.get("target") for e in child_edges}
+        entries[ref_id] = [prefix + n["id"] for n in child_nodes if n["id"] not in targets]
+        exits[ref_id] = [prefix + n["id"] for n in child_nodes if n.get("type") in _SINK_NODE_TYPES]
+        _log(execution_id,
+             f"Alt workflow: [{label}] → {child.name} ({len(child_nodes)} node)",
+             node_id=path + ref_id)
+
+    def _ends(node_id: str, side: dict[str, list[str]]) -> list[str]:
+        if node_id not in refs:
+            return [node_id]
+        if side[node_id]:
+            return side[node_id]
+        # Boş alt workflow: sıralama ref'in girdileri üzerinden korunur
+        return [s for e in edges if e.get("target") == node_id for s in _ends(e.get("source", ""), exits)]
+
+    for e in edges:
+        src, tgt = e.get("source"), e.get("target")
+        if src not in refs and tgt not in refs:
+            continue
+        for a in _ends(src, exits):
+            for b in _ends(tgt, entries):
+                out_edges.append({**e, "id": f"{e.get('id', '')}:{a}->{b}", "source": a, "target": b})
+    return out_nodes, out_edges
+
+
 # ─── Ana execution fonksiyonu ─────────────────────────────────────────────
 
+def _finish_execution(db: Session, execution_id: str, status: str, commit: bool = True, **values: Any) -> bool:
+    """
+    Çalışan execution'ı bitirir. Koşullu UPDATE: durum hâlâ "running" değilse
+    (ör. cancel_execution araya girdiyse) kayıt değişmez ve False döner.
+    """
+    updated = (
+        db.query(Execution)
+        .filter(Execution.id == execution_id, Execution.status == "running")
+        .update({"status": status, "finished_at": now_istanbul(), **values}, synchronize_session=False)
+    )
+    if commit:
+        db.commit()
+    return bool(updated)
+
+
 def run_workflow(
     db: Session,
     workflow_id: str,
     trigger_type: str = "manual",
     execution_id: Optional[str] = None,
+    resume_from: Optional[str] = None,
 ) -> str:
     """
     Workflow'u çalıştırır. execution_id döner.
     execution_id parametresi verilirse mevcut kaydı günceller,
     verilmezse yeni kayıt oluşturur.
+
+    resume_from verilirse o execution'ın checkpoint'lerinden devam edilir:
+    tamamlanmış sink'ler atlanır, hedefler kaldığı yerden yazılır
+    (bkz. checkpoint_service).
+
+    Çalışma süresince execution için iptal token'ı kayıtlıdır
+    (cancel_execution); iptal edilen çalışma "cancelled" durumuyla biter,
+    watermark'lar ilerlemez. Token kayıt okunmadan önce kaydedilir ve durum
+    geçişleri koşullu UPDATE ile yapılır (pending → running → success/failed);
+    iptal edilmiş kayıt hiçbir noktada ezilmez.
     """
     workflow: Optional[Workflow] = db.get(Workflow, workflow_id)
     if not workflow:
         raise ValueError(f"Workflow bulunamadı: {workflow_id}")
 
-    # Execution kaydını bul veya oluştur
+    # İptal token'ı kayıt okunmadan önce kaydedilir: aradaki iptal kaybolmaz
     if execution_id:
-        execution = db.get(Execution, execution_id)
-        if execution:
-            execution.status = "running"
-            execution.started_at = now_istanbul()
-            db.commit()
-        else:
+        token = cancellation.register(execution_id)
+        started = (
+            db.query(Execution)
+            .filter(Execution.id == execution_id, Execution.status == "pending")
+            .update({"status": "running", "started_at": now_istanbul()}, synchronize_session=False)
+        )
+        db.commit()
+        if not started:
+            cancellation.unregister(execution_id)
+            if db.get(Execution, execution_id) is not None:
+                # Kuyrukta beklerken iptal edildi (pending değil); hiç başlatılmaz
+                return execution_id
             execution_id = None  # fallback: yeni oluştur
 
     if not execution_id:
-        execution = Execution(
-            id=uuid.uuid4().hex,
+        execution_id = uuid.uuid4().hex
+        token = cancellation.register(execution_id)
+        db.add(Execution(
+            id=execution_id,
             workflow_id=workflow_id,
             status="running",
             trigger_type=trigger_type,
             started_at=now_istanbul(),
-        )
-        db.add(execution)
+        ))
         db.commit()
-        execution_id = execution.id
 
-    _log(db, execution_id, f"Workflow başlatıldı: {workflow.name}")
+    _log(execution_id, f"Workflow başlatıldı: {workflow.name}")
 
     try:
         definition: dict = json.loads(workflow.definition)
@@ -418,106 +1365,138 @@ def run_workflow(
         if not nodes:
             raise ValueError("Workflow'da hiç node yok")
 
-        sorted_nodes = _topological_sort(nodes, edges)
-        _log(db, execution_id, f"{len(sorted_nodes)} node çalışacak")
+        origins: dict[str, tuple[str, str]] = {}
+        nodes, edges = _expand_workflow_refs(db, execution_id, nodes, edges, (workflow_id,), origins)
+
+        # Workflow geneli motor ayarları (node config'i bunları ezebilir)
+        wf_settings: dict = definition.get("settings") or {}
+        wf_prefetch = int(wf_settings.get("prefetch_chunks", settings.default_prefetch_chunks))
+        max_parallel = int(wf_settings.get("max_parallel_branches", settings.default_max_parallel_branches))
 
-        total_rows = 0
-        total_failed = 0
+        sorted_nodes = topological_sort(nodes, edges)
+        _log(execution_id, f"{len(sorted_nodes)} node çalışacak")
 
-        # Node çıktılarını zincirlemek için buffer
-        node_outputs: dict[str, Any] = {}  # node_id → generator veya rows
+        ctx = _RunContext(
+            execution_id=execution_id,
+            workflow_id=workflow_id,
+            node_map={n["id"]: n for n in sorted_nodes},
+            upstream=upstream_map(sorted_nodes, edges),
+            handles=target_handles(edges),
+            bind=db.get_bind(),
+            prefetch_depth=wf_prefetch,
+            columnar=bool(wf_settings.get("columnar_chunks", settings.default_columnar_chunks)),
+            fanout_depth=int(wf_settings.get("fanout_buffer_chunks", settings.default_fanout_buffer_chunks)),
+            origins=origins,
+        )
+        if wf_settings.get("pushdown", settings.default_pushdown):
+            ctx.pushdown = plan_pushdown(sorted_nodes, edges)
 
+        sinks: list[dict] = []
         for node in sorted_nodes:
             node_id = node["id"]
             node_type = node.get("type", "")
-            node_label = node.get("data", {}).get("label") or node_type
-            node_disabled = node.get("data", {}).get("disabled", False)
-
-            # Bu node'a gelen kaynak node'ları bul
-            incoming_sources = [
-                e["source"] for e in edges if e.get("target") == node_id
-            ]
 
             # Pasif (disabled) node'ları atla
-            if node_disabled:
-                _log(db, execution_id, f"Node atlandı (pasif): {node_label} ({node_id[:8]})", level="warning", node_id=node_id)
+            if _is_disabled(node):
+                _log(execution_id, f"Node atlandı (pasif): {_node_label(node)} ({node_id[:8]})", level="warning", node_id=node_id)
                 continue
 
-            _log(db, execution_id, f"Node çalışıyor: [{node_label}] ({node_type})", node_id=node_id)
-
-            if node_type == "source":
-                chunk_size = (node.get("data", {}).get("config") or {}).get("chunk_size", 5000)
-                node_outputs[node_id] = _run_source_node(db, execution_id, node, chunk_size)
-
-            elif node_type == "destination":
-                def merged_upstream(sources=incoming_sources, outputs=node_outputs):
-                    for src_id in sources:
-                        gen = outputs.get(src_id)
-                        if gen is None:
-                            continue
-                        if hasattr(gen, "__next__") or hasattr(gen, "__iter__"):
-                            yield from gen
-                        else:
-                            yield from [gen]
-
-                written, failed = _run_destination_node(
-                    db, execution_id, node, merged_upstream()
-                )
-                total_rows += written
-                total_failed += failed
-
-            elif node_type in ("transform", "filter"):
-                def transform_gen(src_ids=incoming_sources, node_ref=node, outputs=node_outputs, ntype=node_type):
-                    for src_id in src_ids:
-                        gen = outputs.get(src_id)
-                        if gen is None:
-                            continue
-                        stream = gen if hasattr(gen, "__next__") else iter([gen])
-                        for chunk in stream:
-                            if ntype == "transform":
-                                yield _run_transform_node(node_ref, chunk)
-                            else:
-                                yield _run_filter_node(node_ref, chunk)
+            if node_type in _SINK_NODE_TYPES:
+                sinks.append(node)
+            elif node_type not in _STREAM_NODE_TYPES:
+                _log(execution_id, f"Bilinmeyen node tipi atlandı: {node_type}", level="warning", node_id=node_id)
 
-                node_outputs[node_id] = transform_gen()
-
-            elif node_type == "sqlExecute":
-                _run_sql_execute_node(db, execution_id, node)
+        previous: dict[str, ResumePoint] = {}
+        if resume_from:
+            previous = load_checkpoints(db, resume_from)
+            _log(execution_id,
+                 f"Önceki çalıştırmadan devam ediliyor: {resume_from[:8]} ({len(previous)} checkpoint)")
+        sinks = _plan_checkpoints(db, ctx, sinks, previous)
 
+        try:
+            total_rows, total_failed = _run_sinks(db, ctx, sinks, max_parallel)
+        finally:
+            ctx.close_tees()
+        token.check()
+
+        # Watermark'lar yalnızca tüm hedefler yazıldıktan sonra ilerler
+        by_workflow: dict[str, dict[str, tuple[str, Any]]] = {}
+        if ctx.watermarks:
+            if total_failed:
+                _log(execution_id,
+                     f"Watermark ilerletilmedi: {total_failed} satır yazılamadı, "
+                     f"bir sonraki çalıştırmada tekrar okunacak",
+                     level="warning")
             else:
-                _log(db, execution_id, f"Bilinmeyen node tipi atlandı: {node_type}", level="warning", node_id=node_id)
-
-        # Execution'ı tamamla
-        exec_record = db.get(Execution, execution_id)
-        if exec_record:
-            exec_record.status = "success"
-            exec_record.rows_processed = total_rows
-            exec_record.rows_failed = total_failed
-            exec_record.finished_at = now_istanbul()
-            db.commit()
-
-        _log(db, execution_id, f"Workflow tamamlandı. {total_rows} satır aktarıldı.")
+                # Alt workflow node'larının watermark'ı kendi workflow'una yazılır
+                for node_id, mark in ctx.watermarks.items():
+                    owner, origin_id = origins.get(node_id, (workflow_id, node_id))
+                    by_workflow.setdefault(owner, {})[origin_id] = mark
+                for node_id, (column, value) in ctx.watermarks.items():
+                    _log(execution_id, f"Watermark güncellendi: {column} = {value!r}", node_id=node_id)
+
+        # Execution'ı tamamla — loglar, durum değişmeden önce DB'de olmalı
+        _log(execution_id, f"Workflow tamamlandı. {total_rows} satır aktarıldı.")
+        execution_log_sink.flush()
+
+        # Durum ve watermark'lar tek transaction'da; bu arada iptal edildiyse hiçbiri yazılmaz
+        if not _finish_execution(
+            db, execution_id, "success", commit=False,
+            rows_processed=total_rows, rows_failed=total_failed,
+        ):
+            db.rollback()
+            _log(execution_id, "Execution bitişte iptal edildi; watermark'lar ilerletilmedi", level="warning")
+            execution_log_sink.flush()
+            return execution_id
+        for owner, pending in by_workflow.items():
+            save_watermarks(db, owner, execution_id, pending, commit=False)
+        db.commit()
+        execution_events.publish_status(execution_id, "success", total_rows, total_failed)
 
         # Webhook bildirimi — başarı
-        _send_notification_if_needed(workflow, exec_record, "execution_success", db=db)
+        _send_notification_if_needed(workflow, db.get(Execution, execution_id), "execution_success", db=db)
 
         return execution_id
 
     except Exception as e:
+        if token.cancelled:
+            # İptalle kesilen sorgu/yazma hataları da iptal sayılır
+            _log(execution_id, "Execution iptal edildi; çalışan sorgular kesildi, açık yazmalar geri alındı",
+                 level="warning")
+            execution_log_sink.flush()
+            _finish_execution(db, execution_id, "cancelled")
+            exec_record = db.get(Execution, execution_id)
+            execution_events.publish_status(
+                execution_id,
+                "cancelled",
+                exec_record.rows_processed if exec_record else 0,
+                exec_record.rows_failed if exec_record else 0,
+            )
+            return execution_id
+
         logger.exception("Execution hatasi: %s", e)
+        _log(execution_id, f"Hata: {e}", level="error")
+        execution_log_sink.flush()
+
+        if not _finish_execution(db, execution_id, "failed", error_message=str(e)):
+            return execution_id  # hata sırasında iptal edildi; iptal durumu korunur
         exec_record = db.get(Execution, execution_id)
-        if exec_record:
-            exec_record.status = "failed"
-            exec_record.error_message = str(e)
-            exec_record.finished_at = now_istanbul()
-            db.commit()
-        _log(db, execution_id, f"Hata: {e}", level="error")
+        execution_events.publish_status(
+            execution_id,
+            "failed",
+            exec_record.rows_processed if exec_record else 0,
+            exec_record.rows_failed if exec_record else 0,
+        )
 
         # Webhook bildirimi — hata
         _send_notification_if_needed(workflow, exec_record, "execution_failed", db=db)
 
         return execution_id
 
+    finally:
+        cancellation.unregister(execution_id)
+        execution_log_sink.release(execution_id)
+
 
 # ─── Sorgu fonksiyonları ──────────────────────────────────────────────────
 
@@ -647,6 +1626,9 @@ def get_execution(db: Session, execution_id: str) -> Optional[Execution]:
 
 
 def get_execution_logs(db: Session, execution_id: str) -> list[ExecutionLog]:
+    # Kuyrukta bekleyen satırlar varsa önce yazdır; liste her zaman güncel olsun
+    if execution_log_sink.pending_count(execution_id):
+        execution_log_sink.flush()
     return (
         db.query(ExecutionLog)
         .filter(ExecutionLog.execution_id == execution_id)
@@ -656,10 +1638,57 @@ def get_execution_logs(db: Session, execution_id: str) -> list[ExecutionLog]:
 
 
 def cancel_execution(db: Session, execution_id: str) -> bool:
-    execution = db.get(Execution, execution_id)
-    if not execution or execution.status not in ("pending", "running"):
-        return False
-    execution.status = "cancelled"
-    execution.finished_at = now_istanbul()
+    # Koşullu UPDATE: aynı anda biten çalıştırmanın success/failed durumu ezilmez
+    cancelled = (
+        db.query(Execution)
+        .filter(Execution.id == execution_id, Execution.status.in_(("pending", "running")))
+        .update({"status": "cancelled", "finished_at": now_istanbul()}, synchronize_session=False)
+    )
     db.commit()
+    if not cancelled:
+        return False
+    # Bu process'te çalışıyorsa motor durdurulur; pending ise run_workflow hiç başlamaz
+    cancellation.cancel(execution_id)
+    execution = db.get(Execution, execution_id)
+    execution_events.publish_status(execution_id, "cancelled", execution.rows_processed, execution.rows_failed)
     return True
+
+
+def create_resume_execution(db: Session, execution_id: str) -> Optional[Execution]:
+    """
+    Başarısız veya iptal edilmiş execution'ı kaldığı yerden devam ettirecek
+    yeni (pending) execution kaydını oluşturur; devam ettirilemiyorsa None.
+    Çalıştırma run_workflow(..., resume_from=execution_id) ile yapılır.
+    """
+    previous = db.get(Execution, execution_id)
+    if not previous or previous.status not in ("failed", "cancelled"):
+        return None
+    if db.get(Workflow, previous.workflow_id) is None:
+        return None
+    execution = Execution(
+        workflow_id=previous.workflow_id,
+        status="pending",
+        trigger_type="resume",
+        trigger_info=json.dumps({"resumed_from": execution_id}),
+        started_at=now_istanbul(),
+    )
+    db.add(execution)
+    db.commit()
+    db.refresh(execution)
+    return execution
+
+
+def fail_interrupted_executions(db: Session) -> int:
+    """
+    Sunucu yeniden başlatıldığında yarıda kalmış (running/pending) execution'ları
+    failed olarak kapatır; checkpoint'leri korunur, resume ile devam ettirilebilir.
+    """
+    interrupted = db.query(Execution).filter(Execution.status.in_(("pending", "running"))).all()
+    for execution in interrupted:
+        execution.status = "failed"
+        execution.error_message = "Sunucu yeniden başlatıldığı için yarıda kaldı (kaldığı yerden devam ettirilebilir)"
+        execution.finished_at = now_istanbul()
+    if interrupted:
+        db.commit()
+        logger.warning("%d yarıda kalmış execution failed olarak işaretlendi", len(interrupted))
+    return len(interrupted)
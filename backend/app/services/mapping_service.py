@@ -4,107 +4,402 @@ Column mapping ve transform servisi.
 Workflow node config'inden ColumnMapping listesi alır,
 chunk halinde gelen satır listesini dönüştürür.
 Belleğe tüm veriyi yüklemez; her chunk ayrı işlenir.
+
+Mapping config'i node başına bir kez MappingPlan'a derlenir: kolon
+listeleri ve her kolonun dönüştürücü zinciri önceden hazırlanır, satır
+döngüsünde config sözlükleri tekrar okunmaz.
 """
 from __future__ import annotations
 
-from typing import Any, Optional
+import datetime as _dt
+import decimal as _decimal
+from functools import lru_cache
+from typing import Any, Callable, Optional, Union
 import logging
 
+from app.engine.chunk import Chunk, ColumnarChunk
+from app.engine.expressions import Predicate, compile_predicate
+
 logger = logging.getLogger("dataflow")
 
+Converter = Callable[[Any], Any]
+
 
 # ─── Veri tipi dönüştürücüler ──────────────────────────────────────────────
 
+def _to_string(value: Any) -> Any:
+    if isinstance(value, (_dt.datetime, _dt.date, _dt.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_integer(value: Any) -> Any:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, _decimal.Decimal):
+        return int(value)
+    # "20231205" gibi sayı formatındaki tarihi integer'a çevirme — str yap
+    return int(float(str(value)))
+
+
+def _to_float(value: Any) -> Any:
+    if isinstance(value, bool):
+        return float(int(value))
+    if isinstance(value, _decimal.Decimal):
+        return float(value)
+    return float(str(value))
+
+
+def _to_boolean(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float, _decimal.Decimal)):
+        return bool(int(value))
+    return str(value).lower() in ("1", "true", "yes", "t", "on")
+
+
+def _to_date(value: Any) -> Any:
+    if isinstance(value, _dt.datetime):
+        return value.date().isoformat()   # "2023-12-05"
+    if isinstance(value, _dt.date):
+        return value.isoformat()
+    # "20231205" integer → ISO tarih
+    s = str(value).strip()
+    if s.isdigit() and len(s) == 8:
+        return f"{s[:4]}-{s[4:6]}-{s[6:8]}"
+    return s  # Zaten "2023-12-05" formatındaysa
+
+
+def _to_datetime(value: Any) -> Any:
+    if isinstance(value, (_dt.datetime, _dt.date)):
+        return value.isoformat()
+    return str(value)
+
+
+_CASTERS: dict[str, Converter] = {
+    "string": _to_string,
+    "integer": _to_integer,
+    "float": _to_float,
+    "boolean": _to_boolean,
+    "date": _to_date,
+    "datetime": _to_datetime,
+    "timestamp": _to_datetime,
+}
+
+
 def _cast_value(value: Any, cast_to: str) -> Any:
     """
     Değeri hedef DataType'a dönüştürür.
     DataType: 'string' | 'integer' | 'float' | 'boolean' | 'date' | 'datetime' | 'timestamp'
     """
-    import decimal as _decimal
-    import datetime as _dt
-
     if value is None:
         return None
-
+    caster = _CASTERS.get(cast_to)
+    if caster is None:
+        return value
     try:
-        if cast_to == "string":
-            if isinstance(value, (_dt.datetime, _dt.date, _dt.time)):
-                return value.isoformat()
-            return str(value)
-
-        if cast_to == "integer":
-            if isinstance(value, bool):
-                return int(value)
-            if isinstance(value, _decimal.Decimal):
-                return int(value)
-            # "20231205" gibi sayı formatındaki tarihi integer'a çevirme — str yap
-            return int(float(str(value)))
-
-        if cast_to == "float":
-            if isinstance(value, bool):
-                return float(int(value))
-            if isinstance(value, _decimal.Decimal):
-                return float(value)
-            return float(str(value))
-
-        if cast_to == "boolean":
-            if isinstance(value, bool):
-                return value
-            if isinstance(value, (int, float, _decimal.Decimal)):
-                return bool(int(value))
-            return str(value).lower() in ("1", "true", "yes", "t", "on")
-
-        if cast_to == "date":
-            if isinstance(value, _dt.datetime):
-                return value.date().isoformat()   # "2023-12-05"
-            if isinstance(value, _dt.date):
-                return value.isoformat()
-            # "20231205" integer → ISO tarih
-            s = str(value).strip()
-            if s.isdigit() and len(s) == 8:
-                return f"{s[:4]}-{s[4:6]}-{s[6:8]}"
-            return s  # Zaten "2023-12-05" formatındaysa
-
-        if cast_to in ("datetime", "timestamp"):
-            if isinstance(value, (_dt.datetime, _dt.date)):
-                return value.isoformat()
-            return str(value)
-
+        return caster(value)
     except (ValueError, TypeError, OverflowError):
         return value  # Dönüşüm başarısız → orijinal değer
 
+
+# ─── Kolon bazlı (batch) dönüştürücüler ───────────────────────────────────
+#
+# Aynı kolonun değerleri çoğunlukla tek bir Python tipindedir. Her cast tipi
+# için sık görülen tiplere özel (kesin tip eşleşmeli) hızlı yollar tutulur;
+# sonuçları _CASTERS ile birebir aynıdır. Listede olmayan tipler (alt
+# sınıflar dahil) genel caster'a düşer.
+
+_NoneType = type(None)
+_FLOAT_EXACT_INT = 2 ** 53       # Bu sınırın altındaki int'ler float'a kayıpsız çevrilir
+_TRUE_STRINGS = frozenset(("1", "true", "yes", "t", "on"))
+
+
+def _identity(value: Any) -> Any:
     return value
 
 
+def _isoformat(value: Any) -> Any:
+    return value.isoformat()
+
+
+def _int_to_integer(value: int) -> int:
+    # Orijinal int(float(str(v))) büyük sayılarda float hassasiyetine yuvarlar
+    return value if -_FLOAT_EXACT_INT <= value <= _FLOAT_EXACT_INT else int(float(value))
+
+
+def _int_to_float(value: int) -> float:
+    return float(value) if -_FLOAT_EXACT_INT <= value <= _FLOAT_EXACT_INT else float(str(value))
+
+
+def _text_to_date(value: str) -> str:
+    s = value.strip()
+    if s.isdigit() and len(s) == 8:
+        return f"{s[:4]}-{s[4:6]}-{s[6:8]}"
+    return s
+
+
+_FAST_CASTS: dict[str, dict[type, Converter]] = {
+    "string": {
+        str: _identity, int: str, float: str, bool: str, _decimal.Decimal: str,
+        _dt.datetime: _isoformat, _dt.date: _isoformat, _dt.time: _isoformat,
+    },
+    "integer": {
+        int: _int_to_integer, bool: int, float: int, _decimal.Decimal: int,
+        str: lambda v: int(float(v)),
+    },
+    "float": {
+        float: _identity, int: _int_to_float, bool: lambda v: float(int(v)), _decimal.Decimal: float,
+        str: float,
+    },
+    "boolean": {
+        bool: _identity, int: bool, float: lambda v: bool(int(v)), _decimal.Decimal: lambda v: bool(int(v)),
+        str: lambda v: v.lower() in _TRUE_STRINGS,
+    },
+    "date": {
+        _dt.datetime: lambda v: v.date().isoformat(), _dt.date: _isoformat,
+        str: _text_to_date, int: lambda v: _text_to_date(str(v)),
+    },
+    "datetime": {_dt.datetime: _isoformat, _dt.date: _isoformat, str: _identity},
+}
+_FAST_CASTS["timestamp"] = _FAST_CASTS["datetime"]
+
+
+def cast_column(values: list[Any], cast_to: str) -> list[Any]:
+    """
+    Bir kolonun tüm değerlerini tek geçişte cast_to tipine dönüştürür.
+    Değer bazında _cast_value ile aynı sonucu verir: None aynen kalır,
+    dönüşmeyen değer orijinal haliyle döner, bilinmeyen tipte kolon değişmez.
+
+    Kolon tek tipliyse (None'lar hariç) tipe özel dönüştürücü tüm listeye
+    doğrudan uygulanır; dönüşüm gerektirmiyorsa liste kopyalanmadan döner.
+    """
+    caster = _CASTERS.get(cast_to)
+    if caster is None or not values:
+        return values
+    fast = _FAST_CASTS[cast_to]
+
+    kinds = set(map(type, values))
+    has_none = _NoneType in kinds
+    kinds.discard(_NoneType)
+    if len(kinds) == 1:
+        convert = fast.get(next(iter(kinds)), caster)
+        if convert is _identity:
+            return values
+        try:
+            if has_none:
+                return [None if v is None else convert(v) for v in values]
+            return list(map(convert, values))
+        except (ValueError, TypeError, OverflowError):
+            pass  # Dönüşmeyen değer var — değer bazlı yola düş
+    elif not kinds:
+        return values  # Tamamı NULL
+
+    result: list[Any] = []
+    append = result.append
+    get_fast = fast.get
+    for value in values:
+        if value is None:
+            append(None)
+            continue
+        try:
+            append(get_fast(type(value), caster)(value))
+        except (ValueError, TypeError, OverflowError):
+            append(value)  # Dönüşüm başarısız → orijinal değer
+    return result
+
+
+def _compile_cast(cast_to: str) -> Optional[Converter]:
+    """_cast_value'nun cast_to'ya bağlanmış hali; bilinmeyen tip için None (değer aynen geçer)."""
+    caster = _CASTERS.get(cast_to)
+    if caster is None:
+        return None
+    get_fast = _FAST_CASTS[cast_to].get
+
+    def cast(value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return get_fast(type(value), caster)(value)
+        except (ValueError, TypeError, OverflowError):
+            return value
+    return cast
+
+
 # ─── Tek sütun transform ───────────────────────────────────────────────────
 
-def apply_transforms(value: Any, transforms: list[dict]) -> Any:
-    for t in transforms:
-        t_type = t.get("type")
-        if t_type == "cast":
-            value = _cast_value(value, t.get("cast_to", "string"))
-        elif t_type == "default":
+def _compile_transform(t: dict) -> Optional[Converter]:
+    """Tek transform adımını dönüştürücü fonksiyona çevirir; etkisiz adımlar için None."""
+    t_type = t.get("type")
+    if t_type == "cast":
+        return _compile_cast(t.get("cast_to", "string"))
+    if t_type == "default":
+        default_value = t.get("default_value")
+
+        def default(value: Any) -> Any:
             if value is None or (isinstance(value, str) and value.strip() == ""):
-                value = t.get("default_value")
-        elif t_type == "expression":
-            # Basit expression: sabit değer veya SQL-style (ileride genişletilebilir)
-            expr = t.get("expression", "")
-            if expr.startswith("'") and expr.endswith("'"):
-                value = expr[1:-1]
-            elif expr.isdigit():
-                value = int(expr)
+                return default_value
+            return value
+        return default
+    if t_type == "expression":
+        # Basit expression: sabit değer veya SQL-style (ileride genişletilebilir)
+        expr = t.get("expression", "")
+        if expr.startswith("'") and expr.endswith("'"):
+            constant: Any = expr[1:-1]
+        elif expr.isdigit():
+            constant = int(expr)
+        else:
             # Daha karmaşık expression'lar execution katmanında ele alınacak
-    return value
+            return None
+        return lambda _value: constant
+    return None
+
+
+def compile_transforms(transforms: list[dict]) -> Optional[Converter]:
+    """Transform listesini tek dönüştürücüye derler; hiçbir adım etkili değilse None."""
+    steps = [fn for fn in (_compile_transform(t) for t in transforms or []) if fn is not None]
+    if not steps:
+        return None
+    if len(steps) == 1:
+        return steps[0]
+
+    def chain(value: Any) -> Any:
+        for step in steps:
+            value = step(value)
+        return value
+    return chain
+
+
+ColumnConverter = Callable[[list[Any]], list[Any]]
+
+
+def _compile_column_transform(t: dict) -> Optional[ColumnConverter]:
+    """_compile_transform'un kolon bazlı karşılığı (ColumnarChunk için)."""
+    t_type = t.get("type")
+    if t_type == "cast":
+        cast_to = t.get("cast_to", "string")
+        if cast_to not in _CASTERS:
+            return None
+        return lambda values: cast_column(values, cast_to)
+    if t_type == "default":
+        default_value = t.get("default_value")
+        return lambda values: [
+            default_value if v is None or (isinstance(v, str) and v.strip() == "") else v
+            for v in values
+        ]
+    convert = _compile_transform(t)
+    if convert is None:
+        return None
+    return lambda values: [convert(v) for v in values]
+
+
+def compile_column_transforms(transforms: list[dict]) -> Optional[ColumnConverter]:
+    """Transform listesini tüm kolona tek geçişte uygulanan dönüştürücü zincirine derler."""
+    steps = [fn for fn in (_compile_column_transform(t) for t in transforms or []) if fn is not None]
+    if not steps:
+        return None
+    if len(steps) == 1:
+        return steps[0]
+
+    def chain(values: list[Any]) -> list[Any]:
+        for step in steps:
+            values = step(values)
+        return values
+    return chain
+
+
+def apply_transforms(value: Any, transforms: list[dict]) -> Any:
+    converter = compile_transforms(transforms)
+    return converter(value) if converter is not None else value
 
 
 # ─── Chunk dönüştürme ──────────────────────────────────────────────────────
 
+class MappingPlan:
+    """
+    Derlenmiş kolon mapping'i.
+
+    targets/sources: çıktı kolon sırası ve her hedefin kaynak kolonu
+    converters: (hedef, dönüştürücü) — yalnızca transform'u olan kolonlar
+    Dönüşümsüz kolonlar satır başına tek dict(zip(...)) ile kopyalanır.
+    """
+
+    __slots__ = ("targets", "sources", "converters", "_column_plan")
+
+    def __init__(
+        self,
+        targets: list[str],
+        sources: list[str],
+        converters: list[tuple[str, Converter]],
+        column_converters: Optional[dict[str, ColumnConverter]] = None,
+    ) -> None:
+        self.targets = targets
+        self.sources = sources
+        self.converters = converters
+        column_converters = column_converters or {}
+        self._column_plan = [(src, column_converters.get(tgt)) for tgt, src in zip(targets, sources)]
+
+    def apply(self, rows: Chunk) -> Chunk:
+        if isinstance(rows, ColumnarChunk):
+            return self.apply_columnar(rows)
+        targets = self.targets
+        sources = self.sources
+        converters = self.converters
+        result = []
+        append = result.append
+        for row in rows:
+            new_row = dict(zip(targets, map(row.get, sources)))
+            for tgt, convert in converters:
+                new_row[tgt] = convert(new_row[tgt])
+            append(new_row)
+        return result
+
+    def apply_columnar(self, chunk: ColumnarChunk) -> ColumnarChunk:
+        """Kolon bazlı uygulama: dönüşümsüz kolonlar kopyalanmadan yeni chunk'a geçer."""
+        data = [
+            convert(chunk.column(src)) if convert is not None else chunk.column(src)
+            for src, convert in self._column_plan
+        ]
+        return ColumnarChunk(list(self.targets), data, length=len(chunk))
+
+
+def compile_column_mappings(column_mappings: list[dict]) -> Optional[MappingPlan]:
+    """
+    Mapping listesini MappingPlan'a derler. Mapping yoksa None (satırlar aynen geçer).
+
+    Aynı hedefe birden fazla mapping yazıyorsa (eski davranışla aynı şekilde)
+    kolon ilk göründüğü sırada kalır, değeri son mapping belirler.
+    """
+    if not column_mappings:
+        return None
+
+    final: dict[str, tuple[str, list[dict]]] = {}
+    for mapping in column_mappings:
+        if mapping.get("skip"):
+            continue
+        src = mapping.get("source_column", "")
+        tgt = mapping.get("target_column", src)
+        final[tgt] = (src, mapping.get("transforms") or [])
+
+    targets = list(final)
+    sources = [src for src, _ in final.values()]
+    converters: list[tuple[str, Converter]] = []
+    column_converters: dict[str, ColumnConverter] = {}
+    for tgt, (_, transforms) in final.items():
+        convert = compile_transforms(transforms)
+        if convert is not None:
+            converters.append((tgt, convert))
+            column_converters[tgt] = compile_column_transforms(transforms)
+    return MappingPlan(targets, sources, converters, column_converters)
+
+
 def apply_column_mappings(
-    rows: list[dict[str, Any]],
-    column_mappings: list[dict],
-) -> list[dict[str, Any]]:
+    rows: Chunk,
+    column_mappings: list[dict] | MappingPlan | None,
+) -> Chunk:
     """
-    Verilen mapping listesine göre bir chunk'ı dönüştürür.
+    Verilen mapping listesine (veya önceden derlenmiş MappingPlan'a) göre bir
+    chunk'ı dönüştürür.
 
     column_mappings her eleman:
         {
@@ -114,86 +409,44 @@ def apply_column_mappings(
             "skip": false          # true ise bu kolon atlanır
         }
 
-    Mapping yoksa kaynak satır aynen geçer.
+    Mapping yoksa kaynak satır aynen geçer. Aynı mapping birçok chunk'a
+    uygulanacaksa compile_column_mappings ile bir kez derleyip planı verin.
     """
-    if not column_mappings:
+    plan = column_mappings if isinstance(column_mappings, MappingPlan) else compile_column_mappings(column_mappings)
+    if plan is None:
         return rows
+    return plan.apply(rows)
 
-    result = []
-    for row in rows:
-        new_row: dict[str, Any] = {}
-        for mapping in column_mappings:
-            if mapping.get("skip"):
-                continue
-            src = mapping.get("source_column", "")
-            tgt = mapping.get("target_column", src)
-            value = row.get(src)
-            transforms = mapping.get("transforms") or []
-            if transforms:
-                value = apply_transforms(value, transforms)
-            new_row[tgt] = value
-        result.append(new_row)
-    return result
 
+@lru_cache(maxsize=256)
+def _cached_predicate(condition: str) -> Predicate:
+    return compile_predicate(condition)
 
-def apply_filter(
-    rows: list[dict[str, Any]],
-    condition: str,
-) -> list[dict[str, Any]]:
-    """
-    Basit eşitlik/karşılaştırma filtresi.
-    Desteklenen format: "column operator value"
-      operators: =, !=, >, <, >=, <=, LIKE (basit prefix/suffix * wildcard)
 
-    Karmaşık SQL WHERE ifadeleri execution motorunda ele alınacak.
+def compile_filter(condition: Optional[str]) -> Optional[Predicate]:
+    """
+    Filtre koşulunu derlenmiş Predicate'e çevirir; koşul boşsa None.
+    Aynı koşul metni tekrar derlenmez (önbellek). Geçersiz koşulda
+    ExpressionError (ValueError) fırlatır.
     """
     if not condition or not condition.strip():
-        return rows
+        return None
+    return _cached_predicate(condition.strip())
 
-    import re
-    parts = re.split(r"\s+", condition.strip(), maxsplit=2)
-    if len(parts) != 3:
-        logger.warning("Geçersiz filtre koşulu, atlanıyor: %s", condition)
-        return rows
 
-    col, op, raw_val = parts
-    # Tırnak temizle
-    val_str = raw_val.strip("'\"")
-
-    def match(row: dict[str, Any]) -> bool:
-        cell = row.get(col)
-        if cell is None:
-            return False
-        cell_str = str(cell)
-        if op == "=":
-            return cell_str == val_str
-        if op == "!=":
-            return cell_str != val_str
-        if op == "LIKE":
-            pattern = val_str.replace("*", "")
-            if val_str.startswith("*") and val_str.endswith("*"):
-                return pattern in cell_str
-            if val_str.startswith("*"):
-                return cell_str.endswith(pattern)
-            if val_str.endswith("*"):
-                return cell_str.startswith(pattern)
-            return cell_str == val_str
-        try:
-            cell_n = float(str(cell))
-            val_n = float(val_str)
-            if op == ">":
-                return cell_n > val_n
-            if op == "<":
-                return cell_n < val_n
-            if op == ">=":
-                return cell_n >= val_n
-            if op == "<=":
-                return cell_n <= val_n
-        except ValueError:
-            pass
-        return False
-
-    return [r for r in rows if match(r)]
+def apply_filter(rows: Chunk, condition: Union[str, Predicate, None]) -> Chunk:
+    """
+    Filtre koşulunu chunk'a uygular. Koşul dili app.engine.expressions'ta
+    tanımlıdır (AND/OR/NOT, IN, BETWEEN, LIKE, IS NULL, tipli literal'ler);
+    eski "column operator value" biçimi aynen geçerlidir.
+
+    Aynı filtre birçok chunk'a uygulanacaksa compile_filter ile bir kez
+    derleyip Predicate'i verin. ColumnarChunk'ta yalnızca koşul kolonları taranır.
+    """
+    predicate = condition if isinstance(condition, Predicate) else compile_filter(condition)
+    if predicate is None:
+        return rows
+    return predicate.filter(rows)
 
 
 # ─── Node config yardımcıları ──────────────────────────────────────────────
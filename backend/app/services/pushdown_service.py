@@ -0,0 +1,594 @@
+"""
+Predicate ve projection pushdown servisi.
+
+Workflow tanımı üzerinde çalışan bir optimizer geçişidir; kaynak sorgusunu
+veri okunmadan önce daraltır:
+
+  predicate  : Source node'un tek tüketicisi filter node'uysa (ve zincir
+               filter → filter şeklinde devam ediyorsa) koşullar kaynak
+               sorgusunun WHERE'ine eklenir. Filter node'lar yine çalışır,
+               bu yüzden WHERE yalnızca Python filtresinin geçirdiği satırların
+               üst kümesini döndürmelidir: bir yaprak ancak literal'i kolonun
+               SQL tipine kayıpsız çevrilebiliyorsa taşınır (LIKE yalnızca metin
+               kolonlarında; MSSQL'in harf duyarsız collation'ı nedeniyle metin
+               kolonlarında yalnızca =, IN ve LIKE). Taşınamayan AND kolları
+               düşürülür, OR'un bir kolu bile taşınamıyorsa OR taşınmaz.
+  projection : Kaynaktan sonraki tüm yollar mapping'li transform/destination
+               node'larında bitiyorsa, yalnızca bu mapping'lerin ve filtre
+               koşullarının kullandığı kolonlar okunur.
+
+Kaynak kolonları ve tipleri connector.describe_query ile (veri okumadan)
+öğrenilir; kaynakta olmayan kolonlar seçilmez, böylece mapping'deki eksik
+kolonlar eskisi gibi None olur. Düz tablo okuması (SELECT * FROM tablo)
+dışındaki sorgular alt sorgu olarak sarıldıktan sonra yeniden doğrulanır;
+sarılamıyorsa (ör. MSSQL'de TOP'suz ORDER BY, WITH, isimsiz kolon) o kaynak
+için pushdown atlanır. Source veya filter config'inde `pushdown: false` ya da workflow
+ayarlarında `pushdown: false` ile kapatılabilir.
+
+BigQuery'de okunan kolon ve satır azaldıkça taranan byte (maliyet), MSSQL'de
+ağ trafiği azalır. Plan dry_run_workflow ile çalıştırmadan görülebilir.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import decimal as _decimal
+import json
+import math
+import re
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.engine.dag import topological_sort, upstream_map
+from app.engine.expressions import (
+    And,
+    Between,
+    Compare,
+    Expression,
+    ExpressionError,
+    InList,
+    IsNull,
+    Like,
+    Or,
+    _FALSE_WORDS,
+    _TRUE_WORDS,
+    compile_predicate,
+    expression_columns,
+)
+from app.utils.sql_validator import quote_identifier, sql_literal
+
+_READER_NODE_TYPES = ("transform", "filter", "join", "aggregate", "destination")
+
+
+@dataclass
+class SourcePushdown:
+    """Tek bir source node için optimizer kararı."""
+    node_id: str
+    predicate: Optional[Expression] = None
+    filter_nodes: list[str] = field(default_factory=list)   # koşulu kaynağa taşınan filter node'lar
+    columns: Optional[list[str]] = None                       # gereken kolonlar; None = tümü
+    notes: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PushdownResult:
+    """Kaynak sorgusuna uygulanmış pushdown."""
+    query: str
+    predicate_sql: Optional[str] = None
+    columns: Optional[list[str]] = None    # okunacak kolonlar; None = SELECT *
+    pruned_columns: list[str] = field(default_factory=list)
+    bytes_processed: Optional[int] = None
+    notes: list[str] = field(default_factory=list)
+
+
+# ─── Planlama (veri ve bağlantı gerektirmez) ──────────────────────────────
+
+def _config(node: dict) -> dict:
+    return node.get("data", {}).get("config") or {}
+
+
+def _is_disabled(node: dict) -> bool:
+    return bool(node.get("data", {}).get("disabled", False))
+
+
+def _mapping_sources(column_mappings: list[dict]) -> Optional[set[str]]:
+    """Mapping'in okuduğu kaynak kolonları (compile_column_mappings ile aynı kurallar); mapping yoksa None."""
+    if not column_mappings:
+        return None
+    final: dict[str, str] = {}
+    for mapping in column_mappings:
+        if mapping.get("skip"):
+            continue
+        src = mapping.get("source_column", "")
+        final[mapping.get("target_column", src)] = src
+    return {src for src in final.values() if src}
+
+
+def _aggregate_sources(cfg: dict) -> set[str]:
+    """Aggregate node'unun okuduğu kolonlar: grup kolonları ve fonksiyon kolonları."""
+    columns = {c for c in cfg.get("group_by") or [] if c}
+    for item in cfg.get("aggregates") or []:
+        column = item.get("column")
+        if column and column != "*":
+            columns.add(column)
+    return columns
+
+
+def _conjuncts(expr: Expression) -> list[Expression]:
+    return list(expr.items) if isinstance(expr, And) else [expr]
+
+
+def plan_pushdown(nodes: list[dict], edges: list[dict]) -> dict[str, SourcePushdown]:
+    """Aktif source node'ları için pushdown planı üretir (node_id → SourcePushdown)."""
+    node_map = {n["id"]: n for n in nodes}
+    upstream = upstream_map(nodes, edges)
+
+    # Veri okuyan tüketiciler: source girdi okumaz, sqlExecute akış tüketmez
+    consumers: dict[str, list[str]] = {nid: [] for nid in node_map}
+    for nid, node in node_map.items():
+        if _is_disabled(node) or node.get("type") not in _READER_NODE_TYPES:
+            continue
+        for src_id in upstream.get(nid, []):
+            if nid not in consumers[src_id]:
+                consumers[src_id].append(nid)
+
+    predicates: dict[str, Optional[Expression]] = {}
+
+    def _predicate(node_id: str) -> Optional[Expression]:
+        if node_id not in predicates:
+            try:
+                condition = (_config(node_map[node_id]).get("condition") or "").strip()
+                predicates[node_id] = compile_predicate(condition).expression if condition else None
+            except ExpressionError:
+                predicates[node_id] = None
+        return predicates[node_id]
+
+    needed: dict[str, Optional[set[str]]] = {}
+
+    def _needed_columns(node_id: str) -> Optional[set[str]]:
+        """node_id çıktısından aşağı akışta kullanılan kolonlar; None = tümü."""
+        if node_id in needed:
+            return needed[node_id]
+        needed[node_id] = None  # döngü koruması
+        result: Optional[set[str]] = set()
+        for consumer_id in consumers.get(node_id, []):
+            consumer = node_map[consumer_id]
+            consumer_type = consumer.get("type")
+            if consumer_type == "filter":
+                condition = (_config(consumer).get("condition") or "").strip()
+                expr = _predicate(consumer_id)
+                if condition and expr is None:
+                    cols = None  # geçersiz koşul; çalıştırmada zaten hata verir
+                else:
+                    downstream = _needed_columns(consumer_id)
+                    if downstream is None or expr is None:
+                        cols = downstream
+                    else:
+                        cols = downstream | set(expression_columns(expr))
+            elif consumer_type == "aggregate":
+                cols = _aggregate_sources(_config(consumer))
+            else:
+                cols = _mapping_sources(_config(consumer).get("column_mappings") or [])
+                if cols is None and consumer_type == "transform":
+                    cols = _needed_columns(consumer_id)  # mapping'siz transform satırı aynen geçirir
+            if cols is None:
+                result = None
+                break
+            result |= cols
+        needed[node_id] = result
+        return result
+
+    plans: dict[str, SourcePushdown] = {}
+    for node_id, node in node_map.items():
+        if node.get("type") != "source" or _is_disabled(node):
+            continue
+        cfg = _config(node)
+        plan = SourcePushdown(node_id=node_id)
+        plans[node_id] = plan
+        if cfg.get("pushdown") is False:
+            plan.notes.append("Pushdown source config'inde kapalı")
+            continue
+
+        # Predicate: tek tüketicili filter zinciri boyunca
+        conjuncts: list[Expression] = []
+        current = node_id
+        while True:
+            readers = consumers.get(current, [])
+            if len(readers) != 1:
+                if len(readers) > 1 and current == node_id:
+                    plan.notes.append("Kaynak birden fazla node'a akıyor; filtre taşınmadı")
+                break
+            reader = node_map[readers[0]]
+            if reader.get("type") != "filter":
+                break
+            if upstream.get(reader["id"]) != [current]:
+                plan.notes.append(f"Filter {reader['id']} birden fazla girdi okuyor; taşınmadı")
+                break
+            if _config(reader).get("pushdown") is False:
+                plan.notes.append(f"Filter {reader['id']} config'inde pushdown kapalı")
+                break
+            condition = (_config(reader).get("condition") or "").strip()
+            expr = _predicate(reader["id"])
+            if condition and expr is None:
+                plan.notes.append(f"Filter {reader['id']} koşulu ayrıştırılamadı; taşınmadı")
+                break
+            if expr is not None:
+                conjuncts.extend(_conjuncts(expr))
+            plan.filter_nodes.append(reader["id"])
+            current = reader["id"]
+        if conjuncts:
+            plan.predicate = conjuncts[0] if len(conjuncts) == 1 else And(tuple(conjuncts))
+
+        # Projection: yalnızca aşağı akışta okunan kolonlar
+        columns = _needed_columns(node_id)
+        if columns:
+            columns = set(columns)
+            for extra in (cfg.get("incremental_column"), cfg.get("partition_column"), cfg.get("checkpoint_column")):
+                if extra and extra.strip():
+                    columns.add(extra.strip())
+            plan.columns = sorted(columns)
+    return plans
+
+
+# ─── SQL üretimi ──────────────────────────────────────────────────────────
+
+def _like_pattern(pattern: str, dialect: str) -> str:
+    """Filtre dilindeki deseni (% / * çoklu, _ tek karakter) lehçenin LIKE desenine çevirir."""
+    if dialect == "bigquery":
+        pattern = pattern.replace("\\", "\\\\")
+    else:
+        pattern = pattern.replace("[", "[[]")  # MSSQL'de [ karakter sınıfı açar
+    return pattern.replace("*", "%")
+
+
+def expression_to_sql(expr: Expression, dialect: str) -> str:
+    """NOT'ları yapraklara indirilmiş ifadeyi lehçeye uygun WHERE koşuluna çevirir."""
+    if isinstance(expr, (And, Or)):
+        joiner = " AND " if isinstance(expr, And) else " OR "
+        parts = []
+        for item in expr.items:
+            text = expression_to_sql(item, dialect)
+            parts.append(f"({text})" if isinstance(item, (And, Or)) else text)
+        return joiner.join(parts)
+
+    col = quote_identifier(expr.column, dialect)
+    if isinstance(expr, Compare):
+        op = "<>" if expr.op == "!=" else expr.op
+        return f"{col} {op} {sql_literal(expr.value, dialect)}"
+    if isinstance(expr, IsNull):
+        return f"{col} IS NOT NULL" if expr.negated else f"{col} IS NULL"
+    not_ = "NOT " if expr.negated else ""
+    if isinstance(expr, Like):
+        return f"{col} {not_}LIKE {sql_literal(_like_pattern(expr.pattern, dialect), dialect)}"
+    if isinstance(expr, InList):
+        values = ", ".join(sql_literal(v, dialect) for v in expr.values)
+        return f"{col} {not_}IN ({values})"
+    if isinstance(expr, Between):
+        return (
+            f"{col} {not_}BETWEEN {sql_literal(expr.low, dialect)} "
+            f"AND {sql_literal(expr.high, dialect)}"
+        )
+    raise TypeError(f"SQL'e çevrilemeyen ifade: {type(expr).__name__}")
+
+
+def build_pushdown_query(
+    base_query: str,
+    columns: Optional[list[str]],
+    predicate_sql: Optional[str],
+    dialect: str,
+) -> str:
+    """Kaynak sorgusunu kolon listesi ve WHERE koşuluyla sarar; ikisi de yoksa aynen döner."""
+    if not columns and not predicate_sql:
+        return base_query
+    inner = base_query.strip().rstrip(";")
+    select_list = ", ".join(quote_identifier(c, dialect) for c in columns) if columns else "*"
+    query = f"SELECT {select_list} FROM ({inner}) AS pd_src"
+    if predicate_sql:
+        query += f" WHERE {predicate_sql}"
+    return query
+
+
+_IDENT = r'(?:\[[^\]]+\]|`[^`]+`|"[^"]+"|[A-Za-z_#@][\w$#@-]*)'
+_PLAIN_SELECT_RE = re.compile(rf"^\s*SELECT\s+\*\s+FROM\s+{_IDENT}(?:\s*\.\s*{_IDENT})*\s*;?\s*$", re.IGNORECASE)
+
+
+def is_plain_table_select(query: str) -> bool:
+    """Sorgu `SELECT * FROM tablo` biçiminde mi (alt sorgu olarak her zaman sarılabilir)."""
+    return bool(_PLAIN_SELECT_RE.match(query))
+
+
+# ─── Tip uyumu ────────────────────────────────────────────────────────────
+
+_KINDS = {
+    "string": {"char", "varchar", "nchar", "nvarchar", "text", "ntext", "sysname", "string"},
+    "integer": {"tinyint", "smallint", "int", "bigint", "int64", "integer"},
+    "number": {"decimal", "numeric", "money", "smallmoney", "float", "real",
+               "bignumeric", "bigdecimal", "float64"},
+    "bool": {"bit", "bool", "boolean"},
+    "date": {"date"},
+    "datetime": {"datetime", "datetime2", "smalldatetime"},
+}
+_KIND_BY_TYPE = {name: kind for kind, names in _KINDS.items() for name in names}
+_SKIP = object()
+_BOOL_OPS = ("=", "!=")
+_CI_STRING_OPS = ("=",)
+
+
+def _column_kind(type_name: Optional[str]) -> Optional[str]:
+    """describe_query tip adını karşılaştırma sınıfına çevirir; bilinmeyen tipler None."""
+    return _KIND_BY_TYPE.get((type_name or "").lower())
+
+
+def _typed_literal(kind: str, value: Any, dialect: str) -> Any:
+    """
+    Literal'i kolon sınıfının SQL tipine çevirir; Python filtresinin aynı
+    hücre tipinde yaptığı dönüşümle (expressions._coerce) aynı sonucu vermiyorsa _SKIP.
+    """
+    if value is None:
+        return _SKIP
+    if kind == "string":
+        return value if isinstance(value, str) else _SKIP
+    if kind in ("integer", "number"):
+        if isinstance(value, bool):
+            return _SKIP
+        if isinstance(value, (int, _decimal.Decimal)):
+            return value
+        if isinstance(value, float):
+            return value if math.isfinite(value) else _SKIP
+        if isinstance(value, str):
+            text = value.strip()
+            try:
+                return int(text)
+            except ValueError:
+                pass
+            try:
+                number = _decimal.Decimal(text)
+            except _decimal.InvalidOperation:
+                return _SKIP
+            return number if number.is_finite() else _SKIP
+        return _SKIP
+    if kind == "bool":
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int):
+            return bool(value) if value in (0, 1) else _SKIP
+        if isinstance(value, str):
+            text = value.strip().lower()
+            if text in _TRUE_WORDS:
+                return True
+            if text in _FALSE_WORDS:
+                return False
+        return _SKIP
+    if kind == "date":
+        if isinstance(value, _dt.datetime):
+            return _SKIP
+        if isinstance(value, _dt.date):
+            return value
+        if isinstance(value, str):
+            try:
+                return _dt.date.fromisoformat(value.strip())
+            except ValueError:
+                return _SKIP
+        return _SKIP
+    if kind == "datetime":
+        if isinstance(value, _dt.datetime):
+            parsed = value
+        elif isinstance(value, _dt.date):
+            parsed = _dt.datetime(value.year, value.month, value.day)
+        elif isinstance(value, str):
+            try:
+                parsed = _dt.datetime.fromisoformat(value.strip())
+            except ValueError:
+                return _SKIP
+        else:
+            return _SKIP
+        if parsed.tzinfo is not None:
+            return _SKIP
+        # MSSQL datetime 1/300 sn, datetime2 100 ns hassasiyetinde; sürücünün
+        # döndürdüğü mikrosaniye ile SQL karşılaştırması ancak tam saniyede örtüşür
+        if dialect != "bigquery" and parsed.microsecond:
+            return _SKIP
+        return parsed
+    return _SKIP
+
+
+
+def _pushable_leaf(expr: Expression, kind: Optional[str], dialect: str) -> Optional[Expression]:
+    """Yaprağı kolon tipine uygun literal'lerle döndürür; güvenle taşınamıyorsa None."""
+    if isinstance(expr, IsNull):
+        return expr
+    if kind is None:
+        return None
+    # MSSQL metin karşılaştırması harf duyarsız: yalnızca eşitlik türü koşullar üst küme verir
+    case_insensitive = kind == "string" and dialect != "bigquery"
+    if isinstance(expr, Like):
+        if kind != "string" or (case_insensitive and expr.negated):
+            return None
+        return expr
+    if isinstance(expr, Compare):
+        if kind == "bool" and expr.op not in _BOOL_OPS:
+            return None
+        if case_insensitive and expr.op not in _CI_STRING_OPS:
+            return None
+        value = _typed_literal(kind, expr.value, dialect)
+        return None if value is _SKIP else replace(expr, value=value)
+    if isinstance(expr, InList):
+        if case_insensitive and expr.negated:
+            return None
+        values = tuple(_typed_literal(kind, v, dialect) for v in expr.values)
+        if not values or any(v is _SKIP for v in values):
+            return None
+        return replace(expr, values=values)
+    if isinstance(expr, Between):
+        if kind == "bool" or case_insensitive:
+            return None
+        low, high = _typed_literal(kind, expr.low, dialect), _typed_literal(kind, expr.high, dialect)
+        if low is _SKIP or high is _SKIP:
+            return None
+        return replace(expr, low=low, high=high)
+    return None
+
+
+def pushable_expression(expr: Expression, types: dict[str, str], dialect: str) -> Optional[Expression]:
+    """
+    İfadenin kaynağa güvenle taşınabilen kısmı (kolon tipleri describe_query'den).
+    Sonucun SQL karşılığı her zaman Python filtresinin üst kümesidir; hiçbir kısmı
+    taşınamıyorsa None.
+    """
+    if isinstance(expr, And):
+        items = [p for p in (pushable_expression(i, types, dialect) for i in expr.items) if p is not None]
+        if not items:
+            return None
+        return items[0] if len(items) == 1 else And(tuple(items))
+    if isinstance(expr, Or):
+        items = [pushable_expression(i, types, dialect) for i in expr.items]
+        if any(i is None for i in items):
+            return None
+        return Or(tuple(items))
+    if expr.column not in types:
+        return None
+    return _pushable_leaf(expr, _column_kind(types[expr.column]), dialect)
+
+
+def apply_pushdown(connector: Any, query: str, plan: SourcePushdown, dialect: str) -> PushdownResult:
+    """
+    Planı kaynak sorgusuna uygular. Kaynak kolonları ve tipleri
+    connector.describe_query ile öğrenilir; öğrenilemezse ya da sarılmış sorgu
+    geçersizse kaynak sorgusu aynen okunur.
+    """
+    result = PushdownResult(query=query, notes=list(plan.notes))
+    if plan.predicate is None and plan.columns is None:
+        return result
+    try:
+        described = connector.describe_query(query)
+    except NotImplementedError:
+        result.notes.append("Connector kolon bilgisi vermiyor; pushdown uygulanmadı")
+        return result
+    except Exception as exc:
+        result.notes.append(f"Kaynak kolonları alınamadı, pushdown uygulanmadı: {exc}")
+        return result
+    source_columns: list[str] = described.get("columns") or []
+    types: dict[str, str] = described.get("types") or {}
+
+    if plan.predicate is not None:
+        pushable = pushable_expression(plan.predicate, types, dialect)
+        if pushable is None:
+            result.notes.append("Filtre koşulu kolon tipleriyle güvenle SQL'e çevrilemiyor; kaynağa taşınmadı")
+        else:
+            if pushable != plan.predicate:
+                result.notes.append("Filtre koşulunun yalnızca tiplerle uyumlu kısmı kaynağa taşındı")
+            result.predicate_sql = expression_to_sql(pushable, dialect)
+
+    if plan.columns is not None:
+        wanted = set(plan.columns)
+        selected = [c for c in source_columns if c in wanted]
+        if selected and len(selected) < len(source_columns):
+            result.columns = selected
+            result.pruned_columns = [c for c in source_columns if c not in wanted]
+
+    pushed_query = build_pushdown_query(query, result.columns, result.predicate_sql, dialect)
+    if pushed_query != query and not is_plain_table_select(query):
+        try:
+            connector.describe_query(pushed_query)
+        except Exception as exc:
+            return PushdownResult(
+                query=query,
+                notes=result.notes + [f"Kaynak sorgusu alt sorgu olarak sarılamıyor; pushdown atlandı: {exc}"],
+            )
+    result.query = pushed_query
+    return result
+
+
+# ─── Dry-run ──────────────────────────────────────────────────────────────
+
+def dry_run_workflow(db: Session, workflow_id: str) -> Optional[list[dict]]:
+    """
+    Workflow'u çalıştırmadan her source node'un okuyacağı sorguyu üretir
+    (pushdown + incremental filtre). Workflow yoksa None.
+
+    BigQuery kaynaklarında orijinal ve optimize sorgunun taranacak byte
+    miktarı dry-run job ile (ücretsiz) hesaplanır.
+    """
+    from app.models.workflow import Workflow
+    from app.services.connection_service import get_connection, get_connector
+    from app.services.mapping_service import get_source_query
+    from app.services.checkpoint_service import build_keyset_query
+    from app.services.watermark_service import build_incremental_query, get_watermark
+    from app.config import settings
+
+    workflow = db.get(Workflow, workflow_id)
+    if workflow is None:
+        return None
+    definition: dict = json.loads(workflow.definition)
+    nodes = topological_sort(definition.get("nodes", []), definition.get("edges", []))
+    wf_settings: dict = definition.get("settings") or {}
+    enabled = bool(wf_settings.get("pushdown", settings.default_pushdown))
+    plans = plan_pushdown(nodes, definition.get("edges", []))
+
+    results: list[dict] = []
+    for node in nodes:
+        plan = plans.get(node["id"])
+        if plan is None:
+            continue
+        cfg = _config(node)
+        entry: dict[str, Any] = {
+            "node_id": node["id"],
+            "label": node.get("data", {}).get("label") or "",
+            "dialect": None,
+            "original_query": None,
+            "query": None,
+            "predicate": None,
+            "pushed_filters": [],
+            "columns": None,
+            "pruned_columns": [],
+            "original_bytes": None,
+            "bytes_processed": None,
+            "notes": [] if enabled else ["Pushdown workflow ayarlarında kapalı"],
+        }
+        results.append(entry)
+
+        query = get_source_query(cfg)
+        connection = get_connection(db, cfg.get("connection_id") or "")
+        if not query or connection is None:
+            entry["notes"].append("Kaynak sorgusu veya bağlantısı eksik")
+            continue
+        entry["dialect"] = connection.type
+        entry["original_query"] = query
+
+        connector = get_connector(connection)
+        try:
+            if enabled:
+                pushed = apply_pushdown(connector, query, plan, connection.type)
+                query = pushed.query
+                entry.update(
+                    pushed_filters=plan.filter_nodes if pushed.predicate_sql else [],
+                    predicate=pushed.predicate_sql,
+                    columns=pushed.columns,
+                    pruned_columns=pushed.pruned_columns,
+                )
+                entry["notes"].extend(pushed.notes)
+
+            incremental_column = (cfg.get("incremental_column") or "").strip()
+            if incremental_column:
+                last_value = get_watermark(db, workflow_id, node["id"], incremental_column)
+                query = build_incremental_query(query, incremental_column, last_value, connection.type)
+            checkpoint_column = (cfg.get("checkpoint_column") or "").strip()
+            if checkpoint_column:
+                query = build_keyset_query(query, checkpoint_column, None, connection.type)
+                entry["notes"].append(f"Checkpoint için {checkpoint_column} kolonuna göre sıralı okunacak")
+            elif int(cfg.get("partition_count") or 1) > 1:
+                entry["notes"].append(
+                    f"Sorgu çalıştırmada {cfg['partition_count']} parçaya bölünecek ({cfg.get('partition_column')})"
+                )
+            entry["query"] = query
+
+            if connection.type == "bigquery":
+                try:
+                    entry["original_bytes"] = connector.describe_query(entry["original_query"])["bytes_processed"]
+                    entry["bytes_processed"] = connector.describe_query(query)["bytes_processed"]
+                except Exception as exc:
+                    entry["notes"].append(f"Taranacak byte hesaplanamadı: {exc}")
+        finally:
+            connector.close()
+    return results
@@ -0,0 +1,178 @@
+"""
+Incremental (watermark) okuma servisi.
+
+Source node config'inde `incremental_column` tanımlıysa kaynak her çalıştırmada
+yalnızca kolonu son kaydedilen değerden (high-water mark) büyük olan satırları
+okur. Okuma sırasında görülen en büyük değer execution bitene kadar bekletilir;
+tüm hedefler başarıyla yazıldıktan sonra DB'ye kaydedilir. Hata alan
+çalıştırmada watermark ilerlemez, satırlar bir sonraki çalıştırmada tekrar okunur.
+
+Desteklenen kolonlar: rowversion/timestamp (bytes), identity/artan sayılar,
+datetime/date (ör. modified_at) ve metin.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import decimal as _decimal
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.engine.chunk import Chunk, column_values
+from app.models.watermark import SourceWatermark
+from app.utils.logger import logger
+from app.utils.sql_validator import quote_identifier, sql_literal
+from app.utils.timezone import now_istanbul
+
+
+# ─── Değer (de)serileştirme ───────────────────────────────────────────────
+
+def encode_value(value: Any) -> tuple[str, str]:
+    """Watermark değerini (value_type, metin) çiftine çevirir."""
+    if isinstance(value, bool):
+        return "int", str(int(value))
+    if isinstance(value, int):
+        return "int", str(value)
+    if isinstance(value, _decimal.Decimal):
+        return "decimal", str(value)
+    if isinstance(value, float):
+        return "float", repr(value)
+    if isinstance(value, _dt.datetime):
+        return "datetime", value.isoformat()
+    if isinstance(value, _dt.date):
+        return "date", value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "bytes", bytes(value).hex()
+    return "str", str(value)
+
+
+def decode_value(value_type: str, text: str) -> Any:
+    if value_type == "int":
+        return int(text)
+    if value_type == "decimal":
+        return _decimal.Decimal(text)
+    if value_type == "float":
+        return float(text)
+    if value_type == "datetime":
+        return _dt.datetime.fromisoformat(text)
+    if value_type == "date":
+        return _dt.date.fromisoformat(text)
+    if value_type == "bytes":
+        return bytes.fromhex(text)
+    return text
+
+
+def build_incremental_query(
+    base_query: str,
+    column: str,
+    last_value: Any,
+    dialect: str = "mssql",
+) -> str:
+    """
+    Kaynak sorgusunu watermark filtresiyle sarar.
+    last_value None ise (ilk çalıştırma) sorgu değiştirilmez — tam okuma yapılır.
+
+    Literal sürücünün döndürdüğü Python değerinden üretilir ve kolon tipinde
+    olmayabilir (MSSQL datetime'da CAST(... AS datetime2)); okunan satırlar
+    ayrıca Python'da `> last_value` ile süzülür (bkz. execution_service).
+    """
+    if last_value is None:
+        return base_query
+    inner = base_query.strip().rstrip(";")
+    return (
+        f"SELECT * FROM ({inner}) AS wm_src "
+        f"WHERE {quote_identifier(column, dialect)} > {sql_literal(last_value, dialect)}"
+    )
+
+
+def max_value(current: Any, rows: Chunk, column: str) -> Any:
+    """Chunk'taki en büyük kolon değerini mevcut değerle birlikte döner (NULL'lar atlanır)."""
+    best = current
+    for value in column_values(rows, column):
+        if value is None:
+            continue
+        if best is None or value > best:
+            best = value
+    return best
+
+
+# ─── Kalıcı kayıt ─────────────────────────────────────────────────────────
+
+def get_watermark(db: Session, workflow_id: str, node_id: str, column: str) -> Any:
+    """
+    Kaydedilmiş watermark değerini döner; yoksa None.
+    Kolon değiştirilmişse eski değer geçersizdir (None döner).
+    """
+    record = (
+        db.query(SourceWatermark)
+        .filter(SourceWatermark.workflow_id == workflow_id, SourceWatermark.node_id == node_id)
+        .first()
+    )
+    if record is None or record.column_name != column:
+        return None
+    try:
+        return decode_value(record.value_type, record.value)
+    except (TypeError, ValueError) as exc:
+        logger.warning("Watermark çözülemedi (%s/%s): %s", workflow_id, node_id, exc)
+        return None
+
+
+def save_watermarks(
+    db: Session,
+    workflow_id: str,
+    execution_id: str,
+    pending: dict[str, tuple[str, Any]],
+    commit: bool = True,
+) -> None:
+    """
+    node_id → (kolon, değer) watermark'larını tek transaction'da kaydeder.
+    commit=False ise commit çağırana bırakılır (execution durumuyla birlikte yazmak için).
+    """
+    if not pending:
+        return
+    existing = {
+        r.node_id: r
+        for r in db.query(SourceWatermark).filter(
+            SourceWatermark.workflow_id == workflow_id,
+            SourceWatermark.node_id.in_(list(pending)),
+        )
+    }
+    for node_id, (column, value) in pending.items():
+        value_type, text = encode_value(value)
+        record = existing.get(node_id)
+        if record is None:
+            db.add(SourceWatermark(
+                workflow_id=workflow_id,
+                node_id=node_id,
+                column_name=column,
+                value_type=value_type,
+                value=text,
+                execution_id=execution_id,
+            ))
+        else:
+            record.column_name = column
+            record.value_type = value_type
+            record.value = text
+            record.execution_id = execution_id
+            record.updated_at = now_istanbul()
+    if commit:
+        db.commit()
+
+
+def list_watermarks(db: Session, workflow_id: str) -> list[SourceWatermark]:
+    return (
+        db.query(SourceWatermark)
+        .filter(SourceWatermark.workflow_id == workflow_id)
+        .order_by(SourceWatermark.node_id)
+        .all()
+    )
+
+
+def reset_watermark(db: Session, workflow_id: str, node_id: Optional[str] = None) -> int:
+    """Watermark'ı siler; bir sonraki çalıştırma tam okuma yapar. Silinen kayıt sayısını döner."""
+    q = db.query(SourceWatermark).filter(SourceWatermark.workflow_id == workflow_id)
+    if node_id:
+        q = q.filter(SourceWatermark.node_id == node_id)
+    deleted = q.delete(synchronize_session=False)
+    db.commit()
+    return deleted
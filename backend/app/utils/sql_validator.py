@@ -2,10 +2,14 @@
 SQL güvenlik doğrulama yardımcıları.
 - Tehlikeli MSSQL komutlarını engeller.
 - Tablo/şema adlarını bracket escaping ile güvence altına alır.
+- Üretilmiş filtreler için değerleri güvenli SQL literal'ine çevirir.
 """
 from __future__ import annotations
 
+import datetime as _dt
+import decimal as _decimal
 import re
+from typing import Any
 
 # ── Tehlikeli SQL komutları / ifadeleri (case-insensitive) ────────────────────
 _DANGEROUS_PATTERNS: list[tuple[str, str]] = [
@@ -63,3 +67,44 @@ def safe_table_reference(schema: str | None, table: str) -> str:
         escaped_schema = schema.replace("]", "]]")
         return f"[{escaped_schema}].[{escaped_table}]"
     return f"[{escaped_table}]"
+
+
+def quote_identifier(name: str, dialect: str = "mssql") -> str:
+    """Kolon adını lehçeye göre tırnaklar: MSSQL [ad], BigQuery `ad`."""
+    if dialect == "bigquery":
+        return "`" + name.replace("`", "") + "`"
+    return "[" + name.replace("]", "]]") + "]"
+
+
+def sql_literal(value: Any, dialect: str = "mssql") -> str:
+    """
+    Python değerini lehçeye uygun SQL literal'ine çevirir.
+    Kaynak sorgularına eklenen üretilmiş filtrelerde (watermark, partition
+    sınırları) kullanılır; metinler escape edilir.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        if dialect == "bigquery":
+            return "TRUE" if value else "FALSE"
+        return str(int(value))
+    if isinstance(value, (int, _decimal.Decimal)):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, _dt.datetime):
+        text = value.isoformat()
+        if dialect == "bigquery":
+            # BQ TIMESTAMP kolonları tz-aware, DATETIME kolonları naive döner
+            return f"TIMESTAMP('{text}')" if value.tzinfo else f"DATETIME('{text}')"
+        # datetime kolonu 3'ten fazla kesir hanesini kabul etmez; datetime2 ile karşılaştır
+        return f"CAST('{value.replace(tzinfo=None).isoformat()}' AS datetime2)"
+    if isinstance(value, _dt.date):
+        return f"DATE('{value.isoformat()}')" if dialect == "bigquery" else f"'{value.isoformat()}'"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        hex_text = bytes(value).hex()
+        return f"FROM_HEX('{hex_text}')" if dialect == "bigquery" else f"0x{hex_text}"
+    text = str(value)
+    if dialect == "bigquery":
+        return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    return "N'" + text.replace("'", "''") + "'"
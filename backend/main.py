@@ -7,11 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import ensure_jwt_secret, settings
+from app.connectors.pool import close_all_pools
 from app.database import create_tables
 from app.database import SessionLocal
 from app.routers import admin, ai, auth, audit_logs, connections, data_preview, executions, folders, health, orchestrations, schedules, workflows
-from app.services import orchestration_service, schedule_service
+from app.services import execution_service, orchestration_service, schedule_service
 from app.services.auth_service import ensure_default_admin
+from app.services.execution_log_service import execution_log_sink
 from app.utils.logger import logger
 
 REQUEST_TIMEOUT_SECONDS = 120  # Herhangi bir istek için maksimum süre (long-running ETL'ler için)
@@ -33,6 +35,11 @@ async def lifespan(app: FastAPI):
             conn.execute(text("ALTER TABLE users ADD COLUMN must_change_password BOOLEAN NOT NULL DEFAULT 0"))
             conn.commit()
         logger.info("users tablosuna must_change_password sütunu eklendi.")
+    if "seq" not in [c["name"] for c in inspector.get_columns("execution_logs")]:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE execution_logs ADD COLUMN seq INTEGER"))
+            conn.commit()
+        logger.info("execution_logs tablosuna seq sütunu eklendi.")
 
     logger.info("Veritabanı tabloları hazır.")
     scheduler = schedule_service.init_scheduler(SessionLocal)
@@ -40,12 +47,16 @@ async def lifespan(app: FastAPI):
     db = SessionLocal()
     try:
         ensure_default_admin(db)
+        # Yeniden başlatmada yarıda kalan çalıştırmalar kapatılır (resume ile devam ettirilebilir)
+        execution_service.fail_interrupted_executions(db)
         schedule_service.load_all_schedules(db)
         orchestration_service.load_all_orchestrations(db)
     finally:
         db.close()
     yield
     schedule_service.shutdown_scheduler()
+    execution_log_sink.shutdown()
+    close_all_pools()
     logger.info("EROS - ETL kapatılıyor...")
 
 
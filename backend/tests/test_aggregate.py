@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from app.engine.aggregate import HashAggregate, hash_aggregate, parse_aggregates
+from app.engine.chunk import ColumnarChunk
+
+AGGREGATES = [
+    {"function": "count", "alias": "rows"},
+    {"function": "count", "column": "amount"},
+    {"function": "sum", "column": "amount"},
+    {"function": "min", "column": "amount"},
+    {"function": "max", "column": "amount"},
+    {"function": "avg", "column": "amount"},
+    {"function": "count_distinct", "column": "code"},
+]
+
+
+def _rows(seed: int = 3, n: int = 400):
+    rng = random.Random(seed)
+    return [
+        {
+            "region": rng.choice(["n", "s", "e", None]),
+            "shop": rng.randrange(30),
+            "amount": None if rng.random() < 0.2 else rng.randrange(-50, 100),
+            "code": rng.choice(["a", "b", "c", None]),
+        }
+        for _ in range(n)
+    ]
+
+
+def _chunks(rows: list[dict], size: int = 9):
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def _run(rows, group_by, aggregates=AGGREGATES, columnar=False, **options):
+    events: list[str] = []
+    chunks = _chunks(rows)
+    if columnar:
+        chunks = [ColumnarChunk.from_rows(c) for c in chunks]
+    out = list(hash_aggregate(chunks, group_by, aggregates, partitions=4, on_event=events.append, **options))
+    return [row for chunk in out for row in chunk], events
+
+
+def _by_key(rows, group_by):
+    return {tuple(row[k] for k in group_by): row for row in rows}
+
+
+# ─── Spill ile bellek içi sonucun eşitliği ────────────────────────────────
+
+@pytest.mark.parametrize("group_by", [["region"], ["region", "shop"]])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_spill_matches_in_memory(group_by, columnar):
+    rows = _rows()
+    spilled, spill_events = _run(rows, group_by, columnar=columnar, memory_groups=1)
+    memory, memory_events = _run(rows, group_by, columnar=columnar, memory_groups=10 ** 6)
+
+    assert any("spill" in e for e in spill_events)
+    assert not any("spill" in e for e in memory_events)
+    assert len(spilled) == len(memory)
+    expected = _by_key(memory, group_by)
+    for key, row in _by_key(spilled, group_by).items():
+        # avg kısmi toplamların birleşme sırasına göre son basamakta farklılaşabilir
+        avg, expected_avg = row.pop("avg_amount"), dict(expected[key]).pop("avg_amount")
+        assert avg == (None if expected_avg is None else pytest.approx(expected_avg))
+        assert row == {k: v for k, v in expected[key].items() if k != "avg_amount"}
+
+
+def test_in_memory_matches_brute_force():
+    rows = _rows()
+    result = _by_key(_run(rows, ["region"], memory_groups=1)[0], ["region"])
+    for region in {r["region"] for r in rows}:
+        group = [r for r in rows if r["region"] == region]
+        amounts = [r["amount"] for r in group if r["amount"] is not None]
+        row = result[(region,)]
+        assert row["rows"] == len(group)
+        assert row["count_amount"] == len(amounts)
+        assert row["sum_amount"] == (sum(amounts) if amounts else None)
+        assert row["min_amount"] == (min(amounts) if amounts else None)
+        assert row["max_amount"] == (max(amounts) if amounts else None)
+        assert row["count_distinct_code"] == len({r["code"] for r in group if r["code"] is not None})
+
+
+# ─── Grup kolonu olmadan ──────────────────────────────────────────────────
+
+@pytest.mark.parametrize("memory_groups", [1, 10 ** 6])
+def test_empty_group_by_yields_single_row(memory_groups):
+    rows = _rows(n=50)
+    result, _ = _run(rows, [], memory_groups=memory_groups)
+    amounts = [r["amount"] for r in rows if r["amount"] is not None]
+    assert len(result) == 1
+    assert result[0]["rows"] == 50
+    assert result[0]["sum_amount"] == sum(amounts)
+
+
+def test_empty_group_by_on_empty_input_yields_single_row():
+    result, _ = _run([], [])
+    assert result == [{
+        "rows": 0, "count_amount": 0, "sum_amount": None, "min_amount": None,
+        "max_amount": None, "avg_amount": None, "count_distinct_code": 0,
+    }]
+
+
+def test_grouped_aggregate_on_empty_input_yields_nothing():
+    assert _run([], ["region"])[0] == []
+
+
+# ─── NULL'lar ─────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("memory_groups", [1, 10 ** 6])
+def test_nulls_are_skipped_by_count_min_max(memory_groups):
+    rows = [
+        {"g": "a", "amount": None},
+        {"g": "a", "amount": 5},
+        {"g": "a", "amount": None},
+        {"g": "a", "amount": -2},
+        {"g": "b", "amount": None},
+        {"g": None, "amount": 7},
+        {"g": None, "amount": None},
+    ]
+    result, _ = _run(rows, ["g"], memory_groups=memory_groups)
+    by_group = {row["g"]: row for row in result}
+    assert set(by_group) == {"a", "b", None}
+
+    assert by_group["a"]["rows"] == 4 and by_group["a"]["count_amount"] == 2
+    assert (by_group["a"]["min_amount"], by_group["a"]["max_amount"]) == (-2, 5)
+    # Yalnızca NULL değerli grup: count 0, min/max NULL
+    assert by_group["b"]["rows"] == 1 and by_group["b"]["count_amount"] == 0
+    assert by_group["b"]["min_amount"] is None and by_group["b"]["max_amount"] is None
+    # NULL grup anahtarı ayrı bir gruptur
+    assert by_group[None]["rows"] == 2 and by_group[None]["count_amount"] == 1
+    assert by_group[None]["min_amount"] == by_group[None]["max_amount"] == 7
+
+
+# ─── Doğrulama ────────────────────────────────────────────────────────────
+
+def test_parse_aggregates_defaults_and_errors():
+    specs = parse_aggregates([{"function": "COUNT", "column": "*"}, {"function": "sum", "column": "x"}])
+    assert [(s.function, s.column, s.alias) for s in specs] == [("count", None, "count"), ("sum", "x", "sum_x")]
+    with pytest.raises(ValueError):
+        parse_aggregates([{"function": "median", "column": "x"}])
+    with pytest.raises(ValueError):
+        parse_aggregates([{"function": "sum"}])
+    with pytest.raises(ValueError):
+        HashAggregate([], ["total"], parse_aggregates([{"function": "sum", "column": "x", "alias": "total"}]))
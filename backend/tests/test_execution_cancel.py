@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from app.models.execution import Execution
+from app.models.watermark import SourceWatermark
+from app.models.workflow import Workflow
+from app.services import execution_service
+
+
+class FakeLogSink:
+    def __init__(self):
+        self.on_flush = None
+
+    def flush(self):
+        callback, self.on_flush = self.on_flush, None
+        if callback is not None:
+            callback()
+
+    def release(self, execution_id):
+        pass
+
+
+@pytest.fixture
+def engine(test_db, monkeypatch):
+    """run_workflow'u sink'ler çalışmadan sürer; log, event ve webhook yan etkileri kaydedilir."""
+    state = {"sinks_run": 0, "notifications": [], "events": []}
+    sink = FakeLogSink()
+
+    def run_sinks(db, ctx, sinks, max_parallel):
+        state["sinks_run"] += 1
+        ctx.watermarks["d1"] = ("id", 10)
+        return 5, 0
+
+    monkeypatch.setattr(execution_service, "_log", lambda *a, **k: None)
+    monkeypatch.setattr(execution_service, "execution_log_sink", sink)
+    monkeypatch.setattr(execution_service, "_run_sinks", run_sinks)
+    monkeypatch.setattr(
+        execution_service, "_send_notification_if_needed",
+        lambda workflow, execution, event, **k: state["notifications"].append(event),
+    )
+    monkeypatch.setattr(
+        execution_service.execution_events, "publish_status",
+        lambda execution_id, status, *a: state["events"].append(status),
+    )
+
+    workflow = Workflow(
+        name="wf",
+        definition=json.dumps({"nodes": [{"id": "d1", "type": "destination", "data": {}}], "edges": []}),
+    )
+    test_db.add(workflow)
+    test_db.commit()
+    execution = Execution(workflow_id=workflow.id, status="pending")
+    test_db.add(execution)
+    test_db.commit()
+    state.update(workflow_id=workflow.id, execution_id=execution.id, sink=sink)
+    return state
+
+
+def _status(db, execution_id):
+    db.expire_all()
+    return db.get(Execution, execution_id).status
+
+
+def test_success_saves_watermarks_and_notifies(test_db, engine):
+    execution_service.run_workflow(test_db, engine["workflow_id"], execution_id=engine["execution_id"])
+    assert _status(test_db, engine["execution_id"]) == "success"
+    assert test_db.query(SourceWatermark).count() == 1
+    assert engine["notifications"] == ["execution_success"]
+
+
+def test_cancel_before_start_is_not_lost(test_db, engine):
+    assert execution_service.cancel_execution(test_db, engine["execution_id"])
+    execution_service.run_workflow(test_db, engine["workflow_id"], execution_id=engine["execution_id"])
+    assert engine["sinks_run"] == 0
+    assert _status(test_db, engine["execution_id"]) == "cancelled"
+
+
+def test_cancel_after_sinks_is_not_overwritten(test_db, engine):
+    # İptal, sink'ler bittikten sonra (son log flush'ı sırasında) gelir
+    engine["sink"].on_flush = lambda: execution_service.cancel_execution(test_db, engine["execution_id"])
+    execution_service.run_workflow(test_db, engine["workflow_id"], execution_id=engine["execution_id"])
+    assert _status(test_db, engine["execution_id"]) == "cancelled"
+    assert test_db.query(SourceWatermark).count() == 0
+    assert engine["notifications"] == []
+    assert "success" not in engine["events"]
+
+
+def test_cancel_of_finished_execution_is_rejected(test_db, engine):
+    execution_service.run_workflow(test_db, engine["workflow_id"], execution_id=engine["execution_id"])
+    assert not execution_service.cancel_execution(test_db, engine["execution_id"])
+    assert _status(test_db, engine["execution_id"]) == "success"
@@ -0,0 +1,42 @@
+from app.services import execution_log_service
+from app.services.execution_log_service import MAX_TRACKED_EXECUTIONS, ExecutionLogSink
+
+
+def _sink(monkeypatch, inserted: list, fail: bool = False):
+    def session_local():
+        raise AssertionError("write() DB'ye erişmemeli")
+
+    monkeypatch.setattr(execution_log_service, "SessionLocal", session_local)
+    sink = ExecutionLogSink(batch_size=1000, flush_interval_ms=10, tail_size=10)
+    monkeypatch.setattr(sink, "_insert", lambda batch: fail or inserted.extend(e.to_row() for e in batch) or True)
+    return sink
+
+
+def test_new_execution_starts_at_one_without_db(monkeypatch):
+    inserted: list = []
+    sink = _sink(monkeypatch, inserted)
+    assert [sink.write("e1", f"m{i}").seq for i in range(3)] == [1, 2, 3]
+    assert sink.write("e2", "x").seq == 1
+    assert sink.flush()
+    assert [(r["execution_id"], r["seq"]) for r in inserted] == [("e1", 1), ("e1", 2), ("e1", 3), ("e2", 1)]
+    sink.shutdown()
+
+
+def test_tail_eviction_keeps_sequence(monkeypatch):
+    sink = _sink(monkeypatch, [])
+    sink.write("long", "a")
+    for i in range(MAX_TRACKED_EXECUTIONS + 1):
+        sink.write(f"other-{i}", "x")
+    assert sink.tail("long") == []
+    assert sink.write("long", "b").seq == 2
+    sink.release("long")
+    assert sink.write("long", "c").seq == 1
+    sink.shutdown()
+
+
+def test_tail_after_seq(monkeypatch):
+    sink = _sink(monkeypatch, [])
+    for i in range(5):
+        sink.write("e1", f"m{i}")
+    assert [e.seq for e in sink.tail("e1", after_seq=3)] == [4, 5]
+    sink.shutdown()
@@ -0,0 +1,58 @@
+import datetime as dt
+import decimal
+
+import pytest
+
+from app.engine.expressions import Compare, ExpressionError, Like, compile_predicate
+from app.services.pushdown_service import expression_to_sql, pushable_expression
+
+
+@pytest.mark.parametrize("condition, expected", [
+    ("name = John Smith", Compare("name", "=", "John Smith")),
+    ("created >= 2024-01-15 08:30:00", Compare("created", ">=", "2024-01-15 08:30:00")),
+    ("flag = yes", Compare("flag", "=", "yes")),
+    ("code LIKE AB*", Like("code", "AB*")),
+])
+def test_legacy_condition_falls_back_to_text_literal(condition, expected):
+    assert compile_predicate(condition).expression == expected
+
+
+def test_multi_condition_is_not_treated_as_legacy():
+    with pytest.raises(ExpressionError):
+        compile_predicate("a = 1 AND b = (")
+
+
+@pytest.mark.parametrize("condition, cells, matched", [
+    # Metin literal'i hücre tipine çevrilir
+    ("qty = 5", [5, "5", "05", 5.0, "abc", None], [5, "5", "05", 5.0]),
+    ("flag = yes", [True, False, "yes", "no", "1", None], [True, "yes"]),
+    # Metin hücresi ile metin literal'i metin olarak karşılaştırılır
+    ("qty > '3'", [5, "5", 2, "abc", None], [5, "5", "abc"]),
+    ("amount >= 10.50", [decimal.Decimal("10.50"), decimal.Decimal("3"), "11", None],
+     [decimal.Decimal("10.50"), "11"]),
+    ("created >= 2024-01-15 08:30:00",
+     [dt.datetime(2024, 1, 15, 8, 30), dt.datetime(2024, 1, 14), "2024-01-16T00:00:00", None],
+     [dt.datetime(2024, 1, 15, 8, 30), "2024-01-16T00:00:00"]),
+    # LIKE hücreyi metne çevirerek karşılaştırır
+    ("code LIKE '1%'", [10, "1a", "a1", None], [10, "1a"]),
+])
+def test_mixed_type_cells(condition, cells, matched):
+    predicate = compile_predicate(condition)
+    column = predicate.columns[0]
+    assert [c for c in cells if predicate.matches({column: c})] == matched
+
+
+@pytest.mark.parametrize("condition, column_type, sql", [
+    # Aynı legacy koşul kolon tipine göre farklı literal'le ya da hiç taşınmaz
+    ("qty = 5", "int", "[qty] = 5"),
+    ("qty = 5", "varchar", None),
+    ("flag = yes", "bit", "[flag] = 1"),
+    ("flag = yes", "nvarchar", "[flag] = N'yes'"),
+    ("created >= 2024-01-15 08:30:00", "datetime2", "[created] >= CAST('2024-01-15T08:30:00' AS datetime2)"),
+    ("created >= 2024-01-15 08:30:00", "nvarchar", None),
+    ("code LIKE '1%'", "int", None),
+])
+def test_legacy_condition_to_sql_follows_column_type(condition, column_type, sql):
+    expr = compile_predicate(condition).expression
+    pushed = pushable_expression(expr, {expr.column: column_type}, "mssql")
+    assert (None if pushed is None else expression_to_sql(pushed, "mssql")) == sql
@@ -0,0 +1,99 @@
+import threading
+
+from app.engine.dag import upstream_map
+from app.engine.streams import ChunkTee
+from app.services.execution_service import _plan_fanout, _RunContext
+
+CHUNKS = 20
+DEPTH = 2
+TIMEOUT = 5.0
+
+
+def _source(name: str):
+    return lambda: ([f"{name}-{i}"] for i in range(CHUNKS))
+
+
+def _run_cross_ordered(spill: bool):
+    """D1 önce S1 sonra S2'yi, D2 önce S2 sonra S1'i sırayla okur."""
+    tees = {
+        name: ChunkTee(_source(name), ["d1", "d2"], depth=DEPTH, spill=spill, name=f"tee-{name}")
+        for name in ("s1", "s2")
+    }
+    results: dict[str, list] = {"d1": [], "d2": []}
+
+    def consume(consumer: str, order: list[str]) -> None:
+        for name in order:
+            for chunk in tees[name].branch(consumer):
+                results[consumer].extend(chunk)
+
+    threads = [
+        threading.Thread(target=consume, args=("d1", ["s1", "s2"]), daemon=True),
+        threading.Thread(target=consume, args=("d2", ["s2", "s1"]), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    return tees, threads, results
+
+
+def test_tee_cross_ordered_consumers_deadlock_without_spill():
+    tees, threads, _ = _run_cross_ordered(spill=False)
+    for thread in threads:
+        thread.join(0.5)
+    assert any(thread.is_alive() for thread in threads)
+    for tee in tees.values():
+        tee.close()
+    for thread in threads:
+        thread.join(TIMEOUT)
+        assert not thread.is_alive()
+
+
+def test_tee_cross_ordered_consumers_finish_with_spill():
+    tees, threads, results = _run_cross_ordered(spill=True)
+    for thread in threads:
+        thread.join(TIMEOUT)
+        assert not thread.is_alive(), "çapraz sıralı tüketiciler kilitlendi"
+    expected = [f"s1-{i}" for i in range(CHUNKS)] + [f"s2-{i}" for i in range(CHUNKS)]
+    assert results["d1"] == expected
+    assert results["d2"] == expected[CHUNKS:] + expected[:CHUNKS]
+    for tee in tees.values():
+        tee.close()
+
+
+def _context(nodes: list[dict], edges: list[dict]) -> _RunContext:
+    return _RunContext(
+        execution_id="test",
+        node_map={n["id"]: n for n in nodes},
+        upstream=upstream_map(nodes, edges),
+    )
+
+
+def test_plan_fanout_spills_tees_of_cross_ordered_sinks():
+    nodes = [
+        {"id": "s1", "type": "source"},
+        {"id": "s2", "type": "source"},
+        {"id": "d1", "type": "destination"},
+        {"id": "d2", "type": "destination"},
+    ]
+    edges = [
+        {"source": "s1", "target": "d1"}, {"source": "s2", "target": "d1"},
+        {"source": "s2", "target": "d2"}, {"source": "s1", "target": "d2"},
+    ]
+    ctx = _context(nodes, edges)
+    sinks = [n for n in nodes if n["type"] == "destination"]
+    units = _plan_fanout(ctx, sinks, {"d1": set(), "d2": set()}, parallel=True)
+    assert [[n["id"] for n in unit] for unit in units] == [["d1", "d2"]]
+    assert ctx.spill == {"s1", "s2"}
+
+
+def test_plan_fanout_keeps_single_tee_in_memory():
+    nodes = [
+        {"id": "s1", "type": "source"},
+        {"id": "d1", "type": "destination"},
+        {"id": "d2", "type": "destination"},
+    ]
+    edges = [{"source": "s1", "target": "d1"}, {"source": "s1", "target": "d2"}]
+    ctx = _context(nodes, edges)
+    sinks = [n for n in nodes if n["type"] == "destination"]
+    _plan_fanout(ctx, sinks, {"d1": set(), "d2": set()}, parallel=True)
+    assert ctx.fanout == {"s1": ["d1", "d2"]}
+    assert ctx.spill == set()
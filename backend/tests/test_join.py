@@ -0,0 +1,155 @@
+import random
+
+import pytest
+
+from app.engine.join import HashJoin, hash_join
+
+SUFFIX = "_right"
+
+
+def _tables(seed: int = 7, left_n: int = 120, right_n: int = 90):
+    """Tekrarlı ve NULL anahtarlı iki tablo; 'v' kolonu iki tarafta da vardır."""
+    rng = random.Random(seed)
+
+    def key():
+        return None if rng.random() < 0.1 else rng.randrange(25)
+
+    left = [{"id": key(), "grp": rng.randrange(3), "v": f"l{i}"} for i in range(left_n)]
+    right = [{"id": key(), "grp": rng.randrange(3), "v": f"r{i}", "w": i} for i in range(right_n)]
+    return left, right
+
+
+def _chunks(rows: list[dict], size: int = 7):
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def _reference(left, right, left_keys, right_keys, how):
+    """İç içe döngüyle beklenen çıktı (SQL semantiği: NULL anahtar eşleşmez)."""
+    drop = {rk for lk, rk in zip(left_keys, right_keys) if lk == rk}
+    right_columns = [c for c in right[0] if c not in drop] if right else []
+    out = []
+    for lrow in left:
+        lkey = tuple(lrow[k] for k in left_keys)
+        matches = [
+            rrow for rrow in right
+            if None not in lkey and tuple(rrow[k] for k in right_keys) == lkey
+        ]
+        if how == "anti":
+            if not matches:
+                out.append(dict(lrow))
+            continue
+        for rrow in matches:
+            row = dict(lrow)
+            for name, value in rrow.items():
+                if name not in drop:
+                    row[name + SUFFIX if name in lrow else name] = value
+            out.append(row)
+        if not matches and how == "left":
+            row = dict(lrow)
+            for name in right_columns:
+                row[name + SUFFIX if name in lrow else name] = None
+            out.append(row)
+    return out
+
+
+def _canonical(rows):
+    return sorted(repr(sorted(row.items(), key=lambda kv: kv[0])) for row in rows)
+
+
+def _run(left, right, left_keys, right_keys, **options):
+    events: list[str] = []
+    chunks = list(HashJoin(
+        _chunks(left), _chunks(right), left_keys, right_keys,
+        right_suffix=SUFFIX, partitions=4, chunk_size=10, on_event=events.append, **options,
+    ).run())
+    return [row for chunk in chunks for row in chunk], events
+
+
+# ─── Referansla karşılaştırma ─────────────────────────────────────────────
+
+@pytest.mark.parametrize("how", ["inner", "left", "anti"])
+@pytest.mark.parametrize("memory_rows", [3, 50, 10 ** 6])
+@pytest.mark.parametrize("build_side", ["auto", "left", "right"])
+def test_join_matches_nested_loop_reference(how, memory_rows, build_side):
+    left, right = _tables()
+    rows, events = _run(left, right, ["id"], ["id"], how=how, memory_rows=memory_rows, build_side=build_side)
+    assert _canonical(rows) == _canonical(_reference(left, right, ["id"], ["id"], how))
+    spilled = any("spill" in e for e in events)
+    assert spilled == (memory_rows != 10 ** 6)
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "anti"])
+@pytest.mark.parametrize("memory_rows", [3, 10 ** 6])
+def test_composite_key_matches_reference(how, memory_rows):
+    left, right = _tables(seed=11)
+    keys = ["id", "grp"]
+    rows, _ = _run(left, right, keys, keys, how=how, memory_rows=memory_rows)
+    assert _canonical(rows) == _canonical(_reference(left, right, keys, keys, how))
+
+
+@pytest.mark.parametrize("memory_rows", [3, 10 ** 6])
+def test_single_hot_key_beyond_spill_depth(memory_rows):
+    # Tüm satırlar aynı anahtarda: yeniden bölme işe yaramaz, parça bellekte birleşir
+    left = [{"id": 1, "v": i} for i in range(20)]
+    right = [{"id": 1, "w": i} for i in range(15)]
+    rows, _ = _run(left, right, ["id"], ["id"], how="inner", memory_rows=memory_rows, build_side="right")
+    assert len(rows) == 300
+
+
+# ─── NULL anahtarlar ──────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("memory_rows", [3, 10 ** 6])
+@pytest.mark.parametrize("build_side", ["left", "right"])
+def test_null_keys_never_match(memory_rows, build_side):
+    left = [{"id": None, "a": 1}, {"id": 1, "a": 2}, {"id": 2, "b": None, "a": 3}]
+    right = [{"id": None, "w": "x"}, {"id": 1, "w": "y"}]
+    options = {"memory_rows": memory_rows, "build_side": build_side}
+
+    inner, _ = _run(left, right, ["id"], ["id"], how="inner", **options)
+    assert inner == [{"id": 1, "a": 2, "w": "y"}]
+
+    padded, _ = _run(left, right, ["id"], ["id"], how="left", **options)
+    assert _canonical(padded) == _canonical([
+        {"id": None, "a": 1, "w": None},
+        {"id": 1, "a": 2, "w": "y"},
+        {"id": 2, "b": None, "a": 3, "w": None},
+    ])
+
+    anti, _ = _run(left, right, ["id"], ["id"], how="anti", **options)
+    assert _canonical(anti) == _canonical([left[0], left[2]])
+
+
+def test_partial_null_composite_key_never_matches():
+    left = [{"a": 1, "b": None}, {"a": 1, "b": 2}]
+    right = [{"a": 1, "b": None, "w": "x"}, {"a": 1, "b": 2, "w": "y"}]
+    rows, _ = _run(left, right, ["a", "b"], ["a", "b"], how="inner")
+    assert rows == [{"a": 1, "b": 2, "w": "y"}]
+
+
+# ─── Kolon adları ─────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("memory_rows", [1, 10 ** 6])
+def test_same_named_key_is_dropped_and_overlap_suffixed(memory_rows):
+    left = [{"id": 1, "v": "l1"}, {"id": 2, "v": "l2"}]
+    right = [{"id": 1, "v": "r1", "w": 10}]
+
+    rows, _ = _run(left, right, ["id"], ["id"], how="left", memory_rows=memory_rows)
+    assert _canonical(rows) == _canonical([
+        {"id": 1, "v": "l1", "v_right": "r1", "w": 10},
+        {"id": 2, "v": "l2", "v_right": None, "w": None},
+    ])
+    assert all(list(row) == ["id", "v", "v_right", "w"] for row in rows)
+
+
+def test_differently_named_keys_are_both_kept():
+    left = [{"id": 1, "v": "l1"}]
+    right = [{"cust_id": 1, "id": 99, "v": "r1"}]
+    rows = [row for chunk in hash_join([left], [right], ["id"], ["cust_id"], right_suffix="_r") for row in chunk]
+    assert rows == [{"id": 1, "v": "l1", "cust_id": 1, "id_r": 99, "v_r": "r1"}]
+
+
+def test_invalid_options_raise():
+    with pytest.raises(ValueError):
+        HashJoin([], [], ["id"], ["id"], how="outer")
+    with pytest.raises(ValueError):
+        HashJoin([], [], ["id"], ["a", "b"])
@@ -0,0 +1,117 @@
+import pytest
+
+from app.connectors.mssql_connector import MssqlConnector
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.query = ""
+
+    def execute(self, query, *args):
+        self.query = query
+        self.conn.calls.append(query)
+
+    def fetchall(self):
+        if "sys.columns" in self.query:
+            return [("id", 1), ("name", 2)]
+        return [("id", "int"), ("name", "nvarchar")]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """bulk_copy çağrılarını kaydeder; fail_on'daki çağrı sırasında hata verir."""
+
+    def __init__(self, fail_on=()):
+        self.calls: list = []
+        self.bulk_calls = 0
+        self.fail_on = set(fail_on)
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.calls.append("commit")
+
+    def rollback(self):
+        self.calls.append("rollback")
+
+    def bulk_copy(self, table, rows, **kwargs):
+        self.bulk_calls += 1
+        if self.bulk_calls in self.fail_on:
+            raise RuntimeError("bulk failed")
+        self.calls.append(("bulk", table, len(rows), kwargs["batch_size"]))
+
+
+ROWS = [{"id": i, "name": f"n{i}"} for i in range(5)]
+
+
+def _connector(conn):
+    connector = MssqlConnector({})
+    connector._conn = conn
+    return connector
+
+
+def test_rollback_mode_writes_chunk_as_single_batch():
+    conn = FakeConnection()
+    written = _connector(conn).write_chunk(
+        "dbo", "t", ROWS, load_method="bulk", on_error="rollback", bulk_batch_size=2,
+    )
+    assert written == 5
+    assert [c for c in conn.calls if isinstance(c, tuple)] == [("bulk", "[dbo].[t]", 5, 5)]
+
+
+def test_rollback_mode_failure_raises_without_partial_commit():
+    conn = FakeConnection(fail_on={1})
+    with pytest.raises(RuntimeError):
+        _connector(conn).write_chunk("dbo", "t", ROWS, load_method="bulk", on_error="rollback", bulk_batch_size=2)
+    assert "commit" not in conn.calls
+
+
+def test_continue_mode_skips_failed_batch_and_counts_written_rows():
+    conn = FakeConnection(fail_on={2})
+    written = _connector(conn).write_chunk(
+        "dbo", "t", ROWS, load_method="bulk", on_error="continue", bulk_batch_size=2,
+    )
+    assert written == 3
+    assert [c for c in conn.calls if isinstance(c, tuple)] == [
+        ("bulk", "[dbo].[t]", 2, 2), ("bulk", "[dbo].[t]", 1, 1),
+    ]
+
+
+def test_overwrite_swaps_through_temp_table_in_one_transaction():
+    conn = FakeConnection()
+    _connector(conn).write_chunk("dbo", "t", ROWS, mode="overwrite", load_method="bulk")
+    truncate = conn.calls.index("TRUNCATE TABLE [dbo].[t]")
+    bulk = next(i for i, c in enumerate(conn.calls) if isinstance(c, tuple))
+    assert conn.calls[bulk][1].startswith("[#ovw_") and bulk < truncate
+    assert conn.calls[truncate + 1].startswith("INSERT INTO [dbo].[t]")
+    assert conn.calls[truncate + 2] == "commit"
+
+
+def test_overwrite_failure_leaves_target_untouched():
+    conn = FakeConnection(fail_on={1})
+    with pytest.raises(RuntimeError):
+        _connector(conn).write_chunk("dbo", "t", ROWS, mode="overwrite", load_method="bulk")
+    assert not any(isinstance(c, str) and c.startswith("TRUNCATE") for c in conn.calls)
+
+
+class FakePool:
+    def __init__(self):
+        self.released: list = []
+
+    def release(self, conn, discard=False):
+        self.released.append((conn, discard))
+
+
+def test_finalizer_discards_connection_without_sql():
+    conn = FakeConnection()
+    pool = FakePool()
+    connector = _connector(conn)
+    connector._pool = pool
+    connector._staging[("dbo", "t")] = object()
+    connector.__del__()
+    assert conn.calls == []
+    assert pool.released == [(conn, True)]
@@ -0,0 +1,176 @@
+import datetime as dt
+import decimal
+
+import pytest
+
+from app.engine.expressions import Predicate, compile_predicate
+from app.services.pushdown_service import (
+    SourcePushdown,
+    apply_pushdown,
+    build_pushdown_query,
+    expression_to_sql,
+    is_plain_table_select,
+    pushable_expression,
+)
+
+
+class FakeConnector:
+    """describe_query'yi taklit eder; alt sorgu olarak sarılamayan sorgularda MSSQL gibi hata verir."""
+
+    def __init__(self, types: dict, reject=()):
+        self.types = types
+        self.reject = reject
+        self.described: list[str] = []
+
+    def describe_query(self, query: str) -> dict:
+        self.described.append(query)
+        if query.startswith("SELECT") and "AS pd_src" in query:
+            inner = query[query.index("(") + 1:query.rindex(") AS pd_src")]
+            for marker in self.reject:
+                if marker in inner:
+                    raise ValueError(f"invalid in derived tables: {marker}")
+        return {"columns": list(self.types), "types": dict(self.types), "bytes_processed": None}
+
+
+# ─── Tip uyumu ────────────────────────────────────────────────────────────
+
+MSSQL_TYPES = {
+    "code": "varchar", "amount": "decimal", "qty": "int", "flag": "bit",
+    "created": "datetime2", "day": "date", "uid": "uniqueidentifier",
+}
+BQ_TYPES = {"n": "INT64", "s": "STRING", "ts": "TIMESTAMP", "b": "BOOL"}
+
+
+def _pushed(condition: str, types: dict, dialect: str):
+    expr = pushable_expression(compile_predicate(condition).expression, types, dialect)
+    return None if expr is None else expression_to_sql(expr, dialect)
+
+
+@pytest.mark.parametrize("condition, types, dialect", [
+    ("code = 5", MSSQL_TYPES, "mssql"),
+    ("code != 'a'", MSSQL_TYPES, "mssql"),
+    ("code > 'a'", MSSQL_TYPES, "mssql"),
+    ("code NOT LIKE 'a%'", MSSQL_TYPES, "mssql"),
+    ("flag > 0", MSSQL_TYPES, "mssql"),
+    ("flag = 'maybe'", MSSQL_TYPES, "mssql"),
+    ("created LIKE '2024%'", MSSQL_TYPES, "mssql"),
+    ("created = '2024-01-01 10:00:00.5'", MSSQL_TYPES, "mssql"),
+    ("qty = 'abc'", MSSQL_TYPES, "mssql"),
+    ("qty = true", MSSQL_TYPES, "mssql"),
+    ("uid = 'x'", MSSQL_TYPES, "mssql"),
+    ("missing = 1", MSSQL_TYPES, "mssql"),
+    ("qty = 1 OR code = 5", MSSQL_TYPES, "mssql"),
+    ("n = 'x'", BQ_TYPES, "bigquery"),
+    ("s > 100", BQ_TYPES, "bigquery"),
+    ("ts LIKE '2024%'", BQ_TYPES, "bigquery"),
+])
+def test_incompatible_leaf_is_not_pushed(condition, types, dialect):
+    assert _pushed(condition, types, dialect) is None
+
+
+@pytest.mark.parametrize("condition, types, dialect, sql", [
+    ("qty = '5'", MSSQL_TYPES, "mssql", "[qty] = 5"),
+    ("amount >= '10.50'", MSSQL_TYPES, "mssql", "[amount] >= 10.50"),
+    ("flag = 'yes'", MSSQL_TYPES, "mssql", "[flag] = 1"),
+    ("code = 'A1'", MSSQL_TYPES, "mssql", "[code] = N'A1'"),
+    ("code LIKE 'A%'", MSSQL_TYPES, "mssql", "[code] LIKE N'A%'"),
+    ("day = 2024-01-15", MSSQL_TYPES, "mssql", "[day] = '2024-01-15'"),
+    ("created >= 2024-01-15 08:30:00", MSSQL_TYPES, "mssql",
+     "[created] >= CAST('2024-01-15T08:30:00' AS datetime2)"),
+    ("code IS NULL", MSSQL_TYPES, "mssql", "[code] IS NULL"),
+    ("s > 'b'", BQ_TYPES, "bigquery", "`s` > 'b'"),
+    ("b = 'no'", BQ_TYPES, "bigquery", "`b` = FALSE"),
+])
+def test_compatible_leaf_is_pushed_with_typed_literal(condition, types, dialect, sql):
+    assert _pushed(condition, types, dialect) == sql
+
+
+def test_and_drops_only_incompatible_conjuncts():
+    assert _pushed("qty > 1 AND code = 5 AND created LIKE '2024%'", MSSQL_TYPES, "mssql") == "[qty] > 1"
+
+
+# Python filtresinin geçirdiği her satır, taşınan ifadeyi de (tipli literal'lerle) geçmelidir
+MIXED_CELLS = {
+    "code": ["5", "05", "A1", "a1", "", None],
+    "qty": [5, 10, 0, None],
+    "amount": [decimal.Decimal("10.50"), decimal.Decimal("3"), None],
+    "flag": [True, False, None],
+    "created": [dt.datetime(2024, 1, 15, 8, 30), dt.datetime(2024, 1, 14), None],
+    "day": [dt.date(2024, 1, 15), dt.date(2023, 12, 31), None],
+}
+
+
+@pytest.mark.parametrize("condition", [
+    "qty = '5'", "qty > 3", "amount >= '10.50'", "amount = 10.5", "flag = 'yes'", "flag != 0",
+    "code = 'A1'", "code LIKE '%1'", "code IN ('5', 'A1')", "day = 2024-01-15",
+    "created >= 2024-01-15 08:30:00", "created BETWEEN '2024-01-01' AND '2024-12-31'",
+    "qty = 5 OR code = 5", "NOT (qty > 3 AND code = 'A1')", "code IS NOT NULL AND qty < 10",
+])
+def test_pushed_expression_is_superset_of_python_filter(condition):
+    predicate = compile_predicate(condition)
+    pushed = pushable_expression(predicate.expression, MSSQL_TYPES, "mssql")
+    if pushed is None:
+        return
+    pushed_predicate = Predicate(condition, pushed)
+    rows = [
+        {column: cells[i % len(cells)] for column, cells in MIXED_CELLS.items()}
+        for i in range(max(len(c) for c in MIXED_CELLS.values()) * 3)
+    ]
+    for row in rows:
+        if predicate.matches(row):
+            assert pushed_predicate.matches(row), row
+
+
+# ─── Sorgu sarma ──────────────────────────────────────────────────────────
+
+def test_plain_table_select_detection():
+    assert is_plain_table_select("SELECT * FROM [dbo].[orders]")
+    assert is_plain_table_select("select * from `proj.ds.orders`;")
+    assert not is_plain_table_select("SELECT * FROM orders ORDER BY id")
+    assert not is_plain_table_select("WITH x AS (SELECT 1 AS a) SELECT * FROM x")
+
+
+def test_build_pushdown_query_wraps_query():
+    query = build_pushdown_query("SELECT * FROM t;", ["a"], "[a] = 1", "mssql")
+    assert query == "SELECT [a] FROM (SELECT * FROM t) AS pd_src WHERE [a] = 1"
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT code, qty FROM orders ORDER BY qty",
+    "WITH recent AS (SELECT * FROM orders) SELECT code, qty FROM recent",
+])
+def test_unwrappable_query_skips_pushdown(query):
+    connector = FakeConnector({"code": "varchar", "qty": "int"}, reject=("ORDER BY", "WITH"))
+    plan = SourcePushdown(node_id="src", predicate=compile_predicate("qty > 1").expression, columns=["qty"])
+    result = apply_pushdown(connector, query, plan, "mssql")
+    assert result.query == query
+    assert result.predicate_sql is None and result.columns is None
+    assert any("sarılamıyor" in note for note in result.notes)
+
+
+def test_plain_table_select_is_wrapped_without_revalidation():
+    connector = FakeConnector({"code": "varchar", "qty": "int"})
+    plan = SourcePushdown(node_id="src", predicate=compile_predicate("qty > 1").expression, columns=["qty"])
+    result = apply_pushdown(connector, "SELECT * FROM [orders]", plan, "mssql")
+    assert result.query == "SELECT [qty] FROM (SELECT * FROM [orders]) AS pd_src WHERE [qty] > 1"
+    assert result.pruned_columns == ["code"]
+    assert len(connector.described) == 1
+
+
+def test_validated_custom_query_is_wrapped():
+    connector = FakeConnector({"code": "varchar", "qty": "int"}, reject=("ORDER BY",))
+    plan = SourcePushdown(node_id="src", predicate=compile_predicate("qty > 1 AND code = 5").expression)
+    query = "SELECT code, qty FROM orders WHERE qty < 100"
+    result = apply_pushdown(connector, query, plan, "mssql")
+    assert result.query == f"SELECT * FROM ({query}) AS pd_src WHERE [qty] > 1"
+    assert len(connector.described) == 2
+    assert any("yalnızca" in note for note in result.notes)
+
+
+def test_incompatible_predicate_leaves_query_unchanged():
+    connector = FakeConnector({"code": "varchar", "qty": "int"})
+    plan = SourcePushdown(node_id="src", predicate=compile_predicate("code = 5").expression)
+    query = "SELECT code, qty FROM orders"
+    result = apply_pushdown(connector, query, plan, "mssql")
+    assert result.query == query and result.predicate_sql is None
+    assert any("taşınmadı" in note for note in result.notes)
@@ -0,0 +1,70 @@
+import datetime as dt
+
+from app.engine.chunk import ColumnarChunk
+from app.services import execution_service
+from app.services.watermark_service import build_incremental_query, decode_value, encode_value
+
+# MSSQL datetime 1/300 sn tick'i: sürücü .003000 döndürür, sunucuda .0033333 saklanır
+LAST = dt.datetime(2024, 1, 15, 8, 30, 0, 3000)
+
+
+class FakeConnection:
+    type = "mssql"
+
+
+class FakeConnector:
+    """Watermark sorgusunu datetime2 hassasiyetinde çalıştırmış gibi son satırları tekrar döner."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.queries: list[str] = []
+
+    def read_chunks(self, query, chunk_size, columnar=False):
+        self.queries.append(query)
+        yield from self.chunks
+
+    def close(self):
+        pass
+
+
+def _read(monkeypatch, chunks):
+    connector = FakeConnector(chunks)
+    monkeypatch.setattr(execution_service, "_log", lambda *a, **k: None)
+    monkeypatch.setattr(execution_service, "get_connection", lambda db, conn_id: FakeConnection())
+    monkeypatch.setattr(execution_service, "_open_connector", lambda connection, token: connector)
+    monkeypatch.setattr(execution_service, "get_watermark", lambda *a: LAST)
+    node = {"id": "src", "type": "source", "data": {"config": {
+        "connection_id": "c", "query": "SELECT * FROM t", "incremental_column": "modified_at",
+    }}}
+    watermarks: dict = {}
+    rows = [
+        chunk for chunk in execution_service._run_source_node(
+            None, "exec", node, workflow_id="wf", watermarks=watermarks,
+        )
+    ]
+    return connector, rows, watermarks
+
+
+def test_rows_at_watermark_are_not_read_again(monkeypatch):
+    newer = LAST + dt.timedelta(seconds=1)
+    chunks = [
+        [{"id": 1, "modified_at": LAST}, {"id": 2, "modified_at": LAST}],
+        [{"id": 3, "modified_at": newer}, {"id": 4, "modified_at": None}],
+    ]
+    connector, rows, watermarks = _read(monkeypatch, chunks)
+    assert "[modified_at] > CAST(" in connector.queries[0]
+    assert rows == [[{"id": 3, "modified_at": newer}]]
+    assert watermarks == {"src": ("modified_at", newer)}
+
+
+def test_columnar_chunk_is_filtered_and_watermark_kept(monkeypatch):
+    chunk = ColumnarChunk(["id", "modified_at"], [[1, 2], [LAST, LAST]])
+    _, rows, watermarks = _read(monkeypatch, [chunk])
+    assert rows == []
+    assert watermarks == {}
+
+
+def test_value_roundtrip_and_first_run_query():
+    for value in (5, LAST, dt.date(2024, 1, 15), b"\x00\x01", "abc"):
+        assert decode_value(*encode_value(value)) == value
+    assert build_incremental_query("SELECT * FROM t", "id", None) == "SELECT * FROM t"
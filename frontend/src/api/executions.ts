@@ -35,6 +35,11 @@ export const executionApi = {
     await api.post(`/executions/${id}/cancel`)
   },
 
+  resume: async (id: string) => {
+    const res = await api.post<Execution>(`/executions/${id}/resume`)
+    return res.data
+  },
+
   getTimeline: async (id: string) => {
     const res = await api.get<ExecutionTimeline>(`/executions/${id}/timeline`)
     return res.data
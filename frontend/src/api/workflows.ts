@@ -5,6 +5,7 @@ import type {
   WorkflowUpdate,
   WorkflowValidationResult,
   WorkflowExport,
+  SourceReadPlan,
 } from '@/types/workflow'
 
 export const workflowApi = {
@@ -40,6 +41,11 @@ export const workflowApi = {
     return response.data
   },
 
+  dryRun: async (id: string) => {
+    const response = await apiClient.post<SourceReadPlan[]>(`/workflows/${id}/dry-run`)
+    return response.data
+  },
+
   export: async (id: string) => {
     const response = await apiClient.get<WorkflowExport>(`/workflows/${id}/export`)
     return response.data
@@ -5,10 +5,11 @@ import {
 } from 'lucide-react'
 import { useConnections, useSchemas, useTables, useColumns } from '@/hooks/useConnections'
 import { usePreviewTable, usePreviewQuery, useQueryColumns } from '@/hooks/useDataPreview'
+import { useWorkflows } from '@/hooks/useWorkflows'
 import ColumnMappingEditor from './ColumnMappingEditor'
 import DataPreviewTable from '@/components/data-preview/DataPreviewTable'
 import SqlEditor from '@/components/editor/SqlEditor'
-import type { WorkflowNode, ColumnMapping, DataType } from '@/types/workflow'
+import type { WorkflowNode, ColumnMapping, DataType, AggregateItem } from '@/types/workflow'
 import type { PreviewResponse } from '@/types/dataPreview'
 import type { ColumnInfo } from '@/types/connection'
 
@@ -208,6 +209,7 @@ export default function NodeConfigPanel({ node, allNodes, edges, onClose, onSave
 
   const cfg          = (localNode.data.config as Record<string, unknown>) || {}
   const { data: connections } = useConnections()
+  const { data: workflows } = useWorkflows()
 
   const connectionId = cfg.connection_id as string | undefined
   const schemaName   = cfg.schema      as string | undefined
@@ -535,6 +537,84 @@ export default function NodeConfigPanel({ node, allNodes, edges, onClose, onSave
                           Önerilen: 2000–10000. Bellek/ağ durumuna göre ayarlayın.
                         </p>
                       </div>
+                      <div>
+                        <label className="block text-xs font-medium mb-1 text-muted-foreground">Ön Okuma (chunk)</label>
+                        <input
+                          type="number"
+                          min={0} max={16} step={1}
+                          value={(cfg.prefetch_chunks as number) ?? 2}
+                          onChange={(e) => updateConfig({ prefetch_chunks: Math.max(0, parseInt(e.target.value) || 0) })}
+                          className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                        />
+                        <p className="text-xs text-muted-foreground mt-1">
+                          Hedef yazarken kaynaktan önceden okunacak chunk sayısı. 0 = kapalı.
+                        </p>
+                      </div>
+                      <div>
+                        <label className="block text-xs font-medium mb-1 text-muted-foreground">Incremental Kolon</label>
+                        <input
+                          type="text"
+                          value={(cfg.incremental_column as string) ?? ''}
+                          onChange={(e) => updateConfig({ incremental_column: e.target.value || undefined })}
+                          placeholder="ör. modified_at, rowversion, id"
+                          className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                        />
+                        <p className="text-xs text-muted-foreground mt-1">
+                          Doluysa yalnızca son başarılı çalıştırmadaki en büyük değerden sonraki satırlar okunur. Boş = tam okuma.
+                        </p>
+                      </div>
+                      <div>
+                        <label className="block text-xs font-medium mb-1 text-muted-foreground">Checkpoint Kolonu</label>
+                        <input
+                          type="text"
+                          value={(cfg.checkpoint_column as string) ?? ''}
+                          onChange={(e) => updateConfig({ checkpoint_column: e.target.value || undefined })}
+                          placeholder="ör. id"
+                          className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                        />
+                        <p className="text-xs text-muted-foreground mt-1">
+                          Artan, benzersiz anahtar. Kaynak bu kolona göre sıralı okunur; hata veya iptal sonrası çalıştırma kaldığı yerden devam ettirilebilir. Paralel okumayı kapatır.
+                        </p>
+                      </div>
+                      <div>
+                        <label className="block text-xs font-medium mb-1 text-muted-foreground">Paralel Okuma (parça)</label>
+                        <input
+                          type="number"
+                          min={1} max={16} step={1}
+                          value={(cfg.partition_count as number) ?? 1}
+                          onChange={(e) => updateConfig({ partition_count: Math.max(1, parseInt(e.target.value) || 1) })}
+                          className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                        />
+                        <p className="text-xs text-muted-foreground mt-1">
+                          Sorgu bu kadar parçaya bölünüp ayrı bağlantılardan aynı anda okunur. 1 = kapalı.
+                        </p>
+                      </div>
+                      {((cfg.partition_count as number) ?? 1) > 1 && (
+                        <div className="grid grid-cols-2 gap-2">
+                          <div>
+                            <label className="block text-xs font-medium mb-1 text-muted-foreground">Bölme Kolonu</label>
+                            <input
+                              type="text"
+                              value={(cfg.partition_column as string) ?? ''}
+                              onChange={(e) => updateConfig({ partition_column: e.target.value || undefined })}
+                              placeholder="ör. id, order_date"
+                              className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                            />
+                          </div>
+                          <div>
+                            <label className="block text-xs font-medium mb-1 text-muted-foreground">Bölme Yöntemi</label>
+                            <select
+                              value={(cfg.partition_method as string) ?? 'range'}
+                              onChange={(e) => updateConfig({ partition_method: e.target.value })}
+                              className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                            >
+                              <option value="range">Aralık (min–max)</option>
+                              <option value="ntile">Eşit satır (NTILE)</option>
+                              <option value="hash">Hash</option>
+                            </select>
+                          </div>
+                        </div>
+                      )}
                     </div>
                   )}
                 </div>
@@ -627,6 +707,32 @@ export default function NodeConfigPanel({ node, allNodes, edges, onClose, onSave
                     <option value="overwrite">Üzerine Yaz (Overwrite)</option>
                     <option value="upsert">Güncelle/Ekle (Upsert)</option>
                   </select>
+                  {(cfg.write_mode as string) === 'upsert' && (
+                    <div className="mt-2">
+                      <label className="block text-xs font-medium mb-1 text-muted-foreground">
+                        Eşleşme Anahtarları
+                        <span className="ml-1 text-muted-foreground/60">(boşsa primary key)</span>
+                      </label>
+                      <div className="flex flex-wrap gap-1">
+                        {(dstColumns ?? []).map((col) => {
+                          const keys = (cfg.upsert_keys as string[]) || []
+                          const active = keys.includes(col.name)
+                          return (
+                            <button
+                              key={col.name}
+                              type="button"
+                              onClick={() => updateConfig({
+                                upsert_keys: active ? keys.filter((k) => k !== col.name) : [...keys, col.name],
+                              })}
+                              className={`rounded border px-2 py-0.5 text-xs ${active ? 'border-primary bg-primary/10 text-primary' : 'border-border text-muted-foreground'}`}
+                            >
+                              {col.name}{col.is_primary_key ? ' 🔑' : ''}
+                            </button>
+                          )
+                        })}
+                      </div>
+                    </div>
+                  )}
                 </div>
 
                 {/* ─── Gelişmiş Yazma Ayarları ──────────────────────────── */}
@@ -677,6 +783,46 @@ export default function NodeConfigPanel({ node, allNodes, edges, onClose, onSave
                             : 'Hata olursa tüm işlem geri alınır'}
                         </p>
                       </div>
+
+                      {/* Yükleme Yöntemi */}
+                      <div>
+                        <label className="block text-xs font-medium mb-1 text-muted-foreground">
+                          Yükleme Yöntemi
+                        </label>
+                        <select
+                          value={(cfg.load_method as string) || 'insert'}
+                          onChange={(e) => updateConfig({ load_method: e.target.value })}
+                          className="w-full rounded border border-border bg-background px-2 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                        >
+                          <option value="insert">Multi-row INSERT</option>
+                          <option value="bulk">Bulk Copy (MSSQL)</option>
+                        </select>
+                        <p className="text-xs text-muted-foreground mt-0.5">Geniş tablolarda bulk çok daha hızlıdır</p>
+                      </div>
+
+                      {(cfg.load_method as string) === 'bulk' && (
+                        <div>
+                          <label className="block text-xs font-medium mb-1 text-muted-foreground">
+                            Bulk Batch
+                            <span className="ml-1 text-muted-foreground/60">(0 = chunk)</span>
+                          </label>
+                          <input
+                            type="number"
+                            min={0} step={1000}
+                            value={(cfg.bulk_batch_size as number) ?? 0}
+                            onChange={(e) => updateConfig({ bulk_batch_size: parseInt(e.target.value) || 0 })}
+                            className="w-full rounded border border-border bg-background px-2 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                          />
+                          <label className="mt-1 flex items-center gap-1.5 text-xs text-muted-foreground">
+                            <input
+                              type="checkbox"
+                              checked={(cfg.bulk_tablock as boolean) ?? true}
+                              onChange={(e) => updateConfig({ bulk_tablock: e.target.checked })}
+                            />
+                            Tablo kilidi (TABLOCK)
+                          </label>
+                        </div>
+                      )}
                     </div>
                   )}
                 </div>
@@ -871,10 +1017,189 @@ export default function NodeConfigPanel({ node, allNodes, edges, onClose, onSave
               value={(cfg.condition as string) || ''}
               onChange={(e) => updateConfig({ condition: e.target.value })}
               className="w-full rounded-lg border border-border bg-background px-3 py-2 text-sm font-mono focus:outline-none focus:ring-2 focus:ring-primary"
-              placeholder="column = 'deger'"
+              placeholder="status = 'active' AND amount > 100"
             />
             <p className="text-xs text-muted-foreground mt-1">
-              Desteklenen: =, !=, {'>'}, {'<'}, {'>='},{'<='}, LIKE (* wildcard)
+              Desteklenen: =, !=, {'>'}, {'<'}, {'>='}, {'<='}, AND, OR, NOT, IN (...), BETWEEN, LIKE (% veya * wildcard), IS [NOT] NULL, DATE '2024-01-01'
+            </p>
+          </div>
+        )}
+
+        {/* ══════════ JOIN ══════════ */}
+        {localNode.type === 'join' && (
+          <div className="space-y-3">
+            <div>
+              <label className="block text-sm font-medium mb-1">Join Tipi</label>
+              <select
+                value={(cfg.join_type as string) ?? 'inner'}
+                onChange={(e) => updateConfig({ join_type: e.target.value })}
+                className="w-full rounded-lg border border-border bg-background px-3 py-2 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+              >
+                <option value="inner">Inner (eşleşenler)</option>
+                <option value="left">Left (tüm sol satırlar)</option>
+                <option value="anti">Anti (sağda eşi olmayan sol satırlar)</option>
+              </select>
+            </div>
+            <div className="grid grid-cols-2 gap-2">
+              <div>
+                <label className="block text-xs font-medium mb-1 text-muted-foreground">Sol Anahtarlar</label>
+                <input
+                  type="text"
+                  value={((cfg.left_keys as string[]) || []).join(', ')}
+                  onChange={(e) => updateConfig({ left_keys: e.target.value.split(',').map((k) => k.trim()).filter(Boolean) })}
+                  className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm font-mono focus:outline-none focus:ring-2 focus:ring-primary"
+                  placeholder="customer_id"
+                />
+              </div>
+              <div>
+                <label className="block text-xs font-medium mb-1 text-muted-foreground">Sağ Anahtarlar</label>
+                <input
+                  type="text"
+                  value={((cfg.right_keys as string[]) || []).join(', ')}
+                  onChange={(e) => updateConfig({ right_keys: e.target.value.split(',').map((k) => k.trim()).filter(Boolean) })}
+                  className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm font-mono focus:outline-none focus:ring-2 focus:ring-primary"
+                  placeholder="boş = sol ile aynı"
+                />
+              </div>
+            </div>
+            <div className="grid grid-cols-2 gap-2">
+              <div>
+                <label className="block text-xs font-medium mb-1 text-muted-foreground">Hash Tablosu</label>
+                <select
+                  value={(cfg.build_side as string) ?? 'auto'}
+                  onChange={(e) => updateConfig({ build_side: e.target.value })}
+                  className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                >
+                  <option value="auto">Otomatik (küçük taraf)</option>
+                  <option value="left">Sol</option>
+                  <option value="right">Sağ</option>
+                </select>
+              </div>
+              <div>
+                <label className="block text-xs font-medium mb-1 text-muted-foreground">Bellek Limiti (satır)</label>
+                <input
+                  type="number"
+                  min={1000}
+                  value={(cfg.memory_rows as number) ?? ''}
+                  onChange={(e) => updateConfig({ memory_rows: e.target.value ? Number(e.target.value) : undefined })}
+                  className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                  placeholder="500000"
+                />
+              </div>
+            </div>
+            <p className="text-xs text-muted-foreground">
+              Sol girdi üst-sol, sağ girdi üst-sağ bağlantı noktasına bağlanır. Limit aşılırsa taraflar diske bölünür.
+              Sağda da bulunan sol kolon adlarına "_right" eklenir.
+            </p>
+          </div>
+        )}
+
+        {/* ══════════ AGGREGATE ══════════ */}
+        {localNode.type === 'aggregate' && (
+          <div className="space-y-3">
+            <div>
+              <label className="block text-sm font-medium mb-1">Grup Kolonları</label>
+              <input
+                type="text"
+                value={((cfg.group_by as string[]) || []).join(', ')}
+                onChange={(e) => updateConfig({ group_by: e.target.value.split(',').map((k) => k.trim()).filter(Boolean) })}
+                className="w-full rounded-lg border border-border bg-background px-3 py-2 text-sm font-mono focus:outline-none focus:ring-2 focus:ring-primary"
+                placeholder="region, order_date"
+              />
+              <p className="text-xs text-muted-foreground mt-1">Boş bırakılırsa tüm girdi tek satıra toplanır.</p>
+            </div>
+            <div className="space-y-2">
+              <label className="block text-sm font-medium">Fonksiyonlar</label>
+              {((cfg.aggregates as AggregateItem[]) || []).map((item, i) => {
+                const items = (cfg.aggregates as AggregateItem[]) || []
+                const setItem = (patch: Partial<AggregateItem>) =>
+                  updateConfig({ aggregates: items.map((a, j) => (j === i ? { ...a, ...patch } : a)) })
+                return (
+                  <div key={i} className="grid grid-cols-[1fr_1fr_1fr_auto] gap-1.5 items-center">
+                    <select
+                      value={item.function}
+                      onChange={(e) => setItem({ function: e.target.value as AggregateItem['function'] })}
+                      className="rounded border border-border bg-background px-2 py-1.5 text-xs focus:outline-none focus:ring-2 focus:ring-primary"
+                    >
+                      <option value="count">count</option>
+                      <option value="sum">sum</option>
+                      <option value="min">min</option>
+                      <option value="max">max</option>
+                      <option value="avg">avg</option>
+                      <option value="count_distinct">count distinct</option>
+                      <option value="approx_count_distinct">count distinct (yaklaşık)</option>
+                    </select>
+                    <input
+                      type="text"
+                      value={item.column ?? ''}
+                      onChange={(e) => setItem({ column: e.target.value || undefined })}
+                      className="rounded border border-border bg-background px-2 py-1.5 text-xs font-mono focus:outline-none focus:ring-2 focus:ring-primary"
+                      placeholder={item.function === 'count' ? '* (tümü)' : 'kolon'}
+                    />
+                    <input
+                      type="text"
+                      value={item.alias ?? ''}
+                      onChange={(e) => setItem({ alias: e.target.value || undefined })}
+                      className="rounded border border-border bg-background px-2 py-1.5 text-xs font-mono focus:outline-none focus:ring-2 focus:ring-primary"
+                      placeholder="çıktı adı"
+                    />
+                    <button
+                      type="button"
+                      onClick={() => updateConfig({ aggregates: items.filter((_, j) => j !== i) })}
+                      className="rounded p-1 text-muted-foreground hover:text-destructive hover:bg-destructive/10"
+                    >
+                      <X className="h-3.5 w-3.5" />
+                    </button>
+                  </div>
+                )
+              })}
+              <button
+                type="button"
+                onClick={() => updateConfig({
+                  aggregates: [...((cfg.aggregates as AggregateItem[]) || []), { function: 'sum', column: '' }],
+                })}
+                className="text-xs text-primary hover:underline"
+              >
+                + Fonksiyon ekle
+              </button>
+            </div>
+            <div>
+              <label className="block text-xs font-medium mb-1 text-muted-foreground">Bellek Limiti (grup)</label>
+              <input
+                type="number"
+                min={1000}
+                value={(cfg.memory_groups as number) ?? ''}
+                onChange={(e) => updateConfig({ memory_groups: e.target.value ? Number(e.target.value) : undefined })}
+                className="w-full rounded border border-border bg-background px-3 py-1.5 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+                placeholder="200000"
+              />
+              <p className="text-xs text-muted-foreground mt-1">
+                Grup sayısı limiti aşarsa kısmi sonuçlar diske yazılır ve sonda birleştirilir.
+              </p>
+            </div>
+          </div>
+        )}
+
+        {/* ══════════ WORKFLOW REF ══════════ */}
+        {localNode.type === 'workflowRef' && (
+          <div className="space-y-3">
+            <div>
+              <label className="block text-sm font-medium mb-1">Alt Workflow</label>
+              <select
+                value={(cfg.workflow_ref_id as string) ?? ''}
+                onChange={(e) => updateConfig({ workflow_ref_id: e.target.value || undefined })}
+                className="w-full rounded-lg border border-border bg-background px-3 py-2 text-sm focus:outline-none focus:ring-2 focus:ring-primary"
+              >
+                <option value="">Workflow seçin...</option>
+                {(workflows ?? []).map((wf) => (
+                  <option key={wf.id} value={wf.id}>{wf.name}</option>
+                ))}
+              </select>
+            </div>
+            <p className="text-xs text-muted-foreground">
+              Seçilen workflow bu çalıştırmanın içinde açılır: node'ları diğer dallarla paralel çalışır,
+              loglar aynı execution'a yazılır. Gelen bağlantılar alt workflow başlamadan önce, çıkan bağlantılar
+              alt workflow'un tüm hedefleri bittikten sonra çalışır.
             </p>
           </div>
         )}
@@ -4,6 +4,7 @@ import {
   Zap,
   Filter,
   Merge,
+  Sigma,
   GitBranch,
   Terminal,
 } from 'lucide-react'
@@ -23,6 +24,7 @@ const nodeTypes = [
   { type: 'transform', label: 'Transform', icon: Zap, color: 'text-yellow-500' },
   { type: 'filter', label: 'Filter', icon: Filter, color: 'text-purple-500' },
   { type: 'join', label: 'Join', icon: Merge, color: 'text-pink-500' },
+  { type: 'aggregate', label: 'Aggregate', icon: Sigma, color: 'text-cyan-500' },
   {
     type: 'workflowRef',
     label: 'Workflow Ref',
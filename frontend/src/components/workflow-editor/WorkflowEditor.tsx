@@ -335,6 +335,7 @@ export default function WorkflowEditor({ workflow }: Props) {
       transform: 'Transform',
       filter: 'Filter',
       join: 'Join',
+      aggregate: 'Aggregate',
       workflowRef: 'Workflow Ref',
       sqlExecute: 'SQL Execute',
     }
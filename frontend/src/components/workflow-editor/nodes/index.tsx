@@ -9,6 +9,7 @@ import {
   Shuffle,
   SlidersHorizontal,
   Combine,
+  Sigma,
   Workflow,
   X,
   Terminal,
@@ -395,6 +396,51 @@ export const JoinNode = memo(({ id, data, selected, isConnectable }: NodeProps)
 })
 JoinNode.displayName = 'JoinNode'
 
+// ======= AGGREGATE NODE =======
+export const AggregateNode = memo(({ id, data, selected, isConnectable }: NodeProps) => {
+  const isActive = !!data._isActive
+  const liveRows = data._liveRows as number | null | undefined
+  const groupBy = (data.config?.group_by as string[] | undefined) ?? []
+  return (
+    <div
+      className={`${nodeBase} text-cyan-100 transition-all duration-300 ${
+        isActive
+          ? 'bg-cyan-900 border-green-400 ring-2 ring-green-400/60 shadow-green-900/50 shadow-xl'
+          : 'bg-cyan-950 border-cyan-500'
+      } ${selected ? 'ring-2 ring-cyan-400 ring-offset-1 ring-offset-cyan-950' : ''
+      } ${data.disabled ? 'opacity-40 grayscale' : ''}`}
+    >
+      <NodeActions nodeId={id} disabled={!!data.disabled} />
+      <Handle
+        type="target"
+        position={Position.Top}
+        isConnectable={isConnectable}
+        style={{ ...handleStyle, background: '#22d3ee', borderColor: '#0e7490' }}
+      />
+      <div className="flex items-center gap-2">
+        <Sigma className={`h-5 w-5 flex-shrink-0 ${isActive ? 'text-green-400' : 'text-cyan-400'}`} />
+        <div className="min-w-0">
+          <div className="truncate font-semibold">{data.label || 'Aggregate'}</div>
+          <div className="text-[10px] text-cyan-400/70 uppercase tracking-wider">aggregate</div>
+        </div>
+      </div>
+      {groupBy.length > 0 && (
+        <div className="mt-2 text-xs text-cyan-300/80 truncate bg-cyan-900/40 rounded px-2 py-0.5 font-mono">
+          GROUP BY {groupBy.join(', ')}
+        </div>
+      )}
+      <NodeLiveBadge isActive={isActive} liveRows={liveRows} />
+      <Handle
+        type="source"
+        position={Position.Bottom}
+        isConnectable={isConnectable}
+        style={{ ...handleStyle, background: '#22d3ee', borderColor: '#0e7490' }}
+      />
+    </div>
+  )
+})
+AggregateNode.displayName = 'AggregateNode'
+
 // ======= WORKFLOW REF NODE =======
 export const WorkflowRefNode = memo(({ id, data, selected, isConnectable }: NodeProps) => {
   const isActive = !!data._isActive
@@ -495,6 +541,7 @@ export const NODE_TYPES = {
   transform: TransformNode,
   filter: FilterNode,
   join: JoinNode,
+  aggregate: AggregateNode,
   workflowRef: WorkflowRefNode,
   sqlExecute: SqlExecuteNode,
 } as const
@@ -8,6 +8,7 @@ import {
   Shuffle,
   SlidersHorizontal,
   Combine,
+  Sigma,
   Workflow,
   Terminal,
   ArrowRightToLine,
@@ -48,6 +49,8 @@ function getNodeStyle(type: string) {
       return { icon: SlidersHorizontal, color: 'text-purple-400', bg: 'bg-purple-950', border: 'border-purple-500' }
     case 'join':
       return { icon: Combine, color: 'text-orange-400', bg: 'bg-orange-950', border: 'border-orange-500' }
+    case 'aggregate':
+      return { icon: Sigma, color: 'text-cyan-400', bg: 'bg-cyan-950', border: 'border-cyan-500' }
     case 'workflowRef':
       return { icon: Workflow, color: 'text-pink-400', bg: 'bg-pink-950', border: 'border-pink-500' }
     case 'sqlExecute':
@@ -64,6 +67,7 @@ function getNodeTypeLabel(type: string) {
     case 'transform': return 'Dönüşüm'
     case 'filter': return 'Filtre'
     case 'join': return 'Birleştirme'
+    case 'aggregate': return 'Gruplama'
     case 'workflowRef': return 'Workflow Referans'
     case 'sqlExecute': return 'SQL Execute'
     default: return type
@@ -104,6 +108,17 @@ function extractConfigDetails(node: NodeData): Array<{ key: string; value: strin
     details.push({ key: 'Koşul', value: String(config.condition), isCode: true })
   }
 
+  // Gruplama
+  if (Array.isArray(config.group_by) && config.group_by.length > 0) {
+    details.push({ key: 'Grup Kolonları', value: (config.group_by as string[]).join(', ') })
+  }
+  if (Array.isArray(config.aggregates) && config.aggregates.length > 0) {
+    const aggStr = (config.aggregates as Array<Record<string, unknown>>)
+      .map((a) => `${a.alias ?? `${a.function}_${a.column ?? ''}`} = ${a.function}(${a.column ?? '*'})`)
+      .join('\n')
+    details.push({ key: 'Fonksiyonlar', value: aggStr, isCode: true })
+  }
+
   // Yazma modu
   if (config.write_mode) {
     details.push({ key: 'Yazma Modu', value: String(config.write_mode) })
@@ -275,7 +290,7 @@ export default function WorkflowPreviewModal({ log, onClose }: Props) {
   }, [nodes])
 
   // Tip sıralama
-  const typeOrder = ['source', 'transform', 'filter', 'join', 'destination', 'sqlExecute', 'workflowRef']
+  const typeOrder = ['source', 'transform', 'filter', 'join', 'aggregate', 'destination', 'sqlExecute', 'workflowRef']
 
   return (
     <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/50 p-4">
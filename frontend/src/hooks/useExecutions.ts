@@ -64,3 +64,18 @@ export function useCancelExecution() {
     },
   })
 }
+
+export function useResumeExecution() {
+  const queryClient = useQueryClient()
+
+  return useMutation({
+    mutationFn: (id: string) => executionApi.resume(id),
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ['executions'] })
+      toast.success('Execution kaldığı yerden devam ettiriliyor')
+    },
+    onError: (error: Error) => {
+      toast.error('Devam ettirilemedi', { description: error.message })
+    },
+  })
+}
@@ -34,7 +34,7 @@ const STATUS_TR: Record<string, string> = {
 }
 
 const TRIGGER_TR: Record<string, string> = {
-  manual: 'Manuel', scheduled: 'Zamanlı', chained: 'Zincir',
+  manual: 'Manuel', scheduled: 'Zamanlı', chained: 'Zincir', resume: 'Devam',
 }
 
 export default function DashboardPage() {
@@ -2,9 +2,9 @@ import { useState, useMemo } from 'react'
 import {
   Activity, CheckCircle2, XCircle, Loader2, AlertCircle,
   Search, Filter, RotateCcw, Eye, ChevronDown, ChevronUp, FolderOpen,
-  ChevronLeft, ChevronRight,
+  ChevronLeft, ChevronRight, StepForward,
 } from 'lucide-react'
-import { useExecutions, useCancelExecution } from '@/hooks/useExecutions'
+import { useExecutions, useCancelExecution, useResumeExecution } from '@/hooks/useExecutions'
 import { useWorkflows } from '@/hooks/useWorkflows'
 import { useFolderTree } from '@/hooks/useFolders'
 import type { FolderTree } from '@/types/folder'
@@ -33,7 +33,7 @@ const STATUS_TR: Record<string, string> = {
 }
 
 const TRIGGER_TR: Record<string, string> = {
-  manual: 'Manuel', scheduled: 'Zamanlı', chained: 'Zincir',
+  manual: 'Manuel', scheduled: 'Zamanlı', chained: 'Zincir', resume: 'Devam',
 }
 
 function today(): string {
@@ -66,6 +66,7 @@ export default function ExecutionsPage() {
   const { data: workflows = [] } = useWorkflows()
   const { data: folderTree = [] } = useFolderTree()
   const cancelExecution = useCancelExecution()
+  const resumeExecution = useResumeExecution()
 
   const [viewingId,  setViewingId]  = useState<string | null>(null)
   const [expandedId, setExpandedId] = useState<string | null>(null)
@@ -350,6 +351,16 @@ export default function ExecutionsPage() {
                             <XCircle className="h-4 w-4" />
                           </button>
                         )}
+                        {(exec.status === 'failed' || exec.status === 'cancelled') && (
+                          <button
+                            onClick={() => resumeExecution.mutate(exec.id)}
+                            disabled={resumeExecution.isPending}
+                            title="Kaldığı Yerden Devam Et"
+                            className="rounded p-1.5 hover:bg-accent transition-colors text-muted-foreground hover:text-foreground disabled:opacity-50"
+                          >
+                            <StepForward className="h-4 w-4" />
+                          </button>
+                        )}
                       </div>
                     </td>
                   </tr>
@@ -5,7 +5,7 @@ export interface Execution {
   folder_id?: string
   folder_path?: string   // Örn: "Satış > Günlük"
   status: 'pending' | 'running' | 'success' | 'failed' | 'cancelled'
-  trigger_type: 'manual' | 'scheduled' | 'chained'
+  trigger_type: 'manual' | 'scheduled' | 'chained' | 'resume'
   error_message?: string
   rows_processed: number
   rows_failed: number
@@ -6,6 +6,16 @@ export interface WorkflowDefinition {
     y: number
     zoom: number
   }
+  settings?: WorkflowSettings
+}
+
+// Workflow geneli motor ayarları (node config'i ezebilir)
+export interface WorkflowSettings {
+  prefetch_chunks?: number        // kaynak ön okuma derinliği, 0 = kapalı
+  max_parallel_branches?: number  // aynı anda çalışan bağımsız hedef sayısı
+  columnar_chunks?: boolean       // kaynaklar chunk'ları kolon bazlı taşısın
+  pushdown?: boolean              // filtre/kolon seçimini kaynak sorgusuna taşı (varsayılan true)
+  fanout_buffer_chunks?: number   // fan-out'ta tüketici başına bellekteki chunk sayısı
 }
 
 export interface WorkflowNode {
@@ -34,6 +44,7 @@ export type NodeType =
   | 'transform'
   | 'filter'
   | 'join'
+  | 'aggregate'
   | 'workflow_ref'
   | 'sqlExecute'
 
@@ -73,6 +84,16 @@ export interface SourceNodeConfig {
   table?: string
   query?: string       // custom SQL - overrides table
   chunk_size?: number
+  prefetch_chunks?: number  // okuma ön belleği (chunk), 0 = kapalı
+  fanout_buffer_chunks?: number  // birden fazla hedefe dağıtırken tüketici tamponu
+  fanout_spill?: boolean         // tampon dolunca geçici dosyaya taşı
+  incremental_column?: string    // watermark kolonu (rowversion, modified_at, identity); boş = tam okuma
+  checkpoint_column?: string     // artan benzersiz anahtar; kaynak buna göre sıralı okunur, hata sonrası kaldığı yerden devam
+  partition_count?: number       // paralel okuma parça sayısı, 1 = kapalı
+  partition_column?: string      // parçalara bölme kolonu
+  partition_method?: 'range' | 'ntile' | 'hash'
+  columnar?: boolean             // chunk'lar kolon bazlı taşınsın (workflow ayarını ezer)
+  pushdown?: boolean             // false: filtre ve kolon seçimi kaynak sorgusuna taşınmaz
 }
 
 export interface DestinationNodeConfig {
@@ -85,6 +106,9 @@ export interface DestinationNodeConfig {
   // Performans & hata yönetimi
   batch_size?: number          // multi-row INSERT içindeki satır sayısı (varsayılan 500)
   on_error?: 'rollback' | 'continue'  // chunk hata → rollback(tümünü geri al) | continue(atla devam et)
+  load_method?: 'insert' | 'bulk'     // bulk: TDS bulk copy (MSSQL), desteklenmezse insert
+  bulk_tablock?: boolean              // bulk yüklemede TABLOCK (varsayılan true)
+  bulk_batch_size?: number            // bulk commit başına satır, 0 = chunk başına tek batch
 }
 
 export interface TransformNodeConfig {
@@ -93,12 +117,49 @@ export interface TransformNodeConfig {
 
 export interface FilterNodeConfig {
   condition: string  // SQL WHERE clause style
+  pushdown?: boolean // false: koşul kaynak sorgusuna taşınmaz
+}
+
+export interface JoinNodeConfig {
+  join_type?: 'inner' | 'left' | 'anti'
+  left_keys: string[]
+  right_keys?: string[]            // boş = left_keys ile aynı adlar
+  build_side?: 'auto' | 'left' | 'right'  // hash tablosuna alınan taraf (auto = küçük taraf)
+  memory_rows?: number             // build tarafı bu satır sayısını aşınca diske taşar
+  right_suffix?: string            // çakışan sağ kolonlara sonek (varsayılan "_right")
+  chunk_size?: number              // çıktı chunk boyutu
+}
+
+export type AggregateFunction =
+  | 'count'
+  | 'sum'
+  | 'min'
+  | 'max'
+  | 'avg'
+  | 'count_distinct'
+  | 'approx_count_distinct'   // HyperLogLog, ~%1.6 hata
+
+export interface AggregateItem {
+  function: AggregateFunction
+  column?: string                  // count için boş = count(*)
+  alias?: string                   // boş = "<function>_<column>"
+}
+
+export interface AggregateNodeConfig {
+  group_by: string[]               // boş = tüm girdi tek satır
+  aggregates: AggregateItem[]
+  memory_groups?: number           // bu grup sayısı aşılınca kısmi sonuçlar diske dökülür
+  chunk_size?: number              // çıktı chunk boyutu
+}
+
+export interface WorkflowRefNodeConfig {
+  workflow_ref_id: string          // çalıştırma içinde açılacak alt workflow
 }
 
 export interface NodeData {
   label: string
   description?: string
-  config?: SourceNodeConfig | DestinationNodeConfig | TransformNodeConfig | FilterNodeConfig | Record<string, unknown>
+  config?: SourceNodeConfig | DestinationNodeConfig | TransformNodeConfig | FilterNodeConfig | JoinNodeConfig | AggregateNodeConfig | WorkflowRefNodeConfig | Record<string, unknown>
 }
 
 export interface Workflow {
@@ -140,6 +201,22 @@ export interface WorkflowValidationResult {
   warnings: string[]
 }
 
+// Dry-run: source node'un çalıştırmada okuyacağı sorgu (pushdown sonrası)
+export interface SourceReadPlan {
+  node_id: string
+  label: string
+  dialect?: string | null
+  original_query?: string | null
+  query?: string | null
+  predicate?: string | null
+  pushed_filters: string[]
+  columns?: string[] | null
+  pruned_columns: string[]
+  original_bytes?: number | null
+  bytes_processed?: number | null
+  notes: string[]
+}
+
 export interface WorkflowExport {
   name: string
   description?: string